@@ -1,10 +1,200 @@
 """Streamlit データ分析アプリケーション メインエントリーポイント"""
 
+import importlib
+import time
+
 import streamlit as st
 
-from components.data_analysis import render_data_analysis_page
-from components.pages import render_about_page, render_home_page
 from components.sidebar import get_sidebar_css, render_sidebar_menu
+from utils.metrics import observe_rerun, start_metrics_exporter
+from utils.warmup import start_warmup
+
+# ページIDと描画関数（モジュール名, 関数名）の対応
+# ページモジュールは初回表示時に読み込み、plotly などの重いライブラリの読み込みを遅延させる
+PAGE_RENDERERS: dict[str, tuple[str, str]] = {
+    "home": ("components.pages", "render_home_page"),
+    "analysis": ("components.data_analysis", "render_data_analysis_page"),
+    # データ可視化ページ（現在は分析ページと同じ内容を表示）
+    "visualization": ("components.data_analysis", "render_data_analysis_page"),
+    "about": ("components.pages", "render_about_page"),
+}
+
+# カスタムCSS - スタイリッシュな青・白・黒系デザイン（プロセス起動時に一度だけ組み立てる）
+APP_CSS = (
+    """
+    <style>
+    /* カラースキーム定義 */
+    :root {
+        --primary-blue: #1E3A8A;
+        --secondary-blue: #3B82F6;
+        --light-blue: #60A5FA;
+        --dark-bg: #0F172A;
+        --medium-bg: #1E293B;
+        --light-bg: #F8FAFC;
+        --text-primary: #0F172A;
+        --text-secondary: #64748B;
+        --border-color: #E2E8F0;
+    }
+
+    /* メインエリア */
+    .main {
+        padding-top: 1rem;
+        background: linear-gradient(135deg, #F8FAFC 0%, #E0F2FE 100%);
+    }
+
+    /* ヘッダー・タイトル */
+    h1 {
+        color: var(--primary-blue) !important;
+        font-weight: 700 !important;
+        letter-spacing: -0.5px !important;
+    }
+
+    h2, h3 {
+        color: var(--primary-blue) !important;
+        font-weight: 600 !important;
+    }
+
+    /* タブ */
+    .stTabs [data-baseweb="tab-list"] {
+        gap: 12px;
+        background-color: white;
+        padding: 8px;
+        border-radius: 12px;
+        box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
+    }
+
+    .stTabs [data-baseweb="tab"] {
+        padding: 10px 20px;
+        background-color: transparent;
+        border-radius: 8px;
+        color: var(--text-secondary);
+        font-weight: 500;
+        transition: all 0.3s ease;
+    }
+
+    .stTabs [data-baseweb="tab"]:hover {
+        background-color: #EFF6FF;
+        color: var(--secondary-blue);
+    }
+
+    .stTabs [aria-selected="true"] {
+        background-color: var(--secondary-blue) !important;
+        color: white !important;
+    }
+
+    /* ボタン */
+    .stButton button {
+        background: linear-gradient(135deg, var(--primary-blue) 0%, var(--secondary-blue) 100%);
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 0.6rem 1.5rem;
+        font-weight: 600;
+        box-shadow: 0 4px 6px rgba(59, 130, 246, 0.3);
+        transition: all 0.3s ease;
+    }
+
+    .stButton button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 6px 12px rgba(59, 130, 246, 0.4);
+    }
+
+    /* メトリック */
+    [data-testid="stMetricValue"] {
+        color: var(--primary-blue);
+        font-weight: 700;
+    }
+
+    /* サイドバー */
+    [data-testid="stSidebar"] {
+        background: linear-gradient(180deg, var(--dark-bg) 0%, var(--medium-bg) 100%);
+    }
+
+    [data-testid="stSidebar"] * {
+        color: white !important;
+    }
+
+    [data-testid="stSidebar"] .stSelectbox label {
+        color: #93C5FD !important;
+    }
+
+    /* データフレーム */
+    .dataframe {
+        border-radius: 12px !important;
+        overflow: hidden;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }
+
+    /* カード風スタイル */
+    .element-container {
+        background-color: white;
+        border-radius: 12px;
+        padding: 1rem;
+        margin-bottom: 1rem;
+    }
+
+    /* ファイルアップローダー */
+    [data-testid="stFileUploader"] {
+        background-color: white;
+        border: 2px dashed var(--light-blue);
+        border-radius: 12px;
+        padding: 1.5rem;
+    }
+
+    /* セレクトボックス */
+    .stSelectbox > div > div {
+        background-color: white;
+        border-radius: 8px;
+        border-color: var(--border-color);
+    }
+
+    /* マルチセレクト */
+    .stMultiSelect > div > div {
+        background-color: white;
+        border-radius: 8px;
+    }
+
+    /* アラート・通知 */
+    .stSuccess {
+        background-color: #DBEAFE;
+        color: var(--primary-blue);
+        border-left: 4px solid var(--secondary-blue);
+    }
+
+    .stError {
+        background-color: #FEE2E2;
+        color: #991B1B;
+        border-left: 4px solid #DC2626;
+    }
+    """
+    + get_sidebar_css()
+    + """
+    </style>
+    """
+)
+
+FOOTER_HTML = """
+    <div style='text-align: center; color: #93C5FD; font-size: 0.9em;'>
+    Powered by Streamlit<br>
+    © 2025 Data Analysis App
+    </div>
+    """
+
+
+def get_page_renderer(page_id: str):
+    """
+    ページIDに対応する描画関数を取得（モジュールは初回のみ読み込む）
+
+    Args:
+        page_id: ページID
+
+    Returns:
+        描画関数、未知のページIDの場合はNone
+    """
+    if page_id not in PAGE_RENDERERS:
+        return None
+    module_name, function_name = PAGE_RENDERERS[page_id]
+    return getattr(importlib.import_module(module_name), function_name)
 
 
 def main():
@@ -17,185 +207,30 @@ def main():
         initial_sidebar_state="expanded",
     )
 
-    # カスタムCSS - スタイリッシュな青・白・黒系デザイン
-    st.markdown(
-        """
-        <style>
-        /* カラースキーム定義 */
-        :root {
-            --primary-blue: #1E3A8A;
-            --secondary-blue: #3B82F6;
-            --light-blue: #60A5FA;
-            --dark-bg: #0F172A;
-            --medium-bg: #1E293B;
-            --light-bg: #F8FAFC;
-            --text-primary: #0F172A;
-            --text-secondary: #64748B;
-            --border-color: #E2E8F0;
-        }
-
-        /* メインエリア */
-        .main {
-            padding-top: 1rem;
-            background: linear-gradient(135deg, #F8FAFC 0%, #E0F2FE 100%);
-        }
-
-        /* ヘッダー・タイトル */
-        h1 {
-            color: var(--primary-blue) !important;
-            font-weight: 700 !important;
-            letter-spacing: -0.5px !important;
-        }
-
-        h2, h3 {
-            color: var(--primary-blue) !important;
-            font-weight: 600 !important;
-        }
-
-        /* タブ */
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 12px;
-            background-color: white;
-            padding: 8px;
-            border-radius: 12px;
-            box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
-        }
-
-        .stTabs [data-baseweb="tab"] {
-            padding: 10px 20px;
-            background-color: transparent;
-            border-radius: 8px;
-            color: var(--text-secondary);
-            font-weight: 500;
-            transition: all 0.3s ease;
-        }
-
-        .stTabs [data-baseweb="tab"]:hover {
-            background-color: #EFF6FF;
-            color: var(--secondary-blue);
-        }
-
-        .stTabs [aria-selected="true"] {
-            background-color: var(--secondary-blue) !important;
-            color: white !important;
-        }
-
-        /* ボタン */
-        .stButton button {
-            background: linear-gradient(135deg, var(--primary-blue) 0%, var(--secondary-blue) 100%);
-            color: white;
-            border: none;
-            border-radius: 8px;
-            padding: 0.6rem 1.5rem;
-            font-weight: 600;
-            box-shadow: 0 4px 6px rgba(59, 130, 246, 0.3);
-            transition: all 0.3s ease;
-        }
-
-        .stButton button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 6px 12px rgba(59, 130, 246, 0.4);
-        }
-
-        /* メトリック */
-        [data-testid="stMetricValue"] {
-            color: var(--primary-blue);
-            font-weight: 700;
-        }
-
-        /* サイドバー */
-        [data-testid="stSidebar"] {
-            background: linear-gradient(180deg, var(--dark-bg) 0%, var(--medium-bg) 100%);
-        }
-
-        [data-testid="stSidebar"] * {
-            color: white !important;
-        }
-
-        [data-testid="stSidebar"] .stSelectbox label {
-            color: #93C5FD !important;
-        }
-
-        /* データフレーム */
-        .dataframe {
-            border-radius: 12px !important;
-            overflow: hidden;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        }
-
-        /* カード風スタイル */
-        .element-container {
-            background-color: white;
-            border-radius: 12px;
-            padding: 1rem;
-            margin-bottom: 1rem;
-        }
-
-        /* ファイルアップローダー */
-        [data-testid="stFileUploader"] {
-            background-color: white;
-            border: 2px dashed var(--light-blue);
-            border-radius: 12px;
-            padding: 1.5rem;
-        }
-
-        /* セレクトボックス */
-        .stSelectbox > div > div {
-            background-color: white;
-            border-radius: 8px;
-            border-color: var(--border-color);
-        }
-
-        /* マルチセレクト */
-        .stMultiSelect > div > div {
-            background-color: white;
-            border-radius: 8px;
-        }
-
-        /* アラート・通知 */
-        .stSuccess {
-            background-color: #DBEAFE;
-            color: var(--primary-blue);
-            border-left: 4px solid var(--secondary-blue);
-        }
-
-        .stError {
-            background-color: #FEE2E2;
-            color: #991B1B;
-            border-left: 4px solid #DC2626;
-        }
-
-        """ + get_sidebar_css() + """
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    # カスタムCSS
+    st.markdown(APP_CSS, unsafe_allow_html=True)
 
     # サイドバーメニューの表示
     current_page = render_sidebar_menu()
 
-    # ページごとの表示
-    if current_page == "home":
-        render_home_page()
-    elif current_page == "analysis":
-        render_data_analysis_page()
-    elif current_page == "visualization":
-        # データ可視化ページ（現在は分析ページと同じ内容を表示）
-        render_data_analysis_page()
-    elif current_page == "about":
-        render_about_page()
+    # メトリクスの公開（環境変数で有効化した場合のみ）
+    start_metrics_exporter()
+
+    # サンプル・注目データセットの事前読み込み（環境変数で有効化した場合のみ）
+    start_warmup()
+
+    # ページごとの表示（再実行の所要時間を記録）
+    render_page = get_page_renderer(current_page)
+    if render_page is not None:
+        started = time.perf_counter()
+        try:
+            render_page()
+        finally:
+            observe_rerun(current_page, time.perf_counter() - started)
 
     # フッター
     st.sidebar.markdown("---")
-    st.sidebar.markdown(
-        """
-        <div style='text-align: center; color: #93C5FD; font-size: 0.9em;'>
-        Powered by Streamlit<br>
-        © 2025 Data Analysis App
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.sidebar.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+"""ローカル実行用のベンチマーク・計測ツール"""
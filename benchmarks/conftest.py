@@ -0,0 +1,163 @@
+"""ベンチマークスイートの共通設定・フィクスチャ
+
+使い方:
+    # 既定の規模（1e3, 1e5件）で計測し、前回の結果と比較
+    python -m pytest benchmarks
+
+    # 大規模データも含めて計測し、回帰があれば失敗させる
+    python -m pytest benchmarks --bench-scales 1e3,1e5,1e6,1e7 --bench-strict
+
+計測結果は benchmarks/results/history.jsonl に追記され、次回の比較対象になる。
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from benchmarks.harness import (
+    DEFAULT_HISTORY_PATH,
+    BenchmarkResult,
+    append_run,
+    find_regressions,
+    load_previous_results,
+    measure,
+)
+from benchmarks.synthetic_data import SurveyConfig, write_survey
+from utils.data_loader import load_csv_data
+
+DEFAULT_SCALES = "1e3,1e5"
+
+# この行数以上の規模では計測回数を減らす
+LARGE_SCALE_ROWS = 1_000_000
+
+# 計測回数（並べ替え検定で p < 0.05 を出せるよう、少なくとも4回は計測する）
+DEFAULT_REPEAT = 5
+LARGE_SCALE_REPEAT = 4
+
+_results: dict[str, BenchmarkResult] = {}
+_regressions: list[str] = []
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--bench-scales",
+        default=DEFAULT_SCALES,
+        help=f"計測するデータ件数（カンマ区切り、既定: {DEFAULT_SCALES}）",
+    )
+    group.addoption(
+        "--bench-history",
+        type=Path,
+        default=DEFAULT_HISTORY_PATH,
+        help="計測結果の履歴ファイル（JSON Lines）",
+    )
+    group.addoption("--bench-no-save", action="store_true", help="計測結果を履歴に保存しない")
+    group.addoption("--bench-strict", action="store_true", help="回帰を検出したら失敗させる")
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if "rows" in metafunc.fixturenames:
+        labels = [label.strip() for label in metafunc.config.getoption("bench_scales").split(",")]
+        metafunc.parametrize("rows", [int(float(label)) for label in labels], ids=labels)
+
+
+@pytest.fixture(scope="session")
+def survey_csv_factory(tmp_path_factory: pytest.TempPathFactory) -> Callable[[int], Path]:
+    """件数を指定して合成データのCSVファイルを作る（件数ごとに1回だけ生成）"""
+    paths: dict[int, Path] = {}
+
+    def factory(rows: int) -> Path:
+        if rows not in paths:
+            path = tmp_path_factory.mktemp("bench") / f"survey_{rows}.csv"
+            write_survey(SurveyConfig(rows=rows), path)
+            paths[rows] = path
+        return paths[rows]
+
+    return factory
+
+
+@pytest.fixture(scope="session")
+def survey_frame_factory(
+    survey_csv_factory: Callable[[int], Path],
+) -> Callable[[int], pd.DataFrame]:
+    """件数を指定してCSVから読み込んだ合成データを返す（件数ごとに1回だけ読み込む）
+
+    アプリと同じくCSV経由で読み込むため、年齢層は文字列型になる。
+    """
+    frames: dict[int, pd.DataFrame] = {}
+
+    def factory(rows: int) -> pd.DataFrame:
+        if rows not in frames:
+            frames.clear()  # 大規模データを同時に複数保持しない
+            frames[rows] = load_csv_data(str(survey_csv_factory(rows)))
+        return frames[rows]
+
+    return factory
+
+
+@pytest.fixture
+def survey_csv(survey_csv_factory: Callable[[int], Path], rows: int) -> Path:
+    """計測規模の合成データCSV"""
+    return survey_csv_factory(rows)
+
+
+@pytest.fixture
+def survey_df(survey_frame_factory: Callable[[int], pd.DataFrame], rows: int) -> pd.DataFrame:
+    """計測規模の合成データ（計測対象が変更しないよう、必要ならコピーして使う）"""
+    return survey_frame_factory(rows)
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest, rows: int) -> Callable[..., BenchmarkResult]:
+    """関数の実行時間とピークメモリを計測して記録する
+
+    使い方: bench(fn, *args) または bench(fn, setup=lambda: (args,))
+    1回に数秒以上かかる処理は heavy=True で計測回数を減らす。
+    """
+    name = request.node.name.removeprefix("test_")
+
+    def run(
+        fn: Callable[..., object],
+        *args: object,
+        setup: Callable[[], tuple] | None = None,
+        heavy: bool = False,
+    ) -> BenchmarkResult:
+        repeat = LARGE_SCALE_REPEAT if heavy or rows >= LARGE_SCALE_ROWS else DEFAULT_REPEAT
+        result = measure(name, fn, setup=setup or (lambda: args), repeat=repeat)
+        _results[name] = result
+        return result
+
+    return run
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    if not _results:
+        return
+    config = session.config
+    history_path = config.getoption("bench_history")
+
+    _regressions.extend(find_regressions(_results, load_previous_results(history_path)))
+    if not config.getoption("bench_no_save"):
+        append_run(_results, history_path)
+    if _regressions and config.getoption("bench_strict"):
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    if not _results:
+        return
+    terminalreporter.section("benchmark results")
+    terminalreporter.write_line(f"{'name':<45} {'mean[ms]':>10} {'min[ms]':>10} {'peak[MB]':>9}")
+    for name, result in sorted(_results.items()):
+        terminalreporter.write_line(
+            f"{name:<45} {result.mean * 1e3:>10.2f} {min(result.times) * 1e3:>10.2f} "
+            f"{result.peak_bytes / (1024 * 1024):>9.1f}"
+        )
+
+    if _regressions:
+        terminalreporter.write_line("")
+        terminalreporter.write_line("⚠️ 前回の計測から有意に遅くなったベンチマーク:", yellow=True)
+        for line in _regressions:
+            terminalreporter.write_line(f"  {line}", yellow=True)
@@ -0,0 +1,203 @@
+"""ベンチマークの計測・履歴保存・回帰判定を行うモジュール"""
+
+import itertools
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+DEFAULT_HISTORY_PATH = Path(__file__).parent / "results" / "history.jsonl"
+
+# 回帰と判定する有意水準と、平均時間の増加率の下限
+SIGNIFICANCE_LEVEL = 0.05
+MIN_SLOWDOWN_RATIO = 1.10
+
+# 厳密な並べ替え検定を行う組み合わせ数の上限（超える場合は無作為抽出で近似）
+_EXACT_PERMUTATION_LIMIT = 20_000
+_SAMPLED_PERMUTATIONS = 10_000
+
+
+@dataclass
+class BenchmarkResult:
+    """1ベンチマーク分の計測結果
+
+    Attributes:
+        name: ベンチマーク名（例: "load_csv_data[1e5]"）
+        times: 各回の実行時間（秒）
+        peak_bytes: tracemalloc で計測したピークメモリ（バイト）
+    """
+
+    name: str
+    times: list[float] = field(default_factory=list)
+    peak_bytes: int = 0
+
+    @property
+    def mean(self) -> float:
+        """実行時間の平均（秒）"""
+        return statistics.fmean(self.times) if self.times else 0.0
+
+
+def measure(
+    name: str,
+    fn: Callable[..., Any],
+    setup: Callable[[], tuple] | None = None,
+    repeat: int = 5,
+) -> BenchmarkResult:
+    """関数の実行時間とピークメモリを計測
+
+    ピークメモリは tracemalloc を有効にした1回で計測し、実行時間はその後に
+    repeat 回計測する（tracemalloc のオーバーヘッドを実行時間に含めないため）。
+
+    Args:
+        name: ベンチマーク名
+        fn: 計測する関数
+        setup: 各回の実行前に呼び、fn の引数を返す関数（計測時間に含めない）
+        repeat: 実行時間の計測回数
+
+    Returns:
+        計測結果
+    """
+    result = BenchmarkResult(name=name)
+    make_args = setup or (lambda: ())
+
+    # メモリ計測を先に行い、初回実行の遅延読み込みなどを実行時間から除く
+    args = make_args()
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _current, result.peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    for _ in range(repeat):
+        args = make_args()
+        started = time.perf_counter()
+        fn(*args)
+        result.times.append(time.perf_counter() - started)
+    return result
+
+
+def permutation_p_value(baseline: list[float], current: list[float]) -> float:
+    """今回の平均が前回より大きいことの片側並べ替え検定のp値
+
+    Args:
+        baseline: 前回の実行時間
+        current: 今回の実行時間
+
+    Returns:
+        p値（小さいほど「遅くなった」ことが有意）
+    """
+    pooled = baseline + current
+    n = len(current)
+    observed = statistics.fmean(current) - statistics.fmean(baseline)
+    total = sum(pooled)
+
+    def diff(indices: tuple[int, ...]) -> float:
+        picked = sum(pooled[i] for i in indices)
+        return picked / n - (total - picked) / (len(pooled) - n)
+
+    all_indices = range(len(pooled))
+    n_combinations = 1
+    for k in range(n):
+        n_combinations = n_combinations * (len(pooled) - k) // (k + 1)
+
+    if n_combinations <= _EXACT_PERMUTATION_LIMIT:
+        samples = list(itertools.combinations(all_indices, n))
+    else:
+        rng = random.Random(0)
+        samples = [tuple(rng.sample(all_indices, n)) for _ in range(_SAMPLED_PERMUTATIONS)]
+
+    # 浮動小数点の誤差で観測値自身を取りこぼさないよう、わずかに緩める
+    extreme = sum(1 for indices in samples if diff(indices) >= observed - 1e-12)
+    return extreme / len(samples)
+
+
+def find_regressions(current: dict[str, BenchmarkResult], previous: dict[str, dict]) -> list[str]:
+    """前回の実行と比べて有意に遅くなったベンチマークを列挙
+
+    Args:
+        current: 今回の計測結果
+        previous: 前回の計測結果（load_previous_results() の結果）
+
+    Returns:
+        回帰したベンチマークの説明文のリスト
+    """
+    regressions = []
+    for name, result in sorted(current.items()):
+        base = previous.get(name)
+        if base is None or len(base["times"]) < 2 or len(result.times) < 2:
+            continue
+        base_mean = statistics.fmean(base["times"])
+        ratio = result.mean / base_mean if base_mean else float("inf")
+        if ratio < MIN_SLOWDOWN_RATIO:
+            continue
+        p_value = permutation_p_value(base["times"], result.times)
+        if p_value < SIGNIFICANCE_LEVEL:
+            regressions.append(
+                f"{name}: {base_mean * 1e3:.2f}ms -> {result.mean * 1e3:.2f}ms "
+                f"({ratio:.2f}x, p={p_value:.3f})"
+            )
+    return regressions
+
+
+def load_previous_results(history_path: Path = DEFAULT_HISTORY_PATH) -> dict[str, dict]:
+    """履歴ファイルからベンチマークごとの直近の計測結果を読み込む
+
+    一部のベンチマークだけを実行した回があっても比較できるよう、
+    ベンチマークごとに最後に記録された結果を返す。
+
+    Args:
+        history_path: 履歴ファイル（JSON Lines）
+
+    Returns:
+        ベンチマーク名と直近の計測結果の対応（履歴が無い場合は空）
+    """
+    if not history_path.exists():
+        return {}
+    previous: dict[str, dict] = {}
+    for line in history_path.read_text(encoding="utf-8").splitlines():
+        if line:
+            previous.update(json.loads(line)["results"])
+    return previous
+
+
+def append_run(
+    results: dict[str, BenchmarkResult], history_path: Path = DEFAULT_HISTORY_PATH
+) -> None:
+    """今回の実行結果を履歴ファイルに追記
+
+    Args:
+        results: 今回の計測結果
+        history_path: 履歴ファイル（JSON Lines）
+    """
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "results": {name: asdict(result) for name, result in results.items()},
+    }
+    with open(history_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _git_commit() -> str | None:
+    """現在のgitコミットID（取得できない場合はNone）"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
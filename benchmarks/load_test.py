@@ -0,0 +1,293 @@
+"""複数セッションを同時に動かしてデータ分析ページの負荷を計測するツール
+
+Streamlit のアプリテストAPI（AppTest）で、1プロセス内に複数のセッションを作り、
+各セッションが並行して以下の操作を行う:
+
+1. データ分析ページを開く
+2. 合成データのCSVをアップロードする
+3. 年齢層フィルターの変更・スポーツの選択・CSVエクスポートを繰り返す
+
+使い方:
+    python -m benchmarks.load_test --sessions 1 4 8 --rows 20000 --iterations 3
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic_data import DEFAULT_AGE_MIX, DEFAULT_SPORTS, SurveyConfig, generate_survey
+
+PROJECT_ROOT = Path(__file__).parent.parent
+APP_PATH = PROJECT_ROOT / "app.py"
+
+AGE_GROUPS = list(DEFAULT_AGE_MIX)
+SPORTS = DEFAULT_SPORTS[:8]
+
+
+def make_survey_csv(rows: int, seed: int = 0) -> bytes:
+    """負荷試験用の合成スポーツ関心度調査CSVを生成
+
+    Args:
+        rows: 行数
+        seed: 乱数シード
+
+    Returns:
+        CSVのバイトデータ
+    """
+    config = SurveyConfig(rows=rows, n_sports=len(SPORTS), seed=seed)
+    return generate_survey(config).to_csv(index=False).encode("utf-8")
+
+
+@dataclass
+class SessionResult:
+    """1セッション分の計測結果
+
+    Attributes:
+        latencies: 再実行ごとの所要時間（秒）
+        history_bytes: セッションが保持する履歴データのバイト数
+        errors: 発生したエラーメッセージ
+    """
+
+    latencies: list[float] = field(default_factory=list)
+    history_bytes: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+@dataclass
+class LoadTestReport:
+    """同時セッション数ごとの集計結果
+
+    Attributes:
+        sessions: 同時セッション数
+        reruns: 再実行の総回数
+        p50: 再実行時間の中央値（秒）
+        p95: 再実行時間の95パーセンタイル（秒）
+        p99: 再実行時間の99パーセンタイル（秒）
+        throughput: 1秒あたりの再実行回数
+        wall_seconds: 全セッション完了までの時間（秒）
+        session_history_mb: 1セッションあたりの履歴データ量（MB）
+        rss_mb: 計測終了時点のプロセスRSS（MB）
+        errors: エラーの総数
+    """
+
+    sessions: int
+    reruns: int
+    p50: float
+    p95: float
+    p99: float
+    throughput: float
+    wall_seconds: float
+    session_history_mb: float
+    rss_mb: float
+    errors: int
+
+
+def current_rss_mb() -> float:
+    """現在のプロセスRSS（MB）を取得
+
+    Returns:
+        RSS（MB）。/proc が無い環境ではピークRSSを返す
+    """
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextmanager
+def shared_test_runtime() -> Iterator[None]:
+    """AppTest を複数スレッドから同時に実行できるようにする
+
+    AppTest は実行のたびにモックのランタイムをグローバルに設定し、終了時に
+    None に戻すため、並行実行すると他のセッションの実行中にランタイムが消える。
+    計測中は最後に設定されたランタイムを返し続けるようにして競合を避ける。
+    """
+    from streamlit.runtime.runtime import Runtime
+
+    original = Runtime.__dict__["instance"]
+    last_instance = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last_instance[:] = [cls._instance]
+            return cls._instance
+        if last_instance:
+            return last_instance[0]
+        return original.__func__(cls)
+
+    Runtime.instance = classmethod(instance)
+    try:
+        yield
+    finally:
+        Runtime.instance = original
+
+
+def _find(elements, label: str):
+    """ラベルでウィジェットを検索"""
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"ウィジェットが見つかりません: {label}")
+
+
+def run_session(index: int, csv_bytes: bytes, iterations: int, timeout: float) -> SessionResult:
+    """1セッション分の操作を実行して計測
+
+    Args:
+        index: セッション番号（乱数シードにも使う）
+        csv_bytes: アップロードするCSV
+        iterations: フィルター変更・選択・エクスポートの繰り返し回数
+        timeout: 1回の再実行のタイムアウト（秒）
+
+    Returns:
+        計測結果
+    """
+    from streamlit.testing.v1 import AppTest
+
+    result = SessionResult()
+    rng = random.Random(index)
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    at.session_state["current_page"] = "analysis"
+
+    def timed_run() -> None:
+        started = time.perf_counter()
+        at.run()
+        result.latencies.append(time.perf_counter() - started)
+        result.errors.extend(str(exception.value) for exception in at.exception)
+
+    try:
+        timed_run()
+        at.file_uploader[0].set_value((f"load_{index}.csv", csv_bytes, "text/csv"))
+        timed_run()
+        # 読み込みはバックグラウンドで行われるため、完了して履歴に追加されるまで再実行する
+        # （進捗表示の更新に相当する再実行は計測に含めない）
+        deadline = time.perf_counter() + timeout
+        while any(button.label == "読み込みを取り消す" for button in at.button):
+            if time.perf_counter() > deadline:
+                raise TimeoutError("アップロードの読み込みが完了しません")
+            time.sleep(0.05)
+            at.run()
+
+        for _ in range(iterations):
+            _find(at.sidebar.selectbox, "年齢層").set_value(rng.choice(["全年齢", *AGE_GROUPS]))
+            timed_run()
+
+            _find(at.multiselect, "表示するスポーツを選択").set_value(
+                rng.sample(SPORTS, k=rng.randint(1, 5))
+            )
+            timed_run()
+
+            _find(at.button, "📄 CSV形式").click()
+            timed_run()
+
+        if "upload_history" in at.session_state:
+            result.history_bytes = int(
+                sum(
+                    entry["data"].memory_usage(deep=True).sum()
+                    for entry in at.session_state["upload_history"]
+                )
+            )
+    except Exception as e:
+        result.errors.append(f"{type(e).__name__}: {e}")
+
+    return result
+
+
+def run_load_test(
+    sessions: int, rows: int, iterations: int, timeout: float = 120.0
+) -> LoadTestReport:
+    """指定数のセッションを同時に実行して集計
+
+    Args:
+        sessions: 同時セッション数
+        rows: アップロードするCSVの行数
+        iterations: 各セッションの操作の繰り返し回数
+        timeout: 1回の再実行のタイムアウト（秒）
+
+    Returns:
+        集計結果
+    """
+    csv_bytes = make_survey_csv(rows)
+
+    started = time.perf_counter()
+    with shared_test_runtime(), ThreadPoolExecutor(max_workers=sessions) as executor:
+        results = list(
+            executor.map(
+                lambda index: run_session(index, csv_bytes, iterations, timeout),
+                range(sessions),
+            )
+        )
+    wall_seconds = time.perf_counter() - started
+
+    latencies = np.array([latency for result in results for latency in result.latencies])
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+    return LoadTestReport(
+        sessions=sessions,
+        reruns=len(latencies),
+        p50=float(p50),
+        p95=float(p95),
+        p99=float(p99),
+        throughput=len(latencies) / wall_seconds if wall_seconds else 0.0,
+        wall_seconds=wall_seconds,
+        session_history_mb=float(
+            np.mean([result.history_bytes for result in results]) / (1024 * 1024)
+        ),
+        rss_mb=current_rss_mb(),
+        errors=sum(len(result.errors) for result in results),
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """コマンドラインエントリーポイント"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sessions", type=int, nargs="+", default=[1, 2, 4, 8], help="同時セッション数"
+    )
+    parser.add_argument("--rows", type=int, default=10_000, help="アップロードするCSVの行数")
+    parser.add_argument(
+        "--iterations", type=int, default=3, help="各セッションの操作の繰り返し回数"
+    )
+    parser.add_argument("--timeout", type=float, default=120.0, help="再実行のタイムアウト（秒）")
+    parser.add_argument("--output", type=Path, help="結果の出力先JSON")
+    args = parser.parse_args(argv)
+
+    reports = []
+    print(
+        f"{'sessions':>8} {'reruns':>7} {'p50[s]':>8} {'p95[s]':>8} {'p99[s]':>8} "
+        f"{'rerun/s':>8} {'hist[MB]':>9} {'rss[MB]':>8} {'errors':>7}"
+    )
+    for sessions in args.sessions:
+        report = run_load_test(sessions, args.rows, args.iterations, args.timeout)
+        reports.append(report)
+        print(
+            f"{report.sessions:>8} {report.reruns:>7} {report.p50:>8.3f} {report.p95:>8.3f} "
+            f"{report.p99:>8.3f} {report.throughput:>8.2f} {report.session_history_mb:>9.2f} "
+            f"{report.rss_mb:>8.1f} {report.errors:>7}"
+        )
+
+    if args.output:
+        args.output.write_text(
+            json.dumps([asdict(report) for report in reports], ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        print(f"結果を保存しました: {args.output}")
+
+    return 1 if any(report.errors for report in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""起動時間・初回描画時間を計測し、ベースラインと比較するツール
+
+使い方:
+    # 計測してベースラインと比較（回帰があれば終了コード1）
+    python -m benchmarks.startup_profile
+
+    # 計測結果をベースラインとして保存
+    python -m benchmarks.startup_profile --save-baseline
+
+計測は毎回新しいPythonプロセスで行い、モジュールキャッシュの影響を受けないようにする。
+"""
+
+import argparse
+import json
+import re
+import resource
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+APP_PATH = PROJECT_ROOT / "app.py"
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "startup.json"
+DEFAULT_OUTPUT = PROJECT_ROOT / "startup_profile.json"
+
+# 計測対象のページ（app.PAGE_RENDERERS のページID）
+PAGES = ["home", "analysis", "about"]
+
+# インポート時間を集計するトップレベルパッケージ（それ以外は "other"）
+TRACKED_PACKAGES = ["streamlit", "pandas", "numpy", "plotly", "pyarrow", "components", "utils"]
+
+# 回帰と判定する比率・絶対差の閾値（両方を超えた場合に回帰）
+REGRESSION_RATIO = 1.25
+REGRESSION_MIN_DELTA = {"seconds": 0.05, "rss_mb": 10.0}
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> dict[str, float]:
+    """`python -X importtime` の出力をトップレベルパッケージごとの自己時間（秒）に集計
+
+    Args:
+        stderr: -X importtime 付きで実行したプロセスの標準エラー出力
+
+    Returns:
+        パッケージ名と合計インポート時間（秒）の対応
+    """
+    totals: dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, _cumulative_us, _indent, module = match.groups()
+        package = module.split(".")[0]
+        key = package if package in TRACKED_PACKAGES else "other"
+        totals[key] += int(self_us) / 1e6
+    return dict(totals)
+
+
+def _probe_import(module: str) -> dict:
+    """新しいプロセスでモジュールをインポートし、パッケージ別のインポート時間を計測"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        "wall_seconds": time.perf_counter() - started,
+        "packages": parse_importtime(result.stderr),
+    }
+
+
+def _probe_first_render(page: str) -> dict:
+    """新しいプロセスでページを初回描画し、所要時間とピークRSSを計測"""
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup_profile", "--probe-render", page],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _render_in_process(page: str) -> dict:
+    """（子プロセス内で実行）ページを初回描画して計測結果を出力"""
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=60)
+    at.session_state["current_page"] = page
+    at.run()
+    elapsed = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(f"{page} の描画に失敗しました: {at.exception[0].value}")
+
+    return {
+        "seconds": elapsed,
+        # Linux では ru_maxrss はKB単位
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_profile() -> dict:
+    """起動・初回描画のプロファイルを計測
+
+    Returns:
+        計測結果（JSONに変換可能な辞書）
+    """
+    import app
+
+    page_modules = sorted({module for module, _ in app.PAGE_RENDERERS.values()})
+    return {
+        "python": sys.version.split()[0],
+        "imports": {
+            "app": _probe_import("app"),
+            **{module: _probe_import(module) for module in page_modules},
+        },
+        "first_render": {page: _probe_first_render(page) for page in PAGES},
+    }
+
+
+def flatten_metrics(profile: dict) -> dict[str, float]:
+    """比較用に計測結果を "名前 -> 値" の平坦な辞書に変換
+
+    Args:
+        profile: run_profile() の結果
+
+    Returns:
+        指標名と値の対応（名前の末尾は "seconds" または "rss_mb"）
+    """
+    metrics = {}
+    for module, result in profile["imports"].items():
+        metrics[f"import.{module}.seconds"] = result["wall_seconds"]
+        for package, seconds in result["packages"].items():
+            metrics[f"import.{module}.{package}.seconds"] = seconds
+    for page, result in profile["first_render"].items():
+        metrics[f"render.{page}.seconds"] = result["seconds"]
+        metrics[f"render.{page}.rss_mb"] = result["rss_mb"]
+    return metrics
+
+
+def compare_with_baseline(profile: dict, baseline: dict) -> list[str]:
+    """ベースラインと比較して回帰した指標を列挙
+
+    Args:
+        profile: 今回の計測結果
+        baseline: ベースラインの計測結果
+
+    Returns:
+        回帰した指標の説明文のリスト
+    """
+    current = flatten_metrics(profile)
+    previous = flatten_metrics(baseline)
+    regressions = []
+    for name, value in sorted(current.items()):
+        base = previous.get(name)
+        if base is None:
+            continue
+        unit = "rss_mb" if name.endswith("rss_mb") else "seconds"
+        if value > base * REGRESSION_RATIO and value - base > REGRESSION_MIN_DELTA[unit]:
+            regressions.append(f"{name}: {base:.3f} -> {value:.3f} ({value / base:.2f}x)")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """コマンドラインエントリーポイント"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="結果の出力先JSON")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="ベースラインJSON")
+    parser.add_argument("--save-baseline", action="store_true", help="結果をベースラインとして保存")
+    parser.add_argument("--probe-render", metavar="PAGE", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe_render:
+        print(json.dumps(_render_in_process(args.probe_render)))
+        return 0
+
+    profile = run_profile()
+    args.output.write_text(json.dumps(profile, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"結果を保存しました: {args.output}")
+
+    for name, value in flatten_metrics(profile).items():
+        print(f"  {name:<55} {value:10.3f}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps(profile, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        print(f"ベースラインを保存しました: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("ベースラインがありません（--save-baseline で作成できます）")
+        return 0
+
+    regressions = compare_with_baseline(
+        profile, json.loads(args.baseline.read_text(encoding="utf-8"))
+    )
+    if regressions:
+        print("⚠️ 起動時間の回帰を検出しました:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print("✅ ベースラインからの回帰はありません")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""ベンチマーク・テスト用の合成スポーツ関心度調査データを生成するモジュール
+
+データはチャンク単位でベクトル化して生成するため、1e3〜1e8件のどの規模でも
+メモリ使用量はチャンクサイズで決まる。
+
+使い方:
+    python -m benchmarks.synthetic_data --rows 10000000 --format parquet --output survey.parquet
+"""
+
+import argparse
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_AGE_MIX = {"20代": 0.25, "30代": 0.25, "40代": 0.25, "50代": 0.25}
+
+DEFAULT_SPORTS = [
+    "サッカー",
+    "野球",
+    "バスケットボール",
+    "テニス",
+    "ゴルフ",
+    "水泳",
+    "陸上競技",
+    "格闘技",
+    "eスポーツ",
+]
+
+# 1チャンクあたりの行数
+DEFAULT_CHUNK_ROWS = 500_000
+
+# 標準正規の潜在変数を関心度1〜5に変換する閾値
+_SCORE_THRESHOLDS = np.array([-1.5, -0.5, 0.5, 1.5])
+
+
+@dataclass(frozen=True)
+class SurveyConfig:
+    """合成データの生成条件
+
+    Attributes:
+        rows: 回答者数
+        n_sports: スポーツ種目数（既定の種目名を超える分は "種目N" と命名）
+        age_mix: 年齢層と構成比
+        sport_correlation: 種目間の相関（全種目共通の相関係数、または相関行列）
+        age_effect: 年齢層ごとの関心度の偏りの大きさ（潜在変数の標準偏差単位）
+        missing_rate: 関心度を欠損させるセルの割合
+        invalid_rate: 不正な値を混入させるセルの割合
+        invalid_tokens: 不正な値として使う文字列（空なら範囲外の数値 0 / 9 を使う。
+            指定した場合、関心度のカラムは文字列型になる）
+        seed: 乱数シード
+    """
+
+    rows: int = 1000
+    n_sports: int = 9
+    age_mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_AGE_MIX))
+    sport_correlation: float | np.ndarray = 0.2
+    age_effect: float = 0.5
+    missing_rate: float = 0.0
+    invalid_rate: float = 0.0
+    invalid_tokens: tuple[str, ...] = ()
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.rows < 1:
+            raise ValueError(f"回答者数は1以上を指定してください: rows={self.rows}")
+
+    @property
+    def sports(self) -> list[str]:
+        """スポーツ種目のカラム名"""
+        extra = [f"種目{i + 1}" for i in range(len(DEFAULT_SPORTS), self.n_sports)]
+        return (DEFAULT_SPORTS + extra)[: self.n_sports]
+
+    def correlation_matrix(self) -> np.ndarray:
+        """種目間の相関行列"""
+        if np.ndim(self.sport_correlation) == 0:
+            rho = float(self.sport_correlation)
+            matrix = np.full((self.n_sports, self.n_sports), rho)
+            np.fill_diagonal(matrix, 1.0)
+            return matrix
+        return np.asarray(self.sport_correlation, dtype=np.float64)
+
+
+def iter_survey_chunks(
+    config: SurveyConfig, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    """合成データをチャンク単位で生成
+
+    関心度は相関行列に従う多変量正規の潜在変数に年齢層ごとの偏りを加え、
+    閾値で1〜5に量子化して作る。
+
+    Args:
+        config: 生成条件
+        chunk_rows: 1チャンクあたりの行数
+
+    Yields:
+        回答者ID・年齢層・スポーツ種目のカラムを持つDataFrame
+    """
+    sports = config.sports
+    age_groups = list(config.age_mix)
+    weights = np.array(list(config.age_mix.values()), dtype=np.float64)
+    weights /= weights.sum()
+    cholesky = np.linalg.cholesky(config.correlation_matrix())
+
+    # 年齢層 × 種目の偏りはチャンクに依らず固定
+    effects = np.random.default_rng([config.seed, 0]).normal(
+        0.0, config.age_effect, size=(len(age_groups), len(sports))
+    )
+    use_nullable = config.missing_rate > 0 or (
+        config.invalid_rate > 0 and not config.invalid_tokens
+    )
+
+    for chunk_index, start in enumerate(range(0, config.rows, chunk_rows)):
+        rows = min(chunk_rows, config.rows - start)
+        rng = np.random.default_rng([config.seed, chunk_index + 1])
+
+        age_codes = rng.choice(len(age_groups), size=rows, p=weights)
+        latent = rng.standard_normal((rows, len(sports))) @ cholesky.T + effects[age_codes]
+        scores = (np.searchsorted(_SCORE_THRESHOLDS, latent) + 1).astype(np.int8)
+
+        data: dict[str, object] = {
+            "回答者ID": np.arange(start + 1, start + rows + 1, dtype=np.int64),
+            "年齢層": pd.Categorical.from_codes(age_codes, categories=age_groups),
+        }
+        missing = rng.random((rows, len(sports))) < config.missing_rate
+        invalid = rng.random((rows, len(sports))) < config.invalid_rate
+        for j, sport in enumerate(sports):
+            column = _apply_defects(scores[:, j], missing[:, j], invalid[:, j], config, rng)
+            if use_nullable and column.dtype != object:
+                column = pd.array(column, dtype="Int8")
+            data[sport] = column
+        yield pd.DataFrame(data)
+
+
+def _apply_defects(
+    scores: np.ndarray,
+    missing: np.ndarray,
+    invalid: np.ndarray,
+    config: SurveyConfig,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """欠損と不正な値を1カラム分に混入"""
+    if config.invalid_tokens and config.invalid_rate > 0:
+        # 文字列が混ざるカラムはチャンク間で型を揃えるため常に文字列として扱う
+        column = scores.astype(str).astype(object)
+        tokens = np.array(config.invalid_tokens, dtype=object)
+        column[invalid] = rng.choice(tokens, size=invalid.sum())
+        column[missing] = None
+        return column
+
+    if not missing.any() and not invalid.any():
+        return scores
+
+    column = scores.astype(np.float64)
+    column[invalid] = rng.choice([0, 9], size=invalid.sum())
+    column[missing] = np.nan
+    return column
+
+
+def generate_survey(config: SurveyConfig, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> pd.DataFrame:
+    """合成データを1つのDataFrameとして生成（メモリに収まる規模向け）
+
+    Args:
+        config: 生成条件
+        chunk_rows: 1チャンクあたりの行数
+
+    Returns:
+        合成データ
+    """
+    return pd.concat(iter_survey_chunks(config, chunk_rows), ignore_index=True)
+
+
+def write_survey(
+    config: SurveyConfig,
+    path: Path,
+    file_format: str = "csv",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> int:
+    """合成データをチャンクごとにファイルへ書き出す
+
+    Args:
+        config: 生成条件
+        path: 出力先ファイルパス
+        file_format: "csv", "parquet", "arrow" のいずれか
+        chunk_rows: 1チャンクあたりの行数（Parquetでは行グループの大きさ）
+
+    Returns:
+        書き出した行数
+
+    Raises:
+        ValueError: 未対応の形式が指定された場合
+    """
+    path = Path(path)
+    written = 0
+
+    if file_format == "csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            for i, chunk in enumerate(iter_survey_chunks(config, chunk_rows)):
+                chunk.to_csv(f, index=False, header=i == 0)
+                written += len(chunk)
+        return written
+
+    if file_format not in ("parquet", "arrow"):
+        raise ValueError(f"未対応の形式です: {file_format}")
+
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in iter_survey_chunks(config, chunk_rows):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = (
+                    pq.ParquetWriter(path, table.schema)
+                    if file_format == "parquet"
+                    else ipc.new_file(path, table.schema)
+                )
+            writer.write_table(table)
+            written += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    """コマンドラインエントリーポイント"""
+    parser = argparse.ArgumentParser(description="合成スポーツ関心度調査データを生成")
+    parser.add_argument("--rows", type=float, default=1e5, help="回答者数（例: 1e7）")
+    parser.add_argument("--sports", type=int, default=9, help="スポーツ種目数")
+    parser.add_argument("--correlation", type=float, default=0.2, help="種目間の相関係数")
+    parser.add_argument("--missing-rate", type=float, default=0.0, help="欠損セルの割合")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="不正セルの割合")
+    parser.add_argument("--seed", type=int, default=0, help="乱数シード")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"], default="csv")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--output", type=Path, required=True, help="出力先ファイル")
+    args = parser.parse_args(argv)
+
+    config = SurveyConfig(
+        rows=int(args.rows),
+        n_sports=args.sports,
+        sport_correlation=args.correlation,
+        missing_rate=args.missing_rate,
+        invalid_rate=args.invalid_rate,
+        seed=args.seed,
+    )
+    written = write_survey(config, args.output, args.format, args.chunk_rows)
+    print(f"{written:,}件を書き出しました: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""データ読み込み・加工・履歴・エクスポート・集計・グラフ作成のベンチマーク"""
+
+import os
+
+import pytest
+
+from components.charts import build_default_figures
+from utils.analysis_summary import compute_analysis_summary
+from utils.compute_backend import BACKENDS, create_backend
+from utils.data_loader import (
+    filter_by_age_group,
+    get_sports_columns,
+    load_csv_data,
+    load_data_file,
+    validate_sports_survey_data,
+)
+from utils.export import (
+    EXPORT_SHEET_NAME,
+    encode_dataframe,
+    export_to_csv,
+    export_to_excel,
+    export_to_json,
+)
+from utils.fingerprint import compute_dataset_fingerprint
+from utils.history_manager import HistoryManager, optimize_dataframe_memory
+from utils.incremental_summary import build_running_summary, update_running_summary
+from utils.parallel_aggregation import compute_partitioned_summary, create_aggregation_pool
+from utils.score_cleaning import CleaningReport, clean_scores
+from utils.upload_jobs import UploadJob, parse_csv_upload, parse_upload, parse_upload_files
+from utils.upload_validation import validate_frame
+
+# Excelのワークシートに書き込める最大行数（ヘッダー行を除く）
+EXCEL_MAX_ROWS = 1_048_575
+
+# 複数ファイルのアップロードのベンチマークで読み込むファイル数
+UPLOAD_FILES = 4
+
+# 分割集計のベンチマークで使うワーカー数（1コアの環境でも分割の往復を計測できるよう2以上）
+AGGREGATION_WORKERS = max(2, os.cpu_count() or 1)
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request):
+    """比較する計算バックエンド（インストールされていなければスキップ）"""
+    try:
+        return create_backend(request.param)
+    except ImportError:
+        pytest.skip(f"{request.param} がインストールされていないため計測しない")
+
+
+@pytest.fixture(scope="module")
+def aggregation_pool():
+    """起動済みの集計用プロセスプール（起動時間は計測に含めない）"""
+    pool = create_aggregation_pool(AGGREGATION_WORKERS)
+    yield pool
+    pool.shutdown()
+
+
+class TestLoading:
+    """データ読み込み・検証のベンチマーク"""
+
+    def test_load_csv_data(self, bench, survey_csv):
+        bench(load_csv_data, str(survey_csv))
+
+    def test_validate_sports_survey_data(self, bench, survey_df):
+        bench(validate_sports_survey_data, survey_df)
+
+    def test_validate_frame(self, bench, survey_df):
+        bench(validate_frame, survey_df)
+
+    def test_get_sports_columns(self, bench, survey_df):
+        bench(get_sports_columns, survey_df)
+
+    def test_clean_scores(self, bench, survey_df):
+        """全種目が文字列として読み込まれた場合の表記の修正"""
+        dirty = survey_df.astype(dict.fromkeys(get_sports_columns(survey_df), "str"))
+        bench(clean_scores, setup=lambda: (dirty, CleaningReport()))
+
+
+class TestUpload:
+    """アップロードの読み込み（1ファイルと、複数ファイルの逐次・並列読み込み）のベンチマーク
+
+    並列読み込みの所要時間は、1ファイルの読み込みに近いほど良い。
+    """
+
+    @staticmethod
+    def _job(files):
+        return UploadJob(
+            upload_id="bench",
+            filename=files[0][0],
+            total_bytes=sum(len(data) for _, data in files),
+            file_count=len(files),
+        )
+
+    def test_parse_single_file(self, bench, survey_csv):
+        data = survey_csv.read_bytes()
+        bench(parse_csv_upload, setup=lambda: (data, self._job([("wave.csv", data)])))
+
+    def test_parse_files_sequential(self, bench, survey_csv):
+        files = [(f"wave{i}.csv", survey_csv.read_bytes()) for i in range(UPLOAD_FILES)]
+        bench(parse_upload_files, setup=lambda: (files, self._job(files)))
+
+    def test_parse_files_parallel(self, bench, survey_csv, aggregation_pool):
+        files = [(f"wave{i}.csv", survey_csv.read_bytes()) for i in range(UPLOAD_FILES)]
+        bench(parse_upload_files, setup=lambda: (files, self._job(files), aggregation_pool))
+
+
+class TestFileFormats:
+    """形式ごとの読み込み（サーバー上のファイルと、アップロードの読み込み）のベンチマーク
+
+    同じデータを CSV / Parquet / Feather / xlsx で保存し、CSVと比べる。
+    """
+
+    @pytest.fixture(params=["csv", "parquet", "feather", "xlsx"])
+    def survey_file(self, request, survey_csv, survey_df, rows):
+        file_type = request.param
+        if file_type == "csv":
+            return survey_csv
+        if file_type == "xlsx" and rows > EXCEL_MAX_ROWS:
+            pytest.skip("Excelの最大行数を超えるため計測しない")
+        path = survey_csv.with_suffix(f".{file_type}")
+        if not path.exists():
+            if file_type == "xlsx":
+                survey_df.to_excel(path, index=False, engine="openpyxl")
+            else:
+                getattr(survey_df, f"to_{file_type}")(path)
+        return path
+
+    def test_load_data_file(self, bench, survey_file):
+        bench(load_data_file, str(survey_file), heavy=survey_file.suffix == ".xlsx")
+
+    def test_parse_upload(self, bench, survey_file):
+        files = [(survey_file.name, survey_file.read_bytes())]
+        bench(
+            parse_upload,
+            setup=lambda: (*files[0], TestUpload._job(files)),
+            heavy=survey_file.suffix == ".xlsx",
+        )
+
+
+class TestProcessing:
+    """フィルタリング・メモリ最適化・履歴追加のベンチマーク"""
+
+    def test_filter_by_age_group(self, bench, survey_df):
+        bench(filter_by_age_group, survey_df, "30代")
+
+    def test_optimize_dataframe_memory(self, bench, survey_df):
+        # 引数を直接書き換える関数なので、毎回コピーを渡す（コピーは計測に含めない）
+        bench(optimize_dataframe_memory, setup=lambda: (survey_df.copy(),))
+
+    def test_history_add(self, bench, survey_df):
+        def setup():
+            manager = HistoryManager()
+            manager.clear_all_history()
+            return (manager,)
+
+        bench(lambda manager: manager.add_history("bench.csv", survey_df, "-"), setup=setup)
+
+
+class TestExport:
+    """エクスポートのベンチマーク（変換処理そのものと、キャッシュヒット時）"""
+
+    def test_encode_csv(self, bench, survey_df):
+        bench(encode_dataframe, survey_df, "csv")
+
+    def test_encode_json(self, bench, survey_df):
+        bench(encode_dataframe, survey_df, "json")
+
+    def test_encode_excel(self, bench, survey_df, rows):
+        if rows > EXCEL_MAX_ROWS:
+            pytest.skip("Excelの最大行数を超えるため計測しない")
+        bench(encode_dataframe, survey_df, "excel", heavy=True)
+
+    def test_export_to_csv_cached(self, bench, survey_df):
+        fingerprint = compute_dataset_fingerprint(survey_df)
+        export_to_csv(survey_df, fingerprint=fingerprint)
+        bench(export_to_csv, survey_df, fingerprint)
+
+    def test_export_to_json_cached(self, bench, survey_df):
+        fingerprint = compute_dataset_fingerprint(survey_df)
+        export_to_json(survey_df, fingerprint=fingerprint)
+        bench(export_to_json, survey_df, "records", fingerprint)
+
+    def test_export_to_excel_cached(self, bench, survey_df, rows):
+        if rows > EXCEL_MAX_ROWS:
+            pytest.skip("Excelの最大行数を超えるため計測しない")
+        fingerprint = compute_dataset_fingerprint(survey_df)
+        export_to_excel(survey_df, EXPORT_SHEET_NAME, fingerprint)
+        bench(export_to_excel, survey_df, EXPORT_SHEET_NAME, fingerprint)
+
+    def test_compute_dataset_fingerprint(self, bench, survey_df):
+        bench(compute_dataset_fingerprint, survey_df)
+
+
+class TestAggregation:
+    """グラフ用の集計のベンチマーク"""
+
+    def test_compute_analysis_summary(self, bench, survey_df):
+        bench(compute_analysis_summary, survey_df)
+
+    def test_compute_analysis_summary_filtered(self, bench, survey_df):
+        bench(compute_analysis_summary, filter_by_age_group(survey_df, "30代"))
+
+    def test_compute_partitioned_summary(self, bench, survey_df, aggregation_pool):
+        bench(compute_partitioned_summary, survey_df, aggregation_pool, AGGREGATION_WORKERS)
+
+    def test_update_running_summary(self, bench, survey_df):
+        # 既存の行の部分統計量に、1%の行を追加した分だけを足し合わせる
+        split = len(survey_df) - max(1, len(survey_df) // 100)
+        running = build_running_summary(survey_df.iloc[:split])
+        bench(update_running_summary, running, survey_df.iloc[split:])
+
+
+class TestBackends:
+    """計算バックエンドの比較（読み込み・フィルタリング・集計）"""
+
+    def test_backend_load_csv(self, bench, backend, survey_csv):
+        bench(backend.load_csv, survey_csv)
+
+    def test_backend_filter(self, bench, backend, survey_df):
+        bench(backend.filter_by_age_group, survey_df, "30代")
+
+    def test_backend_summarize(self, bench, backend, survey_df):
+        bench(backend.summarize, survey_df)
+
+
+class TestFigures:
+    """グラフ作成のベンチマーク"""
+
+    def test_build_figures_sequential(self, bench, survey_df):
+        bench(build_default_figures, survey_df, compute_analysis_summary(survey_df))
@@ -0,0 +1,208 @@
+"""データ分析画面のグラフを作成するモジュール
+
+グラフの作成（plotly の Figure を組み立てる処理）と画面への出力を分け、
+作成だけを事前実行（ウォームアップ）や計測できるようにする。
+"""
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from utils.analysis_summary import AnalysisSummary
+
+# 青系カラーパレット
+BLUE_COLORS = ["#1E3A8A", "#3B82F6", "#60A5FA", "#93C5FD", "#DBEAFE"]
+
+# 全グラフ共通のスタイル（plotly のテンプレートとして登録し、他の出力からも参照できるようにする）
+CHART_TEMPLATE_NAME = "sports_survey"
+CHART_TEMPLATE = go.layout.Template(
+    layout={
+        "plot_bgcolor": "rgba(0,0,0,0)",
+        "paper_bgcolor": "rgba(0,0,0,0)",
+        "font": {"color": "#1E3A8A", "size": 12},
+        "title_font": {"size": 16, "color": "#1E3A8A", "family": "Arial, sans-serif"},
+    }
+)
+pio.templates[CHART_TEMPLATE_NAME] = CHART_TEMPLATE
+
+# Streamlit のテーマ（theme="streamlit"）は layout.template を置き換えるため、
+# 共通スタイルはテンプレートの内容をレイアウトへ直接適用する
+_TEMPLATE_LAYOUT = CHART_TEMPLATE.layout.to_plotly_json()
+
+
+def _apply_style(fig: go.Figure, **layout: object) -> go.Figure:
+    """共通スタイルを適用し、グラフ固有のレイアウトで上書き"""
+    return fig.update_layout(_TEMPLATE_LAYOUT, **layout)
+
+
+def build_bar_figure(summary: AnalysisSummary) -> go.Figure:
+    """スポーツ種目別の平均関心度（棒グラフ）を作成
+
+    Args:
+        summary: 集計結果
+
+    Returns:
+        棒グラフ
+    """
+    avg_interest = summary.sport_means
+
+    # 青系グラデーションカラーパレット
+    fig = px.bar(
+        x=avg_interest.index,
+        y=avg_interest.values,
+        labels={"x": "スポーツ種目", "y": "平均関心度"},
+        title="スポーツ種目別の平均関心度",
+        color=avg_interest.values,
+        color_continuous_scale=["#1E3A8A", "#3B82F6", "#60A5FA", "#93C5FD"],
+    )
+    return _apply_style(fig, showlegend=False, height=400)
+
+
+def build_line_figure(summary: AnalysisSummary, selected_sports: list[str]) -> go.Figure:
+    """年齢層別の関心度傾向（折れ線グラフ）を作成
+
+    Args:
+        summary: 集計結果
+        selected_sports: 表示するスポーツ種目
+
+    Returns:
+        折れ線グラフ
+    """
+    age_sport_data = summary.age_group_means[selected_sports]
+
+    fig = go.Figure()
+    for idx, sport in enumerate(selected_sports):
+        fig.add_trace(
+            go.Scatter(
+                x=age_sport_data.index,
+                y=age_sport_data[sport],
+                mode="lines+markers",
+                name=sport,
+                line={"width": 3, "color": BLUE_COLORS[idx % len(BLUE_COLORS)]},
+                marker={"size": 10, "color": BLUE_COLORS[idx % len(BLUE_COLORS)]},
+            )
+        )
+
+    return _apply_style(
+        fig,
+        title_text="年齢層別の関心度傾向",
+        xaxis_title="年齢層",
+        yaxis_title="平均関心度",
+        height=400,
+        hovermode="x unified",
+        legend={
+            "bgcolor": "rgba(255,255,255,0.9)",
+            "bordercolor": "#E2E8F0",
+            "borderwidth": 1,
+        },
+    )
+
+
+def build_heatmap_figure(summary: AnalysisSummary, sports_cols: list[str]) -> go.Figure:
+    """スポーツ種目間の相関（ヒートマップ）を作成
+
+    Args:
+        summary: 集計結果
+        sports_cols: スポーツ種目のカラム名
+
+    Returns:
+        ヒートマップ
+    """
+    # 青・白・黒系のカラースケール（赤・黄色を使わない）
+    fig = px.imshow(
+        summary.correlation,
+        labels={"x": "スポーツ種目", "y": "スポーツ種目", "color": "相関係数"},
+        x=sports_cols,
+        y=sports_cols,
+        color_continuous_scale=[
+            [0, "#0F172A"],  # 負の相関: ダークブルー/ブラック
+            [0.5, "#F8FAFC"],  # 無相関: ホワイト
+            [1, "#1E3A8A"],  # 正の相関: プライマリブルー
+        ],
+        aspect="auto",
+        zmin=-1,
+        zmax=1,
+    )
+    return _apply_style(fig, title_text="スポーツ種目間の相関係数", height=500)
+
+
+def build_box_figure(df: pd.DataFrame, sport: str) -> go.Figure:
+    """年齢層別の関心度の分布（箱ひげ図）を作成
+
+    Args:
+        df: 表示対象のDataFrame
+        sport: 分析するスポーツ種目
+
+    Returns:
+        箱ひげ図
+    """
+    # 青系グラデーションで年齢層ごとに色分け
+    fig = px.box(
+        df,
+        x="年齢層",
+        y=sport,
+        title=f"{sport}の年齢層別分布",
+        labels={"年齢層": "年齢層", sport: "関心度"},
+        color="年齢層",
+        color_discrete_sequence=["#1E3A8A", "#3B82F6", "#60A5FA", "#93C5FD"],
+    )
+    return _apply_style(fig, showlegend=False, height=400)
+
+
+def build_box_figure_from_stats(summary: AnalysisSummary, sport: str) -> go.Figure:
+    """集計結果の分布統計から年齢層別の箱ひげ図を作成（行データを使わない）
+
+    アウトオブコアのデータセットでは行データをメモリに持たないため、
+    分布統計（最小・四分位・中央値・最大）から箱とひげを描く。ひげは最小・最大まで伸ばす。
+
+    Args:
+        summary: 集計結果
+        sport: 分析するスポーツ種目
+
+    Returns:
+        箱ひげ図
+    """
+    stats = summary.distribution_stats[sport].unstack("統計量")
+    colors = ["#1E3A8A", "#3B82F6", "#60A5FA", "#93C5FD"]
+    fig = go.Figure()
+    for i, (age, row) in enumerate(stats.iterrows()):
+        fig.add_trace(
+            go.Box(
+                x=[age],
+                q1=[row["第1四分位"]],
+                median=[row["中央値"]],
+                q3=[row["第3四分位"]],
+                lowerfence=[row["最小"]],
+                upperfence=[row["最大"]],
+                name=str(age),
+                marker_color=colors[i % len(colors)],
+            )
+        )
+    return _apply_style(
+        fig,
+        title_text=f"{sport}の年齢層別分布",
+        xaxis_title="年齢層",
+        yaxis_title="関心度",
+        showlegend=False,
+        height=400,
+    )
+
+
+def build_default_figures(df: pd.DataFrame, summary: AnalysisSummary) -> dict[str, go.Figure]:
+    """画面の初期選択状態（先頭3種目・先頭の種目）の4つのグラフを作成
+
+    Args:
+        df: 表示対象のDataFrame
+        summary: dfの集計結果
+
+    Returns:
+        グラフ名と図の対応
+    """
+    sports_cols = summary.correlation.columns.tolist()
+    return {
+        "bar": build_bar_figure(summary),
+        "line": build_line_figure(summary, sports_cols[:3]),
+        "heatmap": build_heatmap_figure(summary, sports_cols),
+        "box": build_box_figure(df, sports_cols[0]),
+    }
@@ -1,120 +1,370 @@
 """データ分析画面コンポーネント"""
 
+import time
+from pathlib import Path
+
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
 
-from components.export_ui import render_export_section
+from components.charts import (
+    build_bar_figure,
+    build_box_figure,
+    build_box_figure_from_stats,
+    build_heatmap_figure,
+    build_line_figure,
+)
+from components.diagnostics import is_diagnostics_requested, render_diagnostics_panel
+from components.export_ui import render_export_section, render_report_export_section
+from components.memory_admin import render_memory_admin_panel
+from utils.analysis_summary import AnalysisSummary, get_analysis_summary
+from utils.columnar_store import (
+    ColumnarDataset,
+    get_columnar_dataset,
+    get_columnar_summary,
+    is_out_of_core,
+    read_preview,
+)
+from utils.compute_backend import get_compute_backend
 from utils.data_loader import (
-    filter_by_age_group,
+    DATA_FILE_TYPES,
+    SAMPLE_DATA_PATH,
     get_sports_columns,
-    load_sample_data,
     validate_sports_survey_data,
 )
-from utils.history_manager import (
-    HistoryManager,
-    optimize_dataframe_memory,
-    render_history_sidebar,
+from utils.export_estimator import format_bytes
+from utils.fingerprint import compute_dataset_fingerprint, derive_fingerprint
+from utils.history_manager import HistoryManager, render_history_sidebar
+from utils.memory_attribution import (
+    is_memory_admin_enabled,
+    register_session,
+    start_memory_reporter,
+    take_pending_evictions,
 )
+from utils.metrics import ROWS_INGESTED, UPLOAD_PARSE_SECONDS
+from utils.scheduler import estimate_frame_bytes, get_session_id, run_scheduled
+from utils.shared_datasets import featured_dataset_paths, load_shared_dataset
+from utils.tracing import span, start_trace
+from utils.upload_jobs import UploadJob, get_upload_job_manager
+
+# アウトオブコアのデータセットでプレビュー表示する行数
+OUT_OF_CORE_PREVIEW_ROWS = 1000
+
+# アップロードできるファイルサイズの上限（1ファイルあたり10MB）
+MAX_FILE_SIZE = 10 * 1024 * 1024
 
 
 def render_data_analysis_page():
     """データ分析画面のメインコンポーネント"""
+    # 環境変数で有効化されていれば、メモリ保持量の定期レポートを開始する
+    start_memory_reporter()
+
+    # 診断パネルが要求されている場合のみ、各セクションの処理時間を記録する
+    diagnostics = is_diagnostics_requested()
+    with start_trace("analysis_page", enabled=diagnostics, session_id=get_session_id()) as trace:
+        try:
+            _render_page_sections()
+        finally:
+            # 管理画面から参照できるよう、このセッションの履歴を登録する
+            register_session()
+    render_diagnostics_panel(trace)
+    # 他のセッションの情報を扱うため、URLではなくサーバー側の設定で有効にする
+    if diagnostics and is_memory_admin_enabled():
+        render_memory_admin_panel()
+
+
+def _render_page_sections():
+    """データ分析画面の各セクションを描画"""
     st.title("🏃 スポーツ関心度調査 データ分析")
 
     # データ読み込みセクション
-    df = _render_data_loading_section()
+    with span("data_loading"):
+        entry = _render_data_loading_section()
+
+    # 大きなデータセットはメモリに読み込まず、ディスク上の列指向ファイルから集計する
+    out_of_core_source = st.session_state.get("out_of_core_source")
+    if out_of_core_source is not None:
+        _render_out_of_core_sections(Path(out_of_core_source))
+        return
+
+    df = entry["data"] if entry is not None else None
 
     if df is not None and not df.empty:
         # データ検証
-        if not validate_sports_survey_data(df):
+        with span("validate", rows=len(df)):
+            is_valid = validate_sports_survey_data(df)
+        if not is_valid:
             st.error(
                 "⚠️ データ形式が正しくありません。必須カラム: 回答者ID, 年齢層, スポーツ種目(3つ以上)"
             )
             return
 
         # サイドバーでフィルタリングオプション
-        filtered_df = _render_sidebar_filters(df)
+        with span("filter"):
+            filtered_df, selected_age = _render_sidebar_filters(df)
+
+        # フィルター適用後のデータをフィンガープリントで識別（データ本体の再ハッシュを避ける）
+        with span("fingerprint"):
+            base_fingerprint = entry.get("fingerprint") or compute_dataset_fingerprint(df)
+            fingerprint = derive_fingerprint(base_fingerprint, age_group=selected_age)
 
         # データプレビューセクション
-        _render_data_preview_section(filtered_df)
+        with span("preview", rows=len(filtered_df)):
+            _render_data_preview_section(filtered_df)
+
+        # 集計結果（フィンガープリントごとにキャッシュ）
+        with span("summary"):
+            # 行を追加したデータセットは、追加分だけ更新した部分統計量から組み立てる
+            summary = run_scheduled(
+                "集計",
+                get_analysis_summary,
+                fingerprint,
+                filtered_df,
+                entry.get("running_summary"),
+                selected_age,
+                estimated_bytes=estimate_frame_bytes(filtered_df),
+            )
 
         # データエクスポートセクション
-        render_export_section(filtered_df, prefix="sports_data")
+        with span("export"):
+            render_export_section(filtered_df, prefix="sports_data", fingerprint=fingerprint)
+            render_report_export_section(summary, prefix="sports_report", fingerprint=fingerprint)
 
         # 可視化セクション
-        _render_visualization_section(filtered_df)
+        with span("visualization"):
+            _render_visualization_section(filtered_df, summary)
 
 
-def _render_data_loading_section() -> pd.DataFrame | None:
-    """データ読み込みセクションの描画"""
+def _render_data_loading_section() -> dict | None:
+    """データ読み込みセクションの描画
+
+    Returns:
+        現在選択中の履歴エントリ、存在しない場合はNone
+    """
     st.header("📁 データ読み込み")
 
     # 履歴マネージャーの初期化
     history_manager = HistoryManager(max_history=5)
+    # 管理画面から要求された履歴エントリの追い出しを、このセッションのスレッドで反映する
+    for data_id in take_pending_evictions():
+        history_manager.delete_history(data_id)
 
     col1, col2 = st.columns(2)
 
-    # ファイルサイズ制限（10MB）
-    MAX_FILE_SIZE = 10 * 1024 * 1024
-
     with col1:
         use_sample = st.button(
             "サンプルデータを使用", type="primary", use_container_width=True
         )
+        # 注目データセット（環境変数で指定されている場合のみ表示）
+        selected_featured = None
+        for path in featured_dataset_paths():
+            if st.button(f"⭐ {path.stem}", key=f"featured_{path}", use_container_width=True):
+                selected_featured = path
 
     with col2:
-        uploaded_file = st.file_uploader(
-            "CSVファイルをアップロード",
-            type=["csv"],
-            help="回答者ID, 年齢層, スポーツ種目のカラムを含むCSVファイル（最大10MB）",
+        uploaded_files = st.file_uploader(
+            "データファイルをアップロード",
+            type=list(DATA_FILE_TYPES),
+            accept_multiple_files=True,
+            help=(
+                "回答者ID, 年齢層, スポーツ種目のカラムを含むCSV・Parquet・Feather・Excel（xlsx）"
+                "ファイル（1ファイル最大10MB）。"
+                "同じ列構成の複数ファイル（地域・調査回ごとのファイルなど）を選ぶと"
+                "1つのデータセットに結合します"
+            ),
         )
+        # 選択中のデータセットに、新しく届いた回答だけを追加するアップローダー
+        current_entry = history_manager.get_current_entry()
+        appended_files = []
+        if current_entry is not None and "out_of_core_source" not in st.session_state:
+            appended_files = st.file_uploader(
+                "現在のデータセットに行を追加",
+                type=list(DATA_FILE_TYPES),
+                accept_multiple_files=True,
+                key="append_uploader",
+                help="現在のデータセットと同じ列構成の、新しい回答だけを含むファイル",
+            )
 
     # データの読み込み
-    if use_sample:
+    if use_sample or selected_featured is not None:
+        path = SAMPLE_DATA_PATH if use_sample else selected_featured
+        source = "sample" if use_sample else "featured"
         try:
-            df = load_sample_data()
-            # メモリ最適化
-            df = optimize_dataframe_memory(df)
+            if not use_sample and is_out_of_core(path):
+                st.session_state.out_of_core_source = str(path)
+                st.rerun()
+            st.session_state.pop("out_of_core_source", None)
+            # 読み込み中のアップロードがあれば、後から完了して選択が切り替わらないよう取り消す
+            if "upload_job" in st.session_state:
+                get_upload_job_manager().cancel(st.session_state.upload_job)
+            # サーバー上のデータセットは全セッション共通のキャッシュから取得
+            # （ウォームアップ済みなら読み込み済みのDataFrameが返る）
+            started = time.perf_counter()
+            with span("load_sample" if use_sample else "load_featured"):
+                df = run_scheduled(
+                    "サンプルデータ読み込み" if use_sample else "データセット読み込み",
+                    load_shared_dataset,
+                    path,
+                )
+            UPLOAD_PARSE_SECONDS.observe(time.perf_counter() - started, source=source)
+            ROWS_INGESTED.inc(len(df), source=source)
             # 履歴に追加
             file_size = f"{df.memory_usage(deep=True).sum() / 1024:.1f}KB"
-            history_manager.add_history("sample_data.csv", df, file_size)
-            st.success(f"📊 サンプルデータを読み込みました（{len(df)}件）")
+            history_manager.add_history(path.name, df, file_size)
+            if use_sample:
+                st.success(f"📊 サンプルデータを読み込みました（{len(df)}件）")
+            else:
+                st.success(f"📊 {path.name} を読み込みました（{len(df)}件）")
             st.rerun()
         except Exception as e:
             st.error(f"⚠️ エラー: {str(e)}")
             return None
 
-    if uploaded_file is not None:
-        # ファイルサイズチェック
-        if uploaded_file.size > MAX_FILE_SIZE:
-            st.error("❌ ファイルサイズが大きすぎます（最大10MB）")
-            return None
-
-        try:
-            df = pd.read_csv(uploaded_file)
-            # メモリ最適化
-            df = optimize_dataframe_memory(df)
-            # ファイルサイズ計算
-            file_size = f"{uploaded_file.size / 1024:.1f}KB"
-            # 履歴に追加
-            history_manager.add_history(uploaded_file.name, df, file_size)
-            st.success(f"📊 {uploaded_file.name} を読み込みました（{len(df)}件）")
-            st.rerun()
-        except Exception as e:
-            st.error(f"⚠️ ファイルの読み込みに失敗: {str(e)}")
-            return None
+    if not _submit_upload_job(uploaded_files, "loaded_upload_id"):
+        return None
+    if current_entry is not None and not _submit_upload_job(
+        appended_files, "loaded_append_id", append_to=current_entry["id"]
+    ):
+        return None
+
+    job = st.session_state.get("upload_job")
+    if job is not None:
+        if job.is_finished:
+            del st.session_state.upload_job
+            _finish_upload_job(history_manager, job)
+        else:
+            _render_upload_progress()
 
     # サイドバーに履歴を表示
-    render_history_sidebar(history_manager)
+    with span("history_sidebar"):
+        render_history_sidebar(history_manager)
 
     # 現在のデータを取得
-    return history_manager.get_current_data()
+    return history_manager.get_current_entry()
+
+
+def _submit_upload_job(uploaded_files: list, state_key: str, append_to: str | None = None) -> bool:
+    """アップローダーで新しく選ばれたファイルの読み込みジョブを登録
+
+    読み込み済み・読み込み中のファイルはアップローダーに残っていても再読み込みしない
+    （ファイルの組み合わせが変わったら新しいアップロードとして読み込む）。
+
+    Args:
+        uploaded_files: アップローダーで選ばれているファイル
+        state_key: 読み込んだファイルの組み合わせを記録するセッション状態のキー
+        append_to: 読み込んだ行を追加する履歴エントリのID（Noneなら新しいデータセット）
+
+    Returns:
+        ファイルサイズの上限を超えていた場合はFalse、それ以外はTrue
+    """
+    upload_id = ",".join(f.file_id for f in uploaded_files)
+    if not uploaded_files or upload_id == st.session_state.get(state_key):
+        return True
+
+    # ファイルサイズチェック
+    too_large = [f.name for f in uploaded_files if f.size > MAX_FILE_SIZE]
+    if too_large:
+        st.error(f"❌ ファイルサイズが大きすぎます（最大10MB）: {', '.join(too_large)}")
+        return False
+
+    # 読み込みとメモリ最適化はバックグラウンドのジョブで実行し、
+    # その間も選択中のデータセットを表示し続ける（読み込み中の別のファイルは取り消す）
+    upload_manager = get_upload_job_manager()
+    if "upload_job" in st.session_state:
+        upload_manager.cancel(st.session_state.upload_job)
+    with span(
+        "submit_upload",
+        bytes=sum(f.size for f in uploaded_files),
+        files=len(uploaded_files),
+    ):
+        st.session_state.upload_job = upload_manager.submit_files(
+            get_session_id(),
+            upload_id,
+            [(f.name, f.getvalue()) for f in uploaded_files],
+            append_to=append_to,
+        )
+    st.session_state[state_key] = upload_id
+    return True
+
+
+@st.fragment(run_every=1.0)
+def _render_upload_progress():
+    """
+    バックグラウンドで読み込み中のアップロードの進捗を定期的に更新して表示
+
+    読み込みが終わったらページ全体を再実行して結果を履歴に追加する。
+    """
+    manager = get_upload_job_manager()
+    job = st.session_state.get("upload_job")
+    if job is None or job.is_finished:
+        st.rerun()
+
+    if job.status == "running":
+        files = f"{job.files_parsed} / {job.file_count}ファイル、" if job.file_count > 1 else ""
+        text = (
+            f"⏳ {job.filename} を読み込み中...（{files}{format_bytes(job.bytes_read)} / "
+            f"{format_bytes(job.total_bytes)}、{job.rows_parsed:,}行）"
+        )
+    else:
+        text = f"⏳ {job.filename}: 順番待ち中です（{manager.queue_position(job)}番目）"
+    st.progress(job.progress, text=text)
+
+    if st.button("読み込みを取り消す", key="cancel_upload"):
+        manager.cancel(job)
+        st.rerun()
+
+
+def _toast_cleaning(job: UploadJob):
+    """読み込み時に関心度の表記を修正した場合は件数を通知（再実行後も表示されるトースト）"""
+    if job.cleaning.total:
+        st.toast(f"🧹 関心度の表記を修正しました: {job.cleaning.format()}")
 
 
-def _render_sidebar_filters(df: pd.DataFrame) -> pd.DataFrame:
-    """サイドバーでフィルタリングオプションを提供"""
+def _finish_upload_job(history_manager: HistoryManager, job: UploadJob):
+    """終了したアップロードの読み込みジョブの結果を反映
+
+    成功した場合は読み込み結果を履歴に追加して選択し、ページを再実行する。
+    失敗・取り消しの場合はメッセージを表示し、選択中のデータセットはそのまま残す。
+
+    Args:
+        history_manager: 履歴マネージャー
+        job: 終了したジョブ
+    """
+    if job.status == "failed":
+        st.error(f"⚠️ ファイルの読み込みに失敗: {job.error}")
+        return
+    if job.status == "cancelled":
+        st.info(f"🚫 {job.filename} の読み込みを取り消しました")
+        return
+
+    if job.append_to is not None:
+        # 既存のデータセットに追加（集計結果は追加分だけで更新される）
+        try:
+            history_manager.append_to_entry(
+                job.append_to, job.filename, job.data, f"{job.total_bytes / 1024:.1f}KB"
+            )
+        except KeyError:
+            st.warning("⚠️ 追加先のデータセットが履歴から削除されたため、行を追加できませんでした")
+            return
+        except ValueError as e:
+            st.error(f"⚠️ 行を追加できません: {e}")
+            return
+        _toast_cleaning(job)
+        st.success(f"➕ {job.filename} の{job.rows_parsed}件を追加しました")
+        st.rerun()
+
+    st.session_state.pop("out_of_core_source", None)
+    history_manager.add_history(job.filename, job.data, f"{job.total_bytes / 1024:.1f}KB")
+    _toast_cleaning(job)
+    st.success(f"📊 {job.filename} を読み込みました（{job.rows_parsed}件）")
+    st.rerun()
+
+
+def _render_sidebar_filters(df: pd.DataFrame) -> tuple[pd.DataFrame, str]:
+    """サイドバーでフィルタリングオプションを提供
+
+    Returns:
+        フィルタリング後のDataFrameと選択中の年齢層
+    """
     st.sidebar.header("🔍 フィルター")
 
     # 年齢層フィルター
@@ -122,11 +372,13 @@ def _render_sidebar_filters(df: pd.DataFrame) -> pd.DataFrame:
     selected_age = st.sidebar.selectbox("年齢層", age_groups, index=0)
 
     # フィルタリング適用
-    filtered_df = filter_by_age_group(df, selected_age if selected_age != "全年齢" else None)
+    filtered_df = get_compute_backend().filter_by_age_group(
+        df, selected_age if selected_age != "全年齢" else None
+    )
 
     st.sidebar.metric("表示データ数", len(filtered_df))
 
-    return filtered_df
+    return filtered_df, selected_age
 
 
 def _render_data_preview_section(df: pd.DataFrame):
@@ -136,10 +388,10 @@ def _render_data_preview_section(df: pd.DataFrame):
     # タブで表示を切り替え
     tab1, tab2, tab3 = st.tabs(["データ一覧", "基本統計量", "データ情報"])
 
-    with tab1:
+    with tab1, span("dataframe"):
         st.dataframe(df, use_container_width=True, height=400)
 
-    with tab2:
+    with tab2, span("describe"):
         sports_cols = get_sports_columns(df)
         st.dataframe(df[sports_cols].describe(), use_container_width=True)
 
@@ -154,34 +406,107 @@ def _render_data_preview_section(df: pd.DataFrame):
             st.metric("欠損値数", df.isnull().sum().sum())
 
 
-def _render_visualization_section(df: pd.DataFrame):
-    """データ可視化セクションの描画"""
+def _render_out_of_core_sections(source: Path):
+    """アウトオブコアのデータセット（ディスク上の列指向ファイル）の各セクションを描画
+
+    行データはプレビュー分しか読み込まないため、データのエクスポートは行わない。
+
+    Args:
+        source: 元のCSVファイルのパス
+    """
+    try:
+        with span("columnar_dataset"):
+            dataset = run_scheduled("列指向ファイル作成", get_columnar_dataset, source)
+    except Exception as e:
+        st.error(f"⚠️ エラー: {str(e)}")
+        st.session_state.pop("out_of_core_source", None)
+        return
+
+    st.info(
+        f"💾 {source.name} はサイズが大きいため、ディスク上の列指向ファイルから"
+        f"集計しています（{dataset.rows}件）"
+    )
+    if st.button("メモリ上のデータに戻る"):
+        st.session_state.pop("out_of_core_source", None)
+        st.rerun()
+
+    if len(dataset.sports) < 3:
+        st.error(
+            "⚠️ データ形式が正しくありません。必須カラム: 回答者ID, 年齢層, スポーツ種目(3つ以上)"
+        )
+        return
+
+    # 年齢層フィルター（一致しない行グループは読まずに飛ばす）
+    with span("filter"):
+        st.sidebar.header("🔍 フィルター")
+        selected_age = st.sidebar.selectbox("年齢層", ["全年齢"] + dataset.age_groups, index=0)
+        age_group = selected_age if selected_age != "全年齢" else None
+        fingerprint = derive_fingerprint(dataset.fingerprint, age_group=selected_age)
+
+    with span("summary"):
+        summary = run_scheduled("集計", get_columnar_summary, fingerprint, age_group, dataset)
+    st.sidebar.metric("表示データ数", summary.row_count)
+
+    with span("preview"):
+        _render_out_of_core_preview_section(dataset, summary, age_group)
+
+    with span("export"):
+        render_report_export_section(summary, prefix="sports_report", fingerprint=fingerprint)
+
+    with span("visualization"):
+        _render_visualization_section(None, summary)
+
+
+def _render_out_of_core_preview_section(
+    dataset: ColumnarDataset, summary: AnalysisSummary, age_group: str | None
+):
+    """アウトオブコアのデータセットのプレビュー（先頭行と集計結果）を描画"""
+    st.header("📊 データプレビュー")
+
+    tab1, tab2, tab3 = st.tabs(["データ一覧", "基本統計量", "データ情報"])
+
+    with tab1, span("dataframe"):
+        st.caption(f"先頭{OUT_OF_CORE_PREVIEW_ROWS}行を表示しています")
+        st.dataframe(
+            read_preview(dataset, OUT_OF_CORE_PREVIEW_ROWS, age_group),
+            use_container_width=True,
+            height=400,
+        )
+
+    with tab2:
+        st.dataframe(summary.sport_means.rename("平均関心度"), use_container_width=True)
+        st.dataframe(summary.score_distribution, use_container_width=True)
+
+    with tab3:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("総回答数", summary.row_count)
+            st.metric("年齢層数", len(summary.age_group_means))
+
+        with col2:
+            st.metric("スポーツ種目数", len(dataset.sports))
+            st.metric("行グループ数", dataset.row_groups)
+
+
+def _render_visualization_section(df: pd.DataFrame | None, summary: AnalysisSummary):
+    """データ可視化セクションの描画
+
+    Args:
+        df: 表示対象のDataFrame（分布分析で使用、Noneなら集計結果の分布統計から描く）
+        summary: dfの集計結果
+    """
     st.header("📈 データ可視化")
 
-    sports_cols = get_sports_columns(df)
+    sports_cols = summary.correlation.columns.tolist() if df is None else get_sports_columns(df)
+
+    # 見出し・ウィジェットと出力先を先に配置し、グラフは最後にまとめて作成・出力する
+    figures = {}
+    slots = {}
 
     # 1. スポーツ種目別の平均関心度（棒グラフ）
     st.subheader("1️⃣ スポーツ種目別 平均関心度")
-    avg_interest = df[sports_cols].mean().sort_values(ascending=False)
-
-    # 青系グラデーションカラーパレット
-    fig_bar = px.bar(
-        x=avg_interest.index,
-        y=avg_interest.values,
-        labels={"x": "スポーツ種目", "y": "平均関心度"},
-        title="スポーツ種目別の平均関心度",
-        color=avg_interest.values,
-        color_continuous_scale=["#1E3A8A", "#3B82F6", "#60A5FA", "#93C5FD"],
-    )
-    fig_bar.update_layout(
-        showlegend=False,
-        height=400,
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        font={"color": "#1E3A8A", "size": 12},
-        title_font={"size": 16, "color": "#1E3A8A", "family": "Arial, sans-serif"},
-    )
-    st.plotly_chart(fig_bar, use_container_width=True)
+    figures["bar"] = (build_bar_figure, summary)
+    slots["bar"] = st.empty()
 
     # 2. 年齢層別の関心度傾向（折れ線グラフ）
     st.subheader("2️⃣ 年齢層別 関心度傾向")
@@ -195,71 +520,13 @@ def _render_visualization_section(df: pd.DataFrame):
     )
 
     if selected_sports:
-        age_sport_data = df.groupby("年齢層")[selected_sports].mean()
-
-        # 青系カラーパレット
-        blue_colors = ["#1E3A8A", "#3B82F6", "#60A5FA", "#93C5FD", "#DBEAFE"]
-
-        fig_line = go.Figure()
-        for idx, sport in enumerate(selected_sports):
-            fig_line.add_trace(
-                go.Scatter(
-                    x=age_sport_data.index,
-                    y=age_sport_data[sport],
-                    mode="lines+markers",
-                    name=sport,
-                    line={"width": 3, "color": blue_colors[idx % len(blue_colors)]},
-                    marker={"size": 10, "color": blue_colors[idx % len(blue_colors)]},
-                )
-            )
-
-        fig_line.update_layout(
-            title="年齢層別の関心度傾向",
-            xaxis_title="年齢層",
-            yaxis_title="平均関心度",
-            height=400,
-            hovermode="x unified",
-            plot_bgcolor="rgba(0,0,0,0)",
-            paper_bgcolor="rgba(0,0,0,0)",
-            font={"color": "#1E3A8A", "size": 12},
-            title_font={"size": 16, "color": "#1E3A8A", "family": "Arial, sans-serif"},
-            legend={
-                "bgcolor": "rgba(255,255,255,0.9)",
-                "bordercolor": "#E2E8F0",
-                "borderwidth": 1,
-            },
-        )
-        st.plotly_chart(fig_line, use_container_width=True)
+        figures["line"] = (build_line_figure, summary, selected_sports)
+        slots["line"] = st.empty()
 
     # 3. 相関分析（ヒートマップ）
     st.subheader("3️⃣ スポーツ種目間の相関分析")
-
-    correlation_matrix = df[sports_cols].corr()
-
-    # 青・白・黒系のカラースケール（赤・黄色を使わない）
-    fig_heatmap = px.imshow(
-        correlation_matrix,
-        labels={"x": "スポーツ種目", "y": "スポーツ種目", "color": "相関係数"},
-        x=sports_cols,
-        y=sports_cols,
-        color_continuous_scale=[
-            [0, "#0F172A"],  # 負の相関: ダークブルー/ブラック
-            [0.5, "#F8FAFC"],  # 無相関: ホワイト
-            [1, "#1E3A8A"],  # 正の相関: プライマリブルー
-        ],
-        aspect="auto",
-        zmin=-1,
-        zmax=1,
-    )
-    fig_heatmap.update_layout(
-        title="スポーツ種目間の相関係数",
-        height=500,
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        font={"color": "#1E3A8A", "size": 12},
-        title_font={"size": 16, "color": "#1E3A8A", "family": "Arial, sans-serif"},
-    )
-    st.plotly_chart(fig_heatmap, use_container_width=True)
+    figures["heatmap"] = (build_heatmap_figure, summary, sports_cols)
+    slots["heatmap"] = st.empty()
 
     # 4. 分布分析（箱ひげ図）
     st.subheader("4️⃣ 関心度の分布分析")
@@ -267,22 +534,14 @@ def _render_visualization_section(df: pd.DataFrame):
     selected_sport_box = st.selectbox("分析するスポーツを選択", sports_cols)
 
     if selected_sport_box:
-        # 青系グラデーションで年齢層ごとに色分け
-        fig_box = px.box(
-            df,
-            x="年齢層",
-            y=selected_sport_box,
-            title=f"{selected_sport_box}の年齢層別分布",
-            labels={"年齢層": "年齢層", selected_sport_box: "関心度"},
-            color="年齢層",
-            color_discrete_sequence=["#1E3A8A", "#3B82F6", "#60A5FA", "#93C5FD"],
-        )
-        fig_box.update_layout(
-            showlegend=False,
-            height=400,
-            plot_bgcolor="rgba(0,0,0,0)",
-            paper_bgcolor="rgba(0,0,0,0)",
-            font={"color": "#1E3A8A", "size": 12},
-            title_font={"size": 16, "color": "#1E3A8A", "family": "Arial, sans-serif"},
-        )
-        st.plotly_chart(fig_box, use_container_width=True)
+        if df is None:
+            figures["box"] = (build_box_figure_from_stats, summary, selected_sport_box)
+        else:
+            figures["box"] = (build_box_figure, df, selected_sport_box)
+        slots["box"] = st.empty()
+
+    for name, (builder, *args) in figures.items():
+        with span(f"figure:{name}"):
+            figure = builder(*args)
+        with span(f"emit:{name}"):
+            slots[name].plotly_chart(figure, use_container_width=True)
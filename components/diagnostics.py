@@ -0,0 +1,77 @@
+"""開発者向けの診断パネルコンポーネント
+
+URLに ?diagnostics=1 を付けるか、環境変数 STREAMLIT_TRACE=1 を設定すると
+ページ末尾に直近の再実行の処理時間の内訳を表示する。
+"""
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from utils.tracing import Trace, get_trace_file, is_tracing_enabled, summarize_spans
+
+# 診断パネルを表示するクエリパラメータ
+DIAGNOSTICS_QUERY_PARAM = "diagnostics"
+
+# 深さごとのバーの色
+_DEPTH_COLORS = ["#1E3A8A", "#3B82F6", "#60A5FA", "#93C5FD", "#DBEAFE"]
+
+
+def is_diagnostics_requested() -> bool:
+    """診断パネル（トレース）が要求されているか"""
+    return st.query_params.get(DIAGNOSTICS_QUERY_PARAM) == "1" or is_tracing_enabled()
+
+
+def build_flame_figure(trace: Trace) -> go.Figure:
+    """スパンを開始時刻・深さで並べたフレームグラフ風の図を作成
+
+    Args:
+        trace: 表示するトレース
+
+    Returns:
+        横棒グラフ（x: 経過時間[ms]、y: 入れ子の深さ）
+    """
+    fig = go.Figure()
+    for s in trace.spans:
+        fig.add_trace(
+            go.Bar(
+                x=[s.duration * 1e3],
+                base=[s.start * 1e3],
+                y=[s.depth],
+                orientation="h",
+                text=s.name,
+                textposition="inside",
+                insidetextanchor="start",
+                marker={"color": _DEPTH_COLORS[s.depth % len(_DEPTH_COLORS)]},
+                hovertemplate=f"{s.name}<br>{s.duration * 1e3:.1f}ms<extra></extra>",
+                showlegend=False,
+            )
+        )
+    max_depth = max((s.depth for s in trace.spans), default=0)
+    fig.update_layout(
+        barmode="overlay",
+        height=120 + 40 * (max_depth + 1),
+        xaxis_title="経過時間 [ms]",
+        yaxis={"autorange": "reversed", "title": "深さ", "dtick": 1},
+        margin={"l": 40, "r": 20, "t": 20, "b": 40},
+    )
+    return fig
+
+
+def render_diagnostics_panel(trace: Trace | None) -> None:
+    """直近の再実行の処理時間の内訳を表示
+
+    Args:
+        trace: 直近の再実行のトレース（Noneなら何も表示しない）
+    """
+    if trace is None:
+        return
+
+    with st.expander(f"🩺 診断: 直近の再実行 {trace.duration * 1e3:.1f}ms", expanded=False):
+        st.plotly_chart(build_flame_figure(trace), use_container_width=True)
+        st.dataframe(
+            pd.DataFrame(summarize_spans(trace)).round(2),
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption(f"スパンの記録先: {get_trace_file()}")
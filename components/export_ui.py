@@ -5,14 +5,20 @@ import logging
 import pandas as pd
 import streamlit as st
 
+from utils.analysis_summary import AnalysisSummary
 from utils.export import (
     ExportFormat,
-    export_to_csv,
-    export_to_excel,
-    export_to_json,
+    export_analysis_report_bundle,
+    export_analysis_report_excel,
     generate_filename,
     get_mime_type,
 )
+from utils.export_cache import get_export_cache
+from utils.export_estimator import format_bytes, get_export_estimates
+from utils.export_jobs import ExportJob, get_export_job_manager
+from utils.fingerprint import compute_dataset_fingerprint
+from utils.scheduler import get_session_id
+from utils.tracing import span
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
@@ -21,14 +27,26 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+# エクスポート形式とボタンラベル
+EXPORT_FORMATS: list[tuple[ExportFormat, str]] = [
+    ("csv", "📄 CSV形式"),
+    ("excel", "📊 Excel形式"),
+    ("json", "📋 JSON形式"),
+]
 
-def render_export_section(df: pd.DataFrame, prefix: str = "sports_data"):
+
+def render_export_section(
+    df: pd.DataFrame, prefix: str = "sports_data", fingerprint: str | None = None
+):
     """
     データエクスポートセクションを描画
 
+    変換はバックグラウンドのジョブとして実行され、画面は進捗表示のみを行う。
+
     Args:
         df: エクスポート対象のDataFrame
         prefix: ファイル名のプレフィックス（デフォルト: "sports_data"）
+        fingerprint: dfのフィンガープリント（省略時はdfから計算）
     """
     st.header("📥 データエクスポート")
 
@@ -40,8 +58,13 @@ def render_export_section(df: pd.DataFrame, prefix: str = "sports_data"):
     MAX_ROWS = 100000
     MAX_SIZE_MB = 50
 
-    # メモリサイズの概算（MB）
-    memory_usage_mb = df.memory_usage(deep=True).sum() / (1024 * 1024)
+    if fingerprint is None:
+        fingerprint = compute_dataset_fingerprint(df)
+
+    # サンプル変換による形式別の出力サイズ・所要時間の見積もり（データセットごとにキャッシュ）
+    with span("export:estimate"):
+        estimates = get_export_estimates(fingerprint, df)
+    largest = max(estimates.values(), key=lambda estimate: estimate.size_bytes)
 
     if len(df) > MAX_ROWS:
         st.warning(
@@ -49,26 +72,43 @@ def render_export_section(df: pd.DataFrame, prefix: str = "sports_data"):
             f"処理に時間がかかる場合があります。"
         )
 
-    if memory_usage_mb > MAX_SIZE_MB:
+    if largest.size_bytes > MAX_SIZE_MB * 1024 * 1024:
         st.warning(
-            f"⚠️ データサイズが大きいです（約{memory_usage_mb:.1f}MB）。"
-            f"エクスポートに時間がかかる場合があります。"
+            f"⚠️ データサイズが大きいです（{largest.file_format.upper()}形式で"
+            f"約{format_bytes(largest.size_bytes)}）。エクスポートに時間がかかる場合があります。"
         )
 
-    # エクスポート形式選択
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        if st.button("📄 CSV形式", type="primary", use_container_width=True):
-            _download_data(df, "csv", prefix)
-
-    with col2:
-        if st.button("📊 Excel形式", type="primary", use_container_width=True):
-            _download_data(df, "excel", prefix)
-
-    with col3:
-        if st.button("📋 JSON形式", type="primary", use_container_width=True):
-            _download_data(df, "json", prefix)
+    manager = get_export_job_manager()
+
+    # このセッションで要求したエクスポート（フィンガープリント, 形式）
+    if "export_requests" not in st.session_state:
+        st.session_state.export_requests = set()
+
+    # エクスポート形式選択（同じデータ・形式の再要求は既存ジョブに紐づく）
+    columns = st.columns(len(EXPORT_FORMATS))
+    for col, (file_format, label) in zip(columns, EXPORT_FORMATS, strict=True):
+        with col:
+            if st.button(label, type="primary", use_container_width=True):
+                with span("export:submit", format=file_format):
+                    manager.submit(fingerprint, file_format, df, session_id=get_session_id())
+                st.session_state.export_requests.add((fingerprint, file_format))
+            estimate = estimates[file_format]
+            st.caption(f"予測: 約{format_bytes(estimate.size_bytes)} / 約{estimate.seconds:.1f}秒")
+
+    jobs = [
+        manager.get(fingerprint, file_format)
+        for file_format, _ in EXPORT_FORMATS
+        if (fingerprint, file_format) in st.session_state.export_requests
+    ]
+    jobs = [job for job in jobs if job is not None]
+
+    if any(not job.is_finished for job in jobs):
+        _render_export_progress(fingerprint)
+
+    for job in jobs:
+        if job.is_finished:
+            with span("export:result", format=job.file_format):
+                _render_export_result(job, prefix)
 
     # エクスポート情報の表示
     with st.expander("ℹ️ エクスポート情報"):
@@ -84,53 +124,122 @@ def render_export_section(df: pd.DataFrame, prefix: str = "sports_data"):
             """
         )
 
+        # エクスポートキャッシュの状態（キー計算はフィンガープリントのみでデータ量に依存しない）
+        stats = get_export_cache().stats()
+        mean_key_us = stats.key_seconds / stats.key_count * 1e6 if stats.key_count else 0.0
+        st.caption(
+            f"キャッシュ: ヒット率 {stats.hit_rate:.0%} / "
+            f"メモリ {format_bytes(stats.memory_bytes)} / ディスク {format_bytes(stats.disk_bytes)} / "
+            f"キー計算 平均{mean_key_us:.0f}µs"
+        )
+
 
-def _download_data(df: pd.DataFrame, file_format: ExportFormat, prefix: str):
+def render_report_export_section(
+    summary: AnalysisSummary, prefix: str = "sports_report", fingerprint: str | None = None
+):
     """
-    データをエクスポートしてダウンロードボタンを表示
+    分析レポート（集計結果のみ）のエクスポートセクションを描画
+
+    集計結果は計算済みのため、変換は小さな表のみで即座に完了する。変換結果は
+    フィンガープリントをキーにキャッシュし、再実行のたびに作り直さない。
 
     Args:
-        df: エクスポート対象のDataFrame
-        file_format: エクスポート形式（"csv", "excel", "json"）
-        prefix: ファイル名のプレフィックス
+        summary: 分析ページの集計結果
+        prefix: ファイル名のプレフィックス（デフォルト: "sports_report"）
+        fingerprint: 集計対象データのフィンガープリント（省略時はキャッシュしない）
     """
-    try:
-        logger.info(
-            f"Export started: format={file_format}, rows={len(df)}, columns={len(df.columns)}"
-        )
+    st.subheader("📑 分析レポート")
+    st.caption(
+        "種目別平均・年齢層別平均・相関行列・スコア分布・分布統計を"
+        f"まとめてダウンロードできます（集計対象: {summary.row_count:,}件）"
+    )
+
+    col1, col2 = st.columns(2)
+    reports = [
+        (col1, "excel", "📊 Excelレポート（複数シート）", export_analysis_report_excel),
+        (col2, "zip", "🗂️ Parquetバンドル（ZIP）", export_analysis_report_bundle),
+    ]
+    for col, file_format, label, exporter in reports:
+        with col:
+            try:
+                data = exporter(summary, fingerprint)
+            except Exception as e:
+                logger.error(
+                    f"Report export failed: format={file_format}, error={e}", exc_info=True
+                )
+                st.error(f"⚠️ レポートの作成に失敗しました: {str(e)}")
+                continue
+
+            st.download_button(
+                label=label,
+                data=data,
+                file_name=generate_filename(prefix, file_format),
+                mime=get_mime_type(file_format),
+                use_container_width=True,
+                key=f"report_{file_format}",
+            )
+
+
+@st.fragment(run_every=1.0)
+def _render_export_progress(fingerprint: str):
+    """
+    実行中のエクスポートジョブの進捗を定期的に更新して表示
+
+    全てのジョブが完了したらページ全体を再実行してダウンロードボタンを表示する。
 
-        # データの変換
-        if file_format == "csv":
-            data = export_to_csv(df)
-        elif file_format == "excel":
-            data = export_to_excel(df, sheet_name="スポーツ関心度データ")
-        elif file_format == "json":
-            data = export_to_json(df, orient="records")
+    Args:
+        fingerprint: エクスポート対象データのフィンガープリント
+    """
+    manager = get_export_job_manager()
+    running = False
+    for file_format, _ in EXPORT_FORMATS:
+        if (fingerprint, file_format) not in st.session_state.export_requests:
+            continue
+        job = manager.get(fingerprint, file_format)
+        if job is None or job.is_finished:
+            continue
+        running = True
+        if job.status == "running":
+            text = f"⏳ {file_format.upper()}形式を変換中...（{job.progress:.0%}）"
         else:
-            logger.warning(f"Unsupported format requested: {file_format}")
-            st.error(f"⚠️ 未対応の形式です: {file_format}")
-            return
-
-        # ファイル名とMIMEタイプの取得
-        filename = generate_filename(prefix, file_format)
-        mime_type = get_mime_type(file_format)
-
-        logger.info(f"Export successful: filename={filename}, size={len(data)} bytes")
-
-        # ダウンロードボタンの表示
-        st.download_button(
-            label=f"⬇️ {filename} をダウンロード",
-            data=data,
-            file_name=filename,
-            mime=mime_type,
-            type="secondary",
-            use_container_width=True,
-        )
+            position = manager.queue_position(job)
+            text = f"⏳ {file_format.upper()}形式: 順番待ち中です（{position}番目）"
+        st.progress(job.progress, text=text)
 
-        st.success(f"✅ {file_format.upper()}形式でエクスポート準備が完了しました！")
+    if not running:
+        st.rerun()
 
-    except Exception as e:
-        logger.error(
-            f"Export failed: format={file_format}, error={str(e)}", exc_info=True
-        )
-        st.error(f"⚠️ エクスポート中にエラーが発生しました: {str(e)}")
+
+def _render_export_result(job: ExportJob, prefix: str):
+    """
+    完了したエクスポートジョブのダウンロードボタンまたはエラーを表示
+
+    Args:
+        job: 完了済みのエクスポートジョブ
+        prefix: ファイル名のプレフィックス
+    """
+    if job.status == "failed":
+        st.error(f"⚠️ エクスポート中にエラーが発生しました: {job.error}")
+        return
+
+    try:
+        data = get_export_job_manager().read_artifact(job)
+    except FileNotFoundError:
+        logger.warning(f"Export artifact missing: path={job.path}")
+        st.warning("⚠️ エクスポート結果の有効期限が切れました。もう一度エクスポートしてください。")
+        return
+
+    # ファイル名とMIMEタイプの取得
+    filename = generate_filename(prefix, job.file_format)
+    mime_type = get_mime_type(job.file_format)
+
+    # ダウンロードボタンの表示
+    st.download_button(
+        label=f"⬇️ {filename} をダウンロード",
+        data=data,
+        file_name=filename,
+        mime=mime_type,
+        type="secondary",
+        use_container_width=True,
+        key=f"download_{job.fingerprint}_{job.file_format}",
+    )
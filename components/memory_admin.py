@@ -0,0 +1,121 @@
+"""メモリ保持量の管理パネルコンポーネント
+
+サーバー側で環境変数 MEMORY_ADMIN=1 が設定され、かつ ?diagnostics=1 のときだけ
+表示する。全セッションの履歴と共通キャッシュのうち大きいものを一覧し、選んだものを
+追い出せる（他のセッションの履歴は、そのセッションの次回の再実行で取り除かれる）。
+"""
+
+import pandas as pd
+import streamlit as st
+
+from utils.export_estimator import format_bytes
+from utils.memory_attribution import (
+    ALLOCATIONS,
+    MemoryReport,
+    collect_memory_report,
+    evict_holder,
+)
+
+# 一覧に表示する保持元の件数
+TOP_HOLDERS = 20
+
+
+def render_memory_admin_panel() -> None:
+    """メモリ保持量の一覧と追い出し操作を表示"""
+    with st.expander("🧠 メモリ: 保持元の内訳", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            if ALLOCATIONS.is_tracing:
+                if st.button("tracemalloc を停止", key="memory_tracemalloc_stop"):
+                    ALLOCATIONS.stop()
+                    st.rerun()
+            elif st.button("tracemalloc を開始", key="memory_tracemalloc_start"):
+                ALLOCATIONS.start()
+                st.rerun()
+        with col2:
+            refresh = st.button("レポートを更新", key="memory_refresh")
+
+        if refresh or "memory_report" not in st.session_state:
+            st.session_state.memory_report = collect_memory_report()
+        report: MemoryReport = st.session_state.memory_report
+
+        st.caption(f"集計時刻: {report.created_at}")
+        _render_totals(report)
+        _render_holders(report)
+        _render_allocations(report)
+
+
+def _render_totals(report: MemoryReport) -> None:
+    """種類別・セッション別の合計を表示"""
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**種類別**")
+        st.dataframe(
+            pd.DataFrame(
+                [(kind, format_bytes(n)) for kind, n in report.totals_by_kind().items()],
+                columns=["種類", "サイズ"],
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+    with col2:
+        st.markdown("**セッション別**")
+        st.dataframe(
+            pd.DataFrame(
+                [(sid[:8], format_bytes(n)) for sid, n in report.totals_by_session().items()],
+                columns=["セッション", "サイズ"],
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+def _render_holders(report: MemoryReport) -> None:
+    """大きい保持元の一覧と追い出しボタンを表示"""
+    st.markdown(f"**大きい保持元（上位{TOP_HOLDERS}件）**")
+    if not report.holders:
+        st.info("保持しているデータはありません")
+        return
+
+    for i, holder in enumerate(report.holders[:TOP_HOLDERS]):
+        col1, col2, col3, col4 = st.columns([2, 2, 5, 2])
+        col1.write(holder.kind)
+        col2.write(holder.session_id[:8])
+        col3.write(f"{holder.label}（{format_bytes(holder.nbytes)}）")
+        if col4.button("追い出す", key=f"memory_evict_{i}_{holder.kind}_{holder.key}"):
+            # 再実行後も表示されるようトーストで通知する
+            if evict_holder(holder):
+                if holder.kind == "history":
+                    st.toast(f"追い出しを要求しました（次回の再実行で反映）: {holder.label}")
+                else:
+                    st.toast(f"追い出しました: {holder.label}")
+            else:
+                st.toast(f"既に存在しません: {holder.label}")
+            st.session_state.memory_report = collect_memory_report(include_allocations=False)
+            st.rerun()
+
+
+def _render_allocations(report: MemoryReport) -> None:
+    """tracemalloc の差分を表示"""
+    st.markdown("**割り当ての増加（前回のレポートとの差分）**")
+    if not ALLOCATIONS.is_tracing:
+        st.caption("tracemalloc が停止中です（開始すると以降の割り当てを記録します）")
+        return
+    if not report.allocations:
+        st.caption("次回の更新から差分を表示します")
+        return
+    st.dataframe(
+        pd.DataFrame(
+            [
+                {
+                    "箇所": a.location,
+                    "増減": ("+" if a.size_diff >= 0 else "-") + format_bytes(abs(a.size_diff)),
+                    "合計": format_bytes(a.size),
+                    "ブロック数増減": a.count_diff,
+                }
+                for a in report.allocations
+            ]
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
@@ -16,7 +16,7 @@ def render_home_page():
         ### 📊 主な機能
 
         #### データ分析
-        - **データ読み込み**: サンプルデータまたは独自のCSVファイルをアップロード
+        - **データ読み込み**: サンプルデータまたは独自のデータファイル（CSV・Parquet・Feather・xlsx）をアップロード
         - **データプレビュー**: データの一覧、統計情報、データ情報を表示
         - **データ可視化**: 4種類のインタラクティブなグラフで分析
           - スポーツ種目別の平均関心度（棒グラフ）
@@ -28,13 +28,13 @@ def render_home_page():
         ### 🚀 使い方
 
         1. 左側のメニューから **📊 データ分析** を選択
-        2. サンプルデータを使用するか、独自のCSVファイルをアップロード
+        2. サンプルデータを使用するか、独自のデータファイルをアップロード
         3. サイドバーのフィルターで年齢層を絞り込み
         4. 各種グラフでデータを分析
 
         ### 📈 データ形式
 
-        アップロードするCSVファイルは以下の形式である必要があります:
+        アップロードするファイルは以下の形式である必要があります:
         - **必須カラム**: 回答者ID、年齢層
         - **スポーツカラム**: 3つ以上のスポーツ種目（関心度: 1-5）
 
@@ -3,6 +3,8 @@
 import pandas as pd
 import pytest
 
+from benchmarks.synthetic_data import SurveyConfig, generate_survey
+
 
 @pytest.fixture
 def sample_sports_data():
@@ -53,3 +55,36 @@ def invalid_sports_data():
 def empty_dataframe():
     """空のDataFrame"""
     return pd.DataFrame()
+
+
+@pytest.fixture
+def synthetic_survey_factory():
+    """合成スポーツ調査データを生成する関数
+
+    使用例: synthetic_survey_factory(rows=10_000, missing_rate=0.01)
+    """
+
+    def factory(**kwargs) -> pd.DataFrame:
+        return generate_survey(SurveyConfig(**kwargs))
+
+    return factory
+
+
+@pytest.fixture
+def survey_csv(tmp_path):
+    """欠損値を含む合成データのCSVファイル"""
+    path = tmp_path / "survey.csv"
+    generate_survey(SurveyConfig(rows=3000, missing_rate=0.1)).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(scope="session")
+def synthetic_survey_1k():
+    """1,000件の合成スポーツ調査データ"""
+    return generate_survey(SurveyConfig(rows=1_000))
+
+
+@pytest.fixture(scope="session")
+def synthetic_survey_100k():
+    """100,000件の合成スポーツ調査データ"""
+    return generate_survey(SurveyConfig(rows=100_000))
@@ -0,0 +1,40 @@
+"""分析サマリーのテスト"""
+
+import pandas as pd
+
+from utils.analysis_summary import compute_analysis_summary
+
+
+class TestComputeAnalysisSummary:
+    """集計結果計算のテスト"""
+
+    def test_sport_means_sorted(self, sample_sports_data):
+        """種目別平均が降順に並ぶことを確認"""
+        summary = compute_analysis_summary(sample_sports_data)
+        assert list(summary.sport_means) == sorted(summary.sport_means, reverse=True)
+        assert summary.sport_means["野球"] == sample_sports_data["野球"].mean()
+
+    def test_age_group_means(self, sample_sports_data):
+        """年齢層別平均が直接計算と一致することを確認"""
+        summary = compute_analysis_summary(sample_sports_data)
+        expected = sample_sports_data.groupby("年齢層")[["サッカー", "ゴルフ"]].mean()
+        pd.testing.assert_frame_equal(summary.age_group_means[["サッカー", "ゴルフ"]], expected)
+
+    def test_correlation(self, sample_sports_data):
+        """相関行列が直接計算と一致することを確認"""
+        summary = compute_analysis_summary(sample_sports_data)
+        sports = ["サッカー", "野球", "バスケットボール", "テニス", "ゴルフ"]
+        pd.testing.assert_frame_equal(summary.correlation, sample_sports_data[sports].corr())
+
+    def test_score_distribution_counts(self, sample_sports_data):
+        """スコア分布の合計が行数と一致することを確認"""
+        summary = compute_analysis_summary(sample_sports_data)
+        assert list(summary.score_distribution.index) == [1, 2, 3, 4, 5]
+        assert (summary.score_distribution.sum() == len(sample_sports_data)).all()
+
+    def test_distribution_stats(self, sample_sports_data):
+        """分布統計に年齢層ごとの5数要約が含まれることを確認"""
+        summary = compute_analysis_summary(sample_sports_data)
+        assert summary.distribution_stats.loc[("20代", "中央値"), "サッカー"] == 5
+        assert len(summary.distribution_stats) == 4 * 5
+        assert summary.row_count == 20
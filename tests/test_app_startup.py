@@ -0,0 +1,84 @@
+"""アプリ起動時間・再実行オーバーヘッドのテスト"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = Path(__file__).parent.parent / "app.py"
+
+# ホームページ表示に必要ない重いモジュール
+# （plotly.graph_objects は streamlit 本体が遅延読み込み用に登録するため対象外）
+HEAVY_MODULES = [
+    "pandas",
+    "plotly.express",
+    "openpyxl",
+    "components.data_analysis",
+]
+
+# `import app` にかける時間の上限（秒、streamlit本体の読み込みを含む）
+COLD_START_BUDGET = 3.0
+
+# ホームページ再実行1回あたりの時間の上限（秒）
+HOME_RERUN_BUDGET = 0.5
+
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _import_app_in_subprocess() -> dict:
+    """新しいプロセスで app をインポートし、所要時間と読み込まれたモジュールを取得"""
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE],
+        cwd=APP_PATH.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestColdStart:
+    """コールドスタートのテスト"""
+
+    def test_heavy_modules_not_imported(self):
+        """app のインポートで重いモジュールが読み込まれないことを確認"""
+        loaded = set(_import_app_in_subprocess()["modules"])
+        assert loaded.isdisjoint(HEAVY_MODULES), loaded & set(HEAVY_MODULES)
+
+    def test_import_within_budget(self):
+        """app のインポートが時間予算内に収まることを確認"""
+        assert _import_app_in_subprocess()["elapsed"] < COLD_START_BUDGET
+
+
+class TestHomePageRerun:
+    """ホームページ再実行のテスト"""
+
+    def test_home_rerun_within_budget(self):
+        """ホームページの再実行が時間予算内に収まることを確認"""
+        at = AppTest.from_file(str(APP_PATH), default_timeout=30)
+        at.run()
+        assert not at.exception
+
+        timings = []
+        for _ in range(5):
+            started = time.perf_counter()
+            at.run()
+            timings.append(time.perf_counter() - started)
+
+        assert statistics.median(timings) < HOME_RERUN_BUDGET
+
+    def test_home_page_renders(self):
+        """遅延読み込みでホームページが表示されることを確認"""
+        at = AppTest.from_file(str(APP_PATH), default_timeout=30)
+        at.run()
+        assert at.title[0].value == "🏠 ホーム"
@@ -0,0 +1,87 @@
+"""benchmarks.harness（計測・履歴・回帰判定）のテスト"""
+
+from benchmarks.harness import (
+    BenchmarkResult,
+    append_run,
+    find_regressions,
+    load_previous_results,
+    measure,
+    permutation_p_value,
+)
+
+
+class TestMeasure:
+    """measure関数のテスト"""
+
+    def test_records_times_and_peak_memory(self):
+        result = measure("alloc", lambda: bytearray(1024 * 1024), repeat=3)
+
+        assert result.name == "alloc"
+        assert len(result.times) == 3
+        assert result.peak_bytes >= 1024 * 1024
+
+    def test_setup_runs_before_each_call(self):
+        calls = []
+        measure("setup", calls.append, setup=lambda: (len(calls),), repeat=2)
+
+        # メモリ計測1回 + 計測2回
+        assert calls == [0, 1, 2]
+
+
+class TestPermutationPValue:
+    """permutation_p_value関数のテスト"""
+
+    def test_clear_slowdown_is_significant(self):
+        assert permutation_p_value([1.0, 1.1, 0.9, 1.0, 1.05], [2.0, 2.1, 1.9, 2.0, 2.05]) < 0.01
+
+    def test_identical_distributions_are_not_significant(self):
+        assert permutation_p_value([1.0, 1.1, 0.9, 1.0], [1.05, 0.95, 1.0, 1.1]) > 0.05
+
+    def test_speedup_is_not_significant(self):
+        assert permutation_p_value([2.0, 2.1, 1.9, 2.0], [1.0, 1.1, 0.9, 1.0]) > 0.9
+
+    def test_large_samples_are_approximated(self):
+        baseline = [1.0 + i * 0.001 for i in range(30)]
+        current = [1.5 + i * 0.001 for i in range(30)]
+        assert permutation_p_value(baseline, current) < 0.01
+
+
+class TestFindRegressions:
+    """find_regressions関数のテスト"""
+
+    def test_flags_significant_slowdown(self):
+        current = {"a[1e3]": BenchmarkResult("a[1e3]", times=[2.0, 2.1, 1.9, 2.0, 2.05])}
+        previous = {"a[1e3]": {"times": [1.0, 1.1, 0.9, 1.0, 1.05], "peak_bytes": 0}}
+
+        regressions = find_regressions(current, previous)
+
+        assert len(regressions) == 1
+        assert regressions[0].startswith("a[1e3]")
+
+    def test_ignores_small_slowdown(self):
+        # 有意でも10%未満の増加は回帰としない
+        current = {"a": BenchmarkResult("a", times=[1.05, 1.051, 1.052, 1.053])}
+        previous = {"a": {"times": [1.0, 1.001, 1.002, 1.003], "peak_bytes": 0}}
+
+        assert find_regressions(current, previous) == []
+
+    def test_ignores_new_benchmarks(self):
+        current = {"new": BenchmarkResult("new", times=[1.0, 1.0])}
+        assert find_regressions(current, {}) == []
+
+
+class TestHistory:
+    """履歴ファイルの読み書きのテスト"""
+
+    def test_missing_history_is_empty(self, tmp_path):
+        assert load_previous_results(tmp_path / "history.jsonl") == {}
+
+    def test_latest_result_per_benchmark(self, tmp_path):
+        path = tmp_path / "results" / "history.jsonl"
+        append_run({"a": BenchmarkResult("a", [1.0]), "b": BenchmarkResult("b", [2.0])}, path)
+        append_run({"a": BenchmarkResult("a", [3.0])}, path)
+
+        previous = load_previous_results(path)
+
+        assert previous["a"]["times"] == [3.0]
+        assert previous["b"]["times"] == [2.0]
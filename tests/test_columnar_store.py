@@ -0,0 +1,144 @@
+"""utils/columnar_store.py のテスト"""
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from components.charts import build_box_figure_from_stats
+from tests.test_parallel_aggregation import assert_summary_equal
+from utils import columnar_store
+from utils.analysis_summary import compute_analysis_summary
+from utils.columnar_store import (
+    get_columnar_dataset,
+    ingest_csv,
+    matching_row_groups,
+    open_columnar_dataset,
+    read_preview,
+    scan_summary,
+)
+from utils.data_loader import filter_by_age_group
+from utils.warmup import run_warmup
+
+
+@pytest.fixture
+def dataset(survey_csv, tmp_path):
+    """小さなチャンク・行グループで変換したデータセット"""
+    return ingest_csv(survey_csv, tmp_path / "survey.parquet", chunk_rows=700, row_group_rows=400)
+
+
+class TestIngestCsv:
+    """ingest_csv関数のテスト"""
+
+    def test_row_groups_hold_single_age_group(self, dataset):
+        metadata = pq.read_metadata(dataset.path)
+        parquet = pq.ParquetFile(dataset.path)
+
+        assert dataset.rows == 3000
+        assert dataset.row_groups == metadata.num_row_groups > 1
+        for i in range(dataset.row_groups):
+            # 1行グループの行数は row_group_rows 以下に抑えられる
+            assert metadata.row_group(i).num_rows <= 400
+            ages = parquet.read_row_group(i, columns=["年齢層"]).column(0).unique()
+            assert len(ages) == 1
+
+    def test_manifest_is_reopened(self, dataset):
+        assert open_columnar_dataset(dataset.path) == dataset
+        assert dataset.sports[0] == "サッカー"
+        assert dataset.age_groups == sorted(dataset.age_groups)
+
+    def test_dirty_scores_are_cleaned(self, sample_sports_data, tmp_path):
+        dirty = sample_sports_data.astype({"野球": "str"})
+        dirty.loc[[2, 5, 8], "野球"] = ["５", " 4.0 ", "無回答"]
+        source = tmp_path / "dirty.csv"
+        dirty.to_csv(source, index=False)
+
+        dataset = ingest_csv(source, tmp_path / "dirty.parquet", chunk_rows=7)
+
+        scores = pd.read_parquet(dataset.path).set_index("回答者ID")["野球"].sort_index()
+        assert scores.loc[[3, 6]].tolist() == [5.0, 4.0]
+        assert scores.isna().tolist() == [i == 9 for i in range(1, 21)]
+
+    def test_missing_required_column(self, tmp_path):
+        source = tmp_path / "invalid.csv"
+        source.write_text("a,b\n1,2\n", encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            ingest_csv(source, tmp_path / "invalid.parquet")
+        assert not (tmp_path / "invalid.parquet").exists()
+
+
+class TestScanSummary:
+    """scan_summary関数のテスト"""
+
+    def test_matches_compute_analysis_summary(self, dataset, survey_csv):
+        df = pd.read_csv(survey_csv)
+
+        assert_summary_equal(scan_summary(dataset), compute_analysis_summary(df))
+
+    def test_age_filter(self, dataset, survey_csv):
+        df = pd.read_csv(survey_csv)
+        age = dataset.age_groups[1]
+
+        assert_summary_equal(
+            scan_summary(dataset, age), compute_analysis_summary(filter_by_age_group(df, age))
+        )
+
+    def test_age_filter_skips_row_groups(self, dataset, monkeypatch):
+        age = dataset.age_groups[0]
+        matches = matching_row_groups(dataset, age)
+        read = []
+        original = pq.ParquetFile.read_row_group
+
+        def tracking_read(self, i, *args, **kwargs):
+            read.append(i)
+            return original(self, i, *args, **kwargs)
+
+        monkeypatch.setattr(pq.ParquetFile, "read_row_group", tracking_read)
+        scan_summary(dataset, age)
+
+        assert 0 < len(matches) < dataset.row_groups
+        assert read == matches
+
+    def test_unknown_age_group(self, dataset):
+        assert matching_row_groups(dataset, "90代") == []
+        assert scan_summary(dataset, "90代").row_count == 0
+
+
+def test_read_preview(dataset):
+    age = dataset.age_groups[2]
+    preview = read_preview(dataset, rows=450, age_group=age)
+
+    assert len(preview) == 450
+    assert (preview["年齢層"] == age).all()
+    assert list(preview.columns) == dataset.columns
+
+
+def test_get_columnar_dataset_reuses_file(survey_csv, tmp_path, monkeypatch):
+    monkeypatch.setenv("OUT_OF_CORE_DIR", str(tmp_path / "store"))
+    first = get_columnar_dataset(survey_csv)
+    columnar_store._get_columnar_dataset.clear()
+    modified = first.path.stat().st_mtime_ns
+
+    second = get_columnar_dataset(survey_csv)
+
+    assert second == first
+    assert second.path.stat().st_mtime_ns == modified
+
+
+def test_box_figure_from_stats(dataset):
+    summary = scan_summary(dataset)
+    fig = build_box_figure_from_stats(summary, "野球")
+
+    assert [trace.name for trace in fig.data] == dataset.age_groups
+    stats = summary.distribution_stats["野球"].loc[dataset.age_groups[0]]
+    assert fig.data[0].median == (stats["中央値"],)
+
+
+def test_warmup_large_dataset(survey_csv, tmp_path, monkeypatch):
+    monkeypatch.setenv("OUT_OF_CORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setenv("OUT_OF_CORE_MIN_BYTES", "1")
+
+    status = run_warmup([survey_csv], export_formats=["csv"])
+
+    assert status.completed == [str(survey_csv)]
+    assert list((tmp_path / "store").glob("*.parquet"))
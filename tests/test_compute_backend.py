@@ -0,0 +1,134 @@
+"""utils/compute_backend.py のテスト
+
+全てのバックエンドに同じテストを実行し、pandas の処理と同じ結果になることを確認する。
+必要なライブラリがインストールされていないバックエンドのテストはスキップする。
+"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import SurveyConfig, generate_survey
+from tests.test_parallel_aggregation import assert_summary_equal
+from utils import compute_backend
+from utils.analysis_summary import compute_analysis_summary
+from utils.compute_backend import BACKENDS, PandasBackend, create_backend, get_compute_backend
+from utils.data_loader import filter_by_age_group, load_csv_data
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request):
+    """各バックエンド（インストールされていなければスキップ）"""
+    try:
+        return create_backend(request.param)
+    except ImportError as e:
+        pytest.skip(f"{request.param} is not installed: {e}")
+
+
+def assert_frame_values_equal(actual, expected):
+    """行・列の値が一致することを確認（型とインデックスの違いは問わない）"""
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True),
+        expected.reset_index(drop=True),
+        check_dtype=False,
+        check_index_type=False,
+    )
+
+
+class TestBackendConformance:
+    """全バックエンド共通のテスト"""
+
+    def test_load_csv(self, backend, survey_csv):
+        assert_frame_values_equal(backend.load_csv(survey_csv), load_csv_data(str(survey_csv)))
+
+    def test_load_csv_from_buffer(self, backend, survey_csv):
+        buffer = io.BytesIO(survey_csv.read_bytes())
+
+        assert_frame_values_equal(backend.load_csv(buffer), load_csv_data(str(survey_csv)))
+
+    @pytest.mark.parametrize("encoding", ["utf-8-sig", "cp932"])
+    @pytest.mark.parametrize("from_buffer", [False, True], ids=["path", "buffer"])
+    def test_load_tab_with_title(self, backend, survey_csv, tmp_path, from_buffer, encoding):
+        """文字コード・区切り文字・タイトル行を検出して読み込む"""
+        expected = load_csv_data(str(survey_csv))
+        path = tmp_path / "titled.csv"
+        path.write_bytes(("調査結果\n" + expected.to_csv(index=False, sep="\t")).encode(encoding))
+        source = io.BytesIO(path.read_bytes()) if from_buffer else path
+
+        assert_frame_values_equal(backend.load_csv(source), expected)
+
+    def test_load_missing_file(self, backend, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            backend.load_csv(tmp_path / "missing.csv")
+
+    @pytest.mark.parametrize("age_group", ["30代", "全年齢", None, "90代"])
+    def test_filter_by_age_group(self, backend, sample_sports_data, age_group):
+        assert_frame_values_equal(
+            backend.filter_by_age_group(sample_sports_data, age_group),
+            filter_by_age_group(sample_sports_data, age_group),
+        )
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            SurveyConfig(rows=2000),
+            SurveyConfig(rows=2000, missing_rate=0.1),
+            SurveyConfig(rows=2000, missing_rate=0.05, invalid_rate=0.05),
+        ],
+        ids=["clean", "missing", "invalid"],
+    )
+    def test_summarize(self, backend, config):
+        df = generate_survey(config)
+
+        assert_summary_equal(backend.summarize(df), compute_analysis_summary(df))
+
+    def test_summarize_sample_data(self, backend, sample_sports_data):
+        assert_summary_equal(
+            backend.summarize(sample_sports_data), compute_analysis_summary(sample_sports_data)
+        )
+
+    def test_summarize_loaded_and_filtered(self, backend, survey_csv):
+        df = backend.filter_by_age_group(backend.load_csv(survey_csv), "40代")
+
+        assert_summary_equal(backend.summarize(df), compute_analysis_summary(df))
+
+
+class TestGetComputeBackend:
+    """get_compute_backend関数のテスト"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        get_compute_backend.clear()
+        yield
+        get_compute_backend.clear()
+
+    def test_default_is_pandas(self, monkeypatch):
+        monkeypatch.delenv("COMPUTE_BACKEND", raising=False)
+
+        assert get_compute_backend().name == "pandas"
+
+    def test_configured_backend(self, monkeypatch):
+        monkeypatch.setenv("COMPUTE_BACKEND", "Arrow")
+
+        assert get_compute_backend().name == "arrow"
+
+    def test_missing_library_falls_back_to_pandas(self, monkeypatch):
+        class MissingBackend(PandasBackend):
+            """ライブラリがインストールされていないバックエンド"""
+
+            name = "missing"
+
+            def __init__(self):
+                raise ImportError("No module named 'missing'")
+
+        monkeypatch.setitem(compute_backend.BACKENDS, "missing", MissingBackend)
+        monkeypatch.setenv("COMPUTE_BACKEND", "missing")
+
+        assert type(get_compute_backend()) is PandasBackend
+
+    def test_unknown_backend(self, monkeypatch):
+        monkeypatch.setenv("COMPUTE_BACKEND", "spark")
+
+        with pytest.raises(ValueError):
+            get_compute_backend()
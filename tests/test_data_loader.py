@@ -1,18 +1,28 @@
 """データローダーのテスト"""
 
+import io
 from pathlib import Path
 
 import pandas as pd
 import pytest
 
 from utils.data_loader import (
+    SNIFF_BYTES,
+    CsvFormat,
+    data_file_type,
+    detect_csv_format,
     filter_by_age_group,
     get_sports_columns,
+    iter_xlsx_chunks,
     load_csv_data,
+    load_data_file,
     load_sample_data,
+    sniff_csv_format,
     validate_sports_survey_data,
 )
 
+SURVEY_TEXT = "回答者ID,年齢層,野球,サッカー,テニス\n1,20代,3,4,5\n2,30代,1,2,3\n"
+
 
 class TestLoadCsvData:
     """CSVデータ読み込みのテスト"""
@@ -43,6 +53,126 @@ class TestLoadCsvData:
         with pytest.raises(pd.errors.EmptyDataError):
             load_csv_data(str(csv_file))
 
+    @pytest.mark.parametrize(
+        ("encoding", "delimiter"),
+        [("utf-8", ","), ("utf-8-sig", ";"), ("cp932", ","), ("cp932", "\t"), ("utf-16", ",")],
+    )
+    def test_load_encodings_and_delimiters(self, tmp_path, encoding, delimiter):
+        """文字コード・区切り文字を判定して読み込む"""
+        csv_file = tmp_path / "survey.csv"
+        csv_file.write_bytes(SURVEY_TEXT.replace(",", delimiter).encode(encoding))
+
+        df = load_csv_data(str(csv_file))
+
+        assert list(df.columns) == ["回答者ID", "年齢層", "野球", "サッカー", "テニス"]
+        assert df["年齢層"].tolist() == ["20代", "30代"]
+
+    def test_load_with_title_rows(self, tmp_path):
+        """ヘッダー行の前のタイトル行を読み飛ばす"""
+        csv_file = tmp_path / "survey.csv"
+        csv_file.write_bytes(("スポーツ関心度調査\n\n" + SURVEY_TEXT).encode("cp932"))
+
+        df = load_csv_data(str(csv_file))
+
+        assert list(df.columns)[:2] == ["回答者ID", "年齢層"]
+        assert len(df) == 2
+
+
+class TestSniffCsvFormat:
+    """CSV形式の判定のテスト"""
+
+    def test_default_format(self):
+        assert sniff_csv_format(SURVEY_TEXT.encode("utf-8"), truncated=False) == CsvFormat()
+
+    def test_bom(self):
+        fmt = sniff_csv_format(SURVEY_TEXT.encode("utf-8-sig"), truncated=False)
+
+        assert fmt.encoding == "utf-8-sig"
+        assert fmt.arrow_encoding == "utf8"
+
+    def test_shift_jis(self):
+        fmt = sniff_csv_format(SURVEY_TEXT.replace(",", ";").encode("shift_jis"), truncated=False)
+
+        assert fmt == CsvFormat(encoding="cp932", delimiter=";")
+
+    def test_truncated_multibyte_character(self):
+        """先頭のバイト列が全角文字の途中で切れていても UTF-8 と判定する"""
+        data = (SURVEY_TEXT * 10).encode("utf-8")
+        cut = data.index("テニス".encode(), 100) + 1
+
+        assert sniff_csv_format(data[:cut]).encoding == "utf-8"
+
+    def test_no_header(self):
+        assert sniff_csv_format(b"1,3,4,5\n2,1,2,3\n", truncated=False).header_row is None
+
+    def test_single_column(self):
+        assert sniff_csv_format(b"value\n1\n2\n", truncated=False) == CsvFormat()
+
+    def test_detect_from_file_object_keeps_position(self):
+        data = SURVEY_TEXT.replace(",", "\t").encode("cp932") * (SNIFF_BYTES // 40)
+        buffer = io.BytesIO(data)
+
+        fmt = detect_csv_format(buffer)
+
+        assert fmt == CsvFormat(encoding="cp932", delimiter="\t")
+        assert buffer.tell() == 0
+
+
+class TestLoadDataFile:
+    """形式ごとのデータファイル読み込みのテスト"""
+
+    @pytest.mark.parametrize("file_type", ["parquet", "feather"])
+    def test_arrow_formats(self, tmp_path, sample_sports_data, file_type):
+        path = tmp_path / f"survey.{file_type}"
+        getattr(sample_sports_data, f"to_{file_type}")(path)
+
+        df = load_data_file(str(path))
+
+        pd.testing.assert_frame_equal(df, sample_sports_data)
+
+    def test_column_projection(self, tmp_path, sample_sports_data):
+        path = tmp_path / "survey.parquet"
+        sample_sports_data.to_parquet(path)
+
+        df = load_data_file(str(path), columns=["年齢層", "野球"])
+
+        assert list(df.columns) == ["年齢層", "野球"]
+
+    def test_index_is_not_loaded(self, tmp_path, sample_sports_data):
+        """pandas が保存した名前の無いインデックスは読み込まない"""
+        path = tmp_path / "survey.parquet"
+        sample_sports_data.set_index(sample_sports_data.index + 100).to_parquet(path)
+
+        df = load_data_file(str(path))
+
+        assert list(df.columns) == list(sample_sports_data.columns)
+
+    def test_xlsx_with_title_rows(self, tmp_path, sample_sports_data):
+        path = tmp_path / "survey.xlsx"
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            sample_sports_data.to_excel(writer, index=False, startrow=2)
+            writer.sheets["Sheet1"]["A1"] = "スポーツ関心度調査"
+
+        df = load_data_file(str(path))
+
+        pd.testing.assert_frame_equal(df, sample_sports_data)
+
+    def test_xlsx_chunks(self, tmp_path, sample_sports_data):
+        path = tmp_path / "survey.xlsx"
+        sample_sports_data.to_excel(path, index=False)
+
+        chunks = list(iter_xlsx_chunks(path, chunk_rows=8))
+
+        assert [len(chunk) for chunk in chunks] == [8, 8, 4]
+        assert chunks[0].attrs["header_row"] == 0
+
+    def test_unsupported_type(self, tmp_path):
+        with pytest.raises(ValueError, match="対応していないファイル形式"):
+            load_data_file(str(tmp_path / "survey.json"))
+
+    def test_text_files_are_read_as_csv(self):
+        assert data_file_type("survey.TSV") == data_file_type("survey.txt") == "csv"
+
 
 class TestLoadSampleData:
     """サンプルデータ読み込みのテスト"""
@@ -1,12 +1,19 @@
 """データエクスポート機能のテストモジュール"""
 
 import json
+import zipfile
+from io import BytesIO
 
 import pandas as pd
 import pytest
 from openpyxl import load_workbook
 
+from utils.analysis_summary import compute_analysis_summary
 from utils.export import (
+    build_report_tables,
+    encode_dataframe,
+    export_analysis_report_bundle,
+    export_analysis_report_excel,
     export_to_csv,
     export_to_excel,
     export_to_json,
@@ -164,3 +171,53 @@ class TestGetMimeType:
     def test_get_mime_type_unknown(self):
         """未知の形式のデフォルト MIME タイプを確認"""
         assert get_mime_type("unknown") == "application/octet-stream"
+
+
+class TestEncodeDataframe:
+    """画面用エクスポート変換のテスト"""
+
+    def test_matches_cached_exports(self, sample_dataframe):
+        """キャッシュ付き変換関数と同じ結果になることを確認"""
+        assert encode_dataframe(sample_dataframe, "csv") == export_to_csv(sample_dataframe)
+        assert encode_dataframe(sample_dataframe, "json") == export_to_json(sample_dataframe)
+
+    def test_unsupported_format(self, sample_dataframe):
+        """未対応の形式でValueErrorが発生することを確認"""
+        with pytest.raises(ValueError):
+            encode_dataframe(sample_dataframe, "xml")
+
+
+class TestAnalysisReportExport:
+    """分析レポートエクスポートのテスト"""
+
+    def test_excel_report_sheets(self, sample_dataframe, tmp_path):
+        """Excelレポートに全集計表のシートが含まれることを確認"""
+        summary = compute_analysis_summary(sample_dataframe)
+        temp_file = tmp_path / "report.xlsx"
+        temp_file.write_bytes(export_analysis_report_excel(summary))
+
+        workbook = load_workbook(temp_file)
+        assert workbook.sheetnames == list(build_report_tables(summary))
+
+    def test_bundle_contains_parquet_tables(self, sample_dataframe):
+        """ZIPバンドルに各集計表のParquetが含まれることを確認"""
+        summary = compute_analysis_summary(sample_dataframe)
+        with zipfile.ZipFile(BytesIO(export_analysis_report_bundle(summary))) as bundle:
+            names = bundle.namelist()
+            means = pd.read_parquet(BytesIO(bundle.read("種目別平均.parquet")))
+
+        assert names == [f"{name}.parquet" for name in build_report_tables(summary)]
+        assert list(means.columns) == ["スポーツ種目", "平均関心度"]
+        assert len(means) == 3
+
+    def test_reports_are_cached_by_fingerprint(self, sample_dataframe):
+        """フィンガープリント指定時は再実行のたびにレポートを作り直さないことを確認"""
+        summary = compute_analysis_summary(sample_dataframe)
+        for exporter in (export_analysis_report_excel, export_analysis_report_bundle):
+            first = exporter(summary, "report-fingerprint")
+            assert exporter(summary, "report-fingerprint") is first
+
+    def test_zip_filename_and_mime(self):
+        """ZIP形式のファイル名とMIMEタイプを確認"""
+        assert generate_filename("report", "zip").endswith(".zip")
+        assert get_mime_type("zip") == "application/zip"
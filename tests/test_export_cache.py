@@ -0,0 +1,139 @@
+"""エクスポートキャッシュのテスト"""
+
+import threading
+
+import pandas as pd
+
+from utils.export import export_to_csv
+from utils.export_cache import ExportCache
+from utils.fingerprint import compute_dataset_fingerprint
+
+
+class TestExportCache:
+    """ExportCacheのテスト"""
+
+    def test_hit_and_miss(self):
+        """格納したデータがヒットし、統計に反映されることを確認"""
+        cache = ExportCache()
+        key = cache.make_key("fp", "csv")
+        assert cache.get(key) is None
+        cache.put(key, b"data")
+        assert cache.get(key) == b"data"
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+        assert stats.hit_rate == 0.5
+
+    def test_key_depends_on_params(self):
+        """変換パラメータが異なるとキーが異なることを確認"""
+        cache = ExportCache()
+        assert cache.make_key("fp", "json", orient="records") != cache.make_key(
+            "fp", "json", orient="index"
+        )
+        assert cache.make_key("fp", "csv") != cache.make_key("fp", "json")
+
+    def test_byte_bounded_eviction(self):
+        """合計サイズが上限を超えると古いものから追い出されることを確認"""
+        cache = ExportCache(max_memory_bytes=10)
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.get("a")  # aを最近使用に更新
+        cache.put("c", b"12345")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"12345"
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert stats.memory_bytes == 10
+
+    def test_disk_tier(self, tmp_path):
+        """追い出されたデータがディスク層から取得できることを確認"""
+        cache = ExportCache(max_memory_bytes=10, disk_dir=tmp_path)
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.put("c", b"12345")
+
+        assert cache.get("a") == b"12345"
+        stats = cache.stats()
+        assert stats.disk_hits == 1
+        # aはメモリに戻り、代わりにbがディスクに退避される
+        assert stats.disk_bytes == 10
+
+    def test_disk_tier_bounded(self, tmp_path):
+        """ディスク層も合計サイズの上限を守ることを確認"""
+        cache = ExportCache(max_memory_bytes=5, disk_dir=tmp_path, max_disk_bytes=10)
+        for key in "abcd":
+            cache.put(key, b"12345")
+
+        assert cache.stats().disk_bytes == 10
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_clear(self, tmp_path):
+        """全エントリが削除されることを確認"""
+        cache = ExportCache(max_memory_bytes=5, disk_dir=tmp_path)
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.clear()
+
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_memory_entries_and_evict(self, tmp_path):
+        """メモリ上のエントリを列挙でき、指定したエントリをディスクからも削除できることを確認"""
+        cache = ExportCache(max_memory_bytes=5, disk_dir=tmp_path)
+        cache.put("a", b"12345")
+        cache.put("b", b"123")  # aはディスクに退避される
+
+        assert cache.memory_entries() == [("b", 3)]
+        assert cache.evict("a")
+        assert cache.evict("b")
+        assert not cache.evict("b")
+
+        stats = cache.stats()
+        assert (stats.memory_bytes, stats.disk_bytes) == (0, 0)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_disk_tier_is_reindexed(self, tmp_path):
+        """以前のプロセスが退避したファイルが再登録され、上限に数えられることを確認"""
+        first = ExportCache(max_memory_bytes=5, disk_dir=tmp_path)
+        for key in "abc":
+            first.put(key, b"12345")
+        (tmp_path / "d.bin.tmp.1").write_bytes(b"partial")
+
+        cache = ExportCache(max_memory_bytes=5, disk_dir=tmp_path, max_disk_bytes=5)
+
+        assert cache.stats().disk_bytes == 5
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["b.bin"]
+        assert cache.get("b") == b"12345"
+
+    def test_concurrent_spill_is_counted_once(self, tmp_path):
+        """同じキーを並行して退避してもディスク上のサイズを1回だけ数えることを確認"""
+        cache = ExportCache(max_memory_bytes=0, disk_dir=tmp_path)
+        threads = [threading.Thread(target=cache.put, args=("a", b"12345")) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.stats().disk_bytes == 5
+        assert [path.name for path in tmp_path.iterdir()] == ["a.bin"]
+
+
+def test_export_with_fingerprint_skips_hashing(sample_sports_data):
+    """フィンガープリント指定時はデータ量に関係なくキャッシュから返ることを確認"""
+    large = pd.concat([sample_sports_data] * 1000, ignore_index=True)
+    first = export_to_csv(large, fingerprint="large-dataset")
+    # 同じフィンガープリントなら内容を再変換・再ハッシュせずに同じ結果を返す
+    assert export_to_csv(large.iloc[:0], fingerprint="large-dataset") is first
+
+
+def test_export_without_fingerprint_is_cached_by_content(sample_sports_data):
+    """フィンガープリント省略時はデータから計算したフィンガープリントでキャッシュすることを確認"""
+    fingerprint = compute_dataset_fingerprint(sample_sports_data)
+    first = export_to_csv(sample_sports_data)
+
+    assert export_to_csv(sample_sports_data.copy()) is first
+    assert export_to_csv(sample_sports_data, fingerprint=fingerprint) is first
+    changed = sample_sports_data.assign(野球=sample_sports_data["野球"].iloc[::-1].to_numpy())
+    assert export_to_csv(changed) != first
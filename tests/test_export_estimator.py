@@ -0,0 +1,73 @@
+"""エクスポート見積もりのテスト"""
+
+import pandas as pd
+import pytest
+
+from utils.export import encode_dataframe
+from utils.export_estimator import (
+    estimate_export,
+    format_bytes,
+    stratified_sample,
+)
+
+
+@pytest.fixture
+def large_sports_data(sample_sports_data):
+    """見積もり用に行数を増やしたデータ"""
+    return pd.concat([sample_sports_data] * 100, ignore_index=True)
+
+
+class TestStratifiedSample:
+    """層化サンプリングのテスト"""
+
+    def test_small_data_returned_as_is(self, sample_sports_data):
+        """行数がサンプル数以下ならそのまま返すことを確認"""
+        assert stratified_sample(sample_sports_data, 100) is sample_sports_data
+
+    def test_one_row_per_stratum(self, large_sports_data):
+        """各区間から1行ずつ抽出されることを確認"""
+        sample = stratified_sample(large_sports_data, 50)
+        assert len(sample) == 50
+        strata = sample.index.to_numpy() // (len(large_sports_data) // 50)
+        assert list(strata) == list(range(50))
+
+    def test_seeded(self, large_sports_data):
+        """同じシードで同じサンプルになることを確認"""
+        first = stratified_sample(large_sports_data, 50, seed=1)
+        second = stratified_sample(large_sports_data, 50, seed=1)
+        pd.testing.assert_frame_equal(first, second)
+
+
+class TestEstimateExport:
+    """出力サイズ見積もりのテスト"""
+
+    def test_all_formats_estimated(self, sample_sports_data):
+        """全形式の見積もりが返ることを確認"""
+        estimates = estimate_export(sample_sports_data)
+        assert set(estimates) == {"csv", "excel", "json"}
+        assert all(estimate.seconds >= 0 for estimate in estimates.values())
+
+    def test_exact_when_sample_covers_data(self, sample_sports_data):
+        """サンプルが全行を含む場合は実サイズと一致することを確認"""
+        estimates = estimate_export(sample_sports_data)
+        for file_format in ("csv", "json"):
+            actual = len(encode_dataframe(sample_sports_data, file_format))
+            assert estimates[file_format].size_bytes == actual
+
+    @pytest.mark.parametrize("file_format", ["csv", "json"])
+    def test_extrapolation_close_to_actual(self, large_sports_data, file_format):
+        """サンプルからの外挿が実サイズに近いことを確認"""
+        estimate = estimate_export(large_sports_data, sample_rows=200)[file_format]
+        actual = len(encode_dataframe(large_sports_data, file_format))
+        assert abs(estimate.size_bytes - actual) / actual < 0.1
+
+
+class TestFormatBytes:
+    """バイト数表示のテスト"""
+
+    def test_units(self):
+        """単位が切り替わることを確認"""
+        assert format_bytes(512) == "512B"
+        assert format_bytes(1536) == "1.5KB"
+        assert format_bytes(5 * 1024 * 1024) == "5.0MB"
+        assert format_bytes(3 * 1024**3) == "3.0GB"
@@ -0,0 +1,104 @@
+"""エクスポートジョブ管理のテスト"""
+
+import json
+import time
+
+import pandas as pd
+import pytest
+
+from utils.export import export_to_csv, export_to_json
+from utils.export_cache import ExportCache
+from utils.export_jobs import ExportJobManager, write_export_artifact
+from utils.scheduler import JobScheduler
+
+
+def _wait(job, timeout: float = 10.0):
+    """ジョブの完了を待機"""
+    deadline = time.time() + timeout
+    while not job.is_finished and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.is_finished
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """テスト用のExportJobManager"""
+    return ExportJobManager(
+        artifact_dir=tmp_path,
+        scheduler=JobScheduler(max_slots=2),
+        cache=ExportCache(),
+        chunk_rows=3,
+    )
+
+
+class TestWriteExportArtifact:
+    """チャンク書き出しのテスト"""
+
+    def test_csv_matches_export_to_csv(self, sample_sports_data, tmp_path):
+        """チャンク書き出しのCSVが一括変換と一致することを確認"""
+        path = tmp_path / "out.csv"
+        write_export_artifact(sample_sports_data, "csv", path, chunk_rows=3)
+        assert path.read_bytes() == export_to_csv(sample_sports_data)
+
+    def test_json_matches_export_to_json(self, sample_sports_data, tmp_path):
+        """チャンク書き出しのJSONが一括変換と一致することを確認"""
+        path = tmp_path / "out.json"
+        write_export_artifact(sample_sports_data, "json", path, chunk_rows=3)
+        assert path.read_bytes() == export_to_json(sample_sports_data)
+        assert len(json.loads(path.read_text(encoding="utf-8"))) == 20
+
+    def test_excel_preserves_data(self, sample_sports_data, tmp_path):
+        """チャンク書き出しのExcelがデータを保持することを確認"""
+        path = tmp_path / "out.xlsx"
+        write_export_artifact(sample_sports_data, "excel", path, chunk_rows=3)
+        pd.testing.assert_frame_equal(pd.read_excel(path), sample_sports_data)
+
+    def test_progress_reported(self, sample_sports_data, tmp_path):
+        """進捗が単調増加して1.0で終わることを確認"""
+        progress = []
+        write_export_artifact(
+            sample_sports_data, "csv", tmp_path / "out.csv", progress.append, chunk_rows=3
+        )
+        assert progress == sorted(progress)
+        assert progress[-1] == 1.0
+
+    def test_unsupported_format(self, sample_sports_data, tmp_path):
+        """未対応の形式でValueErrorが発生することを確認"""
+        with pytest.raises(ValueError):
+            write_export_artifact(sample_sports_data, "xml", tmp_path / "out.xml")
+
+
+class TestExportJobManager:
+    """ExportJobManagerのテスト"""
+
+    def test_job_completes(self, manager, sample_sports_data):
+        """ジョブが完了して成果物が読めることを確認"""
+        job = manager.submit("fp", "csv", sample_sports_data)
+        _wait(job)
+        assert job.status == "done"
+        assert manager.read_artifact(job) == export_to_csv(sample_sports_data)
+
+    def test_repeat_request_attaches_to_existing_job(self, manager, sample_sports_data):
+        """同じキーの再要求は既存ジョブを返すことを確認"""
+        first = manager.submit("fp", "json", sample_sports_data)
+        second = manager.submit("fp", "json", sample_sports_data)
+        assert first is second
+        assert manager.get("fp", "json") is first
+
+    def test_failed_job_is_resubmitted(self, manager, sample_sports_data):
+        """失敗したジョブは再要求で作り直されることを確認"""
+        job = manager.submit("fp", "csv", sample_sports_data)
+        _wait(job)
+        job.status = "failed"
+        retry = manager.submit("fp", "csv", sample_sports_data)
+        assert retry is not job
+
+    def test_expired_artifacts_evicted(self, manager, sample_sports_data):
+        """TTLを過ぎた成果物が削除されることを確認"""
+        job = manager.submit("fp", "csv", sample_sports_data)
+        _wait(job)
+        manager.ttl_seconds = 0
+        job.finished_at -= 1
+        assert manager.evict_expired() == 1
+        assert not job.path.exists()
+        assert manager.get("fp", "csv") is None
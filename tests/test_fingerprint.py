@@ -0,0 +1,46 @@
+"""フィンガープリント計算のテスト"""
+
+from utils.fingerprint import compute_dataset_fingerprint, derive_fingerprint
+
+
+class TestComputeDatasetFingerprint:
+    """データセットフィンガープリントのテスト"""
+
+    def test_same_data_same_fingerprint(self, sample_sports_data):
+        """同じ内容のデータは同じフィンガープリントになることを確認"""
+        assert compute_dataset_fingerprint(sample_sports_data) == compute_dataset_fingerprint(
+            sample_sports_data.copy()
+        )
+
+    def test_changed_value_changes_fingerprint(self, sample_sports_data):
+        """値が変わるとフィンガープリントが変わることを確認"""
+        modified = sample_sports_data.copy()
+        modified.loc[0, "サッカー"] = 1
+        assert compute_dataset_fingerprint(sample_sports_data) != compute_dataset_fingerprint(
+            modified
+        )
+
+    def test_changed_dtype_changes_fingerprint(self, sample_sports_data):
+        """データ型が変わるとフィンガープリントが変わることを確認"""
+        modified = sample_sports_data.astype({"サッカー": "float64"})
+        assert compute_dataset_fingerprint(sample_sports_data) != compute_dataset_fingerprint(
+            modified
+        )
+
+    def test_empty_dataframe(self, empty_dataframe):
+        """空のDataFrameでも計算できることを確認"""
+        assert len(compute_dataset_fingerprint(empty_dataframe)) == 16
+
+
+class TestDeriveFingerprint:
+    """派生フィンガープリントのテスト"""
+
+    def test_params_order_independent(self):
+        """パラメータの指定順序に依存しないことを確認"""
+        assert derive_fingerprint("abc", a=1, b=2) == derive_fingerprint("abc", b=2, a=1)
+
+    def test_different_params(self):
+        """パラメータが異なると結果が異なることを確認"""
+        assert derive_fingerprint("abc", age_group="20代") != derive_fingerprint(
+            "abc", age_group="30代"
+        )
@@ -0,0 +1,171 @@
+"""utils/incremental_summary.py のテスト"""
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+from benchmarks.synthetic_data import SurveyConfig, generate_survey
+from tests.test_parallel_aggregation import assert_summary_equal
+from tests.test_upload_validation import _issues
+from utils.analysis_summary import compute_analysis_summary
+from utils.data_loader import SOURCE_FILE_COLUMN, filter_by_age_group
+from utils.fingerprint import compute_dataset_fingerprint
+from utils.history_manager import HistoryManager, optimize_dataframe_memory
+from utils.incremental_summary import (
+    append_rows,
+    build_running_summary,
+    check_append_schema,
+    update_running_summary,
+)
+from utils.memory_attribution import frame_nbytes
+from utils.upload_validation import DUPLICATE_ID, UploadRejected, build_id_index
+
+
+def _uploaded(config):
+    """アップロードしたCSVと同じ型（年齢層は文字列、関心度はメモリ最適化済み）の合成データ"""
+    df = generate_survey(config).astype({"年齢層": "str"})
+    return optimize_dataframe_memory(df)
+
+
+@pytest.fixture
+def survey():
+    """欠損値を含む合成データ"""
+    return _uploaded(SurveyConfig(rows=3000, missing_rate=0.1))
+
+
+def _split(df, *bounds):
+    """行を bounds の位置で分割"""
+    edges = [0, *bounds, len(df)]
+    return [
+        df.iloc[start:stop].reset_index(drop=True)
+        for start, stop in zip(edges, edges[1:], strict=False)
+    ]
+
+
+def _assert_matches(running, df):
+    """全データ・年齢層ごとの集計結果が compute_analysis_summary と一致することを確認"""
+    assert_summary_equal(running.summary(df), compute_analysis_summary(df))
+    for age in df["年齢層"].dropna().unique():
+        filtered = filter_by_age_group(df, age)
+        assert_summary_equal(running.summary(filtered, age), compute_analysis_summary(filtered))
+
+
+class TestRunningSummary:
+    """累積部分統計量のテスト"""
+
+    def test_build_matches_compute_analysis_summary(self, survey):
+        _assert_matches(build_running_summary(survey), survey)
+
+    def test_updates_match_whole_dataset(self, survey):
+        first, second, third = _split(survey, 2000, 2600)
+
+        running = build_running_summary(first)
+        running = update_running_summary(running, second)
+        running = update_running_summary(running, third)
+
+        _assert_matches(running, survey)
+
+    def test_new_age_group_in_batch(self, survey):
+        base = survey[survey["年齢層"] != "20代"].reset_index(drop=True)
+        batch = survey[survey["年齢層"] == "20代"].reset_index(drop=True)
+
+        running = update_running_summary(build_running_summary(base), batch)
+
+        assert "20代" in running.groups
+        assert list(running.groups) == sorted(running.groups)
+        _assert_matches(running, pd.concat([base, batch], ignore_index=True))
+
+    def test_irregular_values_fall_back_to_pandas_quantiles(self):
+        df = _uploaded(SurveyConfig(rows=1000, invalid_rate=0.05))
+        first, second = _split(df, 600)
+
+        running = update_running_summary(build_running_summary(first), second)
+
+        assert running.total.irregular > 0
+        _assert_matches(running, df)
+
+
+class TestAppend:
+    """行の追加のテスト"""
+
+    def test_schema_mismatch(self, survey):
+        with pytest.raises(ValueError, match="不足"):
+            check_append_schema(survey, survey.drop(columns="野球"))
+        with pytest.raises(ValueError, match="野球"):
+            check_append_schema(survey, survey.assign(野球="高い"))
+
+    def test_column_order_and_dtypes_are_kept(self, survey):
+        first, second = _split(survey, 2000)
+        batch = second[second.columns[::-1]]
+
+        check_append_schema(first, batch)
+        merged = append_rows(first, batch, "batch.csv")
+
+        assert list(merged.columns) == list(survey.columns)
+        assert merged.dtypes.equals(first.dtypes)
+        pd.testing.assert_frame_equal(merged, survey)
+
+    def test_source_file_column(self, survey):
+        first, second = _split(survey, 2000)
+        first = first.assign(**{SOURCE_FILE_COLUMN: pd.Categorical(["wave1.csv"] * len(first))})
+
+        merged = append_rows(first, second, "wave2.csv")
+
+        assert list(merged[SOURCE_FILE_COLUMN].cat.categories) == ["wave1.csv", "wave2.csv"]
+        assert (merged[SOURCE_FILE_COLUMN].iloc[2000:] == "wave2.csv").all()
+
+
+class TestHistoryAppend:
+    """HistoryManager.append_to_entry のテスト"""
+
+    @pytest.fixture
+    def history(self):
+        st.session_state.clear()
+        yield HistoryManager()
+        st.session_state.clear()
+
+    def test_append_updates_entry(self, history, survey):
+        first, second = _split(survey, 2000)
+        data_id = history.add_history("base.csv", first, "10KB")
+        base_fingerprint = history.get_current_entry()["fingerprint"]
+        assert history.get_current_entry()["memory_bytes"] == frame_nbytes(first)
+
+        history.append_to_entry(data_id, "new.csv", second, "5KB")
+
+        entry = history.get_current_entry()
+        assert entry["id"] == data_id
+        assert entry["row_count"] == 3000
+        assert entry["filename"] == "base.csv + new.csv"
+        # フィンガープリントは既存の行を再ハッシュせずに更新される
+        assert entry["fingerprint"] not in (base_fingerprint, compute_dataset_fingerprint(survey))
+        pd.testing.assert_frame_equal(entry["data"], survey)
+        _assert_matches(entry["running_summary"], survey)
+        assert entry["id_index"] == build_id_index(survey["回答者ID"])
+        assert entry["memory_bytes"] == frame_nbytes(first) + frame_nbytes(second)
+
+    def test_append_existing_ids_is_rejected(self, history, survey):
+        first, second = _split(survey, 2000)
+        data_id = history.add_history("base.csv", first, "10KB")
+        # 累積のファイル（既存の回答を含む）を追加しようとした場合
+        cumulative = pd.concat([first.iloc[-3:], second], ignore_index=True)
+
+        with pytest.raises(UploadRejected, match="2行目=1998") as exc_info:
+            history.append_to_entry(data_id, "cumulative.csv", cumulative, "5KB")
+
+        assert _issues(exc_info.value.report) == {(DUPLICATE_ID, "回答者ID"): 3}
+        assert history.get_current_entry()["row_count"] == 2000
+
+    def test_appending_the_same_batch_twice_is_rejected(self, history, survey):
+        first, second = _split(survey, 2000)
+        data_id = history.add_history("base.csv", first, "10KB")
+        history.append_to_entry(data_id, "new.csv", second, "5KB")
+
+        # 索引は追加した行の回答者IDも含むように更新されている
+        with pytest.raises(UploadRejected):
+            history.append_to_entry(data_id, "new.csv", second, "5KB")
+
+        assert history.get_current_entry()["row_count"] == 3000
+
+    def test_append_to_missing_entry(self, history, survey):
+        with pytest.raises(KeyError):
+            history.append_to_entry("missing", "new.csv", survey, "5KB")
@@ -0,0 +1,27 @@
+"""負荷試験ツールのテスト"""
+
+import io
+
+import pandas as pd
+
+from benchmarks.load_test import make_survey_csv, run_load_test
+
+
+def test_make_survey_csv_is_valid_survey():
+    """合成CSVが調査データの形式を満たすことを確認"""
+    from utils.data_loader import validate_sports_survey_data
+
+    df = pd.read_csv(io.BytesIO(make_survey_csv(100)))
+    assert len(df) == 100
+    assert validate_sports_survey_data(df)
+    assert df.drop(columns=["回答者ID", "年齢層"]).isin(range(1, 6)).all().all()
+
+
+def test_concurrent_sessions_complete_without_errors():
+    """複数セッションの同時実行がエラーなく完了することを確認"""
+    report = run_load_test(sessions=2, rows=200, iterations=1, timeout=60)
+    assert report.errors == 0
+    # 初回表示 + アップロード + (フィルター・選択・エクスポート) × 1回
+    assert report.reruns == 2 * 5
+    assert report.p50 <= report.p95 <= report.p99
+    assert report.session_history_mb > 0
@@ -0,0 +1,141 @@
+"""utils/memory_attribution.py のテスト"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from utils import memory_attribution
+from utils.memory_attribution import (
+    MEMORY_ADMIN_ENV,
+    AllocationTracker,
+    MemoryHolder,
+    SessionHandle,
+    collect_memory_report,
+    evict_holder,
+    frame_nbytes,
+    is_memory_admin_enabled,
+    register_memory_provider,
+    write_memory_report,
+)
+
+
+@pytest.fixture
+def session_handle(monkeypatch, sample_sports_data):
+    """履歴を2件持つセッションを登録する"""
+    handle = SessionHandle("session-a")
+    handle.history = [
+        {
+            "id": "small",
+            "filename": "small.csv",
+            "row_count": 2,
+            "data": sample_sports_data.head(2),
+        },
+        {"id": "large", "filename": "large.csv", "row_count": 10, "data": sample_sports_data},
+    ]
+    monkeypatch.setitem(memory_attribution._sessions, "session-a", handle)
+    return handle
+
+
+def test_frame_nbytes_counts_string_contents():
+    short = pd.DataFrame({"s": ["a"] * 100}, dtype=object)
+    long = pd.DataFrame({"s": ["a" * 1000] * 100}, dtype=object)
+    assert frame_nbytes(long) > frame_nbytes(short) + 90_000
+
+
+class TestCollectMemoryReport:
+    """collect_memory_report関数のテスト"""
+
+    def test_history_holders_sorted_by_size(self, session_handle):
+        report = collect_memory_report(include_allocations=False)
+        history = [h for h in report.holders if h.session_id == "session-a"]
+
+        assert [h.key for h in history] == ["large", "small"]
+        assert history[0].kind == "history"
+        assert history[0].nbytes == frame_nbytes(session_handle.history[1]["data"])
+        assert report.totals_by_session()["session-a"] == sum(h.nbytes for h in history)
+
+    def test_custom_provider(self, monkeypatch):
+        monkeypatch.setattr(memory_attribution, "_providers", {})
+        register_memory_provider(
+            "figures",
+            lambda: [MemoryHolder("figures", "s", "fig1", "棒グラフ", 100)],
+            lambda holder: True,
+        )
+
+        report = collect_memory_report(include_allocations=False)
+
+        assert report.totals_by_kind() == {"figures": 100}
+
+    def test_failing_provider_is_skipped(self, monkeypatch):
+        monkeypatch.setattr(memory_attribution, "_providers", {})
+        register_memory_provider("broken", lambda: 1 / 0, lambda holder: False)
+
+        assert collect_memory_report(include_allocations=False).holders == []
+
+
+class TestEvictHolder:
+    """evict_holder関数のテスト"""
+
+    def test_evict_history_entry_is_deferred(self, session_handle):
+        holder = MemoryHolder("history", "session-a", "large", "large.csv", 0)
+
+        assert evict_holder(holder)
+        # 他のセッションの履歴リストは変更せず、要求として記録する
+        assert [entry["id"] for entry in session_handle.history] == ["small", "large"]
+        assert not evict_holder(holder)
+        report = collect_memory_report(include_allocations=False)
+        assert [h.key for h in report.holders if h.session_id == "session-a"] == ["small"]
+
+        assert session_handle.take_pending_evictions() == {"large"}
+        assert session_handle.take_pending_evictions() == set()
+
+    def test_evict_missing_history_entry(self, session_handle):
+        assert not evict_holder(MemoryHolder("history", "session-a", "gone", "gone.csv", 0))
+
+    def test_unknown_session(self):
+        assert not evict_holder(MemoryHolder("history", "missing", "x", "x", 0))
+
+    def test_unknown_kind(self):
+        assert not evict_holder(MemoryHolder("unknown", "s", "x", "x", 0))
+
+    def test_session_handle_is_weak(self):
+        memory_attribution._sessions["temporary"] = SessionHandle("temporary")
+        # 参照が無くなったハンドルは一覧から消える
+        assert "temporary" not in memory_attribution._sessions
+
+
+def test_memory_admin_requires_env(monkeypatch):
+    monkeypatch.delenv(MEMORY_ADMIN_ENV, raising=False)
+    assert not is_memory_admin_enabled()
+    monkeypatch.setenv(MEMORY_ADMIN_ENV, "1")
+    assert is_memory_admin_enabled()
+
+
+class TestAllocationTracker:
+    """AllocationTrackerのテスト"""
+
+    def test_diff_reports_growth(self):
+        tracker = AllocationTracker()
+        assert tracker.diff() == []
+
+        tracker.start()
+        try:
+            tracker.diff()
+            held = [bytearray(1024) for _ in range(1000)]
+            diffs = tracker.diff()
+        finally:
+            tracker.stop()
+
+        assert held
+        assert sum(d.size_diff for d in diffs) >= 1000 * 1024
+        assert diffs[0].location.rsplit(":", 1)[1].isdigit()
+
+
+def test_write_memory_report(tmp_path, session_handle):
+    path = tmp_path / "memory.jsonl"
+    write_memory_report(collect_memory_report(include_allocations=False), path)
+
+    record = json.loads(path.read_text(encoding="utf-8"))
+    assert record["totals_by_kind"]["history"] > 0
+    assert {"kind", "session_id", "key", "label", "nbytes"} <= set(record["holders"][0])
@@ -0,0 +1,184 @@
+"""utils/metrics.py のテスト"""
+
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+import streamlit as st
+
+from utils import metrics
+from utils.export_cache import ExportCacheStats, record_cache_metrics
+from utils.metrics import (
+    CACHE_REQUESTS,
+    CONTENT_TYPE,
+    METRICS_FILE_ENV,
+    METRICS_PORT_ENV,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    SessionTracker,
+    observe_rerun,
+    start_http_server,
+    write_metrics_file,
+)
+
+
+class TestMetricTypes:
+    """カウンター・ゲージ・ヒストグラムのテスト"""
+
+    def test_counter_render(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("rows_total", "Rows.", ["source"])
+        counter.inc(10, source="upload")
+        counter.inc(5, source="upload")
+        counter.inc(source="sample")
+
+        text = registry.render()
+
+        assert "# TYPE rows_total counter" in text
+        assert 'rows_total{source="upload"} 15' in text
+        assert 'rows_total{source="sample"} 1' in text
+        assert text.endswith("\n")
+
+    def test_counter_rejects_negative(self):
+        with pytest.raises(ValueError):
+            Counter("c", "C.").inc(-1)
+
+    def test_labels_must_match(self):
+        counter = Counter("c", "C.", ["format"])
+        with pytest.raises(ValueError):
+            counter.inc(1, fmt="csv")
+
+    def test_gauge_without_labels(self):
+        registry = MetricsRegistry()
+        registry.gauge("sessions", "Sessions.").set(3)
+
+        assert "sessions 3" in registry.render().splitlines()
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("latency", "Latency.", ["page"], buckets=[0.1, 1.0])
+        for value in [0.05, 0.5, 0.5, 5.0]:
+            histogram.observe(value, page="analysis")
+
+        lines = histogram.render().splitlines()
+
+        assert 'latency_bucket{page="analysis",le="0.1"} 1' in lines
+        assert 'latency_bucket{page="analysis",le="1"} 3' in lines
+        assert 'latency_bucket{page="analysis",le="+Inf"} 4' in lines
+        assert 'latency_sum{page="analysis"} 6.05' in lines
+        assert 'latency_count{page="analysis"} 4' in lines
+        assert histogram.count(page="analysis") == 4
+
+    def test_label_values_are_escaped(self):
+        counter = Counter("c", "C.", ["name"])
+        counter.inc(name='a"b\\c')
+
+        assert 'c{name="a\\"b\\\\c"} 1' in counter.render()
+
+
+class TestMetricsRegistry:
+    """MetricsRegistryのテスト"""
+
+    def test_register_returns_existing(self):
+        registry = MetricsRegistry()
+        first = registry.counter("c", "C.")
+        assert registry.counter("c", "C.") is first
+
+    def test_collector_runs_before_render(self):
+        registry = MetricsRegistry()
+        gauge = registry.gauge("value", "Value.")
+        registry.set_collector("value", lambda: gauge.set(42))
+        # 同名で登録し直すと置き換わる
+        registry.set_collector("value", lambda: gauge.set(7))
+
+        assert "value 7" in registry.render().splitlines()
+
+    def test_failing_collector_does_not_break_render(self):
+        registry = MetricsRegistry()
+        registry.gauge("value", "Value.").set(1)
+        registry.set_collector("broken", lambda: 1 / 0)
+
+        assert "value 1" in registry.render().splitlines()
+
+
+class TestSessionTracker:
+    """SessionTrackerのテスト"""
+
+    def test_snapshot_sums_history(self):
+        tracker = SessionTracker()
+        tracker.touch("a", 100)
+        tracker.touch("b", 50)
+        tracker.touch("a", 200)
+
+        assert tracker.snapshot() == (2, 250)
+
+    def test_idle_sessions_are_dropped(self):
+        tracker = SessionTracker(idle_timeout=-1)
+        tracker.touch("a", 100)
+
+        assert tracker.snapshot() == (0, 0)
+
+
+class TestObserveRerun:
+    """observe_rerun関数のテスト"""
+
+    @pytest.fixture
+    def tracker(self, monkeypatch):
+        monkeypatch.delenv(METRICS_PORT_ENV, raising=False)
+        monkeypatch.delenv(METRICS_FILE_ENV, raising=False)
+        monkeypatch.setattr(metrics, "get_script_run_ctx", lambda: SimpleNamespace(session_id="a"))
+        tracker = SessionTracker()
+        monkeypatch.setattr(metrics, "SESSIONS", tracker)
+        st.session_state.upload_history = [{"memory_bytes": 100}, {"memory_bytes": 50}]
+        yield tracker
+        st.session_state.clear()
+
+    def test_sums_stored_history_bytes(self, tracker, monkeypatch, tmp_path):
+        monkeypatch.setenv(METRICS_FILE_ENV, str(tmp_path / "metrics.prom"))
+
+        observe_rerun("analysis", 0.1)
+
+        assert tracker.snapshot() == (1, 150)
+
+    def test_sessions_are_not_tracked_without_exporter(self, tracker):
+        observe_rerun("analysis", 0.1)
+
+        assert tracker.snapshot() == (0, 0)
+
+
+class TestExporters:
+    """HTTPサーバー・ファイル書き出しのテスト"""
+
+    def test_http_server(self):
+        registry = MetricsRegistry()
+        registry.counter("hits_total", "Hits.").inc(3)
+        server = start_http_server(0, registry=registry)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert "hits_total 3" in body.splitlines()
+        assert content_type == CONTENT_TYPE
+
+    def test_write_metrics_file(self, tmp_path):
+        registry = MetricsRegistry()
+        registry.gauge("value", "Value.").set(1)
+        path = tmp_path / "app.prom"
+
+        write_metrics_file(path, registry)
+
+        assert "value 1" in path.read_text().splitlines()
+        assert list(tmp_path.iterdir()) == [path]
+
+
+def test_record_cache_metrics():
+    record_cache_metrics("test", ExportCacheStats(hits=3, disk_hits=1, misses=2))
+
+    assert CACHE_REQUESTS.get(cache="test", result="hit") == 3
+    assert CACHE_REQUESTS.get(cache="test", result="disk_hit") == 1
+    assert CACHE_REQUESTS.get(cache="test", result="miss") == 2
@@ -0,0 +1,166 @@
+"""utils/partial_stats.py・utils/parallel_aggregation.py のテスト"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import SurveyConfig, generate_survey
+from utils import parallel_aggregation
+from utils.analysis_summary import compute_analysis_summary
+from utils.parallel_aggregation import (
+    compute_partitioned_summary,
+    compute_summary,
+    create_aggregation_pool,
+    get_aggregation_workers,
+    should_partition,
+)
+from utils.partial_stats import compute_partial, correlation, histogram_quantiles
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    """小さなデータでも複数ブロックに分割されるようにする"""
+    monkeypatch.setattr(parallel_aggregation, "MIN_BLOCK_ROWS", 100)
+
+
+@pytest.fixture
+def thread_pool():
+    """共有メモリの受け渡しを同じプロセス内で確認するためのスレッドプール"""
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        yield executor
+
+
+def assert_summary_equal(actual, expected):
+    """集計結果が compute_analysis_summary と一致することを確認（型の違いは問わない）"""
+    options = {"check_dtype": False, "check_exact": False}
+    pd.testing.assert_series_equal(actual.sport_means, expected.sport_means, **options)
+    pd.testing.assert_frame_equal(actual.age_group_means, expected.age_group_means, **options)
+    pd.testing.assert_frame_equal(actual.correlation, expected.correlation, **options)
+    pd.testing.assert_frame_equal(actual.score_distribution, expected.score_distribution, **options)
+    pd.testing.assert_frame_equal(actual.distribution_stats, expected.distribution_stats, **options)
+    assert actual.row_count == expected.row_count
+
+
+class TestPartialStats:
+    """部分統計量のテスト"""
+
+    def test_merge_equals_whole(self):
+        rng = np.random.default_rng(0)
+        block = rng.integers(1, 6, size=(1000, 4)).astype(float)
+        block[rng.random(block.shape) < 0.1] = np.nan
+        codes = rng.integers(-1, 3, size=1000)
+
+        whole = compute_partial(block, codes, 3)
+        merged = compute_partial(block[:300], codes[:300], 3).merge(
+            compute_partial(block[300:], codes[300:], 3)
+        )
+
+        np.testing.assert_allclose(merged.cross, whole.cross)
+        np.testing.assert_array_equal(merged.group_hist, whole.group_hist)
+        np.testing.assert_array_equal(merged.pair_count, whole.pair_count)
+        assert merged.rows == 1000
+
+    def test_correlation_uses_pairwise_complete_rows(self):
+        df = pd.DataFrame({"a": [1, 2, 3, np.nan, 5], "b": [2, 1, 4, 3, np.nan]})
+        stats = compute_partial(df.to_numpy(dtype=float), np.zeros(5, dtype=int), 1)
+
+        np.testing.assert_allclose(correlation(stats), df.corr().to_numpy())
+
+    def test_irregular_values_are_counted(self):
+        block = np.array([[1.0], [2.5], [9.0], [np.nan], [5.0]])
+        stats = compute_partial(block, np.zeros(5, dtype=int), 1)
+
+        assert stats.irregular == 2
+        assert stats.hist.tolist() == [[1, 0, 0, 0, 1]]
+
+    def test_histogram_quantiles_match_numpy(self):
+        values = np.array([1, 1, 2, 4, 5, 5, 5])
+        hist = np.bincount(values - 1, minlength=5)
+        quantiles = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+        np.testing.assert_allclose(
+            histogram_quantiles(hist, quantiles), np.quantile(values, quantiles)
+        )
+        assert np.isnan(histogram_quantiles(np.zeros(5, dtype=int), [0.5])).all()
+
+
+class TestComputePartitionedSummary:
+    """compute_partitioned_summary関数のテスト"""
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            SurveyConfig(rows=2000),
+            SurveyConfig(rows=2000, missing_rate=0.1),
+            SurveyConfig(rows=2000, missing_rate=0.05, invalid_rate=0.05),
+        ],
+        ids=["clean", "missing", "invalid"],
+    )
+    def test_matches_compute_analysis_summary(self, config, small_blocks, thread_pool):
+        df = generate_survey(config)
+
+        actual = compute_partitioned_summary(df, thread_pool, workers=3)
+
+        assert_summary_equal(actual, compute_analysis_summary(df))
+
+    def test_sample_data(self, sample_sports_data, small_blocks, thread_pool):
+        actual = compute_partitioned_summary(sample_sports_data, thread_pool, workers=2)
+
+        assert_summary_equal(actual, compute_analysis_summary(sample_sports_data))
+
+    def test_process_pool(self, small_blocks):
+        df = generate_survey(SurveyConfig(rows=1000, missing_rate=0.05))
+        pool = create_aggregation_pool(2)
+        try:
+            actual = compute_partitioned_summary(df, pool, workers=2)
+        finally:
+            pool.shutdown()
+
+        assert_summary_equal(actual, compute_analysis_summary(df))
+
+
+class TestComputeSummary:
+    """compute_summary関数のテスト"""
+
+    def test_should_partition(self, monkeypatch):
+        monkeypatch.setenv("AGGREGATION_WORKERS", "4")
+        assert should_partition(parallel_aggregation.PARALLEL_MIN_ROWS)
+        assert not should_partition(parallel_aggregation.PARALLEL_MIN_ROWS - 1)
+
+        monkeypatch.setenv("AGGREGATION_WORKERS", "1")
+        assert not should_partition(parallel_aggregation.PARALLEL_MIN_ROWS)
+
+    @pytest.mark.parametrize("value", ["four", "0"])
+    def test_invalid_workers_env_uses_cpu_count(self, monkeypatch, value):
+        monkeypatch.setenv("AGGREGATION_WORKERS", value)
+        assert get_aggregation_workers() == (os.cpu_count() or 1)
+
+    def test_broken_pool_falls_back(self, monkeypatch, sample_sports_data):
+        class BrokenPoolResource:
+            """壊れたプールを返す get_aggregation_pool の代わり"""
+
+            cleared = False
+
+            def __call__(self):
+                return None
+
+            def clear(self):
+                self.cleared = True
+
+        def broken(df, executor):
+            raise BrokenProcessPool("worker died")
+
+        resource = BrokenPoolResource()
+        monkeypatch.setattr(parallel_aggregation, "should_partition", lambda rows: True)
+        monkeypatch.setattr(parallel_aggregation, "get_aggregation_pool", resource)
+        monkeypatch.setattr(parallel_aggregation, "compute_partitioned_summary", broken)
+
+        summary = compute_summary(sample_sports_data)
+
+        assert summary.row_count == 20
+        # 壊れたプールは次回作り直されるよう破棄される
+        assert resource.cleared
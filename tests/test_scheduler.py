@@ -0,0 +1,97 @@
+"""ジョブスケジューラーのテスト"""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from utils.scheduler import JobScheduler, estimate_frame_bytes
+
+
+class TestJobScheduler:
+    """JobSchedulerのテスト"""
+
+    def test_returns_result(self):
+        """タスクの戻り値が取得できることを確認"""
+        scheduler = JobScheduler(max_slots=1)
+        task = scheduler.submit("s1", sum, [1, 2, 3])
+        assert task.future.result(timeout=5) == 6
+
+    def test_propagates_exception(self):
+        """タスク内の例外がFutureに伝わることを確認"""
+        scheduler = JobScheduler(max_slots=1)
+        task = scheduler.submit("s1", int, "not a number")
+        with pytest.raises(ValueError):
+            task.future.result(timeout=5)
+
+    def test_bounded_slots(self):
+        """同時実行数がスロット数を超えないことを確認"""
+        scheduler = JobScheduler(max_slots=2)
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def work():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+
+        tasks = [scheduler.submit(f"s{i}", work) for i in range(6)]
+        for task in tasks:
+            task.future.result(timeout=5)
+        assert max(peak) <= 2
+
+    def test_round_robin_between_sessions(self):
+        """セッション間で交互に実行されることを確認"""
+        scheduler = JobScheduler(max_slots=1)
+        gate = threading.Event()
+        order = []
+        blocker = scheduler.submit("blocker", gate.wait)
+        time.sleep(0.05)
+        tasks = [scheduler.submit("a", order.append, f"a{i}") for i in range(3)]
+        tasks += [scheduler.submit("b", order.append, f"b{i}") for i in range(3)]
+
+        assert scheduler.queue_position(tasks[3]) == 2
+        gate.set()
+        blocker.future.result(timeout=5)
+        for task in tasks:
+            task.future.result(timeout=5)
+        assert order == ["a0", "b0", "a1", "b1", "a2", "b2"]
+
+    def test_memory_admission(self):
+        """推定メモリが予算を超えるタスクは同時に実行されないことを確認"""
+        scheduler = JobScheduler(max_slots=2, memory_budget=100)
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def work():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+
+        tasks = [scheduler.submit(f"s{i}", work, estimated_bytes=80) for i in range(3)]
+        for task in tasks:
+            task.future.result(timeout=5)
+        assert max(peak) == 1
+        assert scheduler.stats()["reserved_bytes"] == 0
+
+    def test_queue_position_zero_after_completion(self):
+        """完了したタスクの待ち順位が0になることを確認"""
+        scheduler = JobScheduler(max_slots=1)
+        task = scheduler.submit("s1", len, "abc")
+        task.future.result(timeout=5)
+        assert scheduler.queue_position(task) == 0
+
+
+def test_estimate_frame_bytes(sample_sports_data):
+    """推定メモリが正の値になることを確認"""
+    assert estimate_frame_bytes(sample_sports_data) > 0
+    assert estimate_frame_bytes(pd.DataFrame()) >= 0
@@ -0,0 +1,133 @@
+"""utils/score_cleaning.py のテスト"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from utils.score_cleaning import (
+    CLEAN_SCORE_DTYPE,
+    DECIMAL,
+    FULL_WIDTH,
+    NA_TOKEN,
+    NA_TOKENS_ENV,
+    TRIMMED,
+    CleaningReport,
+    clean_score_array,
+    clean_scores,
+    clean_table,
+    get_na_tokens,
+    unify_cleaned_dtypes,
+)
+from utils.upload_validation import validate_frame
+
+
+@pytest.fixture
+def dirty_data(sample_sports_data):
+    """関心度のカラムに表記ゆれがあるデータ（サッカーのみ）"""
+    df = sample_sports_data.astype({"サッカー": object})
+    df.loc[[1, 2, 3, 4, 5], "サッカー"] = ["５", " 5 ", "N/A", "4.0", ""]
+    df.loc[6, "サッカー"] = None
+    return df
+
+
+class TestCleanScoreArray:
+    """clean_score_array関数のテスト"""
+
+    def test_repairs_and_counts(self):
+        values = pa.array(["５", " 3", "N/A", "4.0", "", None, "無回答", "2"])
+
+        cleaned, counts = clean_score_array(values)
+
+        assert cleaned.type == pa.uint8()
+        assert cleaned.to_pylist() == [5, 3, None, 4, None, None, None, 2]
+        assert counts == {TRIMMED: 1, FULL_WIDTH: 1, NA_TOKEN: 3, DECIMAL: 1}
+
+    @pytest.mark.parametrize("value", ["高い", "2.5", "-1", "300"])
+    def test_values_that_cannot_be_cleaned(self, value):
+        cleaned, counts = clean_score_array(pa.array(["1", value]))
+
+        assert cleaned is None
+        assert counts == {}
+
+    def test_na_tokens_from_env(self, monkeypatch):
+        monkeypatch.setenv(NA_TOKENS_ENV, "x, ?")
+
+        assert get_na_tokens() == ("x", "?")
+        cleaned, counts = clean_score_array(pa.array(["X", "?", "3"]))
+        assert cleaned.to_pylist() == [None, None, 3]
+        assert counts[NA_TOKEN] == 2
+        # 既定の表記は欠損にならない
+        assert clean_score_array(pa.array(["N/A"]))[0] is None
+
+
+class TestCleanScores:
+    """clean_scores関数のテスト"""
+
+    def test_missing_values_stay_missing(self, sample_sports_data, monkeypatch):
+        # pandas 2 の read_csv は空のセルを NaN として object 型のカラムに入れる
+        monkeypatch.setenv(NA_TOKENS_ENV, "無回答")
+        df = sample_sports_data.astype({"サッカー": object})
+        df.loc[[1, 2], "サッカー"] = ["無回答", np.nan]
+        df.loc[3, "サッカー"] = "５"
+        report = CleaningReport()
+
+        cleaned = clean_scores(df, report)
+
+        assert cleaned["サッカー"].dtype == CLEAN_SCORE_DTYPE
+        assert cleaned.index[cleaned["サッカー"].isna()].tolist() == [1, 2]
+        assert report.repairs == {"サッカー": {FULL_WIDTH: 1, NA_TOKEN: 1}}
+
+    def test_cleaned_data_passes_validation(self, dirty_data, sample_sports_data):
+        report = CleaningReport()
+
+        df = clean_scores(dirty_data, report)
+
+        assert df["サッカー"].dtype == CLEAN_SCORE_DTYPE
+        assert df.index[df["サッカー"].isna()].tolist() == [3, 5, 6]
+        assert df["サッカー"].iloc[[1, 2, 4]].tolist() == [5, 5, 4]
+        # 数値型のカラム・回答者ID・年齢層はそのまま
+        pd.testing.assert_frame_equal(
+            df.drop(columns="サッカー"), sample_sports_data.drop(columns="サッカー")
+        )
+        assert report.columns == ["サッカー"]
+        assert report.repairs == {"サッカー": {TRIMMED: 1, FULL_WIDTH: 1, NA_TOKEN: 2, DECIMAL: 1}}
+        assert report.total == 5
+        assert report.format() == (
+            "サッカー（前後の空白 1件、全角文字 1件、欠損値の表記 2件、小数表記 1件）"
+        )
+        validate_frame(df)
+
+    def test_uncleanable_column_is_left_for_validation(self, dirty_data):
+        dirty_data.loc[7, "サッカー"] = "高い"
+        report = CleaningReport()
+
+        df = clean_scores(dirty_data, report)
+
+        assert df is dirty_data
+        assert report.total == 0
+
+    def test_counts_accumulate_over_chunks(self, dirty_data):
+        report = CleaningReport()
+
+        # 表記ゆれの無いチャンクは read_csv で int64 として読み込まれる
+        raw = [dirty_data.iloc[:10], dirty_data.iloc[10:].astype({"サッカー": "int64"})]
+        chunks = [clean_scores(chunk, report) for chunk in raw]
+        df = unify_cleaned_dtypes(pd.concat(chunks), report)
+
+        assert chunks[-1]["サッカー"].dtype == "int64"
+        assert df["サッカー"].dtype == CLEAN_SCORE_DTYPE
+        assert report.repairs["サッカー"][NA_TOKEN] == 2
+        assert report.total == 5
+
+
+def test_clean_table(dirty_data):
+    table = pa.Table.from_pandas(dirty_data.astype({"サッカー": "string"}), preserve_index=False)
+    report = CleaningReport()
+
+    cleaned = clean_table(table, report)
+
+    assert cleaned.schema.field("サッカー").type == pa.uint8()
+    assert cleaned.schema.field("野球").type == table.schema.field("野球").type
+    assert cleaned.column_names == table.column_names
+    assert report.total == 5
@@ -0,0 +1,52 @@
+"""起動プロファイル計測ツールのテスト"""
+
+from benchmarks.startup_profile import compare_with_baseline, parse_importtime
+
+
+def _profile(import_seconds: float, render_seconds: float, rss_mb: float) -> dict:
+    """テスト用の計測結果"""
+    return {
+        "imports": {"app": {"wall_seconds": import_seconds, "packages": {"pandas": 0.1}}},
+        "first_render": {"home": {"seconds": render_seconds, "rss_mb": rss_mb}},
+    }
+
+
+class TestParseImporttime:
+    """-X importtime 出力の集計のテスト"""
+
+    def test_groups_by_top_level_package(self):
+        """トップレベルパッケージごとに自己時間が集計されることを確認"""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:      1000 |       1500 |   pandas.core\n"
+            "import time:      2000 |       3500 | pandas\n"
+            "import time:       500 |        500 | json\n"
+            "import time:       250 |        250 | components.sidebar\n"
+        )
+        totals = parse_importtime(stderr)
+        assert totals["pandas"] == 0.003
+        assert totals["other"] == 0.0005
+        assert totals["components"] == 0.00025
+
+
+class TestCompareWithBaseline:
+    """ベースライン比較のテスト"""
+
+    def test_no_regression(self):
+        """許容範囲内の変化は回帰としないことを確認"""
+        assert compare_with_baseline(_profile(1.0, 1.0, 100), _profile(0.9, 0.95, 95)) == []
+
+    def test_detects_slowdown(self):
+        """比率・絶対差の両方を超えた場合に回帰とすることを確認"""
+        regressions = compare_with_baseline(_profile(2.0, 1.0, 100), _profile(1.0, 1.0, 100))
+        assert len(regressions) == 1
+        assert regressions[0].startswith("import.app.seconds")
+
+    def test_small_absolute_change_ignored(self):
+        """比率が大きくても絶対差が小さい場合は回帰としないことを確認"""
+        assert compare_with_baseline(_profile(0.02, 1.0, 100), _profile(0.01, 1.0, 100)) == []
+
+    def test_detects_memory_growth(self):
+        """ピークRSSの増加を回帰とすることを確認"""
+        regressions = compare_with_baseline(_profile(1.0, 1.0, 200), _profile(1.0, 1.0, 100))
+        assert regressions == ["render.home.rss_mb: 100.000 -> 200.000 (2.00x)"]
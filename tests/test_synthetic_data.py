@@ -0,0 +1,107 @@
+"""合成データ生成のテスト"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import (
+    SurveyConfig,
+    generate_survey,
+    iter_survey_chunks,
+    write_survey,
+)
+from utils.data_loader import get_sports_columns, validate_sports_survey_data
+
+
+class TestGenerateSurvey:
+    """合成データ生成のテスト"""
+
+    def test_valid_survey_format(self, synthetic_survey_1k):
+        """生成データが調査データの形式を満たすことを確認"""
+        assert len(synthetic_survey_1k) == 1_000
+        assert validate_sports_survey_data(synthetic_survey_1k)
+        scores = synthetic_survey_1k[get_sports_columns(synthetic_survey_1k)]
+        assert scores.isin(range(1, 6)).all().all()
+        assert synthetic_survey_1k["回答者ID"].is_unique
+
+    def test_seeded(self):
+        """同じシード・チャンクサイズなら同じデータになることを確認"""
+        config = SurveyConfig(rows=500, seed=3)
+        pd.testing.assert_frame_equal(
+            generate_survey(config, chunk_rows=100), generate_survey(config, chunk_rows=100)
+        )
+
+    def test_chunks_bounded(self):
+        """チャンクの行数が上限を超えないことを確認"""
+        sizes = [len(chunk) for chunk in iter_survey_chunks(SurveyConfig(rows=250), 100)]
+        assert sizes == [100, 100, 50]
+
+    def test_rows_must_be_positive(self):
+        """回答者数が0の生成条件は作成時に拒否されることを確認"""
+        with pytest.raises(ValueError, match="rows=0"):
+            SurveyConfig(rows=0)
+
+    def test_number_of_sports(self, synthetic_survey_factory):
+        """種目数を既定の種目名より多く指定できることを確認"""
+        df = synthetic_survey_factory(rows=10, n_sports=12)
+        assert len(get_sports_columns(df)) == 12
+        assert "種目12" in df.columns
+
+    def test_age_mix(self, synthetic_survey_factory):
+        """年齢層の構成比が指定に従うことを確認"""
+        df = synthetic_survey_factory(rows=20_000, age_mix={"20代": 0.8, "60代": 0.2})
+        shares = df["年齢層"].value_counts(normalize=True)
+        assert shares["20代"] == pytest.approx(0.8, abs=0.02)
+
+    def test_correlation_structure(self, synthetic_survey_factory):
+        """種目間の相関が指定の強さに応じて変わることを確認"""
+        weak = synthetic_survey_factory(
+            rows=20_000, n_sports=3, sport_correlation=0.0, age_effect=0
+        )
+        strong = synthetic_survey_factory(
+            rows=20_000, n_sports=3, sport_correlation=0.8, age_effect=0
+        )
+        assert abs(weak.iloc[:, 2:].corr().iloc[0, 1]) < 0.05
+        assert strong.iloc[:, 2:].corr().iloc[0, 1] > 0.6
+
+    def test_missing_and_invalid_values(self, synthetic_survey_factory):
+        """欠損・範囲外の値が指定の割合で混入することを確認"""
+        df = synthetic_survey_factory(rows=20_000, missing_rate=0.05, invalid_rate=0.05)
+        scores = df[get_sports_columns(df)]
+        assert scores.isna().mean().mean() == pytest.approx(0.05, abs=0.01)
+        out_of_range = scores.notna() & ~scores.isin(range(1, 6))
+        assert out_of_range.mean().mean() == pytest.approx(0.05 * 0.95, abs=0.01)
+
+    def test_invalid_tokens(self, synthetic_survey_factory):
+        """不正な文字列を混入できることを確認"""
+        df = synthetic_survey_factory(rows=1_000, invalid_rate=0.1, invalid_tokens=("N/A",))
+        assert (df["サッカー"] == "N/A").any()
+
+
+class TestWriteSurvey:
+    """ファイル書き出しのテスト"""
+
+    @pytest.mark.parametrize("file_format", ["csv", "parquet", "arrow"])
+    def test_round_trip(self, tmp_path, file_format):
+        """書き出したファイルを読み込むと同じ行数・カラムになることを確認"""
+        path = tmp_path / f"survey.{file_format}"
+        config = SurveyConfig(rows=1_050, missing_rate=0.01)
+        assert write_survey(config, path, file_format, chunk_rows=500) == 1_050
+
+        if file_format == "csv":
+            df = pd.read_csv(path)
+        elif file_format == "parquet":
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_feather(path)
+        expected = generate_survey(config, chunk_rows=500)
+        assert list(df.columns) == list(expected.columns)
+        np.testing.assert_array_equal(
+            df["サッカー"].to_numpy(dtype="float64", na_value=np.nan),
+            expected["サッカー"].to_numpy(dtype="float64", na_value=np.nan),
+        )
+
+    def test_unsupported_format(self, tmp_path):
+        """未対応の形式でValueErrorが発生することを確認"""
+        with pytest.raises(ValueError):
+            write_survey(SurveyConfig(rows=10), tmp_path / "x.xml", "xml")
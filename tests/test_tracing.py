@@ -0,0 +1,153 @@
+"""utils/tracing.py のテスト"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from utils.tracing import (
+    TRACE_ENV,
+    TRACE_FILE_ENV,
+    Span,
+    Trace,
+    add_span,
+    get_active_trace,
+    span,
+    start_trace,
+    summarize_spans,
+)
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    """トレースの書き出し先を一時ファイルにする"""
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv(TRACE_FILE_ENV, str(path))
+    return path
+
+
+class TestSpan:
+    """span関数のテスト"""
+
+    def test_noop_outside_trace(self):
+        # トレース中でなければ毎回同じダミーを返す（記録処理を行わない）
+        assert span("a") is span("b")
+        with span("a") as record:
+            assert record is None
+
+    def test_disabled_trace_records_nothing(self, trace_file, monkeypatch):
+        monkeypatch.delenv(TRACE_ENV, raising=False)
+        with start_trace("page") as trace:
+            with span("section"):
+                pass
+
+        assert trace is None
+        assert not trace_file.exists()
+
+    def test_nested_spans(self, trace_file):
+        with start_trace("page", enabled=True) as trace:
+            with span("outer", rows=10):
+                with span("inner"):
+                    pass
+            with span("next"):
+                pass
+
+        assert [(s.name, s.depth) for s in trace.spans] == [
+            ("outer", 0),
+            ("inner", 1),
+            ("next", 0),
+        ]
+        assert trace.spans[0].attrs == {"rows": 10}
+        assert trace.spans[0].duration >= trace.spans[1].duration
+        assert get_active_trace() is None
+
+    def test_span_closed_on_exception(self, trace_file):
+        with pytest.raises(ValueError):
+            with start_trace("page", enabled=True) as trace:
+                with span("failing"):
+                    raise ValueError("boom")
+
+        assert trace.spans[0].duration > 0
+        assert get_active_trace() is None
+        assert trace_file.exists()
+
+    def test_traces_are_thread_local(self, trace_file):
+        seen = []
+
+        with start_trace("page", enabled=True):
+            thread = threading.Thread(target=lambda: seen.append(get_active_trace()))
+            thread.start()
+            thread.join()
+
+        assert seen == [None]
+
+    def test_add_span_measured_elsewhere(self, trace_file):
+        with start_trace("page", enabled=True) as trace:
+            started = time.perf_counter()
+            with span("emit"):
+                # 別スレッドで先に始まった区間を後から追加しても開始順に並ぶ
+                add_span("figure:bar", started, 0.5, worker=True)
+
+        assert [(s.name, s.depth) for s in trace.spans] == [("figure:bar", 1), ("emit", 0)]
+        assert trace.spans[0].duration == 0.5
+        assert trace.spans[0].attrs == {"worker": True}
+        # トレース外では何もしない
+        add_span("ignored", started, 0.1)
+
+
+class TestStartTrace:
+    """start_trace関数のテスト"""
+
+    def test_writes_json_lines(self, trace_file):
+        with start_trace("page", enabled=True, session_id="s1"):
+            with span("section", format="csv"):
+                pass
+        with start_trace("page", enabled=True):
+            pass
+
+        records = [json.loads(line) for line in trace_file.read_text().splitlines()]
+        assert len(records) == 2
+        assert records[0]["trace"] == "page"
+        assert records[0]["session_id"] == "s1"
+        assert records[0]["spans"][0]["name"] == "section"
+        assert records[0]["spans"][0]["attrs"] == {"format": "csv"}
+
+    def test_enabled_by_environment(self, trace_file, monkeypatch):
+        monkeypatch.setenv(TRACE_ENV, "1")
+        with start_trace("job") as trace:
+            pass
+
+        assert trace is not None
+        assert trace_file.exists()
+
+    def test_nested_trace_becomes_span(self, trace_file):
+        with start_trace("page", enabled=True) as outer:
+            with start_trace("inner", enabled=True) as inner:
+                pass
+
+        assert inner is outer
+        assert [s.name for s in outer.spans] == ["inner"]
+        assert len(trace_file.read_text().splitlines()) == 1
+
+
+class TestSummarizeSpans:
+    """summarize_spans関数のテスト"""
+
+    def test_self_time_excludes_children(self):
+        trace = Trace(
+            name="page",
+            spans=[
+                Span("outer", start=0.0, duration=0.010, depth=0),
+                Span("child", start=0.001, duration=0.004, depth=1),
+                Span("grandchild", start=0.001, duration=0.003, depth=2),
+                Span("child2", start=0.005, duration=0.002, depth=1),
+                Span("next", start=0.010, duration=0.001, depth=0),
+            ],
+        )
+
+        rows = {row["name"]: row for row in summarize_spans(trace)}
+
+        assert rows["outer"]["self_ms"] == pytest.approx(4.0)
+        assert rows["child"]["self_ms"] == pytest.approx(1.0)
+        assert rows["next"]["self_ms"] == pytest.approx(1.0)
@@ -0,0 +1,384 @@
+"""アップロード読み込みジョブ管理のテスト"""
+
+import io
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from utils.data_loader import SOURCE_FILE_COLUMN, get_sports_columns
+from utils.history_manager import optimize_dataframe_memory
+from utils.scheduler import JobScheduler
+from utils.upload_jobs import (
+    UploadCancelled,
+    UploadJob,
+    UploadJobManager,
+    parse_csv_upload,
+    parse_upload,
+    parse_upload_files,
+)
+from utils.upload_validation import UploadRejected
+
+
+def _wait(job, timeout: float = 10.0):
+    """ジョブの終了を待機"""
+    deadline = time.time() + timeout
+    while not job.is_finished and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.is_finished
+
+
+@pytest.fixture
+def csv_bytes(sample_sports_data):
+    """サンプル形式のCSVの内容"""
+    return sample_sports_data.to_csv(index=False).encode("utf-8")
+
+
+@pytest.fixture
+def scheduler():
+    """1スロットのスケジューラー（実行順を制御しやすくする）"""
+    return JobScheduler(max_slots=1)
+
+
+@pytest.fixture
+def manager(scheduler):
+    """テスト用のUploadJobManager"""
+    return UploadJobManager(scheduler=scheduler, chunk_rows=3)
+
+
+@pytest.fixture
+def wave_files(sample_sports_data):
+    """調査回ごとに分けた3つのCSVファイル（2つ目は欠損値を含む）"""
+    waves = [
+        sample_sports_data.iloc[:7],
+        sample_sports_data.iloc[7:12].copy(),
+        sample_sports_data.iloc[12:],
+    ]
+    waves[1].loc[waves[1].index[0], "野球"] = None
+    return [
+        (f"wave{i}.csv", wave.to_csv(index=False).encode("utf-8")) for i, wave in enumerate(waves)
+    ]
+
+
+@pytest.fixture(scope="module")
+def thread_executor():
+    """ファイルを並列に読み込むスレッドプール"""
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        yield executor
+
+
+def _files_job(files):
+    return UploadJob(
+        upload_id="u",
+        filename=files[0][0],
+        total_bytes=sum(len(data) for _, data in files),
+        file_count=len(files),
+    )
+
+
+def _encode(df, file_type, **kwargs):
+    """DataFrameを指定した形式のファイルの内容にする"""
+    buffer = io.BytesIO()
+    if file_type == "xlsx":
+        df.to_excel(buffer, index=False, engine="openpyxl", **kwargs)
+    else:
+        getattr(df, f"to_{file_type}")(buffer, **kwargs)
+    return buffer.getvalue()
+
+
+def _block(scheduler):
+    """スケジューラーのスロットを占有し、解放用のイベントを返す"""
+    release = threading.Event()
+    started = threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(10)
+
+    scheduler.submit("other", hold)
+    assert started.wait(10)
+    return release
+
+
+class TestParseCsvUpload:
+    """チャンク読み込みのテスト"""
+
+    def test_matches_read_csv(self, csv_bytes, sample_sports_data):
+        job = UploadJob(upload_id="u", filename="a.csv", total_bytes=len(csv_bytes))
+
+        df = parse_csv_upload(csv_bytes, job, chunk_rows=3)
+
+        pd.testing.assert_frame_equal(df, optimize_dataframe_memory(sample_sports_data.copy()))
+        assert job.rows_parsed == 20
+        assert job.bytes_read == len(csv_bytes)
+
+    def test_cancel_stops_parsing(self, csv_bytes):
+        job = UploadJob(upload_id="u", filename="a.csv", total_bytes=len(csv_bytes))
+        job.request_cancel()
+
+        with pytest.raises(UploadCancelled):
+            parse_csv_upload(csv_bytes, job, chunk_rows=3)
+
+    def test_shift_jis_semicolon(self, sample_sports_data):
+        data = ("調査結果\n" + sample_sports_data.to_csv(index=False, sep=";")).encode("cp932")
+        job = UploadJob(upload_id="u", filename="a.csv", total_bytes=len(data))
+
+        df = parse_csv_upload(data, job, chunk_rows=3)
+
+        pd.testing.assert_frame_equal(df, optimize_dataframe_memory(sample_sports_data.copy()))
+
+    def test_line_numbers_include_title_rows(self, sample_sports_data):
+        sample_sports_data.loc[3, "野球"] = 9
+        data = ("調査結果\n\n" + sample_sports_data.to_csv(index=False)).encode("cp932")
+        job = UploadJob(upload_id="u", filename="a.csv", total_bytes=len(data))
+
+        with pytest.raises(UploadRejected, match="7行目=9"):
+            parse_csv_upload(data, job, chunk_rows=3)
+
+
+class TestParseUpload:
+    """CSV以外の形式の読み込みのテスト"""
+
+    @pytest.mark.parametrize("file_type", ["parquet", "feather", "xlsx"])
+    def test_matches_csv(self, sample_sports_data, file_type):
+        data = _encode(sample_sports_data, file_type)
+        job = UploadJob(upload_id="u", filename=f"a.{file_type}", total_bytes=len(data))
+
+        df = parse_upload(f"a.{file_type}", data, job, chunk_rows=6)
+
+        pd.testing.assert_frame_equal(df, optimize_dataframe_memory(sample_sports_data.copy()))
+        assert job.rows_parsed == 20
+        assert job.bytes_read == len(data)
+
+    def test_source_column_is_not_read(self, sample_sports_data):
+        data = _encode(sample_sports_data.assign(**{SOURCE_FILE_COLUMN: "old.csv"}), "parquet")
+        job = UploadJob(upload_id="u", filename="a.parquet", total_bytes=len(data))
+
+        df = parse_upload("a.parquet", data, job)
+
+        assert SOURCE_FILE_COLUMN not in df.columns
+
+    def test_bad_header_is_rejected_from_metadata(self):
+        data = _encode(pd.DataFrame({"a": range(100_000), "b": 1}), "parquet")
+        job = UploadJob(upload_id="u", filename="a.parquet", total_bytes=len(data))
+
+        with pytest.raises(UploadRejected, match="必須カラム"):
+            parse_upload("a.parquet", data, job)
+
+        assert job.rows_parsed == 0
+
+    def test_parquet_row_numbers(self, sample_sports_data):
+        sample_sports_data.loc[4, "野球"] = 9
+        data = _encode(sample_sports_data, "parquet")
+        job = UploadJob(upload_id="u", filename="a.parquet", total_bytes=len(data))
+
+        with pytest.raises(UploadRejected, match="5行目=9"):
+            parse_upload("a.parquet", data, job)
+
+    def test_xlsx_line_numbers_include_title_rows(self, sample_sports_data):
+        sample_sports_data.loc[4, "野球"] = 9
+        data = _encode(sample_sports_data, "xlsx", startrow=3)
+        job = UploadJob(upload_id="u", filename="a.xlsx", total_bytes=len(data))
+
+        with pytest.raises(UploadRejected, match="9行目=9"):
+            parse_upload("a.xlsx", data, job)
+
+    @pytest.mark.parametrize("file_type", ["csv", "parquet", "xlsx"])
+    def test_dirty_scores_are_cleaned(self, sample_sports_data, file_type):
+        df = sample_sports_data.astype({"野球": "str"})
+        df.loc[[2, 15], "野球"] = ["４", "無回答"]
+        data = _encode(df, file_type, **({"index": False} if file_type != "xlsx" else {}))
+        job = UploadJob(upload_id="u", filename=f"a.{file_type}", total_bytes=len(data))
+
+        parsed = parse_upload(f"a.{file_type}", data, job, chunk_rows=6)
+
+        assert parsed["野球"].dtype == "UInt8"
+        assert parsed["野球"].isna().sum() == 1
+        assert parsed["野球"].iloc[2] == 4
+        assert job.cleaning.total == 2
+
+    def test_cancel_stops_parsing(self, sample_sports_data):
+        data = _encode(sample_sports_data, "feather")
+        job = UploadJob(upload_id="u", filename="a.feather", total_bytes=len(data))
+        job.request_cancel()
+
+        with pytest.raises(UploadCancelled):
+            parse_upload("a.feather", data, job)
+
+
+class TestParseCsvFiles:
+    """複数ファイルの読み込み・結合のテスト"""
+
+    def _expected(self, files):
+        frames = [pd.read_csv(io.BytesIO(data)) for _, data in files]
+        return pd.concat(frames, ignore_index=True)
+
+    @pytest.mark.parametrize("parallel", [True, False], ids=["executor", "sequential"])
+    def test_matches_concatenated_read_csv(self, wave_files, thread_executor, parallel):
+        job = _files_job(wave_files)
+
+        df = parse_upload_files(wave_files, job, thread_executor if parallel else None)
+
+        pd.testing.assert_frame_equal(
+            df.drop(columns=SOURCE_FILE_COLUMN), self._expected(wave_files), check_dtype=False
+        )
+        assert job.rows_parsed == len(df) == 20
+        assert job.files_parsed == 3
+        assert job.bytes_read == job.total_bytes
+
+    def test_source_file_column(self, wave_files, thread_executor):
+        df = parse_upload_files(wave_files, _files_job(wave_files), thread_executor)
+
+        assert isinstance(df[SOURCE_FILE_COLUMN].dtype, pd.CategoricalDtype)
+        categories = list(df[SOURCE_FILE_COLUMN].cat.categories)
+        assert categories == ["wave0.csv", "wave1.csv", "wave2.csv"]
+        assert df[SOURCE_FILE_COLUMN].value_counts(sort=False).tolist() == [7, 5, 8]
+        # 読み込み元の列はスポーツ種目として扱わない
+        assert SOURCE_FILE_COLUMN not in get_sports_columns(df)
+
+    def test_column_order_is_aligned(self, wave_files, thread_executor):
+        reordered = pd.read_csv(io.BytesIO(wave_files[2][1])).iloc[:, ::-1]
+        files = [wave_files[0], ("reordered.csv", reordered.to_csv(index=False).encode("utf-8"))]
+
+        df = parse_upload_files(files, _files_job(files), thread_executor)
+
+        assert list(df.columns[:-1]) == list(self._expected(files[:1]).columns)
+        assert len(df) == 15
+
+    def test_duplicate_file_names(self, wave_files, thread_executor):
+        files = [("wave.csv", data) for _, data in wave_files[:2]]
+
+        df = parse_upload_files(files, _files_job(files), thread_executor)
+
+        assert list(df[SOURCE_FILE_COLUMN].cat.categories) == ["wave.csv", "wave.csv (2)"]
+
+    def test_mismatched_columns(self, wave_files, thread_executor):
+        other = pd.DataFrame({"回答者ID": [1], "年齢層": ["20代"], "卓球": [3]})
+        files = [wave_files[0], ("other.csv", other.to_csv(index=False).encode("utf-8"))]
+
+        with pytest.raises(ValueError, match="other.csv"):
+            parse_upload_files(files, _files_job(files), thread_executor)
+
+    def test_mismatched_types(self, wave_files, sample_sports_data, thread_executor):
+        other = sample_sports_data.iloc[:2].copy()
+        other["野球"] = ["高い", "低い"]
+        files = [wave_files[0], ("text.csv", other.to_csv(index=False).encode("utf-8"))]
+
+        with pytest.raises(ValueError, match="text.csv"):
+            parse_upload_files(files, _files_job(files), thread_executor)
+
+    def test_cancel_stops_parsing(self, wave_files, thread_executor):
+        job = _files_job(wave_files)
+        job.request_cancel()
+
+        with pytest.raises(UploadCancelled):
+            parse_upload_files(wave_files, job, thread_executor)
+
+    def test_mixed_formats(self, wave_files, sample_sports_data, thread_executor):
+        """ファイルごとに文字コード・区切り文字が違っても結合できる"""
+        second = sample_sports_data.iloc[7:12].to_csv(index=False, sep="\t").encode("cp932")
+        third = sample_sports_data.iloc[12:].to_csv(index=False).encode("utf-8-sig")
+        files = [wave_files[0], ("wave1.tsv", second), ("wave2.csv", third)]
+
+        df = parse_upload_files(files, _files_job(files), thread_executor)
+
+        pd.testing.assert_frame_equal(
+            df.drop(columns=SOURCE_FILE_COLUMN), sample_sports_data, check_dtype=False
+        )
+
+    def test_mixed_file_types(self, wave_files, sample_sports_data, thread_executor):
+        files = [
+            wave_files[0],
+            ("wave1.parquet", _encode(sample_sports_data.iloc[7:12], "parquet")),
+            ("wave2.xlsx", _encode(sample_sports_data.iloc[12:], "xlsx")),
+        ]
+        job = _files_job(files)
+
+        df = parse_upload_files(files, job, thread_executor)
+
+        pd.testing.assert_frame_equal(
+            df.drop(columns=SOURCE_FILE_COLUMN), sample_sports_data, check_dtype=False
+        )
+        assert df[SOURCE_FILE_COLUMN].value_counts(sort=False).tolist() == [7, 5, 8]
+        assert job.files_parsed == 3
+
+    def test_dirty_scores_are_cleaned(self, wave_files, sample_sports_data, thread_executor):
+        dirty = sample_sports_data.iloc[12:].astype({"野球": object})
+        dirty.loc[13, "野球"] = " ４"
+        files = [wave_files[0], ("dirty.csv", dirty.to_csv(index=False).encode("utf-8"))]
+        job = _files_job(files)
+
+        df = parse_upload_files(files, job, thread_executor)
+
+        assert df["野球"].dtype == "UInt8"
+        expected = pd.concat([sample_sports_data.iloc[:7], sample_sports_data.iloc[12:]])
+        assert df["野球"].tolist() == expected["野球"].tolist()
+        assert job.cleaning.format() == "野球（前後の空白 1件、全角文字 1件）"
+
+    def test_worker_processes(self, wave_files):
+        pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+        with pool:
+            df = parse_upload_files(wave_files, _files_job(wave_files), pool)
+
+        assert len(df) == 20
+
+
+class TestUploadJobManager:
+    """UploadJobManagerのテスト"""
+
+    def test_job_completes(self, manager, csv_bytes, sample_sports_data):
+        job = manager.submit("s1", "u1", "a.csv", csv_bytes)
+        _wait(job)
+
+        assert job.status == "done"
+        assert job.progress == 1.0
+        assert len(job.data) == 20
+
+    def test_failed_job_records_error(self, manager):
+        job = manager.submit("s1", "u1", "empty.csv", b"")
+        _wait(job)
+
+        assert job.status == "failed"
+        assert job.error
+        assert job.data is None
+
+    def test_cancel_queued_job(self, manager, scheduler, csv_bytes):
+        release = _block(scheduler)
+        job = manager.submit("s1", "u1", "a.csv", csv_bytes)
+
+        manager.cancel(job)
+        release.set()
+
+        assert job.status == "cancelled"
+        assert job.task.future.cancelled()
+        assert job.data is None
+
+    def test_cancel_finished_job_is_noop(self, manager, csv_bytes):
+        job = manager.submit("s1", "u1", "a.csv", csv_bytes)
+        _wait(job)
+
+        manager.cancel(job)
+
+        assert job.status == "done"
+        assert not job.cancel_requested
+
+    def test_multiple_files_job(self, scheduler, wave_files, thread_executor):
+        manager = UploadJobManager(scheduler=scheduler, executor=thread_executor)
+        job = manager.submit_files("s1", "u1", wave_files)
+        _wait(job)
+
+        assert job.status == "done"
+        assert job.filename == "wave0.csv ほか2件"
+        assert len(job.data) == 20
+        assert job.data[SOURCE_FILE_COLUMN].nunique() == 3
+
+    def test_jobs_of_same_session_are_independent(self, manager, csv_bytes):
+        a = manager.submit("s1", "u1", "a.csv", csv_bytes)
+        b = manager.submit("s1", "u2", "b.csv", csv_bytes)
+        _wait(a)
+        _wait(b)
+
+        assert a.status == b.status == "done"
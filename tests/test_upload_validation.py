@@ -0,0 +1,237 @@
+"""utils/upload_validation.py のテスト"""
+
+import time
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_data import SurveyConfig, generate_survey
+from utils.upload_jobs import UploadJob, parse_csv_upload, parse_upload_files
+from utils.upload_validation import (
+    DUPLICATE_ID,
+    NULL_AGE,
+    NULL_ID,
+    OUT_OF_DOMAIN,
+    StreamValidator,
+    UploadRejected,
+    build_id_index,
+    check_appended_ids,
+    validate_frame,
+)
+
+
+def _issues(report):
+    """(問題, カラム) → 件数"""
+    return {(issue.message, issue.column): issue.count for issue in report.issues}
+
+
+def _reject(df, **kwargs):
+    """validate_frame で不合格になった検証結果を返す"""
+    with pytest.raises(UploadRejected) as exc_info:
+        validate_frame(df, **kwargs)
+    return exc_info.value.report
+
+
+def _job(data):
+    return UploadJob(upload_id="u", filename="a.csv", total_bytes=len(data))
+
+
+class TestValidateFrame:
+    """validate_frame関数のテスト"""
+
+    def test_valid_data(self, sample_sports_data):
+        report = validate_frame(sample_sports_data)
+
+        assert report.is_valid
+        assert report.complete
+        assert report.rows_checked == 20
+
+    def test_missing_scores_are_allowed(self, sample_sports_data):
+        sample_sports_data["野球"] = sample_sports_data["野球"].astype(float)
+        sample_sports_data.loc[[1, 3], "野球"] = np.nan
+
+        report = validate_frame(sample_sports_data)
+
+        assert report.missing_scores["野球"] == 2
+
+    def test_missing_required_column(self, invalid_sports_data):
+        report = _reject(invalid_sports_data)
+
+        assert "回答者ID" in report.issues[0].message
+        assert report.rows_checked == 0
+
+    def test_too_few_sports(self, sample_sports_data):
+        report = _reject(sample_sports_data[["回答者ID", "年齢層", "野球", "テニス"]])
+
+        assert "3つ未満" in report.issues[0].message
+
+    def test_out_of_domain_scores(self, sample_sports_data):
+        df = sample_sports_data.astype({"野球": float, "テニス": object})
+        df.loc[[2, 7], "野球"] = [0, 2.5]
+        df.loc[4, "テニス"] = "高い"
+
+        report = _reject(df)
+
+        assert _issues(report) == {(OUT_OF_DOMAIN, "野球"): 2, (OUT_OF_DOMAIN, "テニス"): 1}
+        assert report.issues[0].samples == [(2, 0.0), (7, 2.5)]
+        assert report.issues[1].samples == [(4, "高い")]
+
+    def test_nulls_and_duplicates(self, sample_sports_data):
+        df = sample_sports_data.astype({"回答者ID": float})
+        df.loc[0, "回答者ID"] = np.nan
+        df.loc[[5, 15], "回答者ID"] = 3
+        df.loc[9, "年齢層"] = None
+
+        report = _reject(df)
+
+        assert _issues(report) == {
+            (NULL_ID, "回答者ID"): 1,
+            (NULL_AGE, "年齢層"): 1,
+            (DUPLICATE_ID, "回答者ID"): 3,
+        }
+        duplicates = next(issue for issue in report.issues if issue.message == DUPLICATE_ID)
+        assert [row for row, _ in duplicates.samples] == [2, 5, 15]
+
+    def test_samples_are_limited(self):
+        df = generate_survey(SurveyConfig(rows=1000, invalid_rate=0.2))
+
+        report = _reject(df, max_samples=3)
+
+        assert all(len(issue.samples) <= 3 for issue in report.issues)
+        assert sum(issue.count for issue in report.issues) > 100
+
+    def test_format(self, sample_sports_data):
+        sample_sports_data.loc[2, "野球"] = 9
+
+        with pytest.raises(UploadRejected) as exc_info:
+            validate_frame(sample_sports_data)
+
+        message = str(exc_info.value)
+        assert "全行を検査" in message
+        assert f"- {OUT_OF_DOMAIN}（野球）: 1件 例: 4行目=9" in message
+
+
+class TestCheckAppendedIds:
+    """追加する行の回答者IDの検証のテスト"""
+
+    def test_new_ids_pass(self, sample_sports_data):
+        index = build_id_index(sample_sports_data["回答者ID"].iloc[:10])
+
+        report = check_appended_ids(index, sample_sports_data.iloc[10:])
+
+        assert report.is_valid
+        assert report.rows_checked == 10
+
+    def test_existing_ids_are_reported_by_batch_row(self, sample_sports_data):
+        # 既存のデータ内の重複（回答者ID 1）は対象外
+        existing = sample_sports_data.iloc[:10].astype({"回答者ID": "int32"})
+        existing.loc[1, "回答者ID"] = 1
+        batch = sample_sports_data.iloc[8:].astype({"回答者ID": "str"})
+
+        with pytest.raises(UploadRejected) as exc_info:
+            check_appended_ids(build_id_index(existing["回答者ID"]), batch)
+
+        report = exc_info.value.report
+        assert _issues(report) == {(DUPLICATE_ID, "回答者ID"): 2}
+        assert report.issues[0].samples == [(0, "9"), (1, "10")]
+
+    def test_duplicates_within_batch_are_reported(self, sample_sports_data):
+        index = build_id_index(sample_sports_data["回答者ID"].iloc[:10])
+        batch = sample_sports_data.iloc[10:].copy()
+        batch.loc[[12, 15], "回答者ID"] = 100
+
+        with pytest.raises(UploadRejected) as exc_info:
+            check_appended_ids(index, batch)
+
+        assert exc_info.value.report.issues[0].samples == [(2, 100), (5, 100)]
+
+    def test_float_ids_match_integer_ids(self, sample_sports_data):
+        # 欠損を含む回答者IDのカラムは浮動小数点数で読み込まれる
+        existing = sample_sports_data["回答者ID"].iloc[:10].astype("float64")
+        existing.iloc[0] = np.nan
+
+        with pytest.raises(UploadRejected) as exc_info:
+            check_appended_ids(build_id_index(existing), sample_sports_data.iloc[9:])
+
+        assert exc_info.value.report.issues[0].samples == [(0, 10)]
+
+
+class TestStreamValidator:
+    """チャンクごとの検証のテスト"""
+
+    def test_duplicates_across_chunks(self, sample_sports_data):
+        df = sample_sports_data.copy()
+        df.loc[15, "回答者ID"] = 1
+        validator = StreamValidator()
+        validator.check_header(list(df.columns))
+        for start in range(0, 20, 5):
+            validator.check_chunk(df.iloc[start : start + 5])
+
+        with pytest.raises(UploadRejected) as exc_info:
+            validator.finish()
+
+        assert _issues(exc_info.value.report) == {(DUPLICATE_ID, "回答者ID"): 2}
+
+    def test_fail_fast_stops_at_first_bad_chunk(self, sample_sports_data):
+        df = sample_sports_data.copy()
+        df.loc[6, "サッカー"] = 7
+        validator = StreamValidator()
+        validator.check_header(list(df.columns))
+        validator.check_chunk(df.iloc[:5])
+
+        with pytest.raises(UploadRejected) as exc_info:
+            validator.check_chunk(df.iloc[5:10])
+
+        assert exc_info.value.report.rows_checked == 10
+        assert not exc_info.value.report.complete
+
+
+class TestUploadValidation:
+    """アップロードの読み込み中の検証のテスト"""
+
+    def test_bad_header_is_rejected_before_parsing(self):
+        data = b"a,b,c\n" + b"1,2,3\n" * 200_000
+        job = _job(data)
+
+        started = time.perf_counter()
+        with pytest.raises(UploadRejected):
+            parse_csv_upload(data, job, chunk_rows=50_000)
+
+        assert time.perf_counter() - started < 1.0
+        assert job.rows_parsed == 0
+        assert job.bytes_read < len(data)
+
+    def test_bad_values_stop_parsing_early(self):
+        df = generate_survey(SurveyConfig(rows=20_000))
+        df.loc[10, "野球"] = 9
+        data = df.to_csv(index=False).encode("utf-8")
+        job = _job(data)
+
+        with pytest.raises(UploadRejected, match="12行目=9"):
+            parse_csv_upload(data, job, chunk_rows=5_000)
+
+        assert job.rows_parsed == 0
+
+    def test_multiple_files_report_file_and_line(self, sample_sports_data):
+        second = sample_sports_data.iloc[10:].copy()
+        second.loc[second.index[3], "回答者ID"] = 2
+        files = [
+            ("wave1.csv", sample_sports_data.iloc[:10].to_csv(index=False).encode("utf-8")),
+            ("wave2.csv", second.to_csv(index=False).encode("utf-8")),
+        ]
+        job = UploadJob(upload_id="u", filename="wave1.csv", total_bytes=1, file_count=2)
+
+        with pytest.raises(UploadRejected, match="wave2.csv 5行目=2"):
+            parse_upload_files(files, job)
+
+    def test_bad_header_in_any_file(self, sample_sports_data):
+        files = [
+            ("wave1.csv", sample_sports_data.to_csv(index=False).encode("utf-8")),
+            ("broken.csv", b"x,y\n1,2\n"),
+        ]
+        job = UploadJob(upload_id="u", filename="wave1.csv", total_bytes=1, file_count=2)
+
+        with pytest.raises(UploadRejected, match="^broken.csv: "):
+            parse_upload_files(files, job)
+
+        assert job.files_parsed == 0
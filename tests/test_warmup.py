@@ -0,0 +1,112 @@
+"""utils/warmup.py・utils/shared_datasets.py のテスト"""
+
+import os
+
+import pytest
+
+from utils import export_jobs
+from utils.analysis_summary import get_analysis_summary
+from utils.export_cache import ExportCache
+from utils.export_jobs import ExportJobManager
+from utils.fingerprint import compute_dataset_fingerprint, derive_fingerprint
+from utils.scheduler import JobScheduler
+from utils.shared_datasets import featured_dataset_paths, load_shared_dataset
+from utils.warmup import WARMUP_SESSION, run_warmup, warmup_export_formats
+
+
+@pytest.fixture
+def featured_csv(tmp_path, sample_sports_data):
+    """サンプル形式のCSVファイル"""
+    path = tmp_path / "featured.csv"
+    sample_sports_data.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """プロセス共通のExportJobManagerをテスト用に差し替える"""
+    manager = ExportJobManager(
+        artifact_dir=tmp_path / "artifacts", scheduler=JobScheduler(), cache=ExportCache()
+    )
+    monkeypatch.setattr(export_jobs, "get_export_job_manager", lambda: manager)
+    return manager
+
+
+class TestSharedDatasets:
+    """共有データセットの読み込みのテスト"""
+
+    def test_same_frame_is_shared(self, featured_csv):
+        assert load_shared_dataset(featured_csv) is load_shared_dataset(featured_csv)
+
+    def test_reloaded_after_modification(self, featured_csv, sample_sports_data):
+        first = load_shared_dataset(featured_csv)
+        sample_sports_data.head(5).to_csv(featured_csv, index=False)
+        stat = featured_csv.stat()
+        os.utime(featured_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert len(first) == 20
+        assert len(load_shared_dataset(featured_csv)) == 5
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_shared_dataset(tmp_path / "missing.csv")
+
+    def test_featured_dataset_paths(self, monkeypatch, tmp_path):
+        a, b = tmp_path / "a.csv", tmp_path / "b.csv"
+        monkeypatch.setenv("FEATURED_DATASETS", os.pathsep.join([str(a), "", str(b), str(a)]))
+
+        assert featured_dataset_paths() == [a, b]
+
+    def test_featured_dataset_paths_unset(self, monkeypatch):
+        monkeypatch.delenv("FEATURED_DATASETS", raising=False)
+
+        assert featured_dataset_paths() == []
+
+
+class TestRunWarmup:
+    """run_warmup関数のテスト"""
+
+    def test_caches_summaries_and_exports(self, featured_csv, manager):
+        status = run_warmup([featured_csv], export_formats=["csv", "json"])
+
+        assert status.state == "done"
+        assert status.completed == [str(featured_csv)]
+        assert status.errors == {}
+
+        # 画面側と同じ方法で導出したフィンガープリントで結果を参照できる
+        df = load_shared_dataset(featured_csv)
+        fingerprint = derive_fingerprint(compute_dataset_fingerprint(df), age_group="全年齢")
+        for fmt in ["csv", "json"]:
+            job = manager.get(fingerprint, fmt)
+            assert job is not None and job.status == "done"
+        assert manager.get(fingerprint, "excel") is None
+
+        # 集計はキャッシュ済みのため、DataFrameを渡さなくても結果が返る
+        assert get_analysis_summary(fingerprint, None).row_count == 20
+
+    def test_failure_is_recorded_and_next_dataset_runs(self, tmp_path, featured_csv, manager):
+        invalid = tmp_path / "invalid.csv"
+        invalid.write_text("a,b\n1,2\n", encoding="utf-8")
+
+        status = run_warmup([invalid, tmp_path / "missing.csv", featured_csv], export_formats=[])
+
+        assert set(status.errors) == {str(invalid), str(tmp_path / "missing.csv")}
+        assert status.completed == [str(featured_csv)]
+
+    def test_exports_use_warmup_session(self, featured_csv, manager):
+        run_warmup([featured_csv], export_formats=["csv"])
+
+        df = load_shared_dataset(featured_csv)
+        fingerprint = derive_fingerprint(compute_dataset_fingerprint(df), age_group="全年齢")
+        assert manager.get(fingerprint, "csv").task.session_id == WARMUP_SESSION
+
+
+def test_warmup_export_formats(monkeypatch):
+    monkeypatch.delenv("WARMUP_EXPORT_FORMATS", raising=False)
+    assert warmup_export_formats() == ["csv", "excel", "json"]
+
+    monkeypatch.setenv("WARMUP_EXPORT_FORMATS", "csv, json")
+    assert warmup_export_formats() == ["csv", "json"]
+
+    monkeypatch.setenv("WARMUP_EXPORT_FORMATS", "")
+    assert warmup_export_formats() == []
@@ -0,0 +1,106 @@
+"""分析ページで使う集計結果（サマリー）を計算・キャッシュするモジュール"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import streamlit as st
+
+from utils.data_loader import get_sports_columns
+
+if TYPE_CHECKING:
+    from utils.incremental_summary import RunningSummary
+
+# 関心度の取りうる値
+SCORE_VALUES = [1, 2, 3, 4, 5]
+
+
+@dataclass(frozen=True)
+class AnalysisSummary:
+    """分析ページの集計結果
+
+    Attributes:
+        sport_means: スポーツ種目別の平均関心度（降順）
+        age_group_means: 年齢層別・スポーツ種目別の平均関心度
+        correlation: スポーツ種目間の相関行列
+        score_distribution: スポーツ種目別の関心度（1〜5）ごとの回答数
+        distribution_stats: 年齢層別・スポーツ種目別の分布統計（箱ひげ図の要約）
+        row_count: 集計対象の行数
+    """
+
+    sport_means: pd.Series
+    age_group_means: pd.DataFrame
+    correlation: pd.DataFrame
+    score_distribution: pd.DataFrame
+    distribution_stats: pd.DataFrame
+    row_count: int
+
+
+def compute_analysis_summary(df: pd.DataFrame) -> AnalysisSummary:
+    """分析ページの集計結果をまとめて計算
+
+    Args:
+        df: スポーツ関心度調査データ
+
+    Returns:
+        集計結果
+    """
+    sports_cols = get_sports_columns(df)
+    scores = df[sports_cols]
+
+    score_distribution = pd.DataFrame(
+        {
+            sport: scores[sport].value_counts().reindex(SCORE_VALUES, fill_value=0)
+            for sport in sports_cols
+        }
+    )
+    score_distribution.index.name = "関心度"
+
+    grouped = df.groupby("年齢層", observed=True)[sports_cols]
+    distribution_stats = (
+        grouped.quantile([0.0, 0.25, 0.5, 0.75, 1.0])
+        .rename_axis(["年齢層", "統計量"])
+        .rename(
+            index={0.0: "最小", 0.25: "第1四分位", 0.5: "中央値", 0.75: "第3四分位", 1.0: "最大"}
+        )
+    )
+
+    return AnalysisSummary(
+        sport_means=scores.mean().sort_values(ascending=False),
+        age_group_means=grouped.mean(),
+        correlation=scores.corr(),
+        score_distribution=score_distribution,
+        distribution_stats=distribution_stats,
+        row_count=len(df),
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def get_analysis_summary(
+    fingerprint: str,
+    _df: pd.DataFrame,
+    _running: "RunningSummary | None" = None,
+    _age_group: str | None = None,
+) -> AnalysisSummary:
+    """データセットごとにキャッシュした集計結果を取得
+
+    キャッシュキーはフィンガープリントのみで、DataFrame本体はハッシュしない。
+    行を追加したデータセットは累積部分統計量（_running）から組み立て、
+    それ以外は環境変数 COMPUTE_BACKEND で指定した計算バックエンドで集計する。
+
+    Args:
+        fingerprint: 対象データのフィンガープリント（年齢層の絞り込みも含めて識別すること）
+        _df: 集計対象のDataFrame（キャッシュキーには含めない）
+        _running: 絞り込み前のデータセットの累積部分統計量（キャッシュキーには含めない）
+        _age_group: _df の絞り込みに使った年齢層（キャッシュキーには含めない）
+
+    Returns:
+        集計結果
+    """
+    if _running is not None:
+        return _running.summary(_df, _age_group)
+
+    # 循環参照を避けるため関数内で読み込む（計算バックエンドは AnalysisSummary を使う）
+    from utils.compute_backend import get_compute_backend
+
+    return get_compute_backend().summarize(_df)
@@ -0,0 +1,438 @@
+"""メモリに載らない大きなCSVを列指向ファイル（Parquet）経由で集計するモジュール（アウトオブコア）
+
+CSVをチャンクごとに読み、ローカルディスク上の Parquet ファイルに書き出す。
+行グループ（row group）は1つの年齢層だけを含むように書くため、各行グループの
+年齢層の最小値・最大値の統計から、年齢層フィルターに一致しない行グループを
+読まずに飛ばせる（述語のプッシュダウン）。
+
+集計は行グループを1つずつ読み、部分統計量（utils/partial_stats.py）を足し合わせて
+AnalysisSummary を組み立てる。メモリに残るのは1行グループ分のデータと、
+種目数・年齢層数で大きさが決まる部分統計量だけになる。
+
+作成したファイルは環境変数 OUT_OF_CORE_DIR のディレクトリ（既定は一時ディレクトリ配下）に
+元ファイルのパス・サイズ・更新時刻ごとに保存し、プロセスを再起動しても使い回す。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import streamlit as st
+
+from utils.analysis_summary import AnalysisSummary
+from utils.data_loader import SOURCE_FILE_COLUMN, data_file_type, detect_csv_format
+from utils.parallel_aggregation import summary_from_partial
+from utils.partial_stats import PartialStats, compute_partial
+from utils.score_cleaning import CleaningReport, clean_scores
+
+logger = logging.getLogger(__name__)
+
+OUT_OF_CORE_DIR_ENV = "OUT_OF_CORE_DIR"
+OUT_OF_CORE_MIN_BYTES_ENV = "OUT_OF_CORE_MIN_BYTES"
+
+# これ以上の大きさのCSVはメモリに読み込まずアウトオブコアで扱う（既定 512MB）
+DEFAULT_OUT_OF_CORE_MIN_BYTES = 512 * 1024 * 1024
+
+# CSVを読み込むチャンクの行数
+INGEST_CHUNK_ROWS = 250_000
+
+# 1行グループの行数（集計時に一度にメモリに載る行数の上限）
+ROW_GROUP_ROWS = 250_000
+
+# Parquet のメタデータに保存するマニフェストのキー
+MANIFEST_KEY = b"sports_survey_manifest"
+
+ID_COLUMN = "回答者ID"
+AGE_COLUMN = "年齢層"
+
+
+@dataclass(frozen=True)
+class ColumnarDataset:
+    """列指向ファイルに変換したデータセット
+
+    Attributes:
+        path: Parquet ファイルのパス
+        rows: 行数
+        columns: カラム名（元のCSVの順）
+        sports: スポーツ種目のカラム名
+        age_groups: 年齢層（昇順、欠損は含まない）
+        row_groups: 行グループ数
+        fingerprint: 元ファイルのパス・サイズ・更新時刻から求めたフィンガープリント
+    """
+
+    path: Path
+    rows: int
+    columns: list[str]
+    sports: list[str]
+    age_groups: list[str]
+    row_groups: int
+    fingerprint: str
+
+
+def get_out_of_core_dir() -> Path:
+    """列指向ファイルの保存先ディレクトリ"""
+    raw = os.environ.get(OUT_OF_CORE_DIR_ENV)
+    if raw:
+        return Path(raw)
+    return Path(tempfile.gettempdir()) / "streamlit_columnar_store"
+
+
+def get_out_of_core_min_bytes() -> int:
+    """アウトオブコアで扱うファイルサイズの下限（バイト）"""
+    raw = os.environ.get(OUT_OF_CORE_MIN_BYTES_ENV)
+    if raw:
+        return int(raw)
+    return DEFAULT_OUT_OF_CORE_MIN_BYTES
+
+
+def is_out_of_core(path: str | Path) -> bool:
+    """ファイルがアウトオブコアで扱う大きさのCSVか（他の形式はメモリに読み込む）"""
+    if data_file_type(path) != "csv":
+        return False
+    return Path(path).stat().st_size >= get_out_of_core_min_bytes()
+
+
+def source_fingerprint(path: str | Path) -> str:
+    """元ファイルのパス・サイズ・更新時刻から求めるフィンガープリント（内容は読まない）"""
+    path = Path(path)
+    stat = path.stat()
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{path.resolve()}\x1f{stat.st_size}\x1f{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def _chunk_schema(chunk: pd.DataFrame, sports: list[str]) -> pa.Schema:
+    """最初のチャンクから列指向ファイルのスキーマを決める（関心度は float64、年齢層は文字列）"""
+    fields = []
+    for col in chunk.columns:
+        if col in sports:
+            fields.append(pa.field(col, pa.float64()))
+        elif col == AGE_COLUMN:
+            fields.append(pa.field(col, pa.string()))
+        else:
+            fields.append(pa.Schema.from_pandas(chunk[[col]], preserve_index=False).field(col))
+    return pa.schema(fields)
+
+
+def ingest_csv(
+    source: str | Path,
+    dest: str | Path,
+    chunk_rows: int = INGEST_CHUNK_ROWS,
+    row_group_rows: int = ROW_GROUP_ROWS,
+) -> ColumnarDataset:
+    """CSVをチャンクごとに読み込み、年齢層ごとに分けた行グループの Parquet ファイルに変換
+
+    年齢層ごとに行をためて row_group_rows 行ごとに書き出すため、変換中に
+    メモリに載るのは最大で「チャンク1つ + 年齢層数 × row_group_rows 行」になる。
+    関心度の表記ゆれ（全角数字・欠損値の表記など）は utils/score_cleaning.py で
+    修正し、修正しても数値にできない値は欠損として扱う。書き込みは一時ファイルに行い、
+    完了してから置き換える。
+
+    Args:
+        source: CSVファイルのパス
+        dest: 作成する Parquet ファイルのパス
+        chunk_rows: CSVを読み込むチャンクの行数
+        row_group_rows: 1行グループの行数
+
+    Returns:
+        変換したデータセット
+
+    Raises:
+        ValueError: 必須カラムが無い場合、チャンク間でカラムが異なる場合
+    """
+    source = Path(source)
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    fingerprint = source_fingerprint(source)
+
+    columns: list[str] | None = None
+    sports: list[str] = []
+    schema: pa.Schema | None = None
+    writer: pq.ParquetWriter | None = None
+    # 年齢層（欠損は None）ごとに書き出し待ちのチャンク
+    buffers: dict[str | None, list[pd.DataFrame]] = {}
+    buffered_rows: dict[str | None, int] = {}
+    age_groups: set[str] = set()
+    cleaning = CleaningReport()
+    rows = 0
+
+    def flush(age: str | None) -> None:
+        frames = buffers.pop(age, [])
+        buffered_rows.pop(age, None)
+        if frames:
+            table = pa.Table.from_pandas(
+                pd.concat(frames, ignore_index=True), schema=schema, preserve_index=False
+            )
+            writer.write_table(table, row_group_size=row_group_rows)
+
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    try:
+        reader = pd.read_csv(
+            source,
+            chunksize=chunk_rows,
+            dtype={AGE_COLUMN: "string"},
+            **detect_csv_format(source).read_csv_options(),
+        )
+        for chunk in reader:
+            if columns is None:
+                columns = list(chunk.columns)
+                if ID_COLUMN not in columns or AGE_COLUMN not in columns:
+                    raise ValueError(f"必須カラム（{ID_COLUMN}, {AGE_COLUMN}）がありません")
+                excluded = (ID_COLUMN, AGE_COLUMN, SOURCE_FILE_COLUMN)
+                sports = [c for c in columns if c not in excluded]
+            elif list(chunk.columns) != columns:
+                raise ValueError("チャンク間でカラムが一致しません")
+
+            # 表記ゆれはアップロードと同じく修正し、修正できない値だけを欠損にする
+            chunk = clean_scores(chunk, cleaning)
+            for col in sports:
+                chunk[col] = pd.to_numeric(chunk[col], errors="coerce").astype("float64")
+            if schema is None:
+                schema = _chunk_schema(chunk, sports)
+                writer = pq.ParquetWriter(tmp, schema)
+
+            rows += len(chunk)
+            for age, part in chunk.groupby(AGE_COLUMN, dropna=False, sort=False):
+                key = None if pd.isna(age) else str(age)
+                if key is not None:
+                    age_groups.add(key)
+                buffers.setdefault(key, []).append(part)
+                buffered_rows[key] = buffered_rows.get(key, 0) + len(part)
+                if buffered_rows[key] >= row_group_rows:
+                    flush(key)
+
+        if writer is None:
+            raise ValueError("データがありません")
+        for age in list(buffers):
+            flush(age)
+
+        dataset = ColumnarDataset(
+            path=dest,
+            rows=rows,
+            columns=columns,
+            sports=sports,
+            age_groups=sorted(age_groups),
+            row_groups=0,
+            fingerprint=fingerprint,
+        )
+        writer.add_key_value_metadata({MANIFEST_KEY: json.dumps(_manifest(dataset))})
+        writer.close()
+        writer = None
+        os.replace(tmp, dest)
+    finally:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
+
+    if cleaning.total:
+        logger.info(f"Columnar ingest cleaned scores: source={source}, {cleaning.format()}")
+    dataset = open_columnar_dataset(dest)
+    logger.info(
+        f"Columnar ingest finished: source={source}, rows={rows}, "
+        f"row_groups={dataset.row_groups}, elapsed={time.perf_counter() - started:.2f}s"
+    )
+    return dataset
+
+
+def _manifest(dataset: ColumnarDataset) -> dict:
+    """Parquet のメタデータに保存する内容"""
+    return {
+        "rows": dataset.rows,
+        "columns": dataset.columns,
+        "sports": dataset.sports,
+        "age_groups": dataset.age_groups,
+        "fingerprint": dataset.fingerprint,
+    }
+
+
+def open_columnar_dataset(path: str | Path) -> ColumnarDataset:
+    """作成済みの Parquet ファイルを開く（メタデータのマニフェストだけを読む）
+
+    Args:
+        path: Parquet ファイルのパス
+
+    Returns:
+        データセット
+
+    Raises:
+        ValueError: ingest_csv で作成したファイルでない場合
+    """
+    path = Path(path)
+    metadata = pq.read_metadata(path)
+    raw = (metadata.metadata or {}).get(MANIFEST_KEY)
+    if raw is None:
+        raise ValueError(f"マニフェストがありません: {path}")
+    manifest = json.loads(raw)
+    return ColumnarDataset(
+        path=path,
+        rows=manifest["rows"],
+        columns=manifest["columns"],
+        sports=manifest["sports"],
+        age_groups=manifest["age_groups"],
+        row_groups=metadata.num_row_groups,
+        fingerprint=manifest["fingerprint"],
+    )
+
+
+def matching_row_groups(dataset: ColumnarDataset, age_group: str | None = None) -> list[int]:
+    """年齢層フィルターに一致しうる行グループの番号
+
+    行グループの年齢層の最小値・最大値の統計に含まれない行グループと、
+    年齢層がすべて欠損の行グループを除く。統計が無い行グループは読む対象に残す。
+
+    Args:
+        dataset: データセット
+        age_group: 年齢層（Noneなら全行グループ）
+
+    Returns:
+        行グループの番号
+    """
+    if age_group is None:
+        return list(range(dataset.row_groups))
+    metadata = pq.read_metadata(dataset.path)
+    age_index = metadata.schema.to_arrow_schema().get_field_index(AGE_COLUMN)
+    matches = []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(age_index).statistics
+        if stats is not None and stats.has_min_max:
+            if not stats.min <= age_group <= stats.max:
+                continue
+        elif stats is not None and stats.has_null_count and stats.null_count == stats.num_values:
+            continue
+        matches.append(i)
+    return matches
+
+
+def scan_partial(dataset: ColumnarDataset, age_group: str | None = None) -> PartialStats:
+    """行グループを1つずつ読み、部分統計量を足し合わせる
+
+    年齢層フィルターを指定した場合、年齢層の番号は0（その年齢層のみ）になる。
+
+    Args:
+        dataset: データセット
+        age_group: 年齢層（Noneなら全年齢）
+
+    Returns:
+        対象行全体の部分統計量
+    """
+    groups = dataset.age_groups if age_group is None else [age_group]
+    value_set = pa.array(groups, type=pa.string())
+    parquet = pq.ParquetFile(dataset.path)
+
+    stats = compute_partial(
+        np.empty((0, len(dataset.sports))), np.empty(0, dtype=np.int64), len(groups)
+    )
+    for i in matching_row_groups(dataset, age_group):
+        table = parquet.read_row_group(i, columns=[*dataset.sports, AGE_COLUMN])
+        if age_group is not None:
+            table = table.filter(pc.equal(table[AGE_COLUMN], age_group))
+        codes = pc.index_in(table[AGE_COLUMN], value_set=value_set).fill_null(-1).to_numpy()
+        # 種目ごとに連続した (k, n) の配列を作り、転置して (n, k) として渡す
+        block = np.empty((len(dataset.sports), table.num_rows), dtype=np.float64)
+        for j, col in enumerate(dataset.sports):
+            block[j] = table[col].to_numpy()
+        stats = stats.merge(compute_partial(block.T, codes, len(groups)))
+    return stats
+
+
+def scan_summary(dataset: ColumnarDataset, age_group: str | None = None) -> AnalysisSummary:
+    """行グループを走査して compute_analysis_summary と同じ集計結果を求める
+
+    分布統計はヒストグラムから求めるため、1〜5の整数以外の値は分布統計に含めない。
+
+    Args:
+        dataset: データセット
+        age_group: 年齢層（Noneなら全年齢）
+
+    Returns:
+        集計結果
+    """
+    groups = dataset.age_groups if age_group is None else [age_group]
+    return summary_from_partial(scan_partial(dataset, age_group), dataset.sports, groups)
+
+
+def read_preview(
+    dataset: ColumnarDataset, rows: int = 1000, age_group: str | None = None
+) -> pd.DataFrame:
+    """先頭から rows 行だけを読み込む（プレビュー表示用）
+
+    Args:
+        dataset: データセット
+        rows: 読み込む行数
+        age_group: 年齢層（Noneなら全年齢）
+
+    Returns:
+        先頭 rows 行のDataFrame
+    """
+    parquet = pq.ParquetFile(dataset.path)
+    tables = []
+    remaining = rows
+    for i in matching_row_groups(dataset, age_group):
+        if remaining <= 0:
+            break
+        table = parquet.read_row_group(i)
+        if age_group is not None:
+            table = table.filter(pc.equal(table[AGE_COLUMN], age_group))
+        tables.append(table.slice(0, remaining))
+        remaining -= tables[-1].num_rows
+    if not tables:
+        return parquet.schema_arrow.empty_table().to_pandas()
+    return pa.concat_tables(tables).to_pandas()
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _get_columnar_dataset(source: str, mtime_ns: int) -> ColumnarDataset:
+    """列指向ファイルを作成または再利用（元ファイルのパスと更新時刻ごとにキャッシュ）"""
+    dest = get_out_of_core_dir() / f"{source_fingerprint(source)}.parquet"
+    if dest.exists():
+        try:
+            return open_columnar_dataset(dest)
+        except Exception as e:
+            logger.warning(f"Columnar file unreadable, re-ingesting: path={dest}, error={e}")
+    return ingest_csv(source, dest)
+
+
+def get_columnar_dataset(source: str | Path) -> ColumnarDataset:
+    """CSVを列指向ファイルに変換したデータセットを全セッション共通のキャッシュ経由で取得
+
+    Args:
+        source: CSVファイルのパス
+
+    Returns:
+        データセット
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+    """
+    source = Path(source)
+    if not source.exists():
+        raise FileNotFoundError(f"ファイルが見つかりません: {source}")
+    return _get_columnar_dataset(str(source.resolve()), source.stat().st_mtime_ns)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def get_columnar_summary(
+    fingerprint: str, age_group: str | None, _dataset: ColumnarDataset
+) -> AnalysisSummary:
+    """データセット・年齢層ごとにキャッシュした集計結果を取得
+
+    Args:
+        fingerprint: データセットのフィンガープリント
+        age_group: 年齢層（Noneなら全年齢）
+        _dataset: データセット（キャッシュキーには含めない）
+
+    Returns:
+        集計結果
+    """
+    return scan_summary(_dataset, age_group)
@@ -0,0 +1,376 @@
+"""分析処理（読み込み・フィルタリング・集計）の計算バックエンドを切り替えるモジュール
+
+画面側は常に pandas の DataFrame と AnalysisSummary を受け取り、内部の計算だけを
+バックエンドごとに切り替える。使うバックエンドは環境変数 COMPUTE_BACKEND で指定する。
+
+- pandas: 従来の処理（大規模データはプロセスプールで分割集計）
+- arrow: pyarrow のマルチスレッドCSVリーダーで読み込み、部分統計量（行列積）で集計
+- duckdb: プロセス内の DuckDB で SQL として集計（duckdb のインストールが必要）
+- polars: Polars の LazyFrame で集計（polars のインストールが必要）
+
+どのバックエンドも compute_analysis_summary と同じ結果を返す
+（tests/test_compute_backend.py の共通テストで確認する）。
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import IO
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.analysis_summary import SCORE_VALUES, AnalysisSummary
+from utils.data_loader import (
+    detect_csv_format,
+    filter_by_age_group,
+    get_sports_columns,
+    load_csv_data,
+)
+from utils.parallel_aggregation import (
+    QUANTILES,
+    compute_summary,
+    group_quantiles,
+    quantile_frame,
+    summary_from_partial,
+)
+from utils.partial_stats import compute_partial
+
+logger = logging.getLogger(__name__)
+
+COMPUTE_BACKEND_ENV = "COMPUTE_BACKEND"
+DEFAULT_BACKEND = "pandas"
+
+CsvSource = str | Path | IO[bytes]
+
+
+class PandasBackend:
+    """pandas による従来の処理（他のバックエンドの基底クラス）"""
+
+    name = "pandas"
+
+    def load_csv(self, source: CsvSource) -> pd.DataFrame:
+        """CSVを読み込む
+
+        Args:
+            source: CSVファイルのパス、またはアップロードされたファイル
+
+        Returns:
+            読み込んだデータ
+        """
+        if isinstance(source, str | Path):
+            return load_csv_data(str(source))
+        return pd.read_csv(source, **detect_csv_format(source).read_csv_options())
+
+    def filter_by_age_group(self, df: pd.DataFrame, age_group: str | None) -> pd.DataFrame:
+        """年齢層でフィルタリング（None・"全年齢" ならそのまま返す）"""
+        return filter_by_age_group(df, age_group)
+
+    def summarize(self, df: pd.DataFrame) -> AnalysisSummary:
+        """分析ページの集計結果を計算（年齢層別の集計・相関を含む）"""
+        return compute_summary(df)
+
+
+class ArrowBackend(PandasBackend):
+    """pyarrow で読み込み、部分統計量で集計するバックエンド"""
+
+    name = "arrow"
+
+    def load_csv(self, source: CsvSource) -> pd.DataFrame:
+        from pyarrow import csv
+
+        if isinstance(source, str | Path) and not Path(source).exists():
+            raise FileNotFoundError(f"ファイルが見つかりません: {source}")
+        fmt = detect_csv_format(source)
+        table = csv.read_csv(
+            str(source) if isinstance(source, Path) else source,
+            read_options=csv.ReadOptions(
+                use_threads=True,
+                encoding=fmt.arrow_encoding,
+                skip_rows=fmt.header_row or 0,
+                autogenerate_column_names=fmt.header_row is None,
+            ),
+            parse_options=csv.ParseOptions(delimiter=fmt.delimiter),
+        )
+        return table.to_pandas()
+
+    def summarize(self, df: pd.DataFrame) -> AnalysisSummary:
+        sports_cols = get_sports_columns(df)
+        codes, groups = pd.factorize(df["年齢層"], sort=True)
+        scores = np.empty((len(sports_cols), len(df)), dtype=np.float64)
+        for i, col in enumerate(sports_cols):
+            scores[i] = df[col].to_numpy(dtype="float64", na_value=np.nan)
+        stats = compute_partial(scores.T, codes, len(groups))
+        return summary_from_partial(
+            stats, sports_cols, groups, quantile_fallback=lambda: group_quantiles(df, sports_cols)
+        )
+
+
+class DuckDBBackend(PandasBackend):
+    """プロセス内の DuckDB で読み込み・フィルタリング・集計するバックエンド"""
+
+    name = "duckdb"
+
+    def __init__(self):
+        import duckdb
+
+        self._duckdb = duckdb
+
+    def _query(self, df: pd.DataFrame, sql: str, params: list | None = None) -> pd.DataFrame:
+        """DataFrame を survey テーブルとして SQL を実行（接続は呼び出しごとに作る）"""
+        with self._duckdb.connect() as con:
+            con.register("survey", df)
+            return con.execute(sql, params or []).df()
+
+    def load_csv(self, source: CsvSource) -> pd.DataFrame:
+        # DuckDB はファイルオブジェクトを fsspec 経由でしか読めず、UTF-8 以外の文字コードは
+        # 拡張機能が必要なため、これらは pandas で読み込む
+        if not isinstance(source, str | Path):
+            return super().load_csv(source)
+        if not Path(source).exists():
+            raise FileNotFoundError(f"ファイルが見つかりません: {source}")
+        fmt = detect_csv_format(source)
+        if not fmt.is_utf8:
+            return super().load_csv(source)
+        with self._duckdb.connect() as con:
+            return con.read_csv(
+                str(source),
+                sep=fmt.delimiter,
+                header=fmt.header_row is not None,
+                skiprows=fmt.header_row or 0,
+            ).df()
+
+    def filter_by_age_group(self, df: pd.DataFrame, age_group: str | None) -> pd.DataFrame:
+        if age_group is None or age_group == "全年齢":
+            return df
+        return self._query(df, 'SELECT * FROM survey WHERE "年齢層" = ?', [age_group])
+
+    def summarize(self, df: pd.DataFrame) -> AnalysisSummary:
+        sports_cols = get_sports_columns(df)
+        cols = [_quote(col) for col in sports_cols]
+
+        # 全体の平均・相関（corr は2列とも値がある行で計算される）・関心度ごとの件数
+        overall = [f"avg({c})" for c in cols]
+        overall += [f"corr({a}, {b})" for a in cols for b in cols]
+        overall += [f"count(*) FILTER (WHERE {c} = {v})" for c in cols for v in SCORE_VALUES]
+        row = self._query(df, f"SELECT {', '.join(overall)} FROM survey").iloc[0]
+        values = pd.to_numeric(row, errors="coerce").to_numpy(dtype="float64")
+
+        k = len(sports_cols)
+        means = values[:k]
+        corr = values[k : k + k * k].reshape(k, k)
+        hist = values[k + k * k :].reshape(k, len(SCORE_VALUES)).astype(np.int64)
+
+        grouped = self._query(
+            df,
+            f'SELECT "年齢層", {", ".join(f"avg({c})" for c in cols)}, '
+            f"{', '.join(f'quantile_cont({c}, {QUANTILES})' for c in cols)} "
+            'FROM survey WHERE "年齢層" IS NOT NULL GROUP BY 1 ORDER BY 1',
+        )
+        return _assemble_summary(
+            sports_cols,
+            means,
+            corr,
+            hist,
+            groups=_age_groups(grouped.iloc[:, 0].tolist(), df["年齢層"].dtype),
+            group_means=grouped.iloc[:, 1 : k + 1].to_numpy(dtype="float64"),
+            quantiles=grouped.iloc[:, k + 1 :].map(_quantile_list).to_numpy().tolist(),
+            row_count=len(df),
+        )
+
+
+class PolarsBackend(PandasBackend):
+    """Polars の LazyFrame で読み込み・フィルタリング・集計するバックエンド"""
+
+    name = "polars"
+
+    def __init__(self):
+        import polars
+
+        self._pl = polars
+
+    def load_csv(self, source: CsvSource) -> pd.DataFrame:
+        if isinstance(source, str | Path) and not Path(source).exists():
+            raise FileNotFoundError(f"ファイルが見つかりません: {source}")
+        fmt = detect_csv_format(source)
+        return self._pl.read_csv(
+            source,
+            encoding="utf8" if fmt.is_utf8 else fmt.encoding,
+            separator=fmt.delimiter,
+            skip_rows=fmt.header_row or 0,
+            has_header=fmt.header_row is not None,
+        ).to_pandas()
+
+    def filter_by_age_group(self, df: pd.DataFrame, age_group: str | None) -> pd.DataFrame:
+        if age_group is None or age_group == "全年齢":
+            return df
+        pl = self._pl
+        return pl.from_pandas(df).lazy().filter(pl.col("年齢層") == age_group).collect().to_pandas()
+
+    def summarize(self, df: pd.DataFrame) -> AnalysisSummary:
+        pl = self._pl
+        sports_cols = get_sports_columns(df)
+        k = len(sports_cols)
+        lazy = pl.from_pandas(df).lazy().with_columns(pl.col(sports_cols).cast(pl.Float64))
+
+        # 相関は2列とも値がある行だけで計算する（DataFrame.corr と同じ扱い）
+        def pair_corr(a: str, b: str):
+            both = pl.col(a).is_not_null() & pl.col(b).is_not_null()
+            return pl.corr(pl.col(a).filter(both), pl.col(b).filter(both))
+
+        overall = [pl.col(c).mean().alias(f"mean_{i}") for i, c in enumerate(sports_cols)]
+        overall += [
+            pair_corr(a, b).alias(f"corr_{i}_{j}")
+            for i, a in enumerate(sports_cols)
+            for j, b in enumerate(sports_cols)
+        ]
+        overall += [
+            (pl.col(c) == v).sum().alias(f"hist_{i}_{v}")
+            for i, c in enumerate(sports_cols)
+            for v in SCORE_VALUES
+        ]
+        group_exprs = [pl.col(c).mean().alias(f"mean_{i}") for i, c in enumerate(sports_cols)]
+        group_exprs += [
+            pl.col(c).quantile(q, interpolation="linear").alias(f"q_{i}_{n}")
+            for i, c in enumerate(sports_cols)
+            for n, q in enumerate(QUANTILES)
+        ]
+        overall_frame, grouped = pl.collect_all(
+            [
+                lazy.select(overall),
+                lazy.filter(pl.col("年齢層").is_not_null())
+                .group_by("年齢層")
+                .agg(group_exprs)
+                .sort("年齢層"),
+            ]
+        )
+
+        values = np.array(overall_frame.row(0), dtype="float64")
+        quantiles = grouped.select(pl.exclude("年齢層", "^mean_.*$")).to_numpy()
+        return _assemble_summary(
+            sports_cols,
+            means=values[:k],
+            corr=values[k : k + k * k].reshape(k, k),
+            hist=values[k + k * k :].reshape(k, len(SCORE_VALUES)).astype(np.int64),
+            groups=_age_groups(grouped["年齢層"].to_list(), df["年齢層"].dtype),
+            group_means=grouped.select(pl.col("^mean_.*$")).to_numpy().astype("float64"),
+            quantiles=quantiles.reshape(len(grouped), k, len(QUANTILES)).tolist(),
+            row_count=len(df),
+        )
+
+
+# バックエンド名と実装の対応
+BACKENDS: dict[str, type[PandasBackend]] = {
+    backend.name: backend for backend in [PandasBackend, ArrowBackend, DuckDBBackend, PolarsBackend]
+}
+
+
+def _quote(identifier: str) -> str:
+    """SQL の識別子として引用符で囲む"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _quantile_list(value: object) -> list[float]:
+    """DuckDB の quantile_cont の結果（リスト、値が無ければNULL）を分位点のリストにする"""
+    if value is None or (np.isscalar(value) and pd.isna(value)):
+        return [np.nan] * len(QUANTILES)
+    return [np.nan if v is None else float(v) for v in value]
+
+
+def _age_groups(values: list, dtype) -> pd.Index:
+    """集計結果の年齢層を元のカラムと同じ型の Index にする（カテゴリ型は CategoricalIndex）"""
+    return pd.Index(values, name="年齢層").astype(dtype)
+
+
+def _assemble_summary(
+    sports_cols: list[str],
+    means: np.ndarray,
+    corr: np.ndarray,
+    hist: np.ndarray,
+    groups: pd.Index,
+    group_means: np.ndarray,
+    quantiles: list,
+    row_count: int,
+) -> AnalysisSummary:
+    """バックエンドで計算した配列から AnalysisSummary を組み立てる
+
+    Args:
+        sports_cols: スポーツ種目のカラム名
+        means: (k,) 種目別の平均
+        corr: (k, k) 相関行列
+        hist: (k, 5) 種目別の関心度ごとの件数
+        groups: 年齢層（昇順、_age_groups で元のカラムと型を揃えたもの）
+        group_means: (G, k) 年齢層別・種目別の平均
+        quantiles: (G, k, 5) 年齢層別・種目別の分位点
+        row_count: 行数
+
+    Returns:
+        集計結果
+    """
+    group_index = groups
+    score_distribution = pd.DataFrame(hist.T, index=SCORE_VALUES, columns=sports_cols)
+    score_distribution.index.name = "関心度"
+    quantiles = np.asarray(quantiles, dtype="float64").reshape(
+        len(groups), len(sports_cols), len(QUANTILES)
+    )
+    return AnalysisSummary(
+        sport_means=pd.Series(means, index=sports_cols).sort_values(ascending=False),
+        age_group_means=pd.DataFrame(group_means, index=group_index, columns=sports_cols),
+        correlation=pd.DataFrame(corr, index=sports_cols, columns=sports_cols),
+        score_distribution=score_distribution,
+        distribution_stats=quantile_frame(quantiles, sports_cols, groups),
+        row_count=row_count,
+    )
+
+
+def create_backend(name: str) -> PandasBackend:
+    """名前を指定してバックエンドを作成
+
+    Args:
+        name: バックエンド名（"pandas", "arrow", "duckdb", "polars"）
+
+    Returns:
+        バックエンド
+
+    Raises:
+        ValueError: 未知のバックエンド名の場合
+        ImportError: バックエンドに必要なライブラリがインストールされていない場合
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"未知の計算バックエンドです: {name}（{', '.join(BACKENDS)}）")
+    return BACKENDS[name]()
+
+
+def available_backends() -> list[str]:
+    """この環境で使えるバックエンド名（必要なライブラリがインストールされているもの）"""
+    names = []
+    for name in BACKENDS:
+        try:
+            create_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+@st.cache_resource(show_spinner=False)
+def get_compute_backend() -> PandasBackend:
+    """環境変数 COMPUTE_BACKEND で指定されたバックエンドを取得（プロセスで1つ）
+
+    必要なライブラリが無い場合は警告を記録し、pandas バックエンドを使う。
+
+    Returns:
+        バックエンド
+
+    Raises:
+        ValueError: 未知のバックエンド名の場合
+    """
+    name = os.environ.get(COMPUTE_BACKEND_ENV, "").strip().lower() or DEFAULT_BACKEND
+    try:
+        backend = create_backend(name)
+    except ImportError as e:
+        logger.warning(f"Compute backend unavailable, using pandas: backend={name}, error={e}")
+        backend = PandasBackend()
+    logger.info(f"Compute backend: {backend.name}")
+    return backend
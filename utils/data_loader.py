@@ -1,16 +1,187 @@
 """データ読み込みユーティリティモジュール"""
 
+import codecs
+import csv
+import itertools
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
 from pathlib import Path
+from typing import IO
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
 
+# サンプルデータ(男性スポーツ関心度調査)のパス
+SAMPLE_DATA_PATH = Path(__file__).parent.parent / "data" / "sample_data.csv"
 
-def load_csv_data(file_path: str) -> pd.DataFrame:
+# 複数ファイルを結合したデータセットで、各行の読み込み元ファイル名を持つカラム
+SOURCE_FILE_COLUMN = "ソースファイル"
+
+# 文字コード・区切り文字・ヘッダー行の判定に使うファイル先頭のバイト数
+SNIFF_BYTES = 64 * 1024
+
+# 判定に使う先頭の行数の上限
+SNIFF_LINES = 100
+
+# 区切り文字の候補（同じ確からしさなら先の候補を優先）
+DELIMITERS = (",", "\t", ";")
+
+# BOM があればその文字コードで読み込む（utf-8-sig は BOM を読み飛ばす）
+BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# 区切り文字で区切ったテキストファイルの拡張子（どれも "csv" として読み込む）
+TEXT_FILE_TYPES = ("csv", "tsv", "txt")
+
+# 読み込めるファイル形式（拡張子）
+DATA_FILE_TYPES = (*TEXT_FILE_TYPES, "parquet", "feather", "xlsx")
+
+# Parquet / Feather / xlsx を読み込む1チャンクあたりの行数
+TABLE_CHUNK_ROWS = 65_536
+
+# BOM が無い場合に順に試す文字コード（cp932 は Excel が書き出す Shift_JIS の上位互換）
+FALLBACK_ENCODINGS = ("utf-8", "cp932")
+
+
+@dataclass(frozen=True)
+class CsvFormat:
+    """CSVファイルの形式（文字コード・区切り文字・ヘッダー行）
+
+    Attributes:
+        encoding: 文字コード（Python のコーデック名）
+        delimiter: 区切り文字
+        header_row: ヘッダー行の位置（0始まり。前にあるタイトル行などは読み飛ばす。
+            ヘッダー行が無い場合はNone）
+    """
+
+    encoding: str = "utf-8"
+    delimiter: str = ","
+    header_row: int | None = 0
+
+    @property
+    def is_utf8(self) -> bool:
+        """UTF-8（BOM付きを含む）か"""
+        return self.encoding in ("utf-8", "utf-8-sig")
+
+    @property
+    def arrow_encoding(self) -> str:
+        """pyarrow.csv.ReadOptions の encoding（UTF-8 は BOM の有無に関わらず変換せずに読む）"""
+        return "utf8" if self.is_utf8 else self.encoding
+
+    def read_csv_options(self) -> dict:
+        """pd.read_csv に渡すオプション"""
+        return {
+            "encoding": self.encoding,
+            "sep": self.delimiter,
+            "skiprows": self.header_row or 0,
+            "header": None if self.header_row is None else 0,
+        }
+
+
+def _decode_sample(sample: bytes, encodings: tuple[str, ...]) -> tuple[str, str]:
+    """先頭のバイト列を最初に復号できた文字コードで復号（途中で切れた末尾の文字は無視）"""
+    for encoding in encodings:
+        try:
+            return encoding, codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        except UnicodeDecodeError:
+            continue
+    # どれでも復号できなければ既定の文字コードとし、読み込み時のエラーで知らせる
+    return encodings[0], sample.decode(encodings[0], errors="replace")
+
+
+def _is_numeric(field: str) -> bool:
+    try:
+        float(field)
+    except ValueError:
+        return False
+    return True
+
+
+def sniff_csv_format(sample: bytes, truncated: bool = True) -> CsvFormat:
+    """ファイル先頭のバイト列から文字コード・区切り文字・ヘッダー行を判定
+
+    先頭を1回だけ復号し、区切り文字の候補ごとに各行のフィールド数を数える。
+    最も多くの行で同じフィールド数（2以上）になる候補を区切り文字とし、
+    そのフィールド数の最初の行を、数値以外のフィールドを含めばヘッダー行とする。
+
+    Args:
+        sample: ファイル先頭のバイト列（SNIFF_BYTES 程度）
+        truncated: sample がファイルの途中で切れているか（最後の行を判定に使わない）
+
+    Returns:
+        判定したCSVファイルの形式
+    """
+    encodings = FALLBACK_ENCODINGS
+    for bom, bom_encoding in BOM_ENCODINGS:
+        if sample.startswith(bom):
+            encodings = (bom_encoding,)
+            break
+    encoding, text = _decode_sample(sample, encodings)
+
+    lines = text.splitlines()
+    if truncated and len(lines) > 1:
+        # 途中で切れた最後の行は判定に使わない
+        lines.pop()
+    lines = lines[:SNIFF_LINES]
+
+    best = None
+    for delimiter in DELIMITERS:
+        widths = [len(row) for row in csv.reader(lines, delimiter=delimiter)]
+        counts = Counter(width for width in widths if width > 1)
+        if counts:
+            width, frequency = counts.most_common(1)[0]
+            if best is None or frequency > best[1]:
+                best = (delimiter, frequency, width, widths)
+    if best is None:
+        # 1列だけのファイル・空のファイル
+        return CsvFormat(encoding=encoding)
+    delimiter, _, width, widths = best
+
+    header_row = widths.index(width)
+    fields = next(csv.reader([lines[header_row]], delimiter=delimiter))
+    if all(_is_numeric(field) for field in fields if field.strip()):
+        header_row = None
+    return CsvFormat(encoding=encoding, delimiter=delimiter, header_row=header_row)
+
+
+def detect_csv_format(source: str | Path | IO[bytes]) -> CsvFormat:
+    """ファイルまたはファイルオブジェクトの先頭を読んでCSVの形式を判定
+
+    ファイルオブジェクトは先頭を読んだ後、読み始めた位置に戻す。
+
+    Args:
+        source: CSVファイルのパス、またはバイナリのファイルオブジェクト
+
+    Returns:
+        判定したCSVファイルの形式
+    """
+    if isinstance(source, str | Path):
+        with open(source, "rb") as f:
+            sample = f.read(SNIFF_BYTES)
+    else:
+        position = source.tell()
+        sample = source.read(SNIFF_BYTES)
+        source.seek(position)
+    return sniff_csv_format(sample, truncated=len(sample) == SNIFF_BYTES)
+
+
+def load_csv_data(file_path: str, columns: Sequence[str] | None = None) -> pd.DataFrame:
     """
     CSVファイルを読み込んでDataFrameを返す
 
+    文字コード（UTF-8 / BOM付き / Shift_JIS(CP932)）・区切り文字（カンマ / タブ / セミコロン）・
+    ヘッダー行の位置はファイルの先頭から判定する。
+
     Args:
         file_path: CSVファイルのパス
+        columns: 読み込むカラム（省略時は全カラム）
 
     Returns:
         pd.DataFrame: 読み込んだデータ
@@ -23,7 +194,216 @@ def load_csv_data(file_path: str) -> pd.DataFrame:
     if not path.exists():
         raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
 
-    return pd.read_csv(file_path)
+    return pd.read_csv(file_path, usecols=columns, **detect_csv_format(path).read_csv_options())
+
+
+def data_file_type(filename: str | Path) -> str:
+    """
+    ファイル名の拡張子から読み込む形式を判定
+
+    Args:
+        filename: ファイル名またはパス
+
+    Returns:
+        str: "csv" / "parquet" / "feather" / "xlsx"
+
+    Raises:
+        ValueError: 対応していない形式の場合
+    """
+    file_type = Path(filename).suffix.lower().lstrip(".")
+    if file_type not in DATA_FILE_TYPES:
+        raise ValueError(
+            f"対応していないファイル形式です: {Path(filename).name}"
+            f"（対応形式: {', '.join(DATA_FILE_TYPES)}）"
+        )
+    return "csv" if file_type in TEXT_FILE_TYPES else file_type
+
+
+def _arrow_source(source: str | Path | bytes) -> str | pa.BufferReader:
+    """パスはそのまま、バイト列はコピーせずに読み込めるバッファとして渡す"""
+    return pa.BufferReader(source) if isinstance(source, bytes) else str(source)
+
+
+def inspect_arrow_file(source: str | Path | bytes, file_type: str) -> tuple[list[str], int]:
+    """
+    Parquet / Feather ファイルのカラム名と行数をメタデータだけから取得
+
+    Args:
+        source: ファイルのパス、またはファイルの内容
+        file_type: "parquet" または "feather"
+
+    Returns:
+        tuple[list[str], int]: カラム名（pandas が名前の無いインデックスを保存したカラムは除く）と行数
+    """
+    if file_type == "parquet":
+        parquet_file = pq.ParquetFile(_arrow_source(source))
+        schema, num_rows = parquet_file.schema_arrow, parquet_file.metadata.num_rows
+    else:
+        reader = ipc.open_file(_arrow_source(source))
+        schema, num_rows = reader.schema, reader.count_rows()
+    return [name for name in schema.names if not name.startswith("__index_level_")], num_rows
+
+
+def iter_arrow_batches(
+    source: str | Path | bytes,
+    file_type: str,
+    columns: Sequence[str] | None = None,
+    batch_rows: int = TABLE_CHUNK_ROWS,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Parquet / Feather ファイルを先頭から順にレコードバッチとして読み込む
+
+    columns を指定した場合は、そのカラムだけを読み込む（Parquet は他のカラムを復号しない）。
+
+    Args:
+        source: ファイルのパス、またはファイルの内容
+        file_type: "parquet" または "feather"
+        columns: 読み込むカラム（省略時は全カラム）
+        batch_rows: Parquet の1バッチあたりの行数（Feather は書き込み時のバッチ単位）
+
+    Yields:
+        pa.RecordBatch: 読み込んだバッチ
+    """
+    if file_type == "parquet":
+        parquet_file = pq.ParquetFile(_arrow_source(source))
+        yield from parquet_file.iter_batches(batch_size=batch_rows, columns=columns)
+        return
+    reader = ipc.open_file(_arrow_source(source))
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        yield batch if columns is None else batch.select(list(columns))
+
+
+def read_arrow_table(
+    source: str | Path | bytes, file_type: str, columns: Sequence[str] | None = None
+) -> pa.Table:
+    """
+    Parquet / Feather ファイルを Arrow のテーブルとして読み込む
+
+    パスはメモリマップで開き、バイト列はコピーせずにバッファとして読む。
+
+    Args:
+        source: ファイルのパス、またはファイルの内容
+        file_type: "parquet" または "feather"
+        columns: 読み込むカラム（省略時は全カラム）
+
+    Returns:
+        pa.Table: 読み込んだテーブル
+    """
+    columns = None if columns is None else list(columns)
+    if file_type == "parquet":
+        return pq.read_table(_arrow_source(source), columns=columns, memory_map=True)
+    return feather.read_table(_arrow_source(source), columns=columns, memory_map=True)
+
+
+def arrow_to_pandas(table: pa.Table) -> pd.DataFrame:
+    """
+    Arrow のテーブルをDataFrameに変換
+
+    カラムごとに別のブロックにし（1つの2次元配列にまとめるコピーをしない）、欠損の無い
+    数値カラムは Arrow のバッファをそのまま使う。変換したカラムの Arrow 側のメモリは
+    変換しながら解放するため、table は変換後に使わないこと。pandas が保存した
+    メタデータは使わず、読み込んだカラムはインデックスにせずすべてカラムとして返す。
+
+    Args:
+        table: 変換するテーブル
+
+    Returns:
+        pd.DataFrame: 変換したデータ
+    """
+    return table.to_pandas(split_blocks=True, self_destruct=True, ignore_metadata=True)
+
+
+def iter_xlsx_chunks(
+    source: str | Path | IO[bytes],
+    chunk_rows: int = TABLE_CHUNK_ROWS,
+    columns: Sequence[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    xlsx ファイルの最初のワークシートを読み取り専用モードで先頭から順に読み込む
+
+    ワークシート全体をメモリに展開せず、行を順に読みながら chunk_rows 行ごとに
+    DataFrameにする。値が2つ以上ある最初の行をヘッダー行とし、その前のタイトル行は
+    読み飛ばす。空の行も読み飛ばす。各チャンクの attrs に、ヘッダー行の位置
+    （"header_row"、0始まり）と、ワークシートに記録された行数（"sheet_rows"、
+    記録が無ければNone）を入れる。データ行が無い場合は空のチャンクを1つ返す。
+
+    Args:
+        source: xlsx ファイルのパス、またはバイナリのファイルオブジェクト
+        chunk_rows: 1チャンクあたりの行数
+        columns: 読み込むカラム（省略時は全カラム）
+
+    Yields:
+        pd.DataFrame: 読み込んだチャンク
+
+    Raises:
+        pd.errors.EmptyDataError: ヘッダー行が見つからない場合
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        found = next(
+            (
+                (i, row)
+                for i, row in enumerate(rows)
+                if sum(value is not None for value in row) >= 2
+            ),
+            None,
+        )
+        if found is None:
+            raise pd.errors.EmptyDataError("ワークシートにヘッダー行が見つかりません")
+        header_row, header = found
+        width = max(i for i, value in enumerate(header) if value is not None) + 1
+        names = [
+            str(value) if value is not None else f"Unnamed: {i}"
+            for i, value in enumerate(header[:width])
+        ]
+        emitted = False
+        while True:
+            raw = list(itertools.islice(rows, chunk_rows))
+            block = [row[:width] for row in raw if any(value is not None for value in row[:width])]
+            if block or not emitted:
+                chunk = pd.DataFrame(block, columns=names)
+                if columns is not None:
+                    chunk = chunk[list(columns)]
+                chunk.attrs["header_row"] = header_row
+                chunk.attrs["sheet_rows"] = worksheet.max_row
+                yield chunk
+                emitted = True
+            if len(raw) < chunk_rows:
+                break
+    finally:
+        workbook.close()
+
+
+def load_data_file(file_path: str, columns: Sequence[str] | None = None) -> pd.DataFrame:
+    """
+    データファイルを拡張子に応じた形式（CSV / Parquet / Feather / xlsx）で読み込む
+
+    Args:
+        file_path: ファイルのパス
+        columns: 読み込むカラム（省略時は全カラム）
+
+    Returns:
+        pd.DataFrame: 読み込んだデータ
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+        ValueError: 対応していない形式の場合
+    """
+    file_type = data_file_type(file_path)
+    if file_type == "csv":
+        return load_csv_data(file_path, columns)
+    if not Path(file_path).exists():
+        raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
+    if file_type == "xlsx":
+        return pd.concat(iter_xlsx_chunks(file_path, columns=columns), ignore_index=True)
+    if columns is None:
+        columns, _ = inspect_arrow_file(file_path, file_type)
+    return arrow_to_pandas(read_arrow_table(file_path, file_type, columns))
 
 
 def load_sample_data() -> pd.DataFrame:
@@ -33,8 +413,7 @@ def load_sample_data() -> pd.DataFrame:
     Returns:
         pd.DataFrame: サンプルデータ
     """
-    sample_path = Path(__file__).parent.parent / "data" / "sample_data.csv"
-    return load_csv_data(str(sample_path))
+    return load_csv_data(str(SAMPLE_DATA_PATH))
 
 
 def validate_sports_survey_data(df: pd.DataFrame) -> bool:
@@ -55,7 +434,7 @@ def validate_sports_survey_data(df: pd.DataFrame) -> bool:
             return False
 
     # スポーツカラムが3つ以上存在するか確認
-    sports_columns = [col for col in df.columns if col not in required_columns]
+    sports_columns = get_sports_columns(df)
     if len(sports_columns) < 3:
         return False
 
@@ -72,7 +451,7 @@ def get_sports_columns(df: pd.DataFrame) -> list[str]:
     Returns:
         list[str]: スポーツ種目のカラム名リスト
     """
-    excluded_columns = ["回答者ID", "年齢層"]
+    excluded_columns = ["回答者ID", "年齢層", SOURCE_FILE_COLUMN]
     return [col for col in df.columns if col not in excluded_columns]
 
 
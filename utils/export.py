@@ -1,56 +1,74 @@
 """データエクスポートユーティリティモジュール"""
 
 import re
+import zipfile
+from collections.abc import Callable
 from datetime import datetime
 from io import BytesIO
 from typing import Literal
 
 import pandas as pd
-import streamlit as st
+
+from utils.analysis_summary import AnalysisSummary
+from utils.export_cache import get_export_cache
+from utils.fingerprint import compute_dataset_fingerprint
 
 ExportFormat = Literal["csv", "excel", "json"]
 
+# 分析レポートのダウンロード形式（DataFrame単位の変換には使わない）
+ReportFormat = Literal["excel", "zip"]
+
+# 画面からのExcelエクスポートで使うシート名
+EXPORT_SHEET_NAME = "スポーツ関心度データ"
+
+# 画面からのエクスポートで使う形式ごとの変換パラメータ
+UI_EXPORT_PARAMS: dict[str, dict[str, str]] = {
+    "csv": {},
+    "excel": {"sheet_name": EXPORT_SHEET_NAME},
+    "json": {"orient": "records"},
+}
 
-@st.cache_data(ttl=300, show_spinner=False)
-def export_to_csv(df: pd.DataFrame) -> bytes:
+
+def export_to_csv(df: pd.DataFrame, fingerprint: str | None = None) -> bytes:
     """
     DataFrameをCSV形式のバイトデータに変換
 
     Args:
         df: エクスポート対象のDataFrame
+        fingerprint: dfのフィンガープリント（省略時はdfから計算）
 
     Returns:
         bytes: CSV形式のバイトデータ
 
     Note:
-        結果は5分間キャッシュされます
+        結果はフィンガープリントをキーにキャッシュされます
     """
-    return df.to_csv(index=False).encode("utf-8-sig")
+    return _cached_export(df, fingerprint, "csv")
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def export_to_excel(df: pd.DataFrame, sheet_name: str = "Data") -> bytes:
+def export_to_excel(
+    df: pd.DataFrame, sheet_name: str = "Data", fingerprint: str | None = None
+) -> bytes:
     """
     DataFrameをExcel形式のバイトデータに変換
 
     Args:
         df: エクスポート対象のDataFrame
         sheet_name: シート名（デフォルト: "Data"）
+        fingerprint: dfのフィンガープリント（省略時はdfから計算）
 
     Returns:
         bytes: Excel形式のバイトデータ
 
     Note:
-        結果は5分間キャッシュされます
+        結果はフィンガープリントをキーにキャッシュされます
     """
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name=sheet_name)
-    return output.getvalue()
+    return _cached_export(df, fingerprint, "excel", sheet_name=sheet_name)
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def export_to_json(df: pd.DataFrame, orient: str = "records") -> bytes:
+def export_to_json(
+    df: pd.DataFrame, orient: str = "records", fingerprint: str | None = None
+) -> bytes:
     """
     DataFrameをJSON形式のバイトデータに変換
 
@@ -60,25 +78,170 @@ def export_to_json(df: pd.DataFrame, orient: str = "records") -> bytes:
             - "records": [{column -> value}, ... , {column -> value}]
             - "index": {index -> {column -> value}}
             - "columns": {column -> {index -> value}}
+        fingerprint: dfのフィンガープリント（省略時はdfから計算）
 
     Returns:
         bytes: JSON形式のバイトデータ
 
     Note:
-        結果は5分間キャッシュされます
+        結果はフィンガープリントをキーにキャッシュされます
+    """
+    return _cached_export(df, fingerprint, "json", orient=orient)
+
+
+def encode_dataframe(df: pd.DataFrame, file_format: ExportFormat) -> bytes:
+    """
+    DataFrameを画面からのエクスポートと同じ設定で変換（キャッシュなし）
+
+    Args:
+        df: 変換対象のDataFrame
+        file_format: ファイル形式（"csv", "excel", "json"）
+
+    Returns:
+        bytes: 変換後のバイトデータ
+
+    Raises:
+        ValueError: 未対応の形式が指定された場合
     """
+    if file_format not in UI_EXPORT_PARAMS:
+        raise ValueError(f"未対応の形式です: {file_format}")
+    return _ENCODERS[file_format](df, **UI_EXPORT_PARAMS[file_format])
+
+
+def _cached_export(
+    df: pd.DataFrame, fingerprint: str | None, file_format: ExportFormat, **params: str
+) -> bytes:
+    """フィンガープリントと変換条件をキーにキャッシュしつつ変換
+
+    フィンガープリントが無い場合はその場で計算する（データ全体のハッシュが必要なため、
+    読み込み時に計算済みのフィンガープリントを渡せる呼び出し元は渡すこと）。
+    """
+    if fingerprint is None:
+        fingerprint = compute_dataset_fingerprint(df)
+    return _cached_bytes(
+        fingerprint, file_format, lambda: _ENCODERS[file_format](df, **params), **params
+    )
+
+
+def _cached_bytes(
+    fingerprint: str, file_format: str, encode: Callable[[], bytes], **params: str
+) -> bytes:
+    """フィンガープリントと変換条件をキーに、encode の結果をキャッシュ"""
+    cache = get_export_cache()
+    key = cache.make_key(fingerprint, file_format, **params)
+
+    data = cache.get(key)
+    if data is None:
+        data = encode()
+        cache.put(key, data)
+    return data
+
+
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """CSV形式（BOM付きUTF-8）に変換"""
+    return df.to_csv(index=False).encode("utf-8-sig")
+
+
+def _to_excel_bytes(df: pd.DataFrame, sheet_name: str) -> bytes:
+    """Excel形式に変換"""
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        df.to_excel(writer, index=False, sheet_name=sheet_name)
+    return output.getvalue()
+
+
+def _to_json_bytes(df: pd.DataFrame, orient: str) -> bytes:
+    """JSON形式に変換"""
     return df.to_json(orient=orient, force_ascii=False, indent=2).encode("utf-8")
 
 
+_ENCODERS = {"csv": _to_csv_bytes, "excel": _to_excel_bytes, "json": _to_json_bytes}
+
+
+def build_report_tables(summary: AnalysisSummary) -> dict[str, pd.DataFrame]:
+    """
+    分析レポートに含める集計表をシート名付きで取得
+
+    Args:
+        summary: 分析ページの集計結果
+
+    Returns:
+        dict[str, pd.DataFrame]: シート名と集計表（インデックスは列として展開済み）
+    """
+    sport_means = summary.sport_means.rename("平均関心度").rename_axis("スポーツ種目")
+    return {
+        "種目別平均": sport_means.reset_index(),
+        "年齢層別平均": summary.age_group_means.reset_index(),
+        "相関行列": summary.correlation.rename_axis("スポーツ種目").reset_index(),
+        "スコア分布": summary.score_distribution.reset_index(),
+        "分布統計": summary.distribution_stats.reset_index(),
+    }
+
+
+def export_analysis_report_excel(summary: AnalysisSummary, fingerprint: str | None = None) -> bytes:
+    """
+    分析レポートを複数シートのExcel形式に変換
+
+    Args:
+        summary: 分析ページの集計結果
+        fingerprint: 集計対象データのフィンガープリント（指定時は結果をキャッシュ）
+
+    Returns:
+        bytes: Excel形式のバイトデータ
+    """
+    if fingerprint is not None:
+        return _cached_bytes(fingerprint, "report_excel", lambda: _report_excel_bytes(summary))
+    return _report_excel_bytes(summary)
+
+
+def _report_excel_bytes(summary: AnalysisSummary) -> bytes:
+    """分析レポートをExcel形式に変換"""
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        for sheet_name, table in build_report_tables(summary).items():
+            table.to_excel(writer, index=False, sheet_name=sheet_name)
+    return output.getvalue()
+
+
+def export_analysis_report_bundle(
+    summary: AnalysisSummary, fingerprint: str | None = None
+) -> bytes:
+    """
+    分析レポートを集計表ごとのParquetファイルをまとめたZIP形式に変換
+
+    Args:
+        summary: 分析ページの集計結果
+        fingerprint: 集計対象データのフィンガープリント（指定時は結果をキャッシュ）
+
+    Returns:
+        bytes: ZIP形式のバイトデータ
+
+    Raises:
+        ImportError: pyarrowがインストールされていない場合
+    """
+    if fingerprint is not None:
+        return _cached_bytes(fingerprint, "report_zip", lambda: _report_bundle_bytes(summary))
+    return _report_bundle_bytes(summary)
+
+
+def _report_bundle_bytes(summary: AnalysisSummary) -> bytes:
+    """分析レポートをParquetのZIP形式に変換"""
+    output = BytesIO()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as bundle:
+        for name, table in build_report_tables(summary).items():
+            bundle.writestr(f"{name}.parquet", table.to_parquet(index=False))
+    return output.getvalue()
+
+
 def generate_filename(
-    base_name: str = "export_data", file_format: ExportFormat = "csv"
+    base_name: str = "export_data", file_format: ExportFormat | ReportFormat = "csv"
 ) -> str:
     """
     エクスポートファイル名を生成（タイムスタンプ付き）
 
     Args:
         base_name: ベースとなるファイル名（デフォルト: "export_data"）
-        file_format: ファイル形式（"csv", "excel", "json"）
+        file_format: ファイル形式（"csv", "excel", "json", "zip"）
 
     Returns:
         str: 生成されたファイル名（サニタイズ済み）
@@ -94,17 +257,17 @@ def generate_filename(
         safe_name = "export_data"
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    extension_map = {"csv": "csv", "excel": "xlsx", "json": "json"}
+    extension_map = {"csv": "csv", "excel": "xlsx", "json": "json", "zip": "zip"}
     extension = extension_map.get(file_format, "csv")
     return f"{safe_name}_{timestamp}.{extension}"
 
 
-def get_mime_type(file_format: ExportFormat) -> str:
+def get_mime_type(file_format: ExportFormat | ReportFormat) -> str:
     """
     ファイル形式に対応するMIMEタイプを取得
 
     Args:
-        file_format: ファイル形式（"csv", "excel", "json"）
+        file_format: ファイル形式（"csv", "excel", "json", "zip"）
 
     Returns:
         str: MIMEタイプ
@@ -113,5 +276,6 @@ def get_mime_type(file_format: ExportFormat) -> str:
         "csv": "text/csv",
         "excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         "json": "application/json",
+        "zip": "application/zip",
     }
     return mime_types.get(file_format, "application/octet-stream")
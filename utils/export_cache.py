@@ -0,0 +1,315 @@
+"""エクスポート結果をフィンガープリントをキーにキャッシュするモジュール"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import streamlit as st
+
+from utils.fingerprint import derive_fingerprint
+from utils.metrics import CACHE_BYTES, CACHE_REQUESTS, REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# メモリ上に保持するエクスポート結果の合計サイズの上限（バイト）
+DEFAULT_MAX_MEMORY_BYTES = 256 * 1024 * 1024
+
+# ディスク上に保持するエクスポート結果の合計サイズの上限（バイト）
+DEFAULT_MAX_DISK_BYTES = 2 * 1024 * 1024 * 1024
+
+# ディスクキャッシュの保存先を指定する環境変数（未設定ならメモリのみ）
+DISK_DIR_ENV = "EXPORT_CACHE_DIR"
+
+
+@dataclass
+class ExportCacheStats:
+    """エクスポートキャッシュの統計情報
+
+    Attributes:
+        hits: メモリ上でヒットした回数
+        disk_hits: ディスク上でヒットした回数
+        misses: ミスした回数
+        evictions: メモリから追い出した回数
+        memory_bytes: メモリ上の合計サイズ（バイト）
+        disk_bytes: ディスク上の合計サイズ（バイト）
+        key_seconds: キャッシュキーの計算に費やした合計時間（秒）
+        key_count: キャッシュキーを計算した回数
+    """
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    memory_bytes: int = 0
+    disk_bytes: int = 0
+    key_seconds: float = 0.0
+    key_count: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """ヒット率（ディスク上のヒットを含む）"""
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+
+class ExportCache:
+    """バイト数上限付きLRUのエクスポート結果キャッシュ
+
+    キーはデータセットのフィンガープリント・形式・変換パラメータから作るため、
+    DataFrame本体をハッシュしない。メモリ上限を超えた結果は、ディスク層が
+    有効ならディスクに退避し、無効なら破棄する。
+
+    Attributes:
+        max_memory_bytes (int): メモリ上の合計サイズの上限（バイト）
+        disk_dir (Path | None): ディスク層の保存先（Noneなら無効）
+        max_disk_bytes (int): ディスク上の合計サイズの上限（バイト）
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        disk_dir: Path | None = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        """ExportCacheを初期化
+
+        Args:
+            max_memory_bytes: メモリ上の合計サイズの上限（バイト）
+            disk_dir: ディスク層の保存先（Noneならメモリのみ）
+            max_disk_bytes: ディスク上の合計サイズの上限（バイト）
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._stats = ExportCacheStats()
+        self._lock = threading.Lock()
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._index_disk()
+
+    def make_key(self, fingerprint: str, file_format: str, **params: object) -> str:
+        """フィンガープリントと変換条件からキャッシュキーを作成
+
+        Args:
+            fingerprint: 対象データセットのフィンガープリント
+            file_format: エクスポート形式
+            **params: 変換パラメータ（シート名など）
+
+        Returns:
+            キャッシュキー
+        """
+        started = time.perf_counter()
+        key = f"{derive_fingerprint(fingerprint, **params)}_{file_format}"
+        with self._lock:
+            self._stats.key_seconds += time.perf_counter() - started
+            self._stats.key_count += 1
+        return key
+
+    def get(self, key: str) -> bytes | None:
+        """キャッシュから取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            キャッシュされたバイトデータ、存在しない場合はNone
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self._stats.hits += 1
+                return data
+            on_disk = key in self._disk
+
+        if on_disk:
+            try:
+                data = self._disk_path(key).read_bytes()
+            except FileNotFoundError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self._stats.disk_hits += 1
+                self._store_memory(key, data)
+                return data
+
+        with self._lock:
+            self._stats.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """キャッシュに格納
+
+        Args:
+            key: キャッシュキー
+            data: 格納するバイトデータ
+        """
+        self._store_memory(key, data)
+
+    def memory_entries(self) -> list[tuple[str, int]]:
+        """メモリ上のエントリのキーとサイズ（古い順）
+
+        Returns:
+            (キャッシュキー, バイト数) のリスト
+        """
+        with self._lock:
+            return [(key, len(data)) for key, data in self._memory.items()]
+
+    def evict(self, key: str) -> bool:
+        """エントリをメモリ・ディスクの両方から削除
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            削除した場合はTrue
+        """
+        with self._lock:
+            data = self._memory.pop(key, None)
+            if data is not None:
+                self._stats.memory_bytes -= len(data)
+                self._stats.evictions += 1
+            size = self._disk.pop(key, None)
+            if size is not None:
+                self._stats.disk_bytes -= size
+        if size is not None:
+            self._disk_path(key).unlink(missing_ok=True)
+        return data is not None or size is not None
+
+    def stats(self) -> ExportCacheStats:
+        """統計情報のスナップショットを取得
+
+        Returns:
+            統計情報
+        """
+        with self._lock:
+            return ExportCacheStats(**vars(self._stats))
+
+    def clear(self) -> None:
+        """メモリ・ディスクの全エントリを削除"""
+        with self._lock:
+            self._memory.clear()
+            self._stats.memory_bytes = 0
+            disk_keys = list(self._disk)
+            self._disk.clear()
+            self._stats.disk_bytes = 0
+        for key in disk_keys:
+            self._disk_path(key).unlink(missing_ok=True)
+
+    def _disk_path(self, key: str) -> Path:
+        """ディスク層でのファイルパス"""
+        assert self.disk_dir is not None
+        return self.disk_dir / f"{key}.bin"
+
+    def _index_disk(self) -> None:
+        """以前のプロセスが退避したファイルを更新日時の古い順にディスク層へ登録する"""
+        assert self.disk_dir is not None
+        # 書き込み途中で終了した一時ファイルは使えないため削除する
+        for path in self.disk_dir.glob("*.bin.tmp.*"):
+            path.unlink(missing_ok=True)
+        entries = []
+        for path in self.disk_dir.glob("*.bin"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._stats.disk_bytes += size
+        for key in self._trim_disk():
+            self._disk_path(key).unlink(missing_ok=True)
+
+    def _trim_disk(self) -> list[str]:
+        """ディスク層の上限を超えた分を古い順に登録解除し、削除するキーを返す（ロック内で呼ぶ）"""
+        removed = []
+        while self._stats.disk_bytes > self.max_disk_bytes:
+            old_key, size = self._disk.popitem(last=False)
+            self._stats.disk_bytes -= size
+            removed.append(old_key)
+        return removed
+
+    def _store_memory(self, key: str, data: bytes) -> None:
+        """メモリ層に格納し、上限を超えた分を古い順に追い出す"""
+        if len(data) > self.max_memory_bytes:
+            self._spill(key, data)
+            return
+
+        spilled = []
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._stats.memory_bytes -= len(previous)
+            self._memory[key] = data
+            self._stats.memory_bytes += len(data)
+            while self._stats.memory_bytes > self.max_memory_bytes:
+                old_key, old_data = self._memory.popitem(last=False)
+                self._stats.memory_bytes -= len(old_data)
+                self._stats.evictions += 1
+                spilled.append((old_key, old_data))
+
+        for old_key, old_data in spilled:
+            self._spill(old_key, old_data)
+
+    def _spill(self, key: str, data: bytes) -> None:
+        """ディスク層が有効ならディスクに退避する"""
+        if self.disk_dir is None or len(data) > self.max_disk_bytes:
+            return
+        # 確認と登録を同じロック内で行い、同じキーを並行して退避しても1回だけ数える
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+                return
+            self._disk[key] = len(data)
+            self._stats.disk_bytes += len(data)
+            removed = self._trim_disk()
+
+        for old_key in removed:
+            self._disk_path(old_key).unlink(missing_ok=True)
+        # 書き込み途中のファイルを get が読まないよう、一時ファイルから置き換える
+        path = self._disk_path(key)
+        tmp_path = path.with_name(f"{path.name}.tmp.{threading.get_ident()}")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Export cache spill failed: key={key}, error={e}")
+            tmp_path.unlink(missing_ok=True)
+            with self._lock:
+                if self._disk.pop(key, None) is not None:
+                    self._stats.disk_bytes -= len(data)
+
+
+@st.cache_resource(show_spinner=False)
+def get_export_cache() -> ExportCache:
+    """プロセス共通のExportCacheを取得
+
+    環境変数 EXPORT_CACHE_DIR が設定されている場合はディスク層を有効にする。
+
+    Returns:
+        ExportCacheインスタンス
+    """
+    disk_dir = os.environ.get(DISK_DIR_ENV)
+    cache = ExportCache(disk_dir=Path(disk_dir) if disk_dir else None)
+    REGISTRY.set_collector("export_cache", lambda: record_cache_metrics("export", cache.stats()))
+    return cache
+
+
+def record_cache_metrics(name: str, stats: ExportCacheStats) -> None:
+    """キャッシュの統計情報をメトリクスに反映
+
+    Args:
+        name: メトリクスのラベルに使うキャッシュ名
+        stats: 統計情報
+    """
+    CACHE_REQUESTS.set_total(stats.hits, cache=name, result="hit")
+    CACHE_REQUESTS.set_total(stats.disk_hits, cache=name, result="disk_hit")
+    CACHE_REQUESTS.set_total(stats.misses, cache=name, result="miss")
+    CACHE_BYTES.set(stats.memory_bytes, cache=name, tier="memory")
+    CACHE_BYTES.set(stats.disk_bytes, cache=name, tier="disk")
@@ -0,0 +1,123 @@
+"""エクスポート結果のサイズ・所要時間を見積もるモジュール"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.export import ExportFormat, encode_dataframe
+
+# 見積もりに使うサンプル行数
+DEFAULT_SAMPLE_ROWS = 1000
+
+ESTIMATED_FORMATS: tuple[ExportFormat, ...] = ("csv", "excel", "json")
+
+
+@dataclass(frozen=True)
+class ExportEstimate:
+    """エクスポート結果の見積もり
+
+    Attributes:
+        file_format: エクスポート形式
+        size_bytes: 推定出力サイズ（バイト）
+        seconds: 推定変換時間（秒）
+    """
+
+    file_format: ExportFormat
+    size_bytes: int
+    seconds: float
+
+
+def stratified_sample(
+    df: pd.DataFrame, sample_rows: int = DEFAULT_SAMPLE_ROWS, seed: int = 0
+) -> pd.DataFrame:
+    """行位置で層化したサンプルを抽出
+
+    全体を sample_rows 個の連続した区間に分け、各区間から1行ずつ無作為に選ぶ。
+    データ全体を走査しないため、行数に関係なく一定時間で抽出できる。
+
+    Args:
+        df: 抽出元のDataFrame
+        sample_rows: 抽出する行数
+        seed: 乱数シード
+
+    Returns:
+        抽出したDataFrame（行数が sample_rows 以下の場合は df そのもの）
+    """
+    n = len(df)
+    if n <= sample_rows:
+        return df
+
+    rng = np.random.default_rng(seed)
+    bounds = np.linspace(0, n, sample_rows + 1).astype(np.int64)
+    positions = bounds[:-1] + (rng.random(sample_rows) * np.diff(bounds)).astype(np.int64)
+    return df.iloc[positions]
+
+
+def _measure(df: pd.DataFrame, file_format: ExportFormat) -> tuple[int, float]:
+    """変換後のバイト数と所要時間を計測"""
+    started = time.perf_counter()
+    size = len(encode_dataframe(df, file_format))
+    return size, time.perf_counter() - started
+
+
+def estimate_export(
+    df: pd.DataFrame, sample_rows: int = DEFAULT_SAMPLE_ROWS
+) -> dict[ExportFormat, ExportEstimate]:
+    """サンプルを実際に変換して出力サイズと変換時間を外挿
+
+    固定部分（ヘッダー・ファイル構造）は0行のデータの変換結果から求め、
+    残りを1行あたりのコストとして全行数に比例させる。
+
+    Args:
+        df: エクスポート対象のDataFrame
+        sample_rows: 見積もりに使うサンプル行数
+
+    Returns:
+        形式ごとの見積もり
+    """
+    sample = stratified_sample(df, sample_rows)
+    scale = len(df) / len(sample) if len(sample) else 0.0
+
+    estimates = {}
+    for file_format in ESTIMATED_FORMATS:
+        base_size, base_seconds = _measure(df.iloc[:0], file_format)
+        sample_size, sample_seconds = _measure(sample, file_format)
+        size = base_size + max(sample_size - base_size, 0) * scale
+        seconds = base_seconds + max(sample_seconds - base_seconds, 0.0) * scale
+        estimates[file_format] = ExportEstimate(file_format, int(size), seconds)
+    return estimates
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def get_export_estimates(fingerprint: str, _df: pd.DataFrame) -> dict[ExportFormat, ExportEstimate]:
+    """データセットごとにキャッシュした見積もりを取得
+
+    キャッシュキーはフィンガープリントのみで、DataFrame本体はハッシュしない。
+
+    Args:
+        fingerprint: 対象データのフィンガープリント
+        _df: エクスポート対象のDataFrame（キャッシュキーには含めない）
+
+    Returns:
+        形式ごとの見積もり
+    """
+    return estimate_export(_df)
+
+
+def format_bytes(size_bytes: float) -> str:
+    """バイト数を読みやすい単位の文字列に変換
+
+    Args:
+        size_bytes: バイト数
+
+    Returns:
+        例: "512B", "1.5KB", "12.3MB"
+    """
+    for unit in ("B", "KB", "MB"):
+        if size_bytes < 1024:
+            return f"{size_bytes:.0f}{unit}" if unit == "B" else f"{size_bytes:.1f}{unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.1f}GB"
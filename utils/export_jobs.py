@@ -0,0 +1,337 @@
+"""エクスポート変換をバックグラウンドで実行するジョブ管理モジュール"""
+
+import logging
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from utils.export import EXPORT_SHEET_NAME, UI_EXPORT_PARAMS, ExportFormat
+from utils.export_cache import ExportCache, get_export_cache
+from utils.metrics import EXPORT_BYTES, EXPORT_BYTES_TOTAL, EXPORT_SECONDS
+from utils.scheduler import JobScheduler, ScheduledTask, estimate_frame_bytes, get_scheduler
+from utils.tracing import span, start_trace
+
+logger = logging.getLogger(__name__)
+
+# 1チャンクあたりの行数（進捗報告の粒度）
+DEFAULT_CHUNK_ROWS = 50_000
+
+# 成果物の保持期間（秒）
+DEFAULT_ARTIFACT_TTL = 30 * 60
+
+DEFAULT_ARTIFACT_DIR = Path(tempfile.gettempdir()) / "streamlit_export_artifacts"
+
+_EXTENSIONS = {"csv": "csv", "excel": "xlsx", "json": "json"}
+
+
+@dataclass
+class ExportJob:
+    """エクスポートジョブの状態
+
+    Attributes:
+        fingerprint: 対象データセットのフィンガープリント
+        file_format: エクスポート形式
+        status: "pending" / "running" / "done" / "failed"
+        progress: 進捗（0.0〜1.0）
+        path: 成果物ファイルのパス
+        error: 失敗時のエラーメッセージ
+        size: 成果物のバイト数
+        created_at: 登録時刻（time.time()）
+        finished_at: 完了時刻（time.time()）
+        task: スケジューラー上のタスク
+    """
+
+    fingerprint: str
+    file_format: ExportFormat
+    path: Path
+    status: str = "pending"
+    progress: float = 0.0
+    error: str | None = None
+    size: int = 0
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    task: ScheduledTask | None = None
+
+    @property
+    def is_finished(self) -> bool:
+        """ジョブが完了（成功・失敗問わず）しているか"""
+        return self.status in ("done", "failed")
+
+
+def write_export_artifact(
+    df: pd.DataFrame,
+    file_format: ExportFormat,
+    path: Path,
+    on_progress: Callable[[float], None] | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> int:
+    """DataFrameをチャンク単位で変換してファイルに書き出す
+
+    出力内容は export_to_csv / export_to_excel / export_to_json と同一。
+
+    Args:
+        df: エクスポート対象のDataFrame
+        file_format: エクスポート形式（"csv", "excel", "json"）
+        path: 出力先ファイルパス
+        on_progress: チャンクごとに進捗（0.0〜1.0）を受け取るコールバック
+        chunk_rows: 1チャンクあたりの行数
+
+    Returns:
+        書き出したバイト数
+
+    Raises:
+        ValueError: 未対応の形式が指定された場合
+    """
+    total = len(df)
+    starts = list(range(0, total, chunk_rows)) or [0]
+
+    def report(done_rows: int) -> None:
+        if on_progress is not None:
+            on_progress(done_rows / total if total else 1.0)
+
+    if file_format == "csv":
+        with open(path, "wb") as f:
+            f.write("\ufeff".encode())
+            for i, start in enumerate(starts):
+                chunk = df.iloc[start : start + chunk_rows]
+                f.write(chunk.to_csv(index=False, header=i == 0).encode("utf-8"))
+                report(min(start + chunk_rows, total))
+
+    elif file_format == "json":
+        with open(path, "wb") as f:
+            if total == 0:
+                f.write(df.to_json(orient="records", force_ascii=False, indent=2).encode("utf-8"))
+            else:
+                # 各チャンクの "[" と "\n]" を外して連結する
+                f.write(b"[")
+                for i, start in enumerate(starts):
+                    chunk = df.iloc[start : start + chunk_rows]
+                    text = chunk.to_json(orient="records", force_ascii=False, indent=2)
+                    if i > 0:
+                        f.write(b",")
+                    f.write(text[1:-2].encode("utf-8"))
+                    report(min(start + chunk_rows, total))
+                f.write(b"\n]")
+
+    elif file_format == "excel":
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            for i, start in enumerate(starts):
+                chunk = df.iloc[start : start + chunk_rows]
+                chunk.to_excel(
+                    writer,
+                    index=False,
+                    sheet_name=EXPORT_SHEET_NAME,
+                    header=i == 0,
+                    startrow=0 if i == 0 else start + 1,
+                )
+                report(min(start + chunk_rows, total))
+
+    else:
+        raise ValueError(f"未対応の形式です: {file_format}")
+
+    report(total)
+    return path.stat().st_size
+
+
+class ExportJobManager:
+    """エクスポートジョブをジョブスケジューラー上で実行・管理するクラス
+
+    ジョブは (フィンガープリント, 形式) をキーに一意で、同じキーへの再要求や
+    再実行（rerun）は既存のジョブに紐づく。完了した成果物はローカルディスクに
+    保存され、TTLを過ぎると削除される。
+
+    Attributes:
+        artifact_dir (Path): 成果物の保存先ディレクトリ
+        ttl_seconds (float): 成果物の保持期間（秒）
+    """
+
+    def __init__(
+        self,
+        artifact_dir: Path = DEFAULT_ARTIFACT_DIR,
+        scheduler: JobScheduler | None = None,
+        cache: ExportCache | None = None,
+        ttl_seconds: float = DEFAULT_ARTIFACT_TTL,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ):
+        """ExportJobManagerを初期化
+
+        Args:
+            artifact_dir: 成果物の保存先ディレクトリ
+            scheduler: 変換を実行するスケジューラー（省略時はプロセス共通のもの）
+            cache: 成果物を保持するキャッシュ（省略時はプロセス共通のもの）
+            ttl_seconds: 成果物の保持期間（秒）
+            chunk_rows: 1チャンクあたりの行数
+        """
+        self.artifact_dir = Path(artifact_dir)
+        self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.chunk_rows = chunk_rows
+        self._scheduler = scheduler
+        self._cache = cache
+        self._jobs: dict[tuple[str, str], ExportJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        fingerprint: str,
+        file_format: ExportFormat,
+        df: pd.DataFrame,
+        session_id: str = "default",
+    ) -> ExportJob:
+        """エクスポートジョブを登録（既存ジョブがあればそれを返す）
+
+        Args:
+            fingerprint: 対象データセットのフィンガープリント
+            file_format: エクスポート形式
+            df: エクスポート対象のDataFrame
+            session_id: 要求したセッションのID（スケジューラーの公平性制御に使用）
+
+        Returns:
+            登録済み、または新たに登録したジョブ
+        """
+        self.evict_expired()
+        key = (fingerprint, file_format)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status != "failed":
+                return job
+
+            path = self.artifact_dir / f"{fingerprint}_{file_format}.{_EXTENSIONS[file_format]}"
+            job = ExportJob(fingerprint=fingerprint, file_format=file_format, path=path)
+            self._jobs[key] = job
+
+        logger.info(
+            f"Export job queued: format={file_format}, rows={len(df)}, fingerprint={fingerprint}"
+        )
+        scheduler = self._scheduler or get_scheduler()
+        job.task = scheduler.submit(
+            session_id,
+            self._run,
+            job,
+            df,
+            estimated_bytes=estimate_frame_bytes(df),
+            label=f"export:{file_format}",
+        )
+        return job
+
+    def queue_position(self, job: ExportJob) -> int:
+        """ジョブのスケジューラー上の待ち順位を取得
+
+        Args:
+            job: 対象のジョブ
+
+        Returns:
+            待ち順位（実行中・完了済みの場合は0）
+        """
+        if job.task is None:
+            return 0
+        return (self._scheduler or get_scheduler()).queue_position(job.task)
+
+    def get(self, fingerprint: str, file_format: ExportFormat) -> ExportJob | None:
+        """登録済みのジョブを取得
+
+        Args:
+            fingerprint: 対象データセットのフィンガープリント
+            file_format: エクスポート形式
+
+        Returns:
+            ジョブ、存在しない場合はNone
+        """
+        with self._lock:
+            return self._jobs.get((fingerprint, file_format))
+
+    def read_artifact(self, job: ExportJob) -> bytes:
+        """完了したジョブの成果物を読み込む
+
+        成果物はエクスポートキャッシュ経由で読み込み、再実行のたびにディスクを
+        読み直さないようにする。
+
+        Args:
+            job: 完了済みのジョブ
+
+        Returns:
+            成果物のバイトデータ
+
+        Raises:
+            FileNotFoundError: 成果物が削除済みでキャッシュにも無い場合
+        """
+        cache = self._cache or get_export_cache()
+        key = cache.make_key(job.fingerprint, job.file_format, **UI_EXPORT_PARAMS[job.file_format])
+        data = cache.get(key)
+        if data is None:
+            data = job.path.read_bytes()
+            cache.put(key, data)
+        return data
+
+    def evict_expired(self) -> int:
+        """TTLを過ぎた成果物とジョブを削除
+
+        Returns:
+            削除したジョブ数
+        """
+        now = time.time()
+        with self._lock:
+            expired = [
+                key
+                for key, job in self._jobs.items()
+                if job.finished_at is not None and now - job.finished_at > self.ttl_seconds
+            ]
+            for key in expired:
+                job = self._jobs.pop(key)
+                job.path.unlink(missing_ok=True)
+        if expired:
+            logger.info(f"Export artifacts evicted: count={len(expired)}")
+        return len(expired)
+
+    def _run(self, job: ExportJob, df: pd.DataFrame) -> None:
+        """ワーカースレッドでジョブを実行"""
+
+        def on_progress(progress: float) -> None:
+            job.progress = progress
+
+        job.status = "running"
+        started = time.perf_counter()
+        try:
+            # ワーカースレッドでは環境変数でトレースが有効な場合のみ記録する
+            with (
+                start_trace(f"export_job:{job.file_format}"),
+                span("write_artifact", format=job.file_format, rows=len(df)),
+            ):
+                job.size = write_export_artifact(
+                    df, job.file_format, job.path, on_progress, self.chunk_rows
+                )
+            elapsed = time.perf_counter() - started
+            EXPORT_SECONDS.observe(elapsed, format=job.file_format, status="done")
+            EXPORT_BYTES.observe(job.size, format=job.file_format)
+            EXPORT_BYTES_TOTAL.inc(job.size, format=job.file_format)
+            job.finished_at = time.time()
+            job.status = "done"
+            logger.info(
+                f"Export job finished: format={job.file_format}, size={job.size} bytes, "
+                f"elapsed={elapsed:.2f}s"
+            )
+        except Exception as e:
+            EXPORT_SECONDS.observe(
+                time.perf_counter() - started, format=job.file_format, status="failed"
+            )
+            job.error = str(e)
+            job.path.unlink(missing_ok=True)
+            job.finished_at = time.time()
+            job.status = "failed"
+            logger.error(f"Export job failed: format={job.file_format}, error={e}", exc_info=True)
+
+
+@st.cache_resource(show_spinner=False)
+def get_export_job_manager() -> ExportJobManager:
+    """プロセス共通のExportJobManagerを取得
+
+    Returns:
+        ExportJobManagerインスタンス
+    """
+    return ExportJobManager()
@@ -0,0 +1,43 @@
+"""データセットのフィンガープリント（内容ハッシュ）を扱うモジュール"""
+
+import hashlib
+
+import pandas as pd
+
+
+def compute_dataset_fingerprint(df: pd.DataFrame) -> str:
+    """DataFrameの内容からフィンガープリントを計算
+
+    行データ・カラム名・データ型をまとめてハッシュ化する。
+    データ読み込み時に一度だけ計算し、以降はキャッシュキーとして使い回す想定。
+
+    Args:
+        df: 対象のDataFrame
+
+    Returns:
+        16進数16文字のフィンガープリント
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    digest.update("\x1f".join(map(str, df.dtypes)).encode("utf-8"))
+    if len(df):
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def derive_fingerprint(base: str, **params: object) -> str:
+    """元データのフィンガープリントとパラメータから派生フィンガープリントを生成
+
+    フィルター条件などを適用した結果を、データ本体を再ハッシュせずに識別するために使う。
+
+    Args:
+        base: 元データのフィンガープリント
+        **params: 派生条件（例: age_group="20代"）
+
+    Returns:
+        16進数16文字のフィンガープリント
+    """
+    digest = hashlib.blake2b(base.encode("utf-8"), digest_size=8)
+    for key in sorted(params):
+        digest.update(f"\x1f{key}={params[key]!r}".encode())
+    return digest.hexdigest()
@@ -8,6 +8,17 @@ import numpy as np
 import pandas as pd
 import streamlit as st
 
+from utils.fingerprint import compute_dataset_fingerprint, derive_fingerprint
+from utils.incremental_summary import (
+    append_rows,
+    build_running_summary,
+    check_append_schema,
+    update_running_summary,
+)
+from utils.memory_attribution import frame_nbytes
+from utils.tracing import span
+from utils.upload_validation import ID_COLUMN, build_id_index, check_appended_ids
+
 
 class HistoryManager:
     """CSVファイルのアップロード履歴を管理するクラス
@@ -41,16 +52,23 @@ class HistoryManager:
         Returns:
             追加されたエントリのID
         """
-        history_entry = {
-            "id": str(uuid.uuid4()),
-            "filename": filename,
-            "upload_time": datetime.now(),
-            "row_count": len(df),
-            "column_count": len(df.columns),
-            "columns": df.columns.tolist(),
-            "data": df.copy(),
-            "file_size": file_size,
-        }
+        with span("history:add", rows=len(df)):
+            with span("history:fingerprint"):
+                fingerprint = compute_dataset_fingerprint(df)
+            data = df.copy()
+            history_entry = {
+                "id": str(uuid.uuid4()),
+                "filename": filename,
+                "upload_time": datetime.now(),
+                "row_count": len(df),
+                "column_count": len(df.columns),
+                "columns": df.columns.tolist(),
+                "data": data,
+                "file_size": file_size,
+                "fingerprint": fingerprint,
+                # 再実行ごとに数え直さないよう、保持するバイト数は追加時に一度だけ計測する
+                "memory_bytes": frame_nbytes(data),
+            }
 
         # 履歴の先頭に追加
         st.session_state.upload_history.insert(0, history_entry)
@@ -66,6 +84,62 @@ class HistoryManager:
 
         return history_entry["id"]
 
+    def append_to_entry(
+        self, data_id: str, filename: str, batch: pd.DataFrame, file_size: str
+    ) -> None:
+        """既存の履歴エントリのデータに行を追加
+
+        集計用の累積部分統計量（running_summary）と回答者IDの索引（id_index）を
+        追加分だけで更新し、フィンガープリントも追加分のハッシュから派生させる
+        （既存の行は再集計・再ハッシュしない）。累積部分統計量と索引が無いエントリは、
+        最初の追加時に作成する。
+
+        Args:
+            data_id: 追加先のデータID
+            filename: 追加する行のファイル名
+            batch: 追加する行
+            file_size: 追加するファイルのサイズ（文字列形式）
+
+        Raises:
+            KeyError: 追加先のエントリが存在しない場合
+            ValueError: 列構成・型が追加先のデータと一致しない場合
+            UploadRejected: 追加する行の回答者IDが追加先のデータと重複する場合
+        """
+        entry = self.get_entry_by_id(data_id)
+        if entry is None:
+            raise KeyError(data_id)
+        check_append_schema(entry["data"], batch)
+        if "id_index" not in entry:
+            with span("history:build_id_index"):
+                entry["id_index"] = build_id_index(entry["data"][ID_COLUMN])
+        check_appended_ids(entry["id_index"], batch)
+
+        with span("history:append", rows=len(batch)):
+            running = entry.get("running_summary")
+            if running is None:
+                with span("history:build_running_summary"):
+                    running = build_running_summary(entry["data"])
+            with span("history:update_running_summary"):
+                running = update_running_summary(running, batch)
+            df = append_rows(entry["data"], batch, filename)
+            fingerprint = derive_fingerprint(
+                entry["fingerprint"], appended=compute_dataset_fingerprint(batch)
+            )
+
+        entry.update(
+            filename=f"{entry['filename']} + {filename}",
+            row_count=len(df),
+            column_count=len(df.columns),
+            columns=df.columns.tolist(),
+            data=df,
+            file_size=f"{entry['file_size']} + {file_size}",
+            fingerprint=fingerprint,
+            running_summary=running,
+            memory_bytes=entry["memory_bytes"] + frame_nbytes(batch),
+        )
+        entry["id_index"] |= build_id_index(batch[ID_COLUMN])
+        st.session_state.current_data_id = data_id
+
     def get_history(self) -> list[dict[str, Any]]:
         """履歴一覧を取得
 
@@ -138,6 +212,16 @@ class HistoryManager:
             return self.get_data_by_id(st.session_state.current_data_id)
         return None
 
+    def get_current_entry(self) -> dict[str, Any] | None:
+        """現在選択中の履歴エントリ全体を取得
+
+        Returns:
+            現在選択中の履歴エントリ、存在しない場合はNone
+        """
+        if st.session_state.current_data_id:
+            return self.get_entry_by_id(st.session_state.current_data_id)
+        return None
+
     def set_current_data(self, data_id: str) -> None:
         """現在のデータを設定
 
@@ -161,7 +245,8 @@ def optimize_dataframe_memory(df: pd.DataFrame) -> pd.DataFrame:
     for col in df.columns:
         col_type = df[col].dtype
 
-        if col_type != "object":
+        # 数値以外（文字列・カテゴリ）の列はそのまま
+        if pd.api.types.is_numeric_dtype(col_type):
             c_min = df[col].min()
             c_max = df[col].max()
 
@@ -0,0 +1,196 @@
+"""既存のデータセットに行を追加し、集計結果を追加分だけで更新するモジュール
+
+データセット全体と年齢層ごとの部分統計量（utils/partial_stats.py の件数・合計・
+ヒストグラム・積和）を保持しておき、行を追加したときは追加分の部分統計量を
+計算して足し合わせる。追加後の集計結果の計算量は追加した行数に比例し、
+これまでの行を再集計しない（関心度に1〜5の整数以外の値がある場合の分布統計のみ
+pandas で計算し直す）。
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utils.analysis_summary import AnalysisSummary, compute_analysis_summary
+from utils.data_loader import SOURCE_FILE_COLUMN, get_sports_columns
+from utils.parallel_aggregation import group_quantiles, summary_from_partial
+from utils.partial_stats import PartialStats, compute_partial
+
+
+@dataclass(frozen=True)
+class RunningSummary:
+    """データセットの累積部分統計量
+
+    Attributes:
+        sports_cols: スポーツ種目のカラム名（部分統計量の列順）
+        groups: 年齢層（昇順、total の年齢層番号順）
+        total: 全行の部分統計量
+        by_group: 年齢層ごとの、その年齢層の行だけの部分統計量（年齢層数1で計算）
+    """
+
+    sports_cols: tuple[str, ...]
+    groups: tuple[str, ...]
+    total: PartialStats
+    by_group: dict[str, PartialStats]
+
+    def summary(self, df: pd.DataFrame, age_group: str | None = None) -> AnalysisSummary:
+        """部分統計量から集計結果を組み立てる
+
+        Args:
+            df: age_group で絞り込んだデータ（不正値がある場合の分布統計の計算に使用）
+            age_group: 年齢層（None または "全年齢" の場合は全データ）
+
+        Returns:
+            compute_analysis_summary(df) と同じ集計結果
+        """
+        sports_cols = list(self.sports_cols)
+        if age_group is None or age_group == "全年齢":
+            stats, groups = self.total, list(self.groups)
+        elif age_group in self.by_group:
+            stats, groups = self.by_group[age_group], [age_group]
+        else:
+            return compute_analysis_summary(df)
+        return summary_from_partial(
+            stats, sports_cols, groups, quantile_fallback=lambda: group_quantiles(df, sports_cols)
+        )
+
+
+def _scores(df: pd.DataFrame, sports_cols: Sequence[str]) -> np.ndarray:
+    """(n, k) 関心度の行列（float64、欠損はNaN）"""
+    return df[list(sports_cols)].to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _partials(
+    scores: np.ndarray, codes: np.ndarray, groups: Sequence[str]
+) -> tuple[PartialStats, dict[str, PartialStats]]:
+    """全行と年齢層ごとの部分統計量を計算"""
+    total = compute_partial(scores, codes, len(groups))
+    by_group = {}
+    for i, group in enumerate(groups):
+        mask = codes == i
+        if mask.any():
+            by_group[group] = compute_partial(
+                scores[mask], np.zeros(int(mask.sum()), dtype=np.int64), 1
+            )
+    return total, by_group
+
+
+def build_running_summary(df: pd.DataFrame) -> RunningSummary:
+    """データセット全体を1回集計して累積部分統計量を作成
+
+    Args:
+        df: スポーツ関心度調査データ
+
+    Returns:
+        累積部分統計量
+    """
+    sports_cols = get_sports_columns(df)
+    codes, groups = pd.factorize(df["年齢層"], sort=True)
+    total, by_group = _partials(_scores(df, sports_cols), codes, list(groups))
+    return RunningSummary(tuple(sports_cols), tuple(groups), total, by_group)
+
+
+def _reindex_groups(
+    stats: PartialStats, groups: Sequence[str], new_groups: Sequence[str]
+) -> PartialStats:
+    """年齢層の並びを new_groups（groups を含む）に合わせ、増えた年齢層を0で埋める"""
+    if list(groups) == list(new_groups):
+        return stats
+    positions = [list(new_groups).index(group) for group in groups]
+    arrays = {}
+    for name in ("group_count", "group_sum", "group_hist"):
+        current = getattr(stats, name)
+        resized = np.zeros((len(new_groups), *current.shape[1:]), dtype=current.dtype)
+        resized[positions] = current
+        arrays[name] = resized
+    return PartialStats(
+        rows=stats.rows,
+        pair_count=stats.pair_count,
+        pair_sum=stats.pair_sum,
+        pair_sumsq=stats.pair_sumsq,
+        cross=stats.cross,
+        hist=stats.hist,
+        irregular=stats.irregular,
+        **arrays,
+    )
+
+
+def update_running_summary(running: RunningSummary, batch: pd.DataFrame) -> RunningSummary:
+    """追加した行の部分統計量を足し合わせた累積部分統計量を返す
+
+    Args:
+        running: 既存の行の累積部分統計量
+        batch: 追加した行（check_append_schema で検証済み）
+
+    Returns:
+        追加後の累積部分統計量
+    """
+    batch_groups = batch["年齢層"].dropna().unique().tolist()
+    groups = sorted(set(running.groups).union(batch_groups))
+    codes = pd.Index(groups).get_indexer(batch["年齢層"])
+    batch_total, batch_by_group = _partials(_scores(batch, running.sports_cols), codes, groups)
+
+    by_group = dict(running.by_group)
+    for group, stats in batch_by_group.items():
+        by_group[group] = by_group[group].merge(stats) if group in by_group else stats
+    total = _reindex_groups(running.total, running.groups, groups).merge(batch_total)
+    return RunningSummary(running.sports_cols, tuple(groups), total, by_group)
+
+
+def check_append_schema(df: pd.DataFrame, batch: pd.DataFrame) -> None:
+    """追加する行の列構成・型が既存のデータセットと一致するか検証
+
+    列の順序の違いは許容する。読み込み元の列（SOURCE_FILE_COLUMN）は比較しない。
+
+    Args:
+        df: 既存のデータセット
+        batch: 追加する行
+
+    Raises:
+        ValueError: 列が不足・余分な場合、または数値の列に数値以外が含まれる場合
+    """
+    columns = [col for col in df.columns if col != SOURCE_FILE_COLUMN]
+    batch_columns = [col for col in batch.columns if col != SOURCE_FILE_COLUMN]
+    missing = [col for col in columns if col not in batch_columns]
+    extra = [col for col in batch_columns if col not in columns]
+    if missing or extra:
+        raise ValueError(
+            "追加するデータの列が現在のデータセットと一致しません"
+            f"（不足: {', '.join(missing) or 'なし'}、余分: {', '.join(extra) or 'なし'}）"
+        )
+    mismatched = [
+        col
+        for col in columns
+        if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_numeric_dtype(batch[col])
+    ]
+    if mismatched:
+        raise ValueError(f"追加するデータの列の型が一致しません: {', '.join(mismatched)}")
+
+
+def append_rows(df: pd.DataFrame, batch: pd.DataFrame, filename: str) -> pd.DataFrame:
+    """既存のデータセットの末尾に行を追加したDataFrameを返す
+
+    列の順序は既存のデータセットに揃え、メモリ最適化済みの型はそのまま保つ
+    （追加分の値が収まらない列だけ pandas が型を広げる）。既存のデータセットに
+    読み込み元の列がある場合は、追加した行の読み込み元を filename とする。
+
+    Args:
+        df: 既存のデータセット（check_append_schema で検証済みの batch と列が一致すること）
+        batch: 追加する行
+        filename: 追加する行の読み込み元のファイル名
+
+    Returns:
+        行を追加したDataFrame
+    """
+    batch = batch.drop(columns=SOURCE_FILE_COLUMN, errors="ignore")
+    if SOURCE_FILE_COLUMN in df.columns:
+        sources = df[SOURCE_FILE_COLUMN].cat.add_categories(
+            [filename] if filename not in df[SOURCE_FILE_COLUMN].cat.categories else []
+        )
+        df = df.assign(**{SOURCE_FILE_COLUMN: sources})
+        batch = batch.assign(
+            **{SOURCE_FILE_COLUMN: pd.Categorical([filename] * len(batch), dtype=sources.dtype)}
+        )
+    return pd.concat([df, batch[df.columns]], ignore_index=True)
@@ -0,0 +1,47 @@
+"""アップロードされたCSVをワーカープロセスで読み込む関数
+
+複数ファイルのアップロードでは、ファイルごとにワーカープロセスで読み込み、結果を
+Arrow IPC ファイルに書き出す。親プロセスはそれをメモリマップで開くため、読み込んだ
+データをpickleしてプロセス間で送るコピーが発生しない。ワーカーの起動時に pandas や
+Streamlit を読み込まないよう、このモジュールは pyarrow だけに依存させる。
+"""
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.ipc as ipc
+
+
+def parse_csv_to_arrow(
+    source: str,
+    dest: str,
+    use_threads: bool = True,
+    encoding: str = "utf8",
+    delimiter: str = ",",
+    skip_rows: int = 0,
+) -> int:
+    """CSVファイルを読み込み、Arrow IPC ファイルに書き出す
+
+    Args:
+        source: CSVファイルのパス
+        dest: 書き出す Arrow IPC ファイルのパス
+        use_threads: ファイル内の読み込みを複数スレッドで行うか
+            （複数のワーカープロセスで同時に読み込む場合はコア数を超えないよう False にする）
+        encoding: 文字コード（CsvFormat.arrow_encoding）
+        delimiter: 区切り文字
+        skip_rows: ヘッダー行の前に読み飛ばす行数
+
+    Returns:
+        読み込んだ行数
+    """
+    table = pacsv.read_csv(
+        source,
+        read_options=pacsv.ReadOptions(
+            use_threads=use_threads, encoding=encoding, skip_rows=skip_rows
+        ),
+        parse_options=pacsv.ParseOptions(delimiter=delimiter),
+        # 空のセルは pandas.read_csv と同じく、文字列のカラムでも欠損にする
+        convert_options=pacsv.ConvertOptions(strings_can_be_null=True),
+    )
+    with pa.OSFile(dest, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return table.num_rows
@@ -0,0 +1,430 @@
+"""セッション・キャッシュごとのメモリ保持量を集計し、大きな保持元を追い出すモジュール
+
+保持元（履歴エントリ・エクスポートキャッシュなど）は「プロバイダ」として登録し、
+一覧の作成と追い出しをプロバイダに委ねる。tracemalloc のスナップショット差分は
+保持元に紐づかない一時オブジェクト（pandas の中間結果など）の増加を調べるのに使う。
+
+定期的にレポートを出力する場合は環境変数 MEMORY_REPORT_FILE に出力先を指定する。
+他のセッションの情報を表示・操作する管理画面は、サーバー側で環境変数
+MEMORY_ADMIN=1 を設定した場合のみ有効にする。
+"""
+
+import json
+import logging
+import os
+import threading
+import tracemalloc
+import weakref
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from utils.export_cache import get_export_cache
+
+logger = logging.getLogger(__name__)
+
+MEMORY_REPORT_FILE_ENV = "MEMORY_REPORT_FILE"
+MEMORY_REPORT_INTERVAL_ENV = "MEMORY_REPORT_INTERVAL"
+MEMORY_ADMIN_ENV = "MEMORY_ADMIN"
+
+# 定期レポートの既定の間隔（秒）
+DEFAULT_REPORT_INTERVAL = 5 * 60
+
+# tracemalloc で記録するスタックの深さ
+TRACEMALLOC_FRAMES = 10
+
+# セッションに属さない（プロセス共通の）保持元のセッションID
+SHARED_SESSION = "shared"
+
+_HANDLE_KEY = "_memory_handle"
+
+
+@dataclass(frozen=True)
+class MemoryHolder:
+    """メモリを保持している1つの対象
+
+    Attributes:
+        kind: 種類（"history", "export_cache" など。プロバイダ名）
+        session_id: 保持しているセッションのID（共通キャッシュは "shared"）
+        key: プロバイダ内で対象を特定するキー
+        label: 表示用の名前
+        nbytes: 保持しているバイト数
+    """
+
+    kind: str
+    session_id: str
+    key: str
+    label: str
+    nbytes: int
+
+
+@dataclass
+class AllocationDiff:
+    """tracemalloc スナップショット間の割り当て差分（1箇所分）
+
+    Attributes:
+        location: 割り当て箇所（"ファイル:行"）
+        size_diff: 前回からの増減（バイト）
+        size: 現在の合計（バイト）
+        count_diff: 前回からのブロック数の増減
+    """
+
+    location: str
+    size_diff: int
+    size: int
+    count_diff: int
+
+
+@dataclass
+class MemoryReport:
+    """メモリ保持量のレポート
+
+    Attributes:
+        created_at: 作成時刻（ISO 8601）
+        holders: 保持元（大きい順）
+        allocations: tracemalloc の差分（増加が大きい順、未計測なら空）
+    """
+
+    created_at: str
+    holders: list[MemoryHolder] = field(default_factory=list)
+    allocations: list[AllocationDiff] = field(default_factory=list)
+
+    def totals_by_kind(self) -> dict[str, int]:
+        """種類ごとの合計バイト数"""
+        totals: dict[str, int] = {}
+        for holder in self.holders:
+            totals[holder.kind] = totals.get(holder.kind, 0) + holder.nbytes
+        return totals
+
+    def totals_by_session(self) -> dict[str, int]:
+        """セッションごとの合計バイト数"""
+        totals: dict[str, int] = {}
+        for holder in self.holders:
+            totals[holder.session_id] = totals.get(holder.session_id, 0) + holder.nbytes
+        return totals
+
+
+@dataclass
+class MemoryProvider:
+    """保持元の一覧と追い出しを提供する
+
+    Attributes:
+        list_holders: 保持元を列挙する関数
+        evict: 保持元を追い出す関数（追い出せたらTrue）
+    """
+
+    list_holders: Callable[[], list[MemoryHolder]]
+    evict: Callable[[MemoryHolder], bool]
+
+
+_providers: dict[str, MemoryProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def register_memory_provider(
+    kind: str,
+    list_holders: Callable[[], list[MemoryHolder]],
+    evict: Callable[[MemoryHolder], bool],
+) -> None:
+    """保持元のプロバイダを登録（同じ種類は置き換える）
+
+    Args:
+        kind: 種類
+        list_holders: 保持元を列挙する関数
+        evict: 保持元を追い出す関数
+    """
+    with _providers_lock:
+        _providers[kind] = MemoryProvider(list_holders, evict)
+
+
+def is_memory_admin_enabled() -> bool:
+    """環境変数でメモリの管理画面が有効化されているか（URLからは有効にできない）"""
+    return os.environ.get(MEMORY_ADMIN_ENV) == "1"
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """DataFrameが保持するバイト数（文字列などの中身も含めて計測）"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class SessionHandle:
+    """セッションの履歴を外部（管理画面）から参照するためのハンドル
+
+    session_state に格納し、プロセス共通の一覧からは弱参照で参照するため、
+    セッションが終了すると一覧からも自動的に消える。履歴はそのセッションの
+    スクリプトスレッドだけが変更するため、管理画面からの追い出しは要求として
+    記録し、セッションの次回の再実行で反映する。
+
+    Attributes:
+        session_id (str): セッションID
+        history (list): セッションの履歴リスト（session_state と同じオブジェクト、読み取り専用）
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.history: list[dict] = []
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+
+    def request_eviction(self, data_id: str) -> bool:
+        """履歴エントリの追い出しを要求
+
+        Args:
+            data_id: 履歴エントリのID
+
+        Returns:
+            要求を記録した場合はTrue（エントリが無い、または要求済みならFalse）
+        """
+        with self._lock:
+            if data_id in self._pending:
+                return False
+            if not any(entry["id"] == data_id for entry in list(self.history)):
+                return False
+            self._pending.add(data_id)
+            return True
+
+    def pending_evictions(self) -> set[str]:
+        """反映待ちの追い出し要求"""
+        with self._lock:
+            return set(self._pending)
+
+    def take_pending_evictions(self) -> set[str]:
+        """反映待ちの追い出し要求を取り出す（セッション自身のスレッドから呼ぶ）"""
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        return pending
+
+
+_sessions: "weakref.WeakValueDictionary[str, SessionHandle]" = weakref.WeakValueDictionary()
+
+
+def register_session() -> None:
+    """現在のセッションの履歴を集計対象に登録（再実行の最後に呼ぶ）"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    handle = st.session_state.get(_HANDLE_KEY)
+    if handle is None:
+        handle = SessionHandle(ctx.session_id)
+        st.session_state[_HANDLE_KEY] = handle
+    # 履歴リストは追加・削除のたびに作り直されるため、毎回参照を更新する
+    handle.history = st.session_state.get("upload_history", [])
+    _sessions[ctx.session_id] = handle
+
+
+def take_pending_evictions() -> set[str]:
+    """現在のセッションに届いた履歴エントリの追い出し要求を取り出す（再実行の最初に呼ぶ）
+
+    Returns:
+        追い出す履歴エントリのID
+    """
+    handle = st.session_state.get(_HANDLE_KEY)
+    if handle is None:
+        return set()
+    return handle.take_pending_evictions()
+
+
+def _list_history_holders() -> list[MemoryHolder]:
+    """全セッションの履歴エントリを列挙（追い出し要求済みのものを除く）"""
+    holders = []
+    for session_id, handle in list(_sessions.items()):
+        pending = handle.pending_evictions()
+        for entry in list(handle.history):
+            if entry["id"] in pending:
+                continue
+            holders.append(
+                MemoryHolder(
+                    kind="history",
+                    session_id=session_id,
+                    key=entry["id"],
+                    label=f"{entry['filename']}（{entry['row_count']:,}件）",
+                    nbytes=frame_nbytes(entry["data"]),
+                )
+            )
+    return holders
+
+
+def _evict_history(holder: MemoryHolder) -> bool:
+    """履歴エントリの追い出しを要求（保持しているセッションの次回の再実行で取り除かれる）"""
+    handle = _sessions.get(holder.session_id)
+    if handle is None:
+        return False
+    return handle.request_eviction(holder.key)
+
+
+def _list_export_cache_holders() -> list[MemoryHolder]:
+    """エクスポートキャッシュのメモリ上のエントリを列挙"""
+    return [
+        MemoryHolder(
+            kind="export_cache", session_id=SHARED_SESSION, key=key, label=key, nbytes=size
+        )
+        for key, size in get_export_cache().memory_entries()
+    ]
+
+
+def _evict_export_cache(holder: MemoryHolder) -> bool:
+    """エクスポートキャッシュのエントリを削除"""
+    return get_export_cache().evict(holder.key)
+
+
+register_memory_provider("history", _list_history_holders, _evict_history)
+register_memory_provider("export_cache", _list_export_cache_holders, _evict_export_cache)
+
+
+class AllocationTracker:
+    """tracemalloc のスナップショットを取り、前回との差分を求める"""
+
+    def __init__(self):
+        self._previous: tracemalloc.Snapshot | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_tracing(self) -> bool:
+        """tracemalloc が有効か"""
+        return tracemalloc.is_tracing()
+
+    def start(self, nframes: int = TRACEMALLOC_FRAMES) -> None:
+        """tracemalloc を開始（以降の割り当てが記録対象になる）"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(nframes)
+
+    def stop(self) -> None:
+        """tracemalloc を停止し、保存したスナップショットを破棄"""
+        with self._lock:
+            self._previous = None
+        tracemalloc.stop()
+
+    def diff(self, limit: int = 20) -> list[AllocationDiff]:
+        """スナップショットを取り、前回のスナップショットとの差分を返す
+
+        初回は差分ではなく現在の割り当ての内訳を返す。
+
+        Args:
+            limit: 返す件数の上限
+
+        Returns:
+            増加量が大きい順の割り当て差分（tracemalloc が無効なら空）
+        """
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        with self._lock:
+            previous, self._previous = self._previous, snapshot
+
+        if previous is None:
+            stats = [
+                AllocationDiff(_format_location(s.traceback), s.size, s.size, s.count)
+                for s in snapshot.statistics("lineno")[:limit]
+            ]
+        else:
+            stats = [
+                AllocationDiff(_format_location(s.traceback), s.size_diff, s.size, s.count_diff)
+                for s in snapshot.compare_to(previous, "lineno")[:limit]
+            ]
+        return stats
+
+
+def _format_location(traceback: tracemalloc.Traceback) -> str:
+    """割り当て箇所を "ファイル:行" の形式に変換"""
+    frame = traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+ALLOCATIONS = AllocationTracker()
+
+
+def collect_memory_report(include_allocations: bool = True) -> MemoryReport:
+    """全プロバイダの保持元と tracemalloc の差分を集計
+
+    Args:
+        include_allocations: tracemalloc の差分を含めるか（スナップショットを更新する）
+
+    Returns:
+        レポート
+    """
+    with _providers_lock:
+        providers = dict(_providers)
+
+    holders = []
+    for kind, provider in providers.items():
+        try:
+            holders.extend(provider.list_holders())
+        except Exception as e:
+            logger.warning(f"Failed to list memory holders: kind={kind}, error={e}")
+    holders.sort(key=lambda holder: holder.nbytes, reverse=True)
+
+    return MemoryReport(
+        created_at=datetime.now().isoformat(timespec="seconds"),
+        holders=holders,
+        allocations=ALLOCATIONS.diff() if include_allocations else [],
+    )
+
+
+def evict_holder(holder: MemoryHolder) -> bool:
+    """保持元を追い出す
+
+    Args:
+        holder: 追い出す保持元
+
+    Returns:
+        追い出せた場合はTrue（履歴エントリは、保持しているセッションへの要求を記録できた場合）
+    """
+    with _providers_lock:
+        provider = _providers.get(holder.kind)
+    if provider is None:
+        return False
+    evicted = provider.evict(holder)
+    if evicted:
+        logger.info(
+            f"Memory holder evicted: kind={holder.kind}, session={holder.session_id}, "
+            f"key={holder.key}, bytes={holder.nbytes}"
+        )
+    return evicted
+
+
+def write_memory_report(report: MemoryReport, path: Path) -> None:
+    """レポートをJSON Linesファイルに追記
+
+    Args:
+        report: 書き出すレポート
+        path: 書き出し先
+    """
+    record = {
+        **asdict(report),
+        "totals_by_kind": report.totals_by_kind(),
+        "totals_by_session": report.totals_by_session(),
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+@st.cache_resource(show_spinner=False)
+def start_memory_reporter() -> threading.Event | None:
+    """環境変数 MEMORY_REPORT_FILE が設定されていれば定期レポートを開始（プロセスで1回だけ）
+
+    Returns:
+        set() するとレポートを停止するイベント（未設定ならNone）
+    """
+    path = os.environ.get(MEMORY_REPORT_FILE_ENV)
+    if not path:
+        return None
+    interval = float(os.environ.get(MEMORY_REPORT_INTERVAL_ENV, DEFAULT_REPORT_INTERVAL))
+    ALLOCATIONS.start()
+    stop = threading.Event()
+
+    def loop() -> None:
+        while not stop.wait(interval):
+            try:
+                write_memory_report(collect_memory_report(), Path(path))
+            except Exception as e:
+                logger.warning(f"Failed to write memory report: {e}")
+
+    threading.Thread(target=loop, name="memory-report", daemon=True).start()
+    return stop
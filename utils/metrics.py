@@ -0,0 +1,494 @@
+"""プロセス内のメトリクスを集計し、Prometheus のテキスト形式で公開するモジュール
+
+公開方法は環境変数で選ぶ（両方指定も可）:
+    METRICS_PORT: 指定したポートで http://127.0.0.1:<port>/metrics を提供する
+    METRICS_FILE: 指定したファイルに一定間隔で書き出す（node_exporter の textfile collector 向け）
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+logger = logging.getLogger(__name__)
+
+METRICS_PORT_ENV = "METRICS_PORT"
+METRICS_FILE_ENV = "METRICS_FILE"
+
+# メトリクスファイルを書き出す間隔（秒）
+DEFAULT_FILE_INTERVAL = 15.0
+
+# 一定時間再実行の無いセッションは集計から外す（秒）
+SESSION_IDLE_TIMEOUT = 10 * 60
+
+# 所要時間のヒストグラムの区切り（秒）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# バイト数のヒストグラムの区切り
+SIZE_BUCKETS = tuple(float(1024**2 * 2**i) for i in range(-4, 11, 2))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = tuple[str, ...]
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    """ラベルを Prometheus の書式に変換"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    """ラベル値のエスケープ"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """数値を Prometheus の書式に変換"""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """メトリクスの共通部分"""
+
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        """ラベルの辞書を値のタプルに変換"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} のラベルは {self.labelnames} です: {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[str]:
+        """サンプル行（HELP/TYPE 行を除く）"""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Prometheus のテキスト形式に変換"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+            *self.samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """単調増加するカウンター"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """カウンターを増やす
+
+        Args:
+            amount: 増加量（0以上）
+            **labels: ラベル
+        """
+        if amount < 0:
+            raise ValueError("カウンターは減らせません")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels: str) -> None:
+        """他で数えている累積値をそのまま反映（キャッシュ統計など）
+
+        Args:
+            value: 累積値
+            **labels: ラベル
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def get(self, **labels: str) -> float:
+        """現在値を取得"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """任意に増減する値"""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """値を設定"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def get(self, **labels: str) -> float:
+        """現在値を取得"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """値の分布（累積バケット・合計・件数）"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # ラベルごとの [バケットごとの件数..., +Inf の件数], 合計
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """値を1件記録
+
+        Args:
+            value: 観測値
+            **labels: ラベル
+        """
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: str) -> int:
+        """記録した件数"""
+        with self._lock:
+            return sum(self._counts.get(self._key(labels), []))
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(
+                (key, list(counts), self._sums[key]) for key, counts in self._counts.items()
+            )
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """メトリクスの登録先
+
+    メトリクスは登録順に出力する。collector は出力の直前に呼ばれ、
+    キャッシュ統計などの外部の値をゲージ・カウンターに反映するのに使う。
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: dict[str, Callable[[], None]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """メトリクスを登録（同名のメトリクスが登録済みならそれを返す）"""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """カウンターを登録して返す"""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """ゲージを登録して返す"""
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """ヒストグラムを登録して返す"""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def set_collector(self, name: str, collector: Callable[[], None]) -> None:
+        """出力の直前に呼ぶ関数を登録（同名の関数は置き換える）
+
+        Args:
+            name: 登録名
+            collector: 呼び出す関数
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    def render(self) -> str:
+        """全メトリクスを Prometheus のテキスト形式に変換
+
+        Returns:
+            テキスト形式のメトリクス（末尾は改行）
+        """
+        with self._lock:
+            collectors = list(self._collectors.values())
+            metrics = list(self._metrics.values())
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+# プロセス共通のレジストリと、アプリが記録するメトリクス
+REGISTRY = MetricsRegistry()
+
+UPLOAD_PARSE_SECONDS = REGISTRY.histogram(
+    "app_upload_parse_seconds", "Time spent parsing uploaded or sample data.", ["source"]
+)
+ROWS_INGESTED = REGISTRY.counter(
+    "app_rows_ingested_total", "Rows added to upload history.", ["source"]
+)
+EXPORT_SECONDS = REGISTRY.histogram(
+    "app_export_duration_seconds", "Time spent writing export artifacts.", ["format", "status"]
+)
+EXPORT_BYTES = REGISTRY.histogram(
+    "app_export_size_bytes", "Size of export artifacts.", ["format"], buckets=SIZE_BUCKETS
+)
+EXPORT_BYTES_TOTAL = REGISTRY.counter(
+    "app_export_bytes_total", "Bytes written to export artifacts.", ["format"]
+)
+RERUN_SECONDS = REGISTRY.histogram(
+    "app_rerun_duration_seconds", "Script rerun latency by page.", ["page"]
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "app_cache_requests_total", "Cache lookups by result.", ["cache", "result"]
+)
+CACHE_BYTES = REGISTRY.gauge("app_cache_bytes", "Bytes held by caches.", ["cache", "tier"])
+ACTIVE_SESSIONS = REGISTRY.gauge(
+    "app_active_sessions", "Sessions that reran within the idle timeout."
+)
+HISTORY_BYTES = REGISTRY.gauge(
+    "app_history_bytes", "Bytes of upload history held by active sessions."
+)
+
+
+class SessionTracker:
+    """セッションごとの最終再実行時刻と履歴データ量を記録する
+
+    Attributes:
+        idle_timeout (float): この秒数だけ再実行の無いセッションは除外する
+    """
+
+    def __init__(self, idle_timeout: float = SESSION_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._sessions: dict[str, tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, session_id: str, history_bytes: int) -> None:
+        """セッションの再実行を記録
+
+        Args:
+            session_id: セッションID
+            history_bytes: セッションが保持する履歴データのバイト数
+        """
+        with self._lock:
+            self._sessions[session_id] = (time.monotonic(), history_bytes)
+
+    def snapshot(self) -> tuple[int, int]:
+        """アクティブなセッション数と履歴データ量の合計
+
+        Returns:
+            (セッション数, 履歴データの合計バイト数)
+        """
+        now = time.monotonic()
+        with self._lock:
+            for session_id in [
+                sid for sid, (seen, _) in self._sessions.items() if now - seen > self.idle_timeout
+            ]:
+                del self._sessions[session_id]
+            return len(self._sessions), sum(size for _, size in self._sessions.values())
+
+
+SESSIONS = SessionTracker()
+
+
+def _collect_sessions() -> None:
+    """セッション数・履歴データ量をゲージに反映"""
+    count, history_bytes = SESSIONS.snapshot()
+    ACTIVE_SESSIONS.set(count)
+    HISTORY_BYTES.set(history_bytes)
+
+
+REGISTRY.set_collector("sessions", _collect_sessions)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """/metrics を返すHTTPハンドラ"""
+
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        """アクセスログは出力しない"""
+
+
+def start_http_server(
+    port: int, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY
+) -> ThreadingHTTPServer:
+    """メトリクスを提供するHTTPサーバーをデーモンスレッドで起動
+
+    Args:
+        port: 待ち受けポート（0なら空きポート）
+        host: 待ち受けアドレス
+        registry: 公開するレジストリ
+
+    Returns:
+        起動したサーバー（server.server_address で実際のポートを取得できる）
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Metrics server started: http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+def write_metrics_file(path: Path, registry: MetricsRegistry = REGISTRY) -> None:
+    """メトリクスをファイルに書き出す（読み手が途中の内容を見ないよう置き換えで書く）
+
+    Args:
+        path: 書き出し先
+        registry: 書き出すレジストリ
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(registry.render(), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def start_file_writer(
+    path: Path, interval: float = DEFAULT_FILE_INTERVAL, registry: MetricsRegistry = REGISTRY
+) -> threading.Event:
+    """メトリクスを一定間隔でファイルに書き出すデーモンスレッドを起動
+
+    Args:
+        path: 書き出し先
+        interval: 書き出し間隔（秒）
+        registry: 書き出すレジストリ
+
+    Returns:
+        set() すると書き出しを停止するイベント
+    """
+    stop = threading.Event()
+
+    def loop() -> None:
+        while True:
+            try:
+                write_metrics_file(path, registry)
+            except OSError as e:
+                logger.warning(f"Failed to write metrics file: {e}")
+            if stop.wait(interval):
+                return
+
+    threading.Thread(target=loop, name="metrics-file", daemon=True).start()
+    return stop
+
+
+def is_metrics_export_enabled() -> bool:
+    """環境変数でメトリクスの公開（HTTP・ファイル）が有効化されているか"""
+    return bool(os.environ.get(METRICS_PORT_ENV) or os.environ.get(METRICS_FILE_ENV))
+
+
+def observe_rerun(page: str, seconds: float) -> None:
+    """再実行の所要時間と、セッションが保持する履歴データ量を記録
+
+    履歴データ量は各エントリの追加時に計測済みの memory_bytes を合計する。
+    メトリクスを公開していない場合はセッションの記録を省く。
+
+    Args:
+        page: 表示したページID
+        seconds: 再実行の所要時間（秒）
+    """
+    RERUN_SECONDS.observe(seconds, page=page)
+    if not is_metrics_export_enabled():
+        return
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    history = st.session_state.get("upload_history", [])
+    SESSIONS.touch(ctx.session_id, sum(entry["memory_bytes"] for entry in history))
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_exporter() -> dict[str, object]:
+    """環境変数に従ってメトリクスの公開を開始（プロセスで1回だけ）
+
+    Returns:
+        起動したサーバー・ファイル書き出しの停止イベント（未設定なら空）
+    """
+    exporters: dict[str, object] = {}
+    port = os.environ.get(METRICS_PORT_ENV)
+    if port:
+        try:
+            exporters["http"] = start_http_server(int(port))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to start metrics server on port {port}: {e}")
+    path = os.environ.get(METRICS_FILE_ENV)
+    if path:
+        exporters["file"] = start_file_writer(Path(path))
+    return exporters
@@ -0,0 +1,257 @@
+"""大規模データの集計をプロセスプールで分割実行するモジュール
+
+関心度の列と年齢層の番号を共有メモリに1回だけコピーし、ワーカープロセスは
+行ブロックごとの部分統計量（utils/partial_stats.py）を計算して返す。親プロセスは
+部分統計量を足し合わせ、compute_analysis_summary と同じ AnalysisSummary を組み立てる。
+
+プロセスプールはプロセス共通で1つだけ作り、作成時に全ワーカーを起動して
+NumPy の読み込みを済ませておく（最初の集計で起動待ちが発生しないようにする）。
+ワーカー数は環境変数 AGGREGATION_WORKERS で指定する（既定はCPUコア数、1以下で無効）。
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.analysis_summary import SCORE_VALUES, AnalysisSummary, compute_analysis_summary
+from utils.data_loader import get_sports_columns
+from utils.partial_stats import (
+    PartialStats,
+    SharedArraySpec,
+    compute_block_partial,
+    correlation,
+    group_means,
+    histogram_quantiles,
+    means,
+    warm_worker,
+)
+
+logger = logging.getLogger(__name__)
+
+AGGREGATION_WORKERS_ENV = "AGGREGATION_WORKERS"
+
+# これ未満の行数は分割せず compute_analysis_summary で集計する
+PARALLEL_MIN_ROWS = 1_000_000
+
+# 1ブロックの最小行数（小さすぎるとタスクの往復が支配的になる）
+MIN_BLOCK_ROWS = 100_000
+
+# ワーカーあたりのブロック数（処理時間のばらつきを吸収する）
+BLOCKS_PER_WORKER = 2
+
+# 分布統計（箱ひげ図の要約）の分位と表示名
+QUANTILES = [0.0, 0.25, 0.5, 0.75, 1.0]
+QUANTILE_LABELS = ["最小", "第1四分位", "中央値", "第3四分位", "最大"]
+
+
+class SharedArray:
+    """共有メモリ上に確保したNumPy配列（with文を抜けると解放する）"""
+
+    def __init__(self, shape: tuple[int, ...], dtype: str):
+        nbytes = max(1, math.prod(shape) * np.dtype(dtype).itemsize)
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf)
+        self.spec = SharedArraySpec(self._shm.name, shape, dtype)
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        del self.array
+        self._shm.close()
+        self._shm.unlink()
+
+
+def get_aggregation_workers() -> int:
+    """環境変数で指定されたワーカー数（未指定ならCPUコア数）"""
+    raw = os.environ.get(AGGREGATION_WORKERS_ENV)
+    if raw:
+        try:
+            workers = int(raw)
+        except ValueError:
+            workers = 0
+        if workers >= 1:
+            return workers
+        logger.warning(f"Invalid {AGGREGATION_WORKERS_ENV}, using CPU count: value={raw!r}")
+    return os.cpu_count() or 1
+
+
+def should_partition(rows: int) -> bool:
+    """分割集計を使うか（行数が閾値以上で、ワーカーが2つ以上ある場合）"""
+    return rows >= PARALLEL_MIN_ROWS and get_aggregation_workers() > 1
+
+
+def create_aggregation_pool(workers: int) -> ProcessPoolExecutor:
+    """全ワーカーを起動済みのプロセスプールを作成
+
+    Streamlit はスレッドを多数使うため、fork ではなく spawn でワーカーを起動する。
+
+    Args:
+        workers: ワーカー数
+
+    Returns:
+        ProcessPoolExecutorインスタンス
+    """
+    started = time.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    wait([pool.submit(warm_worker) for _ in range(workers)])
+    logger.info(
+        f"Aggregation pool ready: workers={workers}, elapsed={time.perf_counter() - started:.2f}s"
+    )
+    return pool
+
+
+@st.cache_resource(show_spinner=False)
+def get_aggregation_pool() -> ProcessPoolExecutor:
+    """プロセス共通の集計用プロセスプールを取得
+
+    Returns:
+        ProcessPoolExecutorインスタンス
+    """
+    return create_aggregation_pool(get_aggregation_workers())
+
+
+def _block_bounds(rows: int, workers: int) -> list[tuple[int, int]]:
+    """行をブロックに分割した (開始行, 終了行) の一覧"""
+    blocks = max(1, min(workers * BLOCKS_PER_WORKER, math.ceil(rows / MIN_BLOCK_ROWS)))
+    size = math.ceil(rows / blocks) if rows else 0
+    return [(start, min(start + size, rows)) for start in range(0, rows, size or 1)]
+
+
+def compute_partitioned_summary(
+    df: pd.DataFrame, executor: Executor, workers: int | None = None
+) -> AnalysisSummary:
+    """行ブロックに分割して並列に集計し、compute_analysis_summary と同じ結果を返す
+
+    関心度が1〜5の整数以外を含む場合、分布統計だけは pandas で計算する。
+
+    Args:
+        df: スポーツ関心度調査データ
+        executor: 部分統計量を計算するプロセスプール
+        workers: 分割の基準にするワーカー数（省略時は環境変数・CPUコア数）
+
+    Returns:
+        集計結果
+    """
+    sports_cols = get_sports_columns(df)
+    codes, groups = pd.factorize(df["年齢層"], sort=True)
+    rows = len(df)
+
+    with (
+        SharedArray((len(sports_cols), rows), "float64") as scores,
+        SharedArray((rows,), "int64") as shared_codes,
+    ):
+        # 種目ごとに連続した配置でコピーする（列単位のコピーで済み、ブロックも列ごとに連続）
+        for i, col in enumerate(sports_cols):
+            scores.array[i] = df[col].to_numpy(dtype="float64", na_value=np.nan)
+        shared_codes.array[:] = codes
+
+        futures = [
+            executor.submit(
+                compute_block_partial, scores.spec, shared_codes.spec, start, stop, len(groups)
+            )
+            for start, stop in _block_bounds(rows, workers or get_aggregation_workers())
+        ]
+        partials = [future.result() for future in futures]
+
+    stats = partials[0]
+    for partial in partials[1:]:
+        stats = stats.merge(partial)
+
+    return summary_from_partial(
+        stats, sports_cols, groups, quantile_fallback=lambda: group_quantiles(df, sports_cols)
+    )
+
+
+def group_quantiles(df: pd.DataFrame, sports_cols: list[str]) -> pd.DataFrame:
+    """年齢層別・種目別の分布統計を pandas で計算（compute_analysis_summary と同じ形）"""
+    return (
+        df.groupby("年齢層", observed=True)[sports_cols]
+        .quantile(QUANTILES)
+        .rename_axis(["年齢層", "統計量"])
+        .rename(index=dict(zip(QUANTILES, QUANTILE_LABELS, strict=True)))
+    )
+
+
+def quantile_frame(quantiles: np.ndarray, sports_cols: list[str], groups: Sequence) -> pd.DataFrame:
+    """(G, k, 5) の分位点の配列を分布統計の DataFrame（年齢層・統計量の MultiIndex）にする"""
+    return pd.DataFrame(
+        quantiles.transpose(0, 2, 1).reshape(len(groups) * len(QUANTILES), len(sports_cols)),
+        index=pd.MultiIndex.from_product(
+            [pd.Index(groups, name="年齢層"), QUANTILE_LABELS], names=["年齢層", "統計量"]
+        ),
+        columns=sports_cols,
+    )
+
+
+def summary_from_partial(
+    stats: PartialStats,
+    sports_cols: list[str],
+    groups: Sequence,
+    quantile_fallback: Callable[[], pd.DataFrame] | None = None,
+) -> AnalysisSummary:
+    """足し合わせた部分統計量から AnalysisSummary を組み立てる
+
+    分布統計は年齢層別のヒストグラムから求める。1〜5の整数以外の値がある場合は
+    quantile_fallback で計算し、指定が無ければそれらの値を除いて求める。
+
+    Args:
+        stats: 全行分の部分統計量
+        sports_cols: スポーツ種目のカラム名（部分統計量の列順）
+        groups: 年齢層（部分統計量の年齢層番号順）
+        quantile_fallback: 不正値がある場合に分布統計を計算する関数
+
+    Returns:
+        集計結果
+    """
+    group_index = pd.Index(groups, name="年齢層")
+    score_distribution = pd.DataFrame(stats.hist.T, index=SCORE_VALUES, columns=sports_cols)
+    score_distribution.index.name = "関心度"
+
+    if stats.irregular and quantile_fallback is not None:
+        distribution_stats = quantile_fallback()
+    else:
+        distribution_stats = quantile_frame(
+            histogram_quantiles(stats.group_hist, QUANTILES), sports_cols, groups
+        )
+
+    return AnalysisSummary(
+        sport_means=pd.Series(means(stats), index=sports_cols).sort_values(ascending=False),
+        age_group_means=pd.DataFrame(group_means(stats), index=group_index, columns=sports_cols),
+        correlation=pd.DataFrame(correlation(stats), index=sports_cols, columns=sports_cols),
+        score_distribution=score_distribution,
+        distribution_stats=distribution_stats,
+        row_count=stats.rows,
+    )
+
+
+def compute_summary(df: pd.DataFrame) -> AnalysisSummary:
+    """行数に応じて分割集計と compute_analysis_summary を使い分けて集計
+
+    ワーカーが異常終了してプールが使えなくなった場合は、プールを作り直すよう
+    破棄したうえで、このスレッドで集計する。
+
+    Args:
+        df: スポーツ関心度調査データ
+
+    Returns:
+        集計結果
+    """
+    if not should_partition(len(df)):
+        return compute_analysis_summary(df)
+    try:
+        return compute_partitioned_summary(df, get_aggregation_pool())
+    except BrokenProcessPool as e:
+        logger.warning(f"Aggregation pool broken, falling back to single process: {e}")
+        get_aggregation_pool.clear()
+        return compute_analysis_summary(df)
@@ -0,0 +1,237 @@
+"""行ブロックごとに計算して足し合わせられる（マージ可能な）部分統計量
+
+関心度の行列を行ブロックに分け、ブロックごとに件数・合計・積和（共積率）・
+ヒストグラムを求めて足し合わせると、全体の平均・相関・分布を再計算できる。
+ワーカープロセスで実行する関数（compute_block_partial）もここに置き、ワーカーの
+起動時に pandas や Streamlit を読み込まないよう、このモジュールは NumPy だけに依存させる。
+
+欠損値は pandas と同じく、平均では列ごとに、相関では2列とも値がある行だけで扱う。
+"""
+
+import os
+from dataclasses import dataclass, fields
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# 関心度の取りうる値の範囲（ヒストグラムのビン）
+MIN_SCORE = 1
+MAX_SCORE = 5
+N_SCORES = MAX_SCORE - MIN_SCORE + 1
+
+
+@dataclass
+class PartialStats:
+    """行ブロック分の部分統計量（k: スポーツ種目数, G: 年齢層数）
+
+    Attributes:
+        rows: 行数
+        pair_count: (k, k) 2列とも値がある行数
+        pair_sum: (k, k) [i, j] は列jにも値がある行での列iの合計
+        pair_sumsq: (k, k) [i, j] は列jにも値がある行での列iの二乗和
+        cross: (k, k) 列iと列jの積和
+        group_count: (G, k) 年齢層別・種目別の値がある行数
+        group_sum: (G, k) 年齢層別・種目別の合計
+        group_hist: (G, k, 5) 年齢層別・種目別の関心度（1〜5）ごとの件数
+        hist: (k, 5) 種目別の関心度（1〜5）ごとの件数（年齢層の欠損行も含む）
+        irregular: 1〜5の整数以外の値の個数（0ならヒストグラムから分位点を求められる）
+    """
+
+    rows: int
+    pair_count: np.ndarray
+    pair_sum: np.ndarray
+    pair_sumsq: np.ndarray
+    cross: np.ndarray
+    group_count: np.ndarray
+    group_sum: np.ndarray
+    group_hist: np.ndarray
+    hist: np.ndarray
+    irregular: int
+
+    def merge(self, other: "PartialStats") -> "PartialStats":
+        """別のブロックの部分統計量と足し合わせる
+
+        Args:
+            other: 同じ列・年齢層で計算した部分統計量
+
+        Returns:
+            足し合わせた部分統計量
+        """
+        return PartialStats(
+            **{f.name: getattr(self, f.name) + getattr(other, f.name) for f in fields(self)}
+        )
+
+
+def compute_partial(block: np.ndarray, codes: np.ndarray, n_groups: int) -> PartialStats:
+    """行ブロックの部分統計量を計算
+
+    Args:
+        block: (n, k) 関心度（float64、欠損はNaN）
+        codes: (n,) 年齢層の番号（0〜G-1、欠損は-1）
+        n_groups: 年齢層数
+
+    Returns:
+        部分統計量
+    """
+    n_rows, n_cols = block.shape
+    # 種目ごとに連続した (k, n) の配置で計算する（列の取り出しが連続アクセスになる）
+    columns = block.T
+    present = ~np.isnan(columns)
+    weights = present.astype(np.float64)
+    values = np.where(present, columns, 0.0)
+
+    # 2列とも値がある行での件数・合計・二乗和・積和（行列積でまとめて求める）
+    cross = values @ values.T
+    if present.all():
+        # 欠損が無ければ列ごとの件数・合計・二乗和で済む
+        pair_count = np.full((n_cols, n_cols), n_rows, dtype=np.int64)
+        pair_sum = np.repeat(values.sum(axis=1)[:, None], n_cols, axis=1)
+        pair_sumsq = np.repeat(np.diag(cross)[:, None], n_cols, axis=1)
+    else:
+        pair_count = np.rint(weights @ weights.T).astype(np.int64)
+        pair_sum = values @ weights.T
+        pair_sumsq = (values * values) @ weights.T
+
+    # 年齢層の欠損行は番号Gの年齢層として数え、最後に取り除く（マスクでの抽出を避ける）
+    groups = np.where(codes >= 0, codes, n_groups)
+    # 1〜5の整数以外は最後の1ビンに集める
+    overflow = (n_groups + 1) * N_SCORES
+
+    group_count = np.empty((n_groups, n_cols), dtype=np.int64)
+    group_sum = np.empty((n_groups, n_cols), dtype=np.float64)
+    group_hist = np.empty((n_groups, n_cols, N_SCORES), dtype=np.int64)
+    hist = np.empty((n_cols, N_SCORES), dtype=np.int64)
+    irregular = 0
+    for j in range(n_cols):
+        column = values[j]
+        counts = np.bincount(groups, weights=weights[j], minlength=n_groups + 1)
+        group_count[:, j] = np.rint(counts[:n_groups])
+        group_sum[:, j] = np.bincount(groups, weights=column, minlength=n_groups + 1)[:n_groups]
+
+        regular = (column == np.rint(column)) & (column >= MIN_SCORE) & (column <= MAX_SCORE)
+        bins = np.where(regular, groups * N_SCORES + column.astype(np.int64) - MIN_SCORE, overflow)
+        by_group = np.bincount(bins, minlength=overflow + 1)
+        scores = by_group[:overflow].reshape(n_groups + 1, N_SCORES)
+        group_hist[:, j, :] = scores[:n_groups]
+        hist[j] = scores.sum(axis=0)
+        # 欠損（0に置き換え済み）も範囲外に入るため、値がある分だけを不正値として数える
+        irregular += int(counts.sum()) - int(scores.sum())
+
+    return PartialStats(
+        rows=n_rows,
+        pair_count=pair_count,
+        pair_sum=pair_sum,
+        pair_sumsq=pair_sumsq,
+        cross=cross,
+        group_count=group_count,
+        group_sum=group_sum,
+        group_hist=group_hist,
+        hist=hist,
+        irregular=irregular,
+    )
+
+
+def means(stats: PartialStats) -> np.ndarray:
+    """(k,) 種目別の平均（値が無い種目はNaN）"""
+    count = np.diag(stats.pair_count)
+    return _safe_divide(np.diag(stats.pair_sum), count)
+
+
+def group_means(stats: PartialStats) -> np.ndarray:
+    """(G, k) 年齢層別・種目別の平均（値が無い組み合わせはNaN）"""
+    return _safe_divide(stats.group_sum, stats.group_count)
+
+
+def correlation(stats: PartialStats) -> np.ndarray:
+    """(k, k) ピアソンの相関係数（2列とも値がある行で計算、DataFrame.corr と同じ扱い）"""
+    n = stats.pair_count.astype(np.float64)
+    sum_i = stats.pair_sum
+    sum_j = stats.pair_sum.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = stats.cross - sum_i * sum_j / n
+        var_i = stats.pair_sumsq - sum_i * sum_i / n
+        var_j = stats.pair_sumsq.T - sum_j * sum_j / n
+        corr = cov / np.sqrt(var_i * var_j)
+    corr = np.clip(corr, -1.0, 1.0)
+    corr[n < 2] = np.nan
+    return corr
+
+
+def histogram_quantiles(hist: np.ndarray, quantiles: list[float]) -> np.ndarray:
+    """関心度のヒストグラムから分位点を求める（線形補間、pandas の既定と同じ）
+
+    Args:
+        hist: (..., 5) 関心度ごとの件数
+        quantiles: 求める分位（0〜1）
+
+    Returns:
+        (..., len(quantiles)) 分位点（件数0はNaN）
+    """
+    n = hist.sum(axis=-1)
+    cumulative = hist.cumsum(axis=-1)
+    results = []
+    for q in quantiles:
+        position = q * (n - 1)
+        lower = np.floor(position)
+        upper = np.ceil(position)
+        # 順位 i の値 = 累積件数が i を超える最初の関心度
+        lower_value = MIN_SCORE + (cumulative <= lower[..., None]).sum(axis=-1)
+        upper_value = MIN_SCORE + (cumulative <= upper[..., None]).sum(axis=-1)
+        value = lower_value + (position - lower) * (upper_value - lower_value)
+        results.append(np.where(n > 0, value, np.nan))
+    return np.stack(results, axis=-1)
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """0除算をNaNにする割り算"""
+    result = np.full(np.shape(numerator), np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+@dataclass(frozen=True)
+class SharedArraySpec:
+    """共有メモリ上の配列をワーカーで開くための情報
+
+    Attributes:
+        name: 共有メモリ名
+        shape: 配列の形状
+        dtype: 配列の型
+    """
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+def warm_worker() -> int:
+    """ワーカーの起動を待つための空タスク"""
+    return os.getpid()
+
+
+def compute_block_partial(
+    scores: SharedArraySpec, codes: SharedArraySpec, start: int, stop: int, n_groups: int
+) -> PartialStats:
+    """共有メモリ上の行ブロックの部分統計量を計算（ワーカープロセスで実行）
+
+    Args:
+        scores: (k, n) 関心度（種目ごとに連続）の共有配列
+        codes: (n,) 年齢層の番号の共有配列
+        start: ブロックの開始行
+        stop: ブロックの終了行（この行は含まない）
+        n_groups: 年齢層数
+
+    Returns:
+        部分統計量
+    """
+    scores_shm = shared_memory.SharedMemory(name=scores.name)
+    codes_shm = shared_memory.SharedMemory(name=codes.name)
+    try:
+        score_array = np.ndarray(scores.shape, dtype=scores.dtype, buffer=scores_shm.buf)
+        code_array = np.ndarray(codes.shape, dtype=codes.dtype, buffer=codes_shm.buf)
+        partial = compute_partial(score_array[:, start:stop].T, code_array[start:stop], n_groups)
+        del score_array, code_array
+        return partial
+    finally:
+        scores_shm.close()
+        codes_shm.close()
@@ -0,0 +1,281 @@
+"""重い処理をプロセス全体で同時実行数制限付きで実行するスケジューラーモジュール"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from concurrent.futures import Future, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+import pandas as pd
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# 同時実行スロット数
+DEFAULT_MAX_SLOTS = min(4, os.cpu_count() or 1)
+
+# 同時に実行中のジョブが使ってよい推定メモリの合計（バイト）
+DEFAULT_MEMORY_BUDGET = 2 * 1024 * 1024 * 1024
+
+# 待機中に画面を更新する間隔（秒）
+_WAIT_POLL_INTERVAL = 0.2
+
+
+@dataclass
+class ScheduledTask:
+    """スケジューラーに登録されたタスク
+
+    Attributes:
+        session_id: 登録したセッションのID
+        label: 表示用のラベル
+        estimated_bytes: 推定メモリ使用量（バイト）
+        fn: 実行する関数
+        args: fnの位置引数
+        kwargs: fnのキーワード引数
+        future: 実行結果を受け取るFuture
+        submitted_at: 登録時刻（time.monotonic()）
+        started_at: 実行開始時刻（time.monotonic()）
+    """
+
+    session_id: str
+    label: str
+    estimated_bytes: int
+    fn: Callable[..., Any]
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    future: Future = field(default_factory=Future)
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: float | None = None
+
+
+class JobScheduler:
+    """同時実行数・メモリ量を制限してタスクを実行するスケジューラー
+
+    セッションごとに待ち行列を持ち、セッション間はラウンドロビンで公平に
+    取り出す。推定メモリの合計が予算を超えるタスクは、実行中のタスクが
+    終わるまで開始しない（実行中のタスクが無い場合は予算超過でも開始する）。
+
+    Attributes:
+        max_slots (int): 同時実行スロット数
+        memory_budget (int): 推定メモリの予算（バイト）
+    """
+
+    def __init__(
+        self, max_slots: int = DEFAULT_MAX_SLOTS, memory_budget: int = DEFAULT_MEMORY_BUDGET
+    ):
+        """JobSchedulerを初期化
+
+        Args:
+            max_slots: 同時実行スロット数
+            memory_budget: 推定メモリの予算（バイト）
+        """
+        self.max_slots = max_slots
+        self.memory_budget = memory_budget
+        self._queues: OrderedDict[str, deque[ScheduledTask]] = OrderedDict()
+        self._running: set[int] = set()
+        self._reserved_bytes = 0
+        self._condition = threading.Condition()
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"job-scheduler-{i}", daemon=True)
+            for i in range(max_slots)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self,
+        session_id: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        estimated_bytes: int = 0,
+        label: str = "",
+        **kwargs: Any,
+    ) -> ScheduledTask:
+        """タスクを待ち行列に登録
+
+        Args:
+            session_id: 登録するセッションのID
+            fn: 実行する関数
+            *args: fnの位置引数
+            estimated_bytes: 推定メモリ使用量（バイト）
+            label: 表示用のラベル
+            **kwargs: fnのキーワード引数
+
+        Returns:
+            登録したタスク
+        """
+        task = ScheduledTask(
+            session_id=session_id,
+            label=label or getattr(fn, "__name__", "task"),
+            estimated_bytes=estimated_bytes,
+            fn=fn,
+            args=args,
+            kwargs=kwargs,
+        )
+        with self._condition:
+            self._queues.setdefault(session_id, deque()).append(task)
+            self._condition.notify()
+        return task
+
+    def queue_position(self, task: ScheduledTask) -> int:
+        """タスクの待ち順位を取得
+
+        Args:
+            task: 対象のタスク
+
+        Returns:
+            次に実行されるタスクを1とした順位、実行中・完了済みの場合は0
+        """
+        with self._condition:
+            for position, queued in enumerate(self._fair_order(), start=1):
+                if queued is task:
+                    return position
+        return 0
+
+    def stats(self) -> dict[str, int]:
+        """スケジューラーの状態を取得
+
+        Returns:
+            実行中タスク数・待機中タスク数・確保済み推定メモリ
+        """
+        with self._condition:
+            return {
+                "running": len(self._running),
+                "queued": sum(len(queue) for queue in self._queues.values()),
+                "reserved_bytes": self._reserved_bytes,
+            }
+
+    def _fair_order(self) -> list[ScheduledTask]:
+        """セッション間ラウンドロビンでの実行順に並べた待機中タスク"""
+        queues = [list(queue) for queue in self._queues.values()]
+        order = []
+        for depth in range(max((len(queue) for queue in queues), default=0)):
+            order.extend(queue[depth] for queue in queues if depth < len(queue))
+        return order
+
+    def _take_next(self) -> ScheduledTask | None:
+        """メモリ予算内で実行可能な次のタスクを取り出す（ロック保持中に呼ぶ）"""
+        for session_id, queue in list(self._queues.items()):
+            task = queue[0]
+            fits = self._reserved_bytes + task.estimated_bytes <= self.memory_budget
+            if fits or not self._running:
+                queue.popleft()
+                # 取り出したセッションを末尾に回して公平性を保つ
+                del self._queues[session_id]
+                if queue:
+                    self._queues[session_id] = queue
+                return task
+        return None
+
+    def _worker_loop(self) -> None:
+        """ワーカースレッドのメインループ"""
+        while True:
+            with self._condition:
+                task = self._take_next()
+                while task is None:
+                    self._condition.wait()
+                    task = self._take_next()
+                self._running.add(id(task))
+                self._reserved_bytes += task.estimated_bytes
+
+            task.started_at = time.monotonic()
+            result = error = None
+            running = task.future.set_running_or_notify_cancel()
+            if running:
+                try:
+                    result = task.fn(*task.args, **task.kwargs)
+                except BaseException as e:
+                    error = e
+            logger.info(
+                f"Scheduled task finished: label={task.label}, session={task.session_id}, "
+                f"waited={task.started_at - task.submitted_at:.2f}s, "
+                f"ran={time.monotonic() - task.started_at:.2f}s"
+            )
+
+            # 予約を解放してから結果を設定する（完了を待った側からは解放済みに見える）
+            with self._condition:
+                self._running.discard(id(task))
+                self._reserved_bytes -= task.estimated_bytes
+                self._condition.notify_all()
+            if running:
+                if error is None:
+                    task.future.set_result(result)
+                else:
+                    task.future.set_exception(error)
+
+
+def estimate_frame_bytes(df: pd.DataFrame) -> int:
+    """DataFrameの処理に必要なメモリを概算
+
+    文字列カラムを走査しない浅いメモリ使用量を用いるため、データ量に依存せず高速。
+
+    Args:
+        df: 対象のDataFrame
+
+    Returns:
+        推定バイト数
+    """
+    return int(df.memory_usage(index=True, deep=False).sum())
+
+
+def get_session_id() -> str:
+    """現在のStreamlitセッションIDを取得
+
+    Returns:
+        セッションID（スクリプト実行外では "default"）
+    """
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "default"
+
+
+@st.cache_resource(show_spinner=False)
+def get_scheduler() -> JobScheduler:
+    """プロセス共通のJobSchedulerを取得
+
+    Returns:
+        JobSchedulerインスタンス
+    """
+    return JobScheduler()
+
+
+def run_scheduled(
+    label: str,
+    fn: Callable[..., Any],
+    *args: Any,
+    estimated_bytes: int = 0,
+    **kwargs: Any,
+) -> Any:
+    """スケジューラー経由で関数を実行し、待機中は順番待ちの状況を表示
+
+    Args:
+        label: 画面に表示する処理名
+        fn: 実行する関数
+        *args: fnの位置引数
+        estimated_bytes: 推定メモリ使用量（バイト）
+        **kwargs: fnのキーワード引数
+
+    Returns:
+        fnの戻り値
+    """
+    scheduler = get_scheduler()
+    task = scheduler.submit(
+        get_session_id(), fn, *args, estimated_bytes=estimated_bytes, label=label, **kwargs
+    )
+
+    placeholder = None
+    while not wait([task.future], timeout=_WAIT_POLL_INTERVAL).done:
+        position = scheduler.queue_position(task)
+        if position > 0:
+            if placeholder is None:
+                placeholder = st.empty()
+            placeholder.info(f"⏳ {label}: 順番待ち中です（{position}番目）")
+
+    if placeholder is not None:
+        placeholder.empty()
+    return task.future.result()
@@ -0,0 +1,202 @@
+"""関心度のカラムの表記ゆれを読み込み時に修正するモジュール
+
+アップロードされたデータには "N/A"・全角の "５"・空白だけのセル・"4.0" などが混ざり、
+関心度のカラムが文字列型になることがある。文字列型のままでは
+optimize_dataframe_memory で小さい型に変換されず、平均・相関も計算できないか
+遅い処理になる。読み込み時に次の修正を pyarrow.compute の配列演算でまとめて行い、
+欠損を扱える UInt8 型に変換する（セルごとの Python の処理は行わない）。
+
+- 前後の空白を除く
+- 全角の数字・記号を半角にする（NFKC正規化）
+- 欠損値の表記（get_na_tokens、大文字・小文字を区別しない）を欠損にする
+- "4.0" のような小数表記の整数を整数にする
+
+修正後も整数にできない値（"高い"・"2.5" など）があるカラムは変換せずにそのまま残し、
+検証（utils/upload_validation.py）で値域外として報告する。
+"""
+
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from utils.data_loader import SOURCE_FILE_COLUMN
+
+NA_TOKENS_ENV = "SCORE_NA_TOKENS"
+
+# 欠損として扱う表記（NFKC正規化・小文字化した後の値と比較する。空文字は空白だけのセル）
+DEFAULT_NA_TOKENS = ("", "n/a", "na", "nan", "null", "none", "-", "無回答", "不明")
+
+# 修正後の関心度の型
+CLEAN_SCORE_DTYPE = "UInt8"
+
+# 整数として読める表記（"4"・"4.0"・"4."）
+INTEGER_PATTERN = r"^[0-9]+(\.0*)?$"
+
+# 修正の種類
+TRIMMED = "前後の空白"
+FULL_WIDTH = "全角文字"
+NA_TOKEN = "欠損値の表記"
+DECIMAL = "小数表記"
+
+
+def get_na_tokens() -> tuple[str, ...]:
+    """欠損として扱う表記（環境変数 SCORE_NA_TOKENS にカンマ区切りで指定、未設定なら既定値）"""
+    raw = os.environ.get(NA_TOKENS_ENV)
+    if raw is None:
+        return DEFAULT_NA_TOKENS
+    return tuple(token.strip().lower() for token in raw.split(","))
+
+
+@dataclass
+class CleaningReport:
+    """読み込み時の修正結果
+
+    Attributes:
+        columns: 修正して CLEAN_SCORE_DTYPE に変換したカラム（修正箇所が無いものも含む）
+        repairs: カラムごとの、修正の種類ごとの件数（0件の種類は含まない）
+    """
+
+    columns: list[str] = field(default_factory=list)
+    repairs: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        """修正したセルの延べ数"""
+        return sum(sum(counts.values()) for counts in self.repairs.values())
+
+    def record(self, column: str, counts: dict[str, int]) -> None:
+        """カラムの修正件数を加算"""
+        if column not in self.columns:
+            self.columns.append(column)
+        repairs = self.repairs.setdefault(column, {})
+        for kind, count in counts.items():
+            if count:
+                repairs[kind] = repairs.get(kind, 0) + count
+        if not repairs:
+            del self.repairs[column]
+
+    def format(self) -> str:
+        """画面表示用の要約（修正が無ければ空文字）"""
+        parts = []
+        for column, counts in self.repairs.items():
+            details = "、".join(f"{kind} {count:,}件" for kind, count in counts.items())
+            parts.append(f"{column}（{details}）")
+        return " / ".join(parts)
+
+
+def clean_score_array(
+    values: pa.Array | pa.ChunkedArray, na_tokens: Sequence[str] | None = None
+) -> tuple[pa.Array | pa.ChunkedArray | None, dict[str, int]]:
+    """文字列の関心度の配列を修正して uint8 の配列にする
+
+    Args:
+        values: 文字列型の配列
+        na_tokens: 欠損として扱う表記（省略時は get_na_tokens）
+
+    Returns:
+        (uint8 の配列, 修正の種類ごとの件数)。整数にできない値がある場合や
+        uint8 に収まらない場合は配列を None とする
+    """
+    tokens = pa.array(get_na_tokens() if na_tokens is None else na_tokens, pa.string())
+    trimmed = pc.utf8_trim_whitespace(values)
+    normalized = pc.utf8_normalize(trimmed, "NFKC")
+    is_na_token = pc.fill_null(pc.is_in(pc.utf8_lower(normalized), value_set=tokens), False)
+    present = pc.and_(pc.is_valid(values), pc.invert(is_na_token))
+    is_integer = pc.fill_null(pc.match_substring_regex(normalized, INTEGER_PATTERN), False)
+    if not pc.all(pc.or_(pc.invert(present), is_integer)).as_py():
+        return None, {}
+
+    scores = pc.cast(pc.if_else(present, normalized, None), pa.float64())
+    if (pc.max(scores).as_py() or 0) > 255:
+        return None, {}
+    has_decimal = pc.and_(present, pc.match_substring(normalized, "."))
+    counts = {
+        TRIMMED: pc.sum(pc.not_equal(trimmed, values)).as_py() or 0,
+        FULL_WIDTH: pc.sum(pc.not_equal(normalized, trimmed)).as_py() or 0,
+        NA_TOKEN: pc.sum(is_na_token).as_py() or 0,
+        DECIMAL: pc.sum(has_decimal).as_py() or 0,
+    }
+    return pc.cast(scores, pa.uint8()), counts
+
+
+def _score_columns(columns: Sequence[str]) -> list[str]:
+    excluded = ("回答者ID", "年齢層", SOURCE_FILE_COLUMN)
+    return [col for col in columns if col not in excluded]
+
+
+def clean_scores(
+    df: pd.DataFrame, report: CleaningReport, na_tokens: Sequence[str] | None = None
+) -> pd.DataFrame:
+    """文字列型の関心度のカラムを修正して CLEAN_SCORE_DTYPE にしたDataFrameを返す
+
+    数値型のカラムはそのまま残す。チャンクごとに呼ぶ場合は同じ report を渡し、
+    最後に unify_cleaned_dtypes で型を揃える。
+
+    Args:
+        df: 読み込んだデータ（またはチャンク）
+        report: 修正件数を加算する修正結果
+        na_tokens: 欠損として扱う表記（省略時は get_na_tokens）
+
+    Returns:
+        修正したDataFrame（修正するカラムが無ければ df そのもの）
+    """
+    cleaned = {}
+    for col in _score_columns(df.columns):
+        column = df[col]
+        if pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(column):
+            continue
+        # "str" に変換すると pandas 2 では欠損が文字列 "nan" になるため、欠損を保つ string 型にする
+        values, counts = clean_score_array(pa.array(column.astype("string")), na_tokens)
+        if values is None:
+            continue
+        scores = values.to_pandas(types_mapper={pa.uint8(): pd.UInt8Dtype()}.get)
+        cleaned[col] = scores.set_axis(df.index).rename(col)
+        report.record(col, counts)
+    return df.assign(**cleaned) if cleaned else df
+
+
+def clean_table(
+    table: pa.Table, report: CleaningReport, na_tokens: Sequence[str] | None = None
+) -> pa.Table:
+    """文字列型の関心度のカラムを修正して uint8 にした Arrow のテーブルを返す
+
+    Args:
+        table: 読み込んだテーブル
+        report: 修正件数を加算する修正結果
+        na_tokens: 欠損として扱う表記（省略時は get_na_tokens）
+
+    Returns:
+        修正したテーブル
+    """
+    for col in _score_columns(table.column_names):
+        column = table.column(col)
+        if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+            continue
+        values, counts = clean_score_array(column, na_tokens)
+        if values is None:
+            continue
+        table = table.set_column(table.column_names.index(col), col, values)
+        report.record(col, counts)
+    return table
+
+
+def unify_cleaned_dtypes(df: pd.DataFrame, report: CleaningReport) -> pd.DataFrame:
+    """修正したカラムを CLEAN_SCORE_DTYPE に揃える
+
+    チャンクごとに修正した場合、修正が不要だったチャンク（数値型）と結合した
+    カラムは別の型になるため、結合後に呼ぶ。
+
+    Args:
+        df: 結合したデータ
+        report: 修正結果
+
+    Returns:
+        型を揃えたDataFrame
+    """
+    columns = [col for col in report.columns if col in df.columns]
+    mismatched = {col: CLEAN_SCORE_DTYPE for col in columns if df[col].dtype != CLEAN_SCORE_DTYPE}
+    return df.astype(mismatched) if mismatched else df
@@ -0,0 +1,69 @@
+"""セッション間で共有するデータセット（サンプル・注目データセット）の読み込みモジュール
+
+サーバー上のファイルから読み込むデータセットはプロセス内で1回だけ読み込み、
+全セッションで同じDataFrameを共有する。共有するDataFrameは読み取り専用として扱う
+（履歴に追加するときにコピーされる）。
+
+注目データセットは環境変数 FEATURED_DATASETS にパスを列挙して指定する
+（区切り文字は os.pathsep。Linux/macOS では ":"）。
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from utils.compute_backend import get_compute_backend
+from utils.data_loader import data_file_type, load_data_file
+from utils.history_manager import optimize_dataframe_memory
+
+FEATURED_DATASETS_ENV = "FEATURED_DATASETS"
+
+
+def featured_dataset_paths() -> list[Path]:
+    """環境変数で指定された注目データセットのパスを取得
+
+    Returns:
+        注目データセットのパス（未設定なら空、重複は除く）
+    """
+    raw = os.environ.get(FEATURED_DATASETS_ENV, "")
+    paths: list[Path] = []
+    for item in raw.split(os.pathsep):
+        item = item.strip()
+        if item and Path(item) not in paths:
+            paths.append(Path(item))
+    return paths
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _load_shared_dataset(path: str, mtime_ns: int) -> pd.DataFrame:
+    """ファイルを読み込んでメモリ最適化したDataFrameを取得（パスと更新時刻ごとにキャッシュ）
+
+    CSVは計算バックエンドで読み込み、それ以外の形式は拡張子に応じて読み込む。
+    """
+    if data_file_type(path) == "csv":
+        df = get_compute_backend().load_csv(path)
+    else:
+        df = load_data_file(path)
+    return optimize_dataframe_memory(df)
+
+
+def load_shared_dataset(path: str | Path) -> pd.DataFrame:
+    """サーバー上のデータファイルを全セッション共通のキャッシュ経由で読み込む
+
+    ファイルが更新された場合は更新時刻が変わるため読み込み直す。
+
+    Args:
+        path: データファイル（CSV / Parquet / Feather / xlsx）のパス
+
+    Returns:
+        メモリ最適化済みのDataFrame（読み取り専用として扱うこと）
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"ファイルが見つかりません: {path}")
+    return _load_shared_dataset(str(path.resolve()), path.stat().st_mtime_ns)
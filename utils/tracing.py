@@ -0,0 +1,256 @@
+"""再実行ごとの処理時間をスパン単位で記録する軽量トレースモジュール
+
+使い方:
+    with start_trace("analysis_page", enabled=True) as trace:
+        with span("filter"):
+            ...
+        with span("visualization"):
+            with span("figure:bar"):
+                ...
+
+トレースが有効でないスレッドでは span() は共有のダミーを返すだけなので、
+無効時のオーバーヘッドは属性参照1回程度に収まる。
+"""
+
+import bisect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# トレースを常に有効にする環境変数（"1" で有効）
+TRACE_ENV = "STREAMLIT_TRACE"
+
+# スパンを書き出すJSON Linesファイルを指定する環境変数
+TRACE_FILE_ENV = "STREAMLIT_TRACE_FILE"
+
+DEFAULT_TRACE_FILE = Path(tempfile.gettempdir()) / "streamlit_traces.jsonl"
+
+_NULL_SPAN = nullcontext()
+_local = threading.local()
+_file_lock = threading.Lock()
+
+
+@dataclass
+class Span:
+    """1区間分の計測結果
+
+    Attributes:
+        name: スパン名
+        start: トレース開始からの経過時間（秒）
+        duration: 所要時間（秒）
+        depth: 入れ子の深さ（ルート直下が0）
+        attrs: 付加情報（行数・形式など）
+    """
+
+    name: str
+    start: float
+    duration: float = 0.0
+    depth: int = 0
+    attrs: dict[str, object] = field(default_factory=dict)
+
+
+@dataclass
+class Trace:
+    """1回の再実行（またはバックグラウンド処理）分のトレース
+
+    Attributes:
+        name: トレース名
+        session_id: セッションID
+        started_at: 開始時刻（ISO 8601）
+        duration: 全体の所要時間（秒）
+        spans: 記録したスパン（開始順）
+    """
+
+    name: str
+    session_id: str = "default"
+    started_at: str = ""
+    duration: float = 0.0
+    spans: list[Span] = field(default_factory=list)
+    _origin: float = field(default=0.0, repr=False)
+    _depth: int = field(default=0, repr=False)
+
+    def to_record(self) -> dict:
+        """JSON Lines に書き出す形式に変換"""
+        return {
+            "trace": self.name,
+            "session_id": self.session_id,
+            "started_at": self.started_at,
+            "duration_ms": self.duration * 1e3,
+            "spans": [
+                {
+                    "name": s.name,
+                    "start_ms": s.start * 1e3,
+                    "duration_ms": s.duration * 1e3,
+                    "depth": s.depth,
+                    **({"attrs": s.attrs} if s.attrs else {}),
+                }
+                for s in self.spans
+            ],
+        }
+
+
+def is_tracing_enabled() -> bool:
+    """環境変数でトレースが有効化されているか"""
+    return os.environ.get(TRACE_ENV) == "1"
+
+
+def get_active_trace() -> Trace | None:
+    """現在のスレッドで記録中のトレースを取得"""
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def start_trace(
+    name: str, enabled: bool | None = None, session_id: str = "default"
+) -> Iterator[Trace | None]:
+    """トレースを開始し、終了時にファイルへ書き出す
+
+    既にトレース中のスレッドで呼んだ場合は、通常のスパンとして扱う。
+
+    Args:
+        name: トレース名
+        enabled: トレースを記録するか（Noneなら環境変数に従う）
+        session_id: 記録に含めるセッションID
+
+    Yields:
+        記録中のトレース（無効な場合はNone）
+    """
+    if enabled is None:
+        enabled = is_tracing_enabled()
+    if not enabled:
+        yield None
+        return
+    if get_active_trace() is not None:
+        with span(name):
+            yield get_active_trace()
+        return
+
+    trace = Trace(
+        name=name,
+        session_id=session_id,
+        started_at=datetime.now().isoformat(timespec="milliseconds"),
+        _origin=time.perf_counter(),
+    )
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        trace.duration = time.perf_counter() - trace._origin
+        _local.trace = None
+        write_trace(trace)
+
+
+def span(name: str, **attrs: object):
+    """処理区間を計測するコンテキストマネージャを返す
+
+    Args:
+        name: スパン名
+        **attrs: 付加情報
+
+    Returns:
+        コンテキストマネージャ（トレース中でなければ何もしない）
+    """
+    trace = getattr(_local, "trace", None)
+    if trace is None:
+        return _NULL_SPAN
+    return _record_span(trace, name, attrs)
+
+
+@contextmanager
+def _record_span(trace: Trace, name: str, attrs: dict[str, object]) -> Iterator[Span]:
+    """スパンを記録する"""
+    record = Span(
+        name=name, start=time.perf_counter() - trace._origin, depth=trace._depth, attrs=attrs
+    )
+    trace.spans.append(record)
+    trace._depth += 1
+    try:
+        yield record
+    finally:
+        trace._depth -= 1
+        record.duration = time.perf_counter() - trace._origin - record.start
+
+
+def add_span(name: str, started: float, duration: float, **attrs: object) -> None:
+    """別スレッドで計測した区間を、現在のスレッドのトレースにスパンとして追加
+
+    Args:
+        name: スパン名
+        started: 開始時刻（time.perf_counter()）
+        duration: 所要時間（秒）
+        **attrs: 付加情報
+    """
+    trace = getattr(_local, "trace", None)
+    if trace is None:
+        return
+    record = Span(
+        name=name,
+        start=started - trace._origin,
+        duration=duration,
+        depth=trace._depth,
+        attrs=attrs,
+    )
+    # スパンの一覧は開始順に保つ
+    bisect.insort(trace.spans, record, key=lambda s: s.start)
+
+
+def get_trace_file() -> Path:
+    """スパンの書き出し先ファイルを取得"""
+    path = os.environ.get(TRACE_FILE_ENV)
+    return Path(path) if path else DEFAULT_TRACE_FILE
+
+
+def write_trace(trace: Trace, path: Path | None = None) -> None:
+    """トレースをJSON Linesファイルに追記
+
+    Args:
+        trace: 書き出すトレース
+        path: 書き出し先（省略時は get_trace_file()）
+    """
+    path = path or get_trace_file()
+    line = json.dumps(trace.to_record(), ensure_ascii=False, default=str)
+    try:
+        with _file_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        logger.warning(f"Failed to write trace: {e}")
+
+
+def summarize_spans(trace: Trace) -> list[dict[str, object]]:
+    """スパンごとの所要時間と自己時間（子スパンを除いた時間）を集計
+
+    Args:
+        trace: 集計対象のトレース
+
+    Returns:
+        スパンごとの集計（開始順）
+    """
+    rows = []
+    for i, s in enumerate(trace.spans):
+        child_time = 0.0
+        for child in trace.spans[i + 1 :]:
+            if child.depth <= s.depth:
+                break
+            if child.depth == s.depth + 1:
+                child_time += child.duration
+        rows.append(
+            {
+                "name": s.name,
+                "depth": s.depth,
+                "start_ms": s.start * 1e3,
+                "duration_ms": s.duration * 1e3,
+                "self_ms": max(s.duration - child_time, 0.0) * 1e3,
+                "attrs": ", ".join(f"{key}={value}" for key, value in s.attrs.items()),
+            }
+        )
+    return rows
@@ -0,0 +1,746 @@
+"""アップロードされたCSVの読み込みをバックグラウンドで実行するジョブ管理モジュール
+
+読み込みはジョブスケジューラーのワーカースレッドでチャンクごとに行い、読み込んだ
+バイト数・行数を進捗として公開する。画面は進捗を表示するだけで、読み込み中も
+選択中のデータセットをそのまま使える。ジョブはセッション状態に保持し、完了した
+データセットは画面側（スクリプトのスレッド）で1回の操作として履歴に追加する。
+
+CSVのほか、Parquet / Feather（Arrow のバッファから直接変換）と xlsx（読み取り専用
+モードで行ごとに読み込む）も読み込める。形式はファイル名の拡張子で判定する。
+どの形式も、検証の前に関心度の表記ゆれを修正する（utils/score_cleaning.py）。
+
+複数ファイル（地域・調査回ごとのファイル）をまとめてアップロードした場合は、
+CSVはファイルごとに集計用のプロセスプールで並列に読み込み（utils/ingest_worker.py）、
+列構成と型を揃えたうえで1つのデータセットに結合する。各行の読み込み元は
+カテゴリ型の SOURCE_FILE_COLUMN 列に記録する。
+"""
+
+import io
+import itertools
+import logging
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import streamlit as st
+
+from utils.data_loader import (
+    SNIFF_BYTES,
+    SOURCE_FILE_COLUMN,
+    CsvFormat,
+    arrow_to_pandas,
+    data_file_type,
+    inspect_arrow_file,
+    iter_arrow_batches,
+    iter_xlsx_chunks,
+    read_arrow_table,
+    sniff_csv_format,
+)
+from utils.history_manager import optimize_dataframe_memory
+from utils.ingest_worker import parse_csv_to_arrow
+from utils.metrics import ROWS_INGESTED, UPLOAD_PARSE_SECONDS
+from utils.parallel_aggregation import get_aggregation_pool, get_aggregation_workers
+from utils.scheduler import JobScheduler, ScheduledTask, get_scheduler
+from utils.score_cleaning import (
+    CleaningReport,
+    clean_scores,
+    clean_table,
+    unify_cleaned_dtypes,
+)
+from utils.tracing import span, start_trace
+from utils.upload_validation import (
+    FIRST_BLOCK_ROWS,
+    StreamValidator,
+    UploadRejected,
+    validate_frame,
+)
+
+logger = logging.getLogger(__name__)
+
+# 1チャンクあたりの行数（進捗報告・取り消し確認の粒度）
+DEFAULT_CHUNK_ROWS = 50_000
+
+# CSVのファイルサイズに対する読み込み後のメモリ使用量の概算倍率
+CSV_MEMORY_FACTOR = 4
+
+# 複数ファイルの読み込み中に取り消しを確認する間隔（秒）
+CANCEL_POLL_SECONDS = 0.2
+
+
+class UploadCancelled(Exception):
+    """読み込みが取り消された"""
+
+
+@dataclass
+class UploadJob:
+    """アップロード読み込みジョブの状態
+
+    Attributes:
+        upload_id: アップロードされたファイルのID
+        filename: ファイル名（複数ファイルの場合は表示用にまとめた名前）
+        total_bytes: ファイルのバイト数（複数ファイルの場合は合計）
+        status: "pending" / "running" / "done" / "failed" / "cancelled"
+        bytes_read: 読み込んだバイト数
+        rows_parsed: 読み込んだ行数
+        file_count: ファイル数
+        files_parsed: 読み込みが終わったファイル数
+        append_to: 読み込んだ行を追加する履歴エントリのID（Noneなら新しいデータセット）
+        data: 読み込み結果（完了時のみ）
+        cleaning: 関心度の表記ゆれの修正結果
+        error: 失敗時のエラーメッセージ
+        created_at: 登録時刻（time.time()）
+        finished_at: 完了時刻（time.time()）
+        task: スケジューラー上のタスク
+    """
+
+    upload_id: str
+    filename: str
+    total_bytes: int
+    status: str = "pending"
+    bytes_read: int = 0
+    rows_parsed: int = 0
+    file_count: int = 1
+    files_parsed: int = 0
+    append_to: str | None = None
+    data: pd.DataFrame | None = None
+    cleaning: CleaningReport = field(default_factory=CleaningReport)
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    task: ScheduledTask | None = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        """ジョブが終了（成功・失敗・取り消し問わず）しているか"""
+        return self.status in ("done", "failed", "cancelled")
+
+    @property
+    def progress(self) -> float:
+        """読み込んだバイト数の割合（0.0〜1.0）"""
+        if self.status == "done":
+            return 1.0
+        return min(1.0, self.bytes_read / self.total_bytes) if self.total_bytes else 0.0
+
+    @property
+    def cancel_requested(self) -> bool:
+        """取り消しが要求されているか"""
+        return self._cancel.is_set()
+
+    def request_cancel(self) -> None:
+        """取り消しを要求（実行中の読み込みは次の読み込み単位で中断する）"""
+        self._cancel.set()
+
+
+class _ProgressReader(io.RawIOBase):
+    """読み込んだバイト数をジョブに記録し、取り消しを確認するファイルラッパー"""
+
+    def __init__(self, raw: io.BufferedIOBase, job: UploadJob):
+        self._raw = raw
+        self._job = job
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._job.cancel_requested:
+            raise UploadCancelled()
+        data = self._raw.read(len(buffer))
+        buffer[: len(data)] = data
+        self._job.bytes_read += len(data)
+        return len(data)
+
+
+def sniff_upload(data: bytes) -> CsvFormat:
+    """アップロードされたCSVの先頭から文字コード・区切り文字・ヘッダー行を判定"""
+    return sniff_csv_format(data[:SNIFF_BYTES], truncated=len(data) > SNIFF_BYTES)
+
+
+def parse_csv_upload(
+    data: bytes, job: UploadJob, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> pd.DataFrame:
+    """CSVのバイト列をチャンクごとに読み込み、検証・メモリ最適化したDataFrameを返す
+
+    文字コード・区切り文字・ヘッダー行は先頭から判定し、全体は1回だけ復号する。
+    まずヘッダーと先頭の FIRST_BLOCK_ROWS 行だけを読み込んで検証し、形式が違う
+    ファイルは全体を読み込む前に不合格にする。以降はチャンクごとに関心度の表記ゆれを
+    修正して（修正件数は job.cleaning に記録する）値を検証し、job の読み込み行数を
+    更新する。取り消しが要求されていれば中断する。
+
+    Args:
+        data: CSVファイルの内容
+        job: 進捗を記録するジョブ
+        chunk_rows: 1チャンクあたりの行数
+
+    Returns:
+        メモリ最適化済みのDataFrame
+
+    Raises:
+        UploadCancelled: 取り消しが要求された場合
+        UploadRejected: 検証で問題が見つかった場合
+    """
+    reader = io.BufferedReader(_ProgressReader(io.BytesIO(data), job))
+    validator = StreamValidator()
+    chunks = []
+    fmt = sniff_upload(data)
+    try:
+        with pd.read_csv(reader, chunksize=chunk_rows, **fmt.read_csv_options()) as parser:
+            first = parser.get_chunk(min(FIRST_BLOCK_ROWS, chunk_rows))
+            validator.check_header(list(first.columns))
+            for chunk in itertools.chain([first], parser):
+                chunk = clean_scores(chunk, job.cleaning)
+                validator.check_chunk(chunk)
+                chunks.append(chunk)
+                job.rows_parsed += len(chunk)
+                if job.cancel_requested:
+                    raise UploadCancelled()
+        validator.finish()
+    except UploadRejected as e:
+        if not fmt.header_row:
+            raise
+        # ヘッダー行の前のタイトル行を含めたファイル上の行番号で報告する
+        raise UploadRejected(e.report, locate=lambda row: f"{row + fmt.header_row + 2}行目") from e
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    return optimize_dataframe_memory(unify_cleaned_dtypes(df, job.cleaning))
+
+
+def _arrow_columns(data: bytes, file_type: str) -> tuple[list[str], int]:
+    """Parquet / Feather から読み込むカラム（読み込み元の列は付け直すため除く）と行数"""
+    names, num_rows = inspect_arrow_file(data, file_type)
+    return [name for name in names if name != SOURCE_FILE_COLUMN], num_rows
+
+
+def parse_arrow_upload(
+    data: bytes, file_type: str, job: UploadJob, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> pd.DataFrame:
+    """Parquet / Feather のバイト列をバッチごとに読み込み、検証・メモリ最適化したDataFrameを返す
+
+    カラム構成はファイルのメタデータだけで検証し、データ本体を読む前に不合格にする。
+    読み込むカラムを指定して読み（読み込み元の列は読まない）、バッチを連結して
+    関心度の表記ゆれを Arrow のまま修正してから、pandas への変換を1回だけ行う
+    （欠損の無い数値カラムはコピーしない）。
+
+    Args:
+        data: ファイルの内容
+        file_type: "parquet" または "feather"
+        job: 進捗を記録するジョブ
+        chunk_rows: Parquet の1バッチあたりの行数
+
+    Returns:
+        メモリ最適化済みのDataFrame
+
+    Raises:
+        UploadCancelled: 取り消しが要求された場合
+        UploadRejected: 検証で問題が見つかった場合
+    """
+    columns, num_rows = _arrow_columns(data, file_type)
+    validator = StreamValidator()
+    try:
+        validator.check_header(columns)
+        batches = []
+        for batch in iter_arrow_batches(data, file_type, columns, chunk_rows):
+            if not batches:
+                first = batch.slice(0, FIRST_BLOCK_ROWS).to_pandas()
+                validator.check_chunk(clean_scores(first, CleaningReport()))
+            batches.append(batch)
+            job.rows_parsed += batch.num_rows
+            # 復号したバイト数は分からないため、行数の割合から見積もる
+            job.bytes_read = len(data) * job.rows_parsed // max(num_rows, 1)
+            if job.cancel_requested:
+                raise UploadCancelled()
+        if batches:
+            table = pa.Table.from_batches(batches)
+            batches.clear()
+        else:
+            table = read_arrow_table(data, file_type, columns)
+        df = unify_cleaned_dtypes(arrow_to_pandas(clean_table(table, job.cleaning)), job.cleaning)
+        job.bytes_read = len(data)
+        validate_frame(df)
+    except UploadRejected as e:
+        # ヘッダー行が無いため、データ行の番号（1始まり）で報告する
+        raise UploadRejected(e.report, locate=lambda row: f"{row + 1}行目") from e
+    return optimize_dataframe_memory(df)
+
+
+def parse_xlsx_upload(
+    data: bytes, job: UploadJob, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> pd.DataFrame:
+    """xlsx のバイト列を行ごとに読み込み、検証・メモリ最適化したDataFrameを返す
+
+    最初のワークシートを読み取り専用モードで先頭から順に読み、FIRST_BLOCK_ROWS 行
+    ごとに関心度の表記ゆれを修正して値を検証し、job の読み込み行数を更新する。
+    取り消しが要求されていれば中断する。
+
+    Args:
+        data: xlsx ファイルの内容
+        job: 進捗を記録するジョブ
+        chunk_rows: 1チャンクあたりの行数（FIRST_BLOCK_ROWS を超える場合は FIRST_BLOCK_ROWS）
+
+    Returns:
+        メモリ最適化済みのDataFrame
+
+    Raises:
+        UploadCancelled: 取り消しが要求された場合
+        UploadRejected: 検証で問題が見つかった場合
+    """
+    validator = StreamValidator()
+    chunks = []
+    header_row = 0
+    try:
+        for chunk in iter_xlsx_chunks(io.BytesIO(data), min(FIRST_BLOCK_ROWS, chunk_rows)):
+            if not chunks:
+                header_row = chunk.attrs["header_row"]
+                validator.check_header(list(chunk.columns))
+            chunk = clean_scores(chunk, job.cleaning)
+            validator.check_chunk(chunk)
+            chunks.append(chunk)
+            job.rows_parsed += len(chunk)
+            sheet_rows = chunk.attrs["sheet_rows"]
+            if sheet_rows:
+                job.bytes_read = min(len(data), len(data) * job.rows_parsed // sheet_rows)
+            if job.cancel_requested:
+                raise UploadCancelled()
+        validator.finish()
+    except UploadRejected as e:
+        if not header_row:
+            raise
+        raise UploadRejected(e.report, locate=lambda row: f"{row + header_row + 2}行目") from e
+    job.bytes_read = len(data)
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    return optimize_dataframe_memory(unify_cleaned_dtypes(df, job.cleaning))
+
+
+def parse_upload(
+    filename: str, data: bytes, job: UploadJob, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> pd.DataFrame:
+    """ファイル名の拡張子に応じた形式で1ファイルを読み込む
+
+    Args:
+        filename: ファイル名
+        data: ファイルの内容
+        job: 進捗を記録するジョブ
+        chunk_rows: 1チャンクあたりの行数
+
+    Returns:
+        メモリ最適化済みのDataFrame
+
+    Raises:
+        UploadCancelled: 取り消しが要求された場合
+        UploadRejected: 検証で問題が見つかった場合
+        ValueError: 対応していない形式の場合
+    """
+    file_type = data_file_type(filename)
+    if file_type == "csv":
+        return parse_csv_upload(data, job, chunk_rows)
+    if file_type == "xlsx":
+        return parse_xlsx_upload(data, job, chunk_rows)
+    return parse_arrow_upload(data, file_type, job, chunk_rows)
+
+
+def _unique_names(filenames: list[str]) -> list[str]:
+    """同名のファイルに連番を付けて、カテゴリとして使える重複のない名前にする"""
+    seen: dict[str, int] = {}
+    names = []
+    for name in filenames:
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name} ({seen[name]})")
+    return names
+
+
+def merge_arrow_tables(tables: list[pa.Table], filenames: list[str]) -> pd.DataFrame:
+    """ファイルごとに読み込んだ Arrow のテーブルを1つのDataFrameに結合
+
+    列構成は最初のファイルに揃え（列の順序の違いは許容する）、型はファイル間で
+    昇格させて統一する（整数と欠損を含む小数なら小数など）。テーブルはコピーせずに
+    連結して、pandas への変換を1回だけ行う。
+
+    Args:
+        tables: ファイルごとのテーブル（CSVはメモリマップで開いた Arrow IPC ファイル）
+        filenames: 各ファイルの元のファイル名（読み込み元の列の値になる）
+
+    Returns:
+        結合したDataFrame（SOURCE_FILE_COLUMN 列はカテゴリ型）
+
+    Raises:
+        ValueError: 列構成または型が最初のファイルと一致しない場合
+    """
+    # 既に読み込み元の列を持つファイル（結合済みデータの再アップロード）は付け直す
+    tables = [
+        table.drop_columns([SOURCE_FILE_COLUMN])
+        if SOURCE_FILE_COLUMN in table.column_names
+        else table
+        for table in tables
+    ]
+    columns = tables[0].column_names
+    schema = tables[0].schema
+    for name, table in zip(filenames[1:], tables[1:], strict=True):
+        missing = [col for col in columns if col not in table.column_names]
+        extra = [col for col in table.column_names if col not in columns]
+        if missing or extra:
+            raise ValueError(
+                f"{name} の列が {filenames[0]} と一致しません"
+                f"（不足: {', '.join(missing) or 'なし'}、余分: {', '.join(extra) or 'なし'}）"
+            )
+        try:
+            schema = pa.unify_schemas(
+                [schema, table.select(columns).schema], promote_options="permissive"
+            )
+        except (pa.ArrowTypeError, pa.ArrowInvalid) as e:
+            raise ValueError(f"{name} の列の型が他のファイルと一致しません: {e}") from e
+
+    dictionary = pa.array(_unique_names(filenames), pa.string())
+    parts = []
+    for i, table in enumerate(tables):
+        source = pa.DictionaryArray.from_arrays(
+            pa.array(np.full(table.num_rows, i, dtype=np.int32)), dictionary
+        )
+        parts.append(table.select(columns).cast(schema).append_column(SOURCE_FILE_COLUMN, source))
+    merged = pa.concat_tables(parts)
+    del tables, parts
+    return arrow_to_pandas(merged)
+
+
+def _first_block(data: bytes, file_type: str, fmt: CsvFormat | None) -> pd.DataFrame:
+    """ファイルのヘッダーと先頭の FIRST_BLOCK_ROWS 行だけを読み込む"""
+    if file_type == "csv":
+        return pd.read_csv(io.BytesIO(data), nrows=FIRST_BLOCK_ROWS, **fmt.read_csv_options())
+    if file_type == "xlsx":
+        return next(iter_xlsx_chunks(io.BytesIO(data), FIRST_BLOCK_ROWS))
+    columns, _ = _arrow_columns(data, file_type)
+    batch = next(iter_arrow_batches(data, file_type, columns, FIRST_BLOCK_ROWS), None)
+    if batch is None:
+        return pd.DataFrame(columns=columns)
+    return batch.slice(0, FIRST_BLOCK_ROWS).to_pandas()
+
+
+def _read_table(data: bytes, file_type: str, report: CleaningReport) -> pa.Table:
+    """CSV以外のファイルを Arrow のテーブルとして読み込む"""
+    if file_type == "xlsx":
+        df = pd.concat(iter_xlsx_chunks(io.BytesIO(data)), ignore_index=True)
+        # セルごとに型が違う（数値と文字列が混ざった）カラムは文字列にそろえて変換する
+        df = clean_scores(df, report)
+        text_columns = [col for col in df.columns if df[col].dtype == object]
+        # "str" では pandas 2 で欠損が文字列 "nan" になるため、欠損を保つ string 型にする
+        df = df.astype(dict.fromkeys(text_columns, "string"))
+        return pa.Table.from_pandas(df, preserve_index=False)
+    columns, _ = _arrow_columns(data, file_type)
+    return read_arrow_table(data, file_type, columns)
+
+
+def parse_upload_files(
+    files: list[tuple[str, bytes]], job: UploadJob, executor: Executor | None = None
+) -> pd.DataFrame:
+    """複数のファイルを並列に読み込み、結合してメモリ最適化したDataFrameを返す
+
+    まず各ファイルのヘッダーと先頭の FIRST_BLOCK_ROWS 行を検証し、形式が違う
+    ファイルがあれば読み込みを始める前に不合格にする。CSVは一時ディレクトリに
+    書き出し、executor のワーカーでファイルごとに Arrow IPC ファイルに変換する。
+    CSV以外（Parquet / Feather / xlsx）はその間にこのスレッドで Arrow のテーブルとして
+    読み込む。読み込みが終わったファイルごとに job の進捗を更新し、取り消しが
+    要求されていれば待機中の読み込みを取り消して中断する。ファイルごとに関心度の
+    表記ゆれを修正してから結合し、全行の値を検証する。
+
+    Args:
+        files: (ファイル名, ファイルの内容) の一覧（形式は拡張子で判定する）
+        job: 進捗を記録するジョブ
+        executor: CSVの読み込みを実行するExecutor（Noneの場合はこのスレッドで順に読み込む）
+
+    Returns:
+        結合・メモリ最適化済みのDataFrame
+
+    Raises:
+        UploadCancelled: 取り消しが要求された場合
+        UploadRejected: 検証で問題が見つかった場合
+        ValueError: 対応していない形式の場合、読み込みに失敗した場合、
+            または列構成・型がファイル間で一致しない場合
+    """
+    filenames = [name for name, _ in files]
+    file_types = [data_file_type(name) for name in filenames]
+    formats = [
+        sniff_upload(data) if file_type == "csv" else None
+        for (_, data), file_type in zip(files, file_types, strict=True)
+    ]
+    # 行番号の表示でデータ行の位置に足す数（ヘッダー行とその前のタイトル行の分）
+    line_offsets = []
+    for (name, data), file_type, fmt in zip(files, file_types, formats, strict=True):
+        try:
+            first = _first_block(data, file_type, fmt)
+            validator = StreamValidator()
+            validator.check_header(list(first.columns))
+            validator.check_chunk(clean_scores(first, CleaningReport()))
+        except UploadRejected as e:
+            raise UploadRejected(e.report, source=name) from e
+        except (ValueError, pd.errors.ParserError, pa.ArrowException) as e:
+            raise ValueError(f"{name} を読み込めません: {e}") from e
+        if file_type == "csv":
+            line_offsets.append((fmt.header_row or 0) + 2)
+        elif file_type == "xlsx":
+            line_offsets.append(first.attrs["header_row"] + 2)
+        else:
+            line_offsets.append(1)
+
+    row_counts = [0] * len(files)
+    tables: list[pa.Table | None] = [None] * len(files)
+    csv_indices = [i for i, file_type in enumerate(file_types) if file_type == "csv"]
+    with tempfile.TemporaryDirectory(prefix="upload_", ignore_cleanup_errors=True) as tmp:
+        sources = {i: Path(tmp) / f"{i}.csv" for i in csv_indices}
+        dests = {i: Path(tmp) / f"{i}.arrow" for i in csv_indices}
+        for i, source in sources.items():
+            source.write_bytes(files[i][1])
+
+        def record(i: int, rows: int) -> None:
+            row_counts[i] = rows
+            job.bytes_read += len(files[i][1])
+            job.rows_parsed += rows
+            job.files_parsed += 1
+
+        def parse_error(i: int, e: Exception) -> ValueError:
+            return ValueError(f"{filenames[i]} を読み込めません: {e}")
+
+        def csv_args(i: int, use_threads: bool) -> tuple:
+            fmt = formats[i]
+            return (
+                str(sources[i]),
+                str(dests[i]),
+                use_threads,
+                fmt.arrow_encoding,
+                fmt.delimiter,
+                fmt.header_row or 0,
+            )
+
+        def read_others() -> None:
+            for i, file_type in enumerate(file_types):
+                if file_type == "csv":
+                    continue
+                if job.cancel_requested:
+                    raise UploadCancelled()
+                try:
+                    tables[i] = _read_table(files[i][1], file_type, job.cleaning)
+                except (ValueError, pa.ArrowException) as e:
+                    raise parse_error(i, e) from e
+                record(i, tables[i].num_rows)
+
+        if executor is None:
+            for i in csv_indices:
+                if job.cancel_requested:
+                    raise UploadCancelled()
+                try:
+                    record(i, parse_csv_to_arrow(*csv_args(i, True)))
+                except pa.ArrowException as e:
+                    raise parse_error(i, e) from e
+            read_others()
+        else:
+            futures = {
+                executor.submit(parse_csv_to_arrow, *csv_args(i, False)): i for i in csv_indices
+            }
+            pending = set(futures)
+            try:
+                # CSVをワーカーで読み込んでいる間に、それ以外の形式をこのスレッドで読み込む
+                read_others()
+                while pending:
+                    done, pending = wait(
+                        pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED
+                    )
+                    for future in done:
+                        try:
+                            record(futures[future], future.result())
+                        except pa.ArrowException as e:
+                            raise parse_error(futures[future], e) from e
+                    if job.cancel_requested:
+                        raise UploadCancelled()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        if job.cancel_requested:
+            raise UploadCancelled()
+        for i in csv_indices:
+            tables[i] = ipc.open_file(pa.memory_map(str(dests[i]))).read_all()
+        # 表記ゆれの修正で文字列型になっていたカラムを整数にしてから、ファイル間で型を揃える
+        cleaned = [clean_table(table, job.cleaning) for table in tables]
+        # 検証・メモリ最適化の間に Arrow のテーブルを保持し続けないよう参照を外す
+        tables.clear()
+        df = unify_cleaned_dtypes(merge_arrow_tables(cleaned, filenames), job.cleaning)
+        del cleaned
+
+    starts = np.cumsum([0, *row_counts])
+
+    def locate(row: int) -> str:
+        i = int(np.searchsorted(starts, row, side="right")) - 1
+        return f"{filenames[i]} {row - starts[i] + line_offsets[i]}行目"
+
+    try:
+        validate_frame(df)
+    except UploadRejected as e:
+        raise UploadRejected(e.report, locate=locate) from e
+    return optimize_dataframe_memory(df)
+
+
+class UploadJobManager:
+    """アップロードの読み込みジョブをジョブスケジューラー上で実行するクラス"""
+
+    def __init__(
+        self,
+        scheduler: JobScheduler | None = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        executor: Executor | None = None,
+    ):
+        """UploadJobManagerを初期化
+
+        Args:
+            scheduler: 読み込みを実行するスケジューラー（省略時はプロセス共通のもの）
+            chunk_rows: 1チャンクあたりの行数
+            executor: 複数ファイルを並列に読み込むExecutor（省略時は集計用のプロセスプール。
+                ワーカーが1つ以下ならジョブのスレッドで順に読み込む）
+        """
+        self.chunk_rows = chunk_rows
+        self._scheduler = scheduler
+        self._executor = executor
+
+    def submit(self, session_id: str, upload_id: str, filename: str, data: bytes) -> UploadJob:
+        """読み込みジョブを登録
+
+        Args:
+            session_id: アップロードしたセッションのID（スケジューラーの公平性制御に使用）
+            upload_id: アップロードされたファイルのID
+            filename: ファイル名
+            data: ファイルの内容
+
+        Returns:
+            登録したジョブ
+        """
+        return self.submit_files(session_id, upload_id, [(filename, data)])
+
+    def submit_files(
+        self,
+        session_id: str,
+        upload_id: str,
+        files: list[tuple[str, bytes]],
+        append_to: str | None = None,
+    ) -> UploadJob:
+        """複数ファイルを1つのデータセットとして読み込むジョブを登録
+
+        ファイルが1つの場合は submit と同じくチャンクごとに読み込む（読み込み元の列は
+        追加しない）。2つ以上の場合はファイルごとに並列に読み込んで結合する。
+
+        Args:
+            session_id: アップロードしたセッションのID（スケジューラーの公平性制御に使用）
+            upload_id: アップロードされたファイル（の組み合わせ）のID
+            files: (ファイル名, ファイルの内容) の一覧
+            append_to: 読み込んだ行を追加する履歴エントリのID（省略時は新しいデータセット）
+
+        Returns:
+            登録したジョブ
+        """
+        total_bytes = sum(len(data) for _, data in files)
+        filename = files[0][0] if len(files) == 1 else f"{files[0][0]} ほか{len(files) - 1}件"
+        job = UploadJob(
+            upload_id=upload_id,
+            filename=filename,
+            total_bytes=total_bytes,
+            file_count=len(files),
+            append_to=append_to,
+        )
+        logger.info(f"Upload job queued: file={filename}, files={len(files)}, bytes={total_bytes}")
+        scheduler = self._scheduler or get_scheduler()
+        job.task = scheduler.submit(
+            session_id,
+            self._run,
+            job,
+            files,
+            estimated_bytes=total_bytes * CSV_MEMORY_FACTOR,
+            label="upload",
+        )
+        return job
+
+    def queue_position(self, job: UploadJob) -> int:
+        """ジョブのスケジューラー上の待ち順位（実行中・完了済みの場合は0）"""
+        if job.task is None:
+            return 0
+        return (self._scheduler or get_scheduler()).queue_position(job.task)
+
+    def cancel(self, job: UploadJob) -> None:
+        """ジョブを取り消す（待機中なら実行させず、実行中なら読み込みの区切りで中断させる）
+
+        Args:
+            job: 取り消すジョブ（終了済みなら何もしない）
+        """
+        if job.is_finished:
+            return
+        job.request_cancel()
+        if job.task is not None and job.task.future.cancel():
+            job.finished_at = time.time()
+            job.status = "cancelled"
+        logger.info(f"Upload job cancel requested: file={job.filename}")
+
+    def _parse_files(self, files: list[tuple[str, bytes]], job: UploadJob) -> pd.DataFrame:
+        """複数ファイルを並列に読み込む（プロセスプールが壊れていたらこのスレッドで読み込む）"""
+        executor = self._executor
+        if executor is None and get_aggregation_workers() > 1:
+            executor = get_aggregation_pool()
+        try:
+            return parse_upload_files(files, job, executor)
+        except BrokenProcessPool as e:
+            logger.warning(f"Aggregation pool broken, parsing files in this thread: {e}")
+            get_aggregation_pool.clear()
+            job.bytes_read = job.rows_parsed = job.files_parsed = 0
+            return parse_upload_files(files, job)
+
+    def _run(self, job: UploadJob, files: list[tuple[str, bytes]]) -> None:
+        """ワーカースレッドでジョブを実行"""
+        if job.cancel_requested:
+            job.status = "cancelled"
+            job.finished_at = time.time()
+            return
+        job.status = "running"
+        started = time.perf_counter()
+        try:
+            with (
+                start_trace("upload_job"),
+                span("parse_upload", bytes=job.total_bytes, files=len(files)),
+            ):
+                if len(files) == 1:
+                    df = parse_upload(files[0][0], files[0][1], job, self.chunk_rows)
+                else:
+                    df = self._parse_files(files, job)
+        except UploadCancelled:
+            job.finished_at = time.time()
+            job.status = "cancelled"
+            logger.info(f"Upload job cancelled: file={job.filename}, rows={job.rows_parsed}")
+            return
+        except Exception as e:
+            job.error = str(e)
+            job.finished_at = time.time()
+            job.status = "failed"
+            logger.error(f"Upload job failed: file={job.filename}, error={e}", exc_info=True)
+            return
+
+        elapsed = time.perf_counter() - started
+        UPLOAD_PARSE_SECONDS.observe(elapsed, source="upload")
+        ROWS_INGESTED.inc(len(df), source="upload")
+        # 結果を設定してから状態を変える（画面側は done を見てから data を読む）
+        job.data = df
+        job.rows_parsed = len(df)
+        job.finished_at = time.time()
+        job.status = "done"
+        logger.info(
+            f"Upload job finished: file={job.filename}, rows={len(df)}, elapsed={elapsed:.2f}s"
+        )
+
+
+@st.cache_resource(show_spinner=False)
+def get_upload_job_manager() -> UploadJobManager:
+    """プロセス共通のUploadJobManagerを取得
+
+    Returns:
+        UploadJobManagerインスタンス
+    """
+    return UploadJobManager()
@@ -0,0 +1,353 @@
+"""アップロードされたデータをチャンクごとに検証するモジュール
+
+ヘッダーと最初のブロックを先に検証し、形式が明らかに違うファイルは全体を
+読み込む前に不合格にする。その後は読み込んだチャンクごとに、関心度の値域
+（1〜5の整数）・必須項目の空欄・回答者IDの重複をNumPyの配列演算で検証する。
+問題は種類・カラムごとに件数と該当行の例をまとめた ValidationReport にする。
+"""
+
+from collections.abc import Callable, Sequence, Set
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import SOURCE_FILE_COLUMN
+
+ID_COLUMN = "回答者ID"
+AGE_COLUMN = "年齢層"
+
+# スポーツ種目のカラムの最小数（validate_sports_survey_data と同じ）
+MIN_SPORTS_COLUMNS = 3
+
+# 全体を読み込む前に検証する先頭の行数
+FIRST_BLOCK_ROWS = 1_000
+
+# 問題ごとに報告する該当行の例の数
+MAX_SAMPLES = 5
+
+# 関心度の取りうる範囲
+MIN_SCORE = 1
+MAX_SCORE = 5
+
+NULL_ID = "回答者IDが空欄です"
+NULL_AGE = "年齢層が空欄です"
+DUPLICATE_ID = "回答者IDが重複しています"
+OUT_OF_DOMAIN = f"関心度が{MIN_SCORE}〜{MAX_SCORE}の整数ではありません"
+
+
+@dataclass
+class ValidationIssue:
+    """検証で見つかった問題（種類・カラムごと）
+
+    Attributes:
+        message: 問題の内容
+        column: 対象のカラム（ファイル全体の問題はNone）
+        count: 該当する行数
+        samples: 該当行の例（0始まりのデータ行番号, 値）
+    """
+
+    message: str
+    column: str | None = None
+    count: int = 0
+    samples: list[tuple[int, object]] = field(default_factory=list)
+
+
+@dataclass
+class ValidationReport:
+    """検証結果
+
+    Attributes:
+        rows_checked: 検証した行数
+        complete: 全行を検証したか（途中で不合格にした場合はFalse）
+        issues: 見つかった問題
+        missing_scores: カラムごとの関心度の欠損数（欠損は回答なしとして許容する）
+    """
+
+    rows_checked: int = 0
+    complete: bool = False
+    issues: list[ValidationIssue] = field(default_factory=list)
+    missing_scores: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def is_valid(self) -> bool:
+        """問題が見つからなかったか"""
+        return not self.issues
+
+    def format(self, locate: Callable[[int], str] | None = None) -> str:
+        """画面表示用の要約（Markdownの箇条書き）
+
+        Args:
+            locate: データ行番号（0始まり）を表示用の位置に変換する関数
+                （省略時はヘッダーを1行目とした行番号）
+
+        Returns:
+            要約の文字列
+        """
+        locate = locate or (lambda row: f"{row + 2}行目")
+        scope = "全行" if self.complete else f"先頭{self.rows_checked:,}行"
+        lines = [f"アップロードされたデータに問題があります（{scope}を検査）"]
+        for issue in self.issues:
+            target = f"（{issue.column}）" if issue.column else ""
+            count = f": {issue.count:,}件" if issue.count else ""
+            examples = ", ".join(f"{locate(row)}={value!r}" for row, value in issue.samples)
+            lines.append(f"- {issue.message}{target}{count}")
+            if examples:
+                lines[-1] += f" 例: {examples}"
+        return "\n".join(lines)
+
+
+class UploadRejected(ValueError):
+    """検証で問題が見つかったため読み込みを中止した
+
+    Attributes:
+        report: 検証結果
+        source: 問題が見つかったファイル名（指定された場合はメッセージの先頭に付ける）
+    """
+
+    def __init__(
+        self,
+        report: ValidationReport,
+        source: str | None = None,
+        locate: Callable[[int], str] | None = None,
+    ):
+        message = report.format(locate)
+        super().__init__(f"{source}: {message}" if source else message)
+        self.report = report
+        self.source = source
+
+
+def _duplicate_rows(ids: np.ndarray) -> np.ndarray:
+    """値が他の行と重複している行の位置（昇順）"""
+    order = np.argsort(ids, kind="stable")
+    ordered = ids[order]
+    same = ordered[1:] == ordered[:-1]
+    duplicated = np.zeros(len(ids), dtype=bool)
+    duplicated[1:] |= same
+    duplicated[:-1] |= same
+    return np.sort(order[duplicated])
+
+
+class StreamValidator:
+    """読み込んだチャンクを順に検証するクラス
+
+    check_header → check_chunk（チャンクごと）→ finish の順に呼ぶ。
+    fail_fast の場合は問題が見つかったチャンクの検証が終わった時点で UploadRejected を送出する。
+    """
+
+    def __init__(self, fail_fast: bool = True, max_samples: int = MAX_SAMPLES):
+        """StreamValidatorを初期化
+
+        Args:
+            fail_fast: 問題が見つかった時点で中止するか（Falseなら全行を検証する）
+            max_samples: 問題ごとに報告する該当行の例の数
+        """
+        self.fail_fast = fail_fast
+        self.max_samples = max_samples
+        self.report = ValidationReport()
+        self._issues: dict[tuple[str, str | None], ValidationIssue] = {}
+        self._ids: list[np.ndarray] = []
+
+    def _record(self, message: str, column: str | None, rows: np.ndarray, values) -> None:
+        """該当行を問題として記録"""
+        if len(rows) == 0:
+            return
+        issue = self._issues.get((message, column))
+        if issue is None:
+            issue = self._issues[(message, column)] = ValidationIssue(message, column)
+            self.report.issues.append(issue)
+        issue.count += len(rows)
+        room = self.max_samples - len(issue.samples)
+        if room > 0:
+            issue.samples.extend(
+                (int(row), value.item() if isinstance(value, np.generic) else value)
+                for row, value in zip(rows[:room], values[:room], strict=False)
+            )
+
+    def record_duplicates(self, rows: np.ndarray, ids: np.ndarray) -> None:
+        """チャンク以外の検査（既存のデータとの照合など）で見つけた回答者IDの重複を記録
+
+        Args:
+            rows: 重複している行の位置
+            ids: 重複している行の回答者ID
+        """
+        self._record(DUPLICATE_ID, ID_COLUMN, rows, ids)
+
+    def _reject_if_invalid(self) -> None:
+        if not self.report.is_valid:
+            raise UploadRejected(self.report)
+
+    def check_header(self, columns: Sequence[str]) -> None:
+        """カラム構成を検証
+
+        Args:
+            columns: カラム名
+
+        Raises:
+            UploadRejected: 必須カラムが無い、またはスポーツ種目のカラムが足りない場合
+        """
+        missing = [col for col in (ID_COLUMN, AGE_COLUMN) if col not in columns]
+        if missing:
+            self.report.issues.append(
+                ValidationIssue(f"必須カラムがありません: {', '.join(missing)}")
+            )
+        sports = [col for col in columns if col not in (ID_COLUMN, AGE_COLUMN, SOURCE_FILE_COLUMN)]
+        if len(sports) < MIN_SPORTS_COLUMNS:
+            self.report.issues.append(
+                ValidationIssue(
+                    f"スポーツ種目のカラムが{MIN_SPORTS_COLUMNS}つ未満です（{len(sports)}つ）"
+                )
+            )
+        # カラム構成の問題は以降の検証ができないため、fail_fast に関わらず中止する
+        self._reject_if_invalid()
+
+    def check_chunk(self, chunk: pd.DataFrame) -> None:
+        """チャンクの値を検証（check_header で検証済みのカラム構成であること）
+
+        Args:
+            chunk: 読み込んだチャンク（チャンクの行は前のチャンクの続きとして数える）
+
+        Raises:
+            UploadRejected: fail_fast で問題が見つかった場合
+        """
+        offset = self.report.rows_checked
+        rows = np.arange(offset, offset + len(chunk))
+
+        ids = chunk[ID_COLUMN].to_numpy()
+        id_present = ~pd.isna(ids)
+        self._record(NULL_ID, ID_COLUMN, rows[~id_present], ids[~id_present])
+        self._ids.append(ids)
+        age_missing = chunk[AGE_COLUMN].isna().to_numpy()
+        self._record(NULL_AGE, AGE_COLUMN, rows[age_missing], ids[age_missing])
+
+        for col in chunk.columns:
+            if col in (ID_COLUMN, AGE_COLUMN, SOURCE_FILE_COLUMN):
+                continue
+            column = chunk[col]
+            present = column.notna().to_numpy()
+            if pd.api.types.is_numeric_dtype(column):
+                values = column.to_numpy(dtype="float64", na_value=np.nan)
+            else:
+                # 数値に変換できない文字列は NaN になり、値域外として扱われる
+                values = pd.to_numeric(column, errors="coerce").to_numpy(
+                    dtype="float64", na_value=np.nan
+                )
+            in_domain = (values >= MIN_SCORE) & (values <= MAX_SCORE) & (values == np.rint(values))
+            invalid = present & ~in_domain
+            self._record(OUT_OF_DOMAIN, col, rows[invalid], column.to_numpy()[invalid])
+            missing = int(len(present) - present.sum())
+            self.report.missing_scores[col] = self.report.missing_scores.get(col, 0) + missing
+
+        if self.fail_fast:
+            # チャンク内の重複は、チャンクをまたぐ重複（finish で検証）より先に見つける
+            duplicates = np.flatnonzero(id_present)[_duplicate_rows(ids[id_present])]
+            self._record(DUPLICATE_ID, ID_COLUMN, rows[duplicates], ids[duplicates])
+
+        self.report.rows_checked += len(chunk)
+        if self.fail_fast:
+            self._reject_if_invalid()
+
+    def finish(self) -> ValidationReport:
+        """全チャンクをまたいで回答者IDの重複を検証し、検証結果を返す
+
+        Returns:
+            検証結果（問題が無い場合）
+
+        Raises:
+            UploadRejected: 問題が見つかった場合
+        """
+        self.report.complete = True
+        if self._ids:
+            present = np.concatenate([~pd.isna(part) for part in self._ids])
+            if len({part.dtype for part in self._ids}) > 1:
+                # チャンクごとに数値・文字列と型が違っても比較できるよう文字列に揃える
+                ids = np.concatenate([part.astype(str) for part in self._ids])
+            else:
+                ids = np.concatenate(self._ids)
+            positions = np.flatnonzero(present)
+            duplicates = positions[_duplicate_rows(ids[present])]
+            # チャンク内で見つけた重複も含めて、全体の結果に置き換える
+            self._issues.pop((DUPLICATE_ID, ID_COLUMN), None)
+            self.report.issues = [
+                issue for issue in self.report.issues if issue.message != DUPLICATE_ID
+            ]
+            self._record(DUPLICATE_ID, ID_COLUMN, duplicates, ids[duplicates])
+        self._reject_if_invalid()
+        return self.report
+
+
+def _id_keys(ids: np.ndarray) -> list[str]:
+    """欠損を除いた回答者IDを、重複の比較に使う文字列にそろえる
+
+    ファイルごとに数値・文字列と型が違っても比較できるよう文字列にする
+    （欠損を含む数値のIDは浮動小数点数で読み込まれるため、整数値は整数として扱う）。
+    """
+    if ids.dtype.kind == "f" and np.all(ids == np.rint(ids)):
+        ids = ids.astype("int64")
+    return ids.astype(str).tolist()
+
+
+def build_id_index(ids: pd.Series) -> set[str]:
+    """回答者IDの重複を検査するための索引を作成
+
+    Args:
+        ids: 回答者IDのカラム
+
+    Returns:
+        欠損を除いた回答者ID（型をそろえた文字列）の集合
+    """
+    values = ids.to_numpy()
+    return set(_id_keys(values[~pd.isna(values)]))
+
+
+def check_appended_ids(
+    id_index: Set[str], batch: pd.DataFrame, max_samples: int = MAX_SAMPLES
+) -> ValidationReport:
+    """既存のデータセットに追加する行の回答者IDが、追加後に重複しないか検証
+
+    同じ調査回のファイルや累積のファイルを再度追加すると、全回答者が重複して
+    集計結果が二重に数えられるため、既存の回答者IDと一致する行を不合格にする。
+    既存の回答者IDは build_id_index の索引で引くため、追加する行の数に比例した時間で済む。
+
+    Args:
+        id_index: 既存のデータセットの回答者IDの索引（build_id_index で作成）
+        batch: 追加する行（行番号は batch の先頭を0として数える）
+        max_samples: 問題ごとに報告する該当行の例の数
+
+    Returns:
+        検証結果（問題が無い場合）
+
+    Raises:
+        UploadRejected: 追加後に回答者IDが重複する場合
+    """
+    ids = batch[ID_COLUMN].to_numpy()
+    present = np.flatnonzero(~pd.isna(ids))
+    keys = _id_keys(ids[present])
+    duplicated = np.fromiter((key in id_index for key in keys), dtype=bool, count=len(keys))
+    # 追加する行どうしで重複している行も、追加後には重複になる
+    duplicated[_duplicate_rows(np.array(keys, dtype=object))] = True
+    rows = present[duplicated]
+
+    validator = StreamValidator(fail_fast=False, max_samples=max_samples)
+    validator.record_duplicates(rows, ids[rows])
+    validator.report.rows_checked = len(batch)
+    return validator.finish()
+
+
+def validate_frame(df: pd.DataFrame, max_samples: int = MAX_SAMPLES) -> ValidationReport:
+    """読み込み済みのDataFrame全体を検証
+
+    Args:
+        df: 検証するDataFrame
+        max_samples: 問題ごとに報告する該当行の例の数
+
+    Returns:
+        検証結果（問題が無い場合）
+
+    Raises:
+        UploadRejected: 問題が見つかった場合
+    """
+    validator = StreamValidator(fail_fast=False, max_samples=max_samples)
+    validator.check_header(list(df.columns))
+    validator.check_chunk(df)
+    return validator.finish()
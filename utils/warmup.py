@@ -0,0 +1,254 @@
+"""サーバー起動時のウォームアップ（事前読み込み）モジュール
+
+環境変数 WARMUP_ON_START=1 のとき、サンプルデータと注目データセット
+（FEATURED_DATASETS）をバックグラウンドスレッドで読み込み、集計結果・
+エクスポート見積もり・よく使うエクスポート形式の成果物をプロセス共通の
+キャッシュに用意する。グラフは初期表示と同じ条件で一度作成し、plotly の
+初回呼び出しの遅さを最初の利用者が負担しないようにする。大規模データの
+分割集計に使うプロセスプールも、このときに起動しておく。アウトオブコアで扱う
+大きさのデータセットは、列指向ファイルへの変換と集計だけを行う。
+
+app.py から読み込むため、pandas などの重いモジュールは関数内で読み込む。
+"""
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENV = "WARMUP_ON_START"
+WARMUP_EXPORT_FORMATS_ENV = "WARMUP_EXPORT_FORMATS"
+
+# 既定で事前作成するエクスポート形式
+DEFAULT_WARMUP_FORMATS = ("csv", "excel", "json")
+
+# スケジューラー上でウォームアップのジョブに使うセッションID
+WARMUP_SESSION = "warmup"
+
+
+@dataclass
+class WarmupStatus:
+    """ウォームアップの進行状況
+
+    Attributes:
+        datasets: 対象データセットのパス
+        state: "pending" / "running" / "done"
+        completed: 完了したデータセットのパス
+        errors: 失敗したデータセットのパスとエラーメッセージ
+        started_at: 開始時刻（time.time()）
+        finished_at: 終了時刻（time.time()）
+    """
+
+    datasets: list[str]
+    state: str = "pending"
+    completed: list[str] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+
+def is_warmup_enabled() -> bool:
+    """環境変数でウォームアップが有効化されているか"""
+    return os.environ.get(WARMUP_ENV, "").lower() in ("1", "true", "yes")
+
+
+def warmup_export_formats() -> list[str]:
+    """事前作成するエクスポート形式を取得（環境変数でカンマ区切り指定、空なら作成しない）"""
+    raw = os.environ.get(WARMUP_EXPORT_FORMATS_ENV)
+    if raw is None:
+        return list(DEFAULT_WARMUP_FORMATS)
+    return [fmt.strip() for fmt in raw.split(",") if fmt.strip()]
+
+
+def warmup_dataset_paths() -> list[Path]:
+    """ウォームアップ対象のデータセット（サンプルデータと注目データセット）"""
+    from utils.data_loader import SAMPLE_DATA_PATH
+    from utils.shared_datasets import featured_dataset_paths
+
+    paths = [SAMPLE_DATA_PATH]
+    paths.extend(p for p in featured_dataset_paths() if p not in paths)
+    return paths
+
+
+def warmup_dataset(path: Path, export_formats: Sequence[str] = DEFAULT_WARMUP_FORMATS) -> None:
+    """1つのデータセットを読み込み、画面で使う結果をキャッシュに用意
+
+    フィンガープリントは画面側と同じ方法で導出するため、利用者が同じデータを
+    開くと集計・見積もり・エクスポートはキャッシュから返る。
+
+    Args:
+        path: CSVファイルのパス
+        export_formats: 事前作成するエクスポート形式
+    """
+    from components.charts import build_default_figures
+    from utils.analysis_summary import get_analysis_summary
+    from utils.columnar_store import is_out_of_core
+    from utils.compute_backend import get_compute_backend
+    from utils.data_loader import validate_sports_survey_data
+    from utils.export_estimator import get_export_estimates
+    from utils.export_jobs import get_export_job_manager
+    from utils.fingerprint import compute_dataset_fingerprint, derive_fingerprint
+    from utils.shared_datasets import load_shared_dataset
+    from utils.tracing import span, start_trace
+
+    if path.exists() and is_out_of_core(path):
+        warmup_columnar_dataset(path)
+        return
+
+    with start_trace(f"warmup:{path.name}"):
+        with span("load"):
+            df = load_shared_dataset(path)
+        if not validate_sports_survey_data(df):
+            raise ValueError(f"データ形式が正しくありません: {path}")
+        base = compute_dataset_fingerprint(df)
+
+        # 全年齢と各年齢層の集計（サイドバーの年齢層フィルターと同じ選択肢）
+        for age in ["全年齢"] + sorted(df["年齢層"].unique().tolist()):
+            with span("summary", age_group=age):
+                get_analysis_summary(
+                    derive_fingerprint(base, age_group=age),
+                    get_compute_backend().filter_by_age_group(df, age),
+                )
+
+        fingerprint = derive_fingerprint(base, age_group="全年齢")
+        with span("figures"):
+            build_default_figures(df, get_analysis_summary(fingerprint, df))
+        with span("estimates"):
+            get_export_estimates(fingerprint, df)
+
+        manager = get_export_job_manager()
+        jobs = [
+            manager.submit(fingerprint, fmt, df, session_id=WARMUP_SESSION)
+            for fmt in export_formats
+        ]
+        with span("exports", formats=",".join(export_formats)):
+            for job in jobs:
+                if job.task is not None:
+                    job.task.future.result()
+                if job.status == "failed":
+                    raise RuntimeError(f"{job.file_format} の作成に失敗: {job.error}")
+
+    logger.info(f"Warmup dataset ready: path={path}, rows={len(df)}")
+
+
+def warmup_columnar_dataset(path: Path) -> None:
+    """アウトオブコアで扱うデータセットを列指向ファイルに変換し、集計結果を用意
+
+    行データを持たないため、エクスポートは作成しない。
+
+    Args:
+        path: CSVファイルのパス
+    """
+    from components.charts import (
+        build_bar_figure,
+        build_box_figure_from_stats,
+        build_heatmap_figure,
+        build_line_figure,
+    )
+    from utils.columnar_store import get_columnar_dataset, get_columnar_summary
+    from utils.fingerprint import derive_fingerprint
+    from utils.tracing import span, start_trace
+
+    with start_trace(f"warmup:{path.name}"):
+        with span("columnar_dataset"):
+            dataset = get_columnar_dataset(path)
+        if len(dataset.sports) < 3:
+            raise ValueError(f"データ形式が正しくありません: {path}")
+
+        for age in ["全年齢"] + dataset.age_groups:
+            with span("summary", age_group=age):
+                get_columnar_summary(
+                    derive_fingerprint(dataset.fingerprint, age_group=age),
+                    age if age != "全年齢" else None,
+                    dataset,
+                )
+
+        summary = get_columnar_summary(
+            derive_fingerprint(dataset.fingerprint, age_group="全年齢"), None, dataset
+        )
+        with span("figures"):
+            build_bar_figure(summary)
+            build_line_figure(summary, dataset.sports[:3])
+            build_heatmap_figure(summary, dataset.sports)
+            build_box_figure_from_stats(summary, dataset.sports[0])
+
+    logger.info(f"Warmup columnar dataset ready: path={path}, rows={dataset.rows}")
+
+
+def run_warmup(
+    paths: Sequence[Path],
+    export_formats: Sequence[str] = DEFAULT_WARMUP_FORMATS,
+    status: WarmupStatus | None = None,
+) -> WarmupStatus:
+    """データセットを順にウォームアップ（失敗したものは記録して次へ進む）
+
+    Args:
+        paths: 対象データセットのパス
+        export_formats: 事前作成するエクスポート形式
+        status: 進行状況の記録先（省略時は新規作成）
+
+    Returns:
+        進行状況
+    """
+    if status is None:
+        status = WarmupStatus(datasets=[str(p) for p in paths])
+    status.state = "running"
+    status.started_at = time.time()
+    for path in paths:
+        try:
+            warmup_dataset(Path(path), export_formats)
+            status.completed.append(str(path))
+        except Exception as e:
+            status.errors[str(path)] = str(e)
+            logger.warning(f"Warmup failed: path={path}, error={e}")
+    status.finished_at = time.time()
+    status.state = "done"
+    logger.info(
+        f"Warmup finished: datasets={len(status.completed)}/{len(paths)}, "
+        f"elapsed={status.finished_at - status.started_at:.2f}s"
+    )
+    return status
+
+
+def _warmup_thread(
+    paths: Sequence[Path], export_formats: Sequence[str], status: WarmupStatus
+) -> None:
+    """バックグラウンドスレッドの処理（集計用プロセスプールの起動とデータセットの準備）"""
+    from utils.parallel_aggregation import get_aggregation_pool, get_aggregation_workers
+
+    if get_aggregation_workers() > 1:
+        try:
+            get_aggregation_pool()
+        except Exception as e:
+            logger.warning(f"Failed to start aggregation pool: {e}")
+    run_warmup(paths, export_formats, status)
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup() -> WarmupStatus | None:
+    """環境変数 WARMUP_ON_START が有効ならウォームアップを開始（プロセスで1回だけ）
+
+    Streamlit にはサーバー起動時のフックが無いため、最初のセッションの
+    再実行で開始する。処理はバックグラウンドスレッドで行い、画面表示は待たない。
+
+    Returns:
+        進行状況（無効ならNone）
+    """
+    if not is_warmup_enabled():
+        return None
+    paths = warmup_dataset_paths()
+    status = WarmupStatus(datasets=[str(p) for p in paths])
+    threading.Thread(
+        target=_warmup_thread,
+        args=(paths, warmup_export_formats(), status),
+        name="warmup",
+        daemon=True,
+    ).start()
+    return status